@@ -1,95 +1,281 @@
+import importlib
 import logging
 import sys
-from typing import Literal
-
-from openai import AsyncOpenAI
-
-from . import _config
-from .agent import Agent
-from .agent_output import AgentOutputSchema
-from .computer import AsyncComputer, Button, Computer, Environment
-from .exceptions import (
-    AgentsException,
-    InputGuardrailTripwireTriggered,
-    MaxTurnsExceeded,
-    ModelBehaviorError,
-    OutputGuardrailTripwireTriggered,
-    UserError,
-)
-from .guardrail import (
-    GuardrailFunctionOutput,
-    InputGuardrail,
-    InputGuardrailResult,
-    OutputGuardrail,
-    OutputGuardrailResult,
-    input_guardrail,
-    output_guardrail,
-)
-from .handoffs import Handoff, HandoffInputData, HandoffInputFilter, handoff
-from .items import (
-    HandoffCallItem,
-    HandoffOutputItem,
-    ItemHelpers,
-    MessageOutputItem,
-    ModelResponse,
-    ReasoningItem,
-    RunItem,
-    ToolCallItem,
-    ToolCallOutputItem,
-    TResponseInputItem,
-)
-from .lifecycle import AgentHooks, RunHooks
-from .model_settings import ModelSettings
-from .models.interface import Model, ModelProvider, ModelTracing
-from .models.openai_chatcompletions import OpenAIChatCompletionsModel
-from .models.openai_provider import OpenAIProvider
-from .models.openai_responses import OpenAIResponsesModel
-from .result import RunResult, RunResultStreaming
-from .run import RunConfig, Runner
-from .run_context import RunContextWrapper, TContext
-from .stream_events import (
-    AgentUpdatedStreamEvent,
-    RawResponsesStreamEvent,
-    RunItemStreamEvent,
-    StreamEvent,
-)
-from .tool import (
-    ComputerTool,
-    FileSearchTool,
-    FunctionTool,
-    Tool,
-    WebSearchTool,
-    default_tool_error_function,
-    function_tool,
-)
-from .tracing import (
-    AgentSpanData,
-    CustomSpanData,
-    FunctionSpanData,
-    GenerationSpanData,
-    GuardrailSpanData,
-    HandoffSpanData,
-    Span,
-    SpanData,
-    SpanError,
-    Trace,
-    add_trace_processor,
-    agent_span,
-    custom_span,
-    function_span,
-    gen_span_id,
-    gen_trace_id,
-    generation_span,
-    get_current_span,
-    get_current_trace,
-    guardrail_span,
-    handoff_span,
-    set_trace_processors,
-    set_tracing_disabled,
-    set_tracing_export_api_key,
-    trace,
-)
-from .usage import Usage
+from typing import TYPE_CHECKING, Any, Literal
+
+if TYPE_CHECKING:
+    from openai import AsyncOpenAI
+
+    from .agent import Agent
+    from .agent_output import AgentOutputSchema
+    from .checkpoint import (
+        CheckpointStore,
+        FileCheckpointStore,
+        RunCheckpoint,
+        SQLiteCheckpointStore,
+    )
+    from .compaction import CompactionFilter, CompactionInputData
+    from .computer import AsyncComputer, Button, Computer, Environment
+    from .exceptions import (
+        AgentsException,
+        InputGuardrailTripwireTriggered,
+        MaxTurnsExceeded,
+        ModelBehaviorError,
+        OutputGuardrailTripwireTriggered,
+        UserError,
+    )
+    from .guardrail import (
+        GuardrailFunctionOutput,
+        GuardrailStats,
+        InputGuardrail,
+        InputGuardrailResult,
+        InputGuardrailStrategy,
+        OutputGuardrail,
+        OutputGuardrailResult,
+        StreamedTextWindow,
+        StreamingOutputGuardrail,
+        input_guardrail,
+        output_guardrail,
+    )
+    from .guardrail_cache import GuardrailCache, InMemoryGuardrailCache, SQLiteGuardrailCache
+    from .handoffs import Handoff, HandoffInputData, HandoffInputFilter, handoff
+    from .items import (
+        HandoffCallItem,
+        HandoffOutputItem,
+        ItemHelpers,
+        MessageOutputItem,
+        ModelResponse,
+        ReasoningItem,
+        RunItem,
+        ToolCallItem,
+        ToolCallOutputItem,
+        TResponseInputItem,
+    )
+    from .json_codec import JSONCodec, OrjsonCodec, StdlibJSONCodec, get_json_codec, set_json_codec
+    from .lifecycle import AgentHooks, RunHooks
+    from .memory import InMemorySession, Session, SQLiteSession
+    from .model_settings import ModelSettings
+    from .models.interface import Model, ModelProvider, ModelTracing
+    from .models.openai_chatcompletions import OpenAIChatCompletionsModel
+    from .models.openai_provider import OpenAIProvider
+    from .models.openai_responses import OpenAIResponsesModel
+    from .result import RunResult, RunResultStreaming
+    from .run import RunConfig, Runner
+    from .run_context import RunContextWrapper, TContext
+    from .schema_cache import SchemaCache, get_schema_cache, set_schema_cache
+    from .stream_events import (
+        AgentUpdatedStreamEvent,
+        PartialOutputStreamEvent,
+        RawResponsesStreamEvent,
+        RunItemStreamEvent,
+        StreamEvent,
+    )
+    from .stream_multiplexer import (
+        MultiplexedRunComplete,
+        MultiplexedStreamEvent,
+        MultiplexerEvent,
+        StreamMultiplexer,
+    )
+    from .stream_queue import StreamQueueOverflowPolicy, StreamQueueStats
+    from .token_estimator import (
+        HeuristicTokenEstimator,
+        TiktokenEstimator,
+        TokenEstimator,
+        get_default_token_estimator,
+        set_default_token_estimator,
+    )
+    from .tool import (
+        ComputerTool,
+        FileSearchTool,
+        FunctionTool,
+        Tool,
+        WebSearchTool,
+        default_tool_error_function,
+        function_tool,
+    )
+    from .tracing import (
+        AgentSpanData,
+        CustomSpanData,
+        FunctionSpanData,
+        GenerationSpanData,
+        GuardrailSpanData,
+        HandoffSpanData,
+        Span,
+        SpanData,
+        SpanError,
+        Trace,
+        add_trace_processor,
+        agent_span,
+        custom_span,
+        function_span,
+        gen_span_id,
+        gen_trace_id,
+        generation_span,
+        get_current_span,
+        get_current_trace,
+        guardrail_span,
+        handoff_span,
+        set_trace_processors,
+        set_tracing_disabled,
+        set_tracing_export_api_key,
+        trace,
+    )
+    from .usage import Usage
+
+# The public names of the package, and the modules they're defined in. They're imported on first
+# access (PEP 562), so that `import agents` doesn't pay for the OpenAI client, the models, tracing
+# and the rest until they're used.
+_LAZY_IMPORTS: dict[str, str] = {
+    "Agent": ".agent",
+    "AgentOutputSchema": ".agent_output",
+    "CheckpointStore": ".checkpoint",
+    "FileCheckpointStore": ".checkpoint",
+    "RunCheckpoint": ".checkpoint",
+    "SQLiteCheckpointStore": ".checkpoint",
+    "CompactionFilter": ".compaction",
+    "CompactionInputData": ".compaction",
+    "AsyncComputer": ".computer",
+    "Button": ".computer",
+    "Computer": ".computer",
+    "Environment": ".computer",
+    "AgentsException": ".exceptions",
+    "InputGuardrailTripwireTriggered": ".exceptions",
+    "MaxTurnsExceeded": ".exceptions",
+    "ModelBehaviorError": ".exceptions",
+    "OutputGuardrailTripwireTriggered": ".exceptions",
+    "UserError": ".exceptions",
+    "GuardrailFunctionOutput": ".guardrail",
+    "GuardrailStats": ".guardrail",
+    "InputGuardrail": ".guardrail",
+    "InputGuardrailResult": ".guardrail",
+    "InputGuardrailStrategy": ".guardrail",
+    "OutputGuardrail": ".guardrail",
+    "OutputGuardrailResult": ".guardrail",
+    "StreamedTextWindow": ".guardrail",
+    "StreamingOutputGuardrail": ".guardrail",
+    "input_guardrail": ".guardrail",
+    "output_guardrail": ".guardrail",
+    "GuardrailCache": ".guardrail_cache",
+    "InMemoryGuardrailCache": ".guardrail_cache",
+    "SQLiteGuardrailCache": ".guardrail_cache",
+    "Handoff": ".handoffs",
+    "HandoffInputData": ".handoffs",
+    "HandoffInputFilter": ".handoffs",
+    "handoff": ".handoffs",
+    "HandoffCallItem": ".items",
+    "HandoffOutputItem": ".items",
+    "ItemHelpers": ".items",
+    "MessageOutputItem": ".items",
+    "ModelResponse": ".items",
+    "ReasoningItem": ".items",
+    "RunItem": ".items",
+    "ToolCallItem": ".items",
+    "ToolCallOutputItem": ".items",
+    "TResponseInputItem": ".items",
+    "JSONCodec": ".json_codec",
+    "OrjsonCodec": ".json_codec",
+    "StdlibJSONCodec": ".json_codec",
+    "get_json_codec": ".json_codec",
+    "set_json_codec": ".json_codec",
+    "AgentHooks": ".lifecycle",
+    "RunHooks": ".lifecycle",
+    "InMemorySession": ".memory",
+    "Session": ".memory",
+    "SQLiteSession": ".memory",
+    "ModelSettings": ".model_settings",
+    "Model": ".models.interface",
+    "ModelProvider": ".models.interface",
+    "ModelTracing": ".models.interface",
+    "OpenAIChatCompletionsModel": ".models.openai_chatcompletions",
+    "OpenAIProvider": ".models.openai_provider",
+    "OpenAIResponsesModel": ".models.openai_responses",
+    "RunResult": ".result",
+    "RunResultStreaming": ".result",
+    "RunConfig": ".run",
+    "Runner": ".run",
+    "SchemaCache": ".schema_cache",
+    "get_schema_cache": ".schema_cache",
+    "set_schema_cache": ".schema_cache",
+    "RunContextWrapper": ".run_context",
+    "TContext": ".run_context",
+    "AgentUpdatedStreamEvent": ".stream_events",
+    "PartialOutputStreamEvent": ".stream_events",
+    "RawResponsesStreamEvent": ".stream_events",
+    "RunItemStreamEvent": ".stream_events",
+    "StreamEvent": ".stream_events",
+    "MultiplexedRunComplete": ".stream_multiplexer",
+    "MultiplexedStreamEvent": ".stream_multiplexer",
+    "MultiplexerEvent": ".stream_multiplexer",
+    "StreamMultiplexer": ".stream_multiplexer",
+    "StreamQueueOverflowPolicy": ".stream_queue",
+    "StreamQueueStats": ".stream_queue",
+    "HeuristicTokenEstimator": ".token_estimator",
+    "TiktokenEstimator": ".token_estimator",
+    "TokenEstimator": ".token_estimator",
+    "get_default_token_estimator": ".token_estimator",
+    "set_default_token_estimator": ".token_estimator",
+    "ComputerTool": ".tool",
+    "FileSearchTool": ".tool",
+    "FunctionTool": ".tool",
+    "Tool": ".tool",
+    "WebSearchTool": ".tool",
+    "default_tool_error_function": ".tool",
+    "function_tool": ".tool",
+    "AgentSpanData": ".tracing",
+    "CustomSpanData": ".tracing",
+    "FunctionSpanData": ".tracing",
+    "GenerationSpanData": ".tracing",
+    "GuardrailSpanData": ".tracing",
+    "HandoffSpanData": ".tracing",
+    "Span": ".tracing",
+    "SpanData": ".tracing",
+    "SpanError": ".tracing",
+    "Trace": ".tracing",
+    "add_trace_processor": ".tracing",
+    "agent_span": ".tracing",
+    "custom_span": ".tracing",
+    "function_span": ".tracing",
+    "gen_span_id": ".tracing",
+    "gen_trace_id": ".tracing",
+    "generation_span": ".tracing",
+    "get_current_span": ".tracing",
+    "get_current_trace": ".tracing",
+    "guardrail_span": ".tracing",
+    "handoff_span": ".tracing",
+    "set_trace_processors": ".tracing",
+    "set_tracing_disabled": ".tracing",
+    "set_tracing_export_api_key": ".tracing",
+    "trace": ".tracing",
+    "Usage": ".usage",
+}
+
+
+def __getattr__(name: str) -> Any:
+    module_name = _LAZY_IMPORTS.get(name)
+    if module_name is None:
+        return _import_submodule(name)
+    value = getattr(importlib.import_module(module_name, __name__), name)
+    # Cache the value, so that `__getattr__` isn't called for it again
+    globals()[name] = value
+    return value
+
+
+def _import_submodule(name: str) -> Any:
+    """Imports a submodule on attribute access, e.g. `agents.tracing`, as the package used to import
+    them all eagerly."""
+    if not name.startswith("__"):
+        try:
+            # Importing a submodule also sets it as an attribute of the package
+            return importlib.import_module(f".{name}", __name__)
+        except ModuleNotFoundError as e:
+            # Errors about missing dependencies of the submodule are raised as is
+            if e.name != f"{__name__}.{name}":
+                raise
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+
+def __dir__() -> list[str]:
+    return sorted(set(globals()) | set(_LAZY_IMPORTS))
 
 
 def set_default_openai_key(key: str) -> None:
@@ -98,10 +284,12 @@ def set_default_openai_key(key: str) -> None:
 
     If provided, this key will be used instead of the OPENAI_API_KEY environment variable.
     """
+    from . import _config
+
     _config.set_default_openai_key(key)
 
 
-def set_default_openai_client(client: AsyncOpenAI, use_for_tracing: bool = True) -> None:
+def set_default_openai_client(client: "AsyncOpenAI", use_for_tracing: bool = True) -> None:
     """Set the default OpenAI client to use for LLM requests and/or tracing. If provided, this
     client will be used instead of the default OpenAI client.
 
@@ -111,6 +299,8 @@ def set_default_openai_client(client: AsyncOpenAI, use_for_tracing: bool = True)
             you'll either need to set the OPENAI_API_KEY environment variable or call
             set_tracing_export_api_key() with the API key you want to use for tracing.
     """
+    from . import _config
+
     _config.set_default_openai_client(client, use_for_tracing)
 
 
@@ -118,6 +308,8 @@ def set_default_openai_api(api: Literal["chat_completions", "responses"]) -> Non
     """Set the default API to use for OpenAI LLM requests. By default, we will use the responses API
     but you can set this to use the chat completions API instead.
     """
+    from . import _config
+
     _config.set_default_openai_api(api)
 
 
@@ -154,13 +346,22 @@ __all__ = [
     "InputGuardrailResult",
     "OutputGuardrail",
     "OutputGuardrailResult",
+    "StreamingOutputGuardrail",
+    "StreamedTextWindow",
     "GuardrailFunctionOutput",
+    "GuardrailStats",
+    "InputGuardrailStrategy",
     "input_guardrail",
     "output_guardrail",
+    "GuardrailCache",
+    "InMemoryGuardrailCache",
+    "SQLiteGuardrailCache",
     "handoff",
     "Handoff",
     "HandoffInputData",
     "HandoffInputFilter",
+    "CompactionInputData",
+    "CompactionFilter",
     "TResponseInputItem",
     "MessageOutputItem",
     "ModelResponse",
@@ -172,8 +373,23 @@ __all__ = [
     "ReasoningItem",
     "ModelResponse",
     "ItemHelpers",
+    "JSONCodec",
+    "StdlibJSONCodec",
+    "OrjsonCodec",
+    "get_json_codec",
+    "set_json_codec",
+    "SchemaCache",
+    "get_schema_cache",
+    "set_schema_cache",
     "RunHooks",
     "AgentHooks",
+    "Session",
+    "InMemorySession",
+    "SQLiteSession",
+    "RunCheckpoint",
+    "CheckpointStore",
+    "FileCheckpointStore",
+    "SQLiteCheckpointStore",
     "RunContextWrapper",
     "TContext",
     "RunResult",
@@ -182,7 +398,14 @@ __all__ = [
     "RawResponsesStreamEvent",
     "RunItemStreamEvent",
     "AgentUpdatedStreamEvent",
+    "PartialOutputStreamEvent",
     "StreamEvent",
+    "StreamMultiplexer",
+    "MultiplexedStreamEvent",
+    "MultiplexedRunComplete",
+    "MultiplexerEvent",
+    "StreamQueueOverflowPolicy",
+    "StreamQueueStats",
     "FunctionTool",
     "ComputerTool",
     "FileSearchTool",
@@ -190,6 +413,11 @@ __all__ = [
     "WebSearchTool",
     "function_tool",
     "Usage",
+    "TokenEstimator",
+    "HeuristicTokenEstimator",
+    "TiktokenEstimator",
+    "get_default_token_estimator",
+    "set_default_token_estimator",
     "add_trace_processor",
     "agent_span",
     "custom_span",
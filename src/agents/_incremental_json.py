@@ -0,0 +1,335 @@
+from __future__ import annotations
+
+import json
+import re
+from typing import Any, Literal, Union
+
+from typing_extensions import TypeAlias
+
+_WHITESPACE = frozenset(" \t\n\r")
+_STRING_SPECIAL = re.compile(r'["\\]')
+_SIMPLE_ESCAPES = {
+    '"': '"',
+    "\\": "\\",
+    "/": "/",
+    "b": "\b",
+    "f": "\f",
+    "n": "\n",
+    "r": "\r",
+    "t": "\t",
+}
+_NUMBER_CHARS = frozenset("0123456789+-.eE")
+_LITERALS: dict[str, Any] = {"true": True, "false": False, "null": None}
+_MISSING: Any = object()
+
+_Container: TypeAlias = Union[dict[str, Any], list[Any]]
+_Slot: TypeAlias = Union[tuple[_Container, Any], None]
+"""A container and the key/index of a value in it, or None for the top-level value."""
+
+
+class IncrementalJsonError(ValueError):
+    """Raised when the text fed to an `IncrementalJsonParser` is not valid JSON."""
+
+
+class IncrementalJsonParser:
+    """Parses a JSON document as it arrives in chunks, e.g. the text deltas of a streamed model
+    response.
+
+    Every character is looked at exactly once: completed values are stored in live containers, so
+    feeding a new chunk only costs as much as the chunk itself. `snapshot()` returns the value
+    parsed so far, with the same semantics as `pydantic_core.from_json(...,
+    allow_partial="trailing-strings")`: an unfinished trailing string is included, as is a trailing
+    number or literal if it's valid so far, while unfinished keys are left out. The one difference
+    is that a string ending in an unfinished escape sequence keeps the text before it.
+    """
+
+    def __init__(self) -> None:
+        self._root: Any = _MISSING
+        self._stack: list[_Container] = []
+        """The containers that are still open, outermost first."""
+        self._stack_slots: list[_Slot] = []
+        """Where each open container lives in its parent."""
+        self._expect: Literal["value", "key", "colon", "comma", "done"] = "value"
+        self._key: str | None = None
+        """The key awaiting its value in the innermost object."""
+
+        self._string_parts: list[str] | None = None
+        """The decoded parts of the string being parsed, or None if not inside a string."""
+        self._string_is_key = False
+        self._string_slot: _Slot = None
+        """Where the string being parsed lives, so snapshots can fill it in."""
+        self._string_has_surrogates = False
+        self._escape: str | None = None
+        """An escape sequence (without the backslash) that was split across chunks."""
+
+        self._token: str | None = None
+        """A number or literal being parsed."""
+        self._token_placed = False
+        """Whether a snapshot already stored the token, as a number, in `_token_slot`."""
+        self._token_slot: _Slot = None
+
+    @property
+    def done(self) -> bool:
+        """Whether a complete top-level value has been parsed."""
+        return self._expect == "done" and self._token is None and self._string_parts is None
+
+    def feed(self, chunk: str) -> None:
+        """Parse the next chunk of the document. Raises `IncrementalJsonError` if the document is
+        not valid JSON.
+        """
+        i = 0
+        n = len(chunk)
+        while i < n:
+            if self._string_parts is not None:
+                chunk, i = self._feed_string(chunk, i)
+                n = len(chunk)
+                continue
+
+            char = chunk[i]
+            if self._token is not None:
+                if char in _NUMBER_CHARS or char.isalpha():
+                    start = i
+                    while i < n and (chunk[i] in _NUMBER_CHARS or chunk[i].isalpha()):
+                        i += 1
+                    self._token += chunk[start:i]
+                    continue
+                self._finish_token()
+
+            if char in _WHITESPACE:
+                i += 1
+                continue
+
+            expect = self._expect
+            if expect == "value":
+                if char == "{":
+                    obj: dict[str, Any] = {}
+                    self._push(obj)
+                    self._expect = "key"
+                elif char == "[":
+                    array: list[Any] = []
+                    self._push(array)
+                    self._expect = "value"
+                elif char == '"':
+                    self._start_string(is_key=False)
+                elif char == "]" and self._stack and isinstance(self._stack[-1], list):
+                    self._close_container()
+                elif char in _NUMBER_CHARS or char.isalpha():
+                    self._token = ""
+                    continue
+                else:
+                    self._raise_unexpected(char)
+            elif expect == "key":
+                if char == '"':
+                    self._start_string(is_key=True)
+                elif char == "}":
+                    self._close_container()
+                else:
+                    self._raise_unexpected(char)
+            elif expect == "colon":
+                if char != ":":
+                    self._raise_unexpected(char)
+                self._expect = "value"
+            elif expect == "comma":
+                container = self._stack[-1]
+                if char == ",":
+                    self._expect = "key" if isinstance(container, dict) else "value"
+                elif (char == "}" and isinstance(container, dict)) or (
+                    char == "]" and isinstance(container, list)
+                ):
+                    self._close_container()
+                else:
+                    self._raise_unexpected(char)
+            else:
+                self._raise_unexpected(char)
+            i += 1
+
+    def snapshot(self) -> Any:
+        """The value parsed so far. Raises `IncrementalJsonError` if nothing has been parsed yet.
+
+        Feeding more chunks doesn't change a snapshot that was already returned. Only the
+        containers that are still open are copied; closed ones are shared between snapshots, so
+        they must not be mutated.
+        """
+        if self._string_parts is not None and not self._string_is_key:
+            self._set_slot(self._string_slot, self._current_string())
+        elif self._token is not None:
+            value = _parse_token(self._token)
+            if value is not _MISSING:
+                if self._token_placed:
+                    self._set_slot(self._token_slot, value)
+                else:
+                    self._token_slot = self._add_value(value)
+                    self._token_placed = True
+            elif self._token_placed:
+                # E.g. "1" was a valid number, but "1." isn't (yet)
+                self._remove_token()
+
+        if self._root is _MISSING:
+            raise IncrementalJsonError("No JSON value has been parsed yet")
+        if not self._stack:
+            return self._root
+
+        copies = [container.copy() for container in self._stack]
+        for depth in range(1, len(copies)):
+            slot = self._stack_slots[depth]
+            assert slot is not None
+            copies[depth - 1][slot[1]] = copies[depth]
+        return copies[0]
+
+    def _feed_string(self, chunk: str, i: int) -> tuple[str, int]:
+        """Parses string contents starting at `chunk[i]`, returning the (possibly updated) chunk
+        and the position to continue from.
+        """
+        assert self._string_parts is not None
+        n = len(chunk)
+
+        if self._escape is not None:
+            # Resume an escape sequence that was split across chunks
+            chunk = "\\" + self._escape + chunk[i:]
+            self._escape = None
+            i = 0
+            n = len(chunk)
+
+        while i < n:
+            match = _STRING_SPECIAL.search(chunk, i)
+            if match is None:
+                self._string_parts.append(chunk[i:])
+                return chunk, n
+
+            end = match.start()
+            if end > i:
+                self._string_parts.append(chunk[i:end])
+            if chunk[end] == '"':
+                self._finish_string()
+                return chunk, end + 1
+
+            # A backslash: decode the escape sequence if the chunk contains all of it
+            escape = chunk[end + 1 : end + 2]
+            if escape == "u":
+                escape = chunk[end + 1 : end + 6]
+            if not escape or (escape.startswith("u") and len(escape) < 5):
+                self._escape = escape
+                return chunk, n
+            self._string_parts.append(self._decode_escape(escape))
+            i = end + 1 + len(escape)
+        return chunk, i
+
+    def _decode_escape(self, escape: str) -> str:
+        if escape.startswith("u"):
+            try:
+                code = int(escape[1:], 16)
+            except ValueError:
+                raise IncrementalJsonError(f"Invalid unicode escape: \\{escape}") from None
+            if 0xD800 <= code <= 0xDFFF:
+                self._string_has_surrogates = True
+            return chr(code)
+        try:
+            return _SIMPLE_ESCAPES[escape]
+        except KeyError:
+            raise IncrementalJsonError(f"Invalid escape: \\{escape}") from None
+
+    def _start_string(self, *, is_key: bool) -> None:
+        self._string_parts = []
+        self._string_is_key = is_key
+        self._string_has_surrogates = False
+        if not is_key:
+            self._string_slot = self._add_value("")
+
+    def _current_string(self) -> str:
+        assert self._string_parts is not None
+        if len(self._string_parts) > 1:
+            # Keep the parts compact, so repeated snapshots don't rejoin every delta
+            self._string_parts = ["".join(self._string_parts)]
+        value = self._string_parts[0] if self._string_parts else ""
+        if self._string_has_surrogates:
+            value = value.encode("utf-16", "surrogatepass").decode("utf-16", "replace")
+        return value
+
+    def _finish_string(self) -> None:
+        value = self._current_string()
+        self._string_parts = None
+        self._escape = None
+        if self._string_is_key:
+            self._key = value
+            self._expect = "colon"
+        else:
+            self._set_slot(self._string_slot, value)
+            self._string_slot = None
+
+    def _finish_token(self) -> None:
+        assert self._token is not None
+        value = _parse_token(self._token)
+        if value is _MISSING:
+            raise IncrementalJsonError(f"Invalid JSON value: {self._token!r}")
+        if self._token_placed:
+            self._set_slot(self._token_slot, value)
+        else:
+            self._add_value(value)
+        self._token = None
+        self._token_placed = False
+        self._token_slot = None
+
+    def _remove_token(self) -> None:
+        slot = self._token_slot
+        if slot is None:
+            self._root = _MISSING
+        else:
+            container, key = slot
+            if isinstance(container, list):
+                container.pop()
+            else:
+                del container[key]
+                self._key = key
+        self._token_placed = False
+        self._token_slot = None
+
+    def _add_value(self, value: Any) -> _Slot:
+        """Stores a new value in the innermost container (or as the root), returning its slot."""
+        if not self._stack:
+            if self._root is not _MISSING:
+                raise IncrementalJsonError("Unexpected data after the JSON value")
+            self._root = value
+            self._expect = "done"
+            return None
+
+        container = self._stack[-1]
+        self._expect = "comma"
+        if isinstance(container, list):
+            container.append(value)
+            return container, len(container) - 1
+        key = self._key
+        self._key = None
+        container[key] = value  # type: ignore[index]
+        return container, key
+
+    def _set_slot(self, slot: _Slot, value: Any) -> None:
+        if slot is None:
+            self._root = value
+        else:
+            container, key = slot
+            container[key] = value
+
+    def _push(self, container: _Container) -> None:
+        self._stack_slots.append(self._add_value(container))
+        self._stack.append(container)
+
+    def _close_container(self) -> None:
+        self._stack.pop()
+        self._stack_slots.pop()
+        self._expect = "comma" if self._stack else "done"
+
+    def _raise_unexpected(self, char: str) -> None:
+        raise IncrementalJsonError(f"Unexpected character {char!r} in JSON")
+
+
+def _parse_token(token: str) -> Any:
+    """Parses a number or literal, returning `_MISSING` if it's not valid."""
+    if token in _LITERALS:
+        return _LITERALS[token]
+    if not token or token[-1] not in "0123456789":
+        # Python would accept e.g. "NaN" or "Infinity", which aren't valid JSON
+        return _MISSING
+    try:
+        return json.loads(token)
+    except ValueError:
+        return _MISSING
@@ -1,15 +1,19 @@
 from __future__ import annotations
 
 import asyncio
+import time
+from collections.abc import Coroutine
 from dataclasses import dataclass
 from typing import TYPE_CHECKING, Any
 
 from openai.types.responses import (
     ResponseComputerToolCall,
+    ResponseContentPartAddedEvent,
     ResponseFileSearchToolCall,
     ResponseFunctionToolCall,
     ResponseFunctionWebSearch,
     ResponseOutputMessage,
+    ResponseTextDeltaEvent,
 )
 from openai.types.responses.response_computer_tool_call import (
     ActionClick,
@@ -26,11 +30,24 @@ from openai.types.responses.response_input_param import ComputerCallOutput
 from openai.types.responses.response_reasoning_item import ResponseReasoningItem
 
 from . import _utils
+from ._incremental_json import IncrementalJsonError, IncrementalJsonParser
 from .agent import Agent
 from .agent_output import AgentOutputSchema
 from .computer import AsyncComputer, Computer
-from .exceptions import AgentsException, ModelBehaviorError, UserError
-from .guardrail import InputGuardrail, InputGuardrailResult, OutputGuardrail, OutputGuardrailResult
+from .exceptions import (
+    AgentsException,
+    ModelBehaviorError,
+    OutputGuardrailTripwireTriggered,
+    UserError,
+)
+from .guardrail import (
+    InputGuardrail,
+    InputGuardrailResult,
+    OutputGuardrail,
+    OutputGuardrailResult,
+    StreamedTextWindow,
+    StreamingOutputGuardrail,
+)
 from .handoffs import Handoff, HandoffInputData
 from .items import (
     HandoffCallItem,
@@ -43,12 +60,13 @@ from .items import (
     ToolCallItem,
     ToolCallOutputItem,
     TResponseInputItem,
+    TResponseStreamEvent,
 )
 from .lifecycle import RunHooks
 from .logger import logger
 from .models.interface import ModelTracing
 from .run_context import RunContextWrapper, TContext
-from .stream_events import RunItemStreamEvent, StreamEvent
+from .stream_events import PartialOutputStreamEvent, RunItemStreamEvent, StreamEvent
 from .tool import ComputerTool, FunctionTool
 from .tracing import (
     SpanError,
@@ -175,6 +193,7 @@ class RunImpl:
         hooks: RunHooks[TContext],
         context_wrapper: RunContextWrapper[TContext],
         run_config: RunConfig,
+        started_tool_calls: dict[str, asyncio.Task[Any]] | None = None,
     ) -> SingleStepResult:
         # Make a copy of the generated items
         pre_step_items = list(pre_step_items)
@@ -190,6 +209,7 @@ class RunImpl:
                 hooks=hooks,
                 context_wrapper=context_wrapper,
                 config=run_config,
+                started_tool_calls=started_tool_calls,
             ),
             cls.execute_computer_actions(
                 agent=agent,
@@ -355,51 +375,24 @@ class RunImpl:
         hooks: RunHooks[TContext],
         context_wrapper: RunContextWrapper[TContext],
         config: RunConfig,
+        started_tool_calls: dict[str, asyncio.Task[Any]] | None = None,
     ) -> list[RunItem]:
-        async def run_single_tool(
-            func_tool: FunctionTool, tool_call: ResponseFunctionToolCall
-        ) -> str:
-            with function_span(func_tool.name) as span_fn:
-                if config.trace_include_sensitive_data:
-                    span_fn.span_data.input = tool_call.arguments
-                try:
-                    _, _, result = await asyncio.gather(
-                        hooks.on_tool_start(context_wrapper, agent, func_tool),
-                        (
-                            agent.hooks.on_tool_start(context_wrapper, agent, func_tool)
-                            if agent.hooks
-                            else _utils.noop_coroutine()
-                        ),
-                        func_tool.on_invoke_tool(context_wrapper, tool_call.arguments),
-                    )
-
-                    await asyncio.gather(
-                        hooks.on_tool_end(context_wrapper, agent, func_tool, result),
-                        (
-                            agent.hooks.on_tool_end(context_wrapper, agent, func_tool, result)
-                            if agent.hooks
-                            else _utils.noop_coroutine()
-                        ),
-                    )
-                except Exception as e:
-                    _utils.attach_error_to_current_span(
-                        SpanError(
-                            message="Error running tool",
-                            data={"tool_name": func_tool.name, "error": str(e)},
-                        )
-                    )
-                    if isinstance(e, AgentsException):
-                        raise e
-                    raise UserError(f"Error running tool {func_tool.name}: {e}") from e
-
-                if config.trace_include_sensitive_data:
-                    span_fn.span_data.output = result
-            return result
-
         tasks = []
         for tool_run in tool_runs:
-            function_tool = tool_run.function_tool
-            tasks.append(run_single_tool(function_tool, tool_run.tool_call))
+            # Tool calls may already have been started while the response was streaming
+            started = (
+                started_tool_calls.get(tool_run.tool_call.call_id) if started_tool_calls else None
+            )
+            tasks.append(
+                started
+                or cls.execute_function_tool_call(
+                    agent=agent,
+                    tool_run=tool_run,
+                    hooks=hooks,
+                    context_wrapper=context_wrapper,
+                    config=config,
+                )
+            )
 
         results = await asyncio.gather(*tasks)
 
@@ -412,6 +405,94 @@ class RunImpl:
             for tool_run, result in zip(tool_runs, results)
         ]
 
+    @classmethod
+    async def execute_function_tool_call(
+        cls,
+        *,
+        agent: Agent[TContext],
+        tool_run: ToolRunFunction,
+        hooks: RunHooks[TContext],
+        context_wrapper: RunContextWrapper[TContext],
+        config: RunConfig,
+    ) -> Any:
+        func_tool = tool_run.function_tool
+        tool_call = tool_run.tool_call
+        with function_span(func_tool.name) as span_fn:
+            if config.trace_include_sensitive_data:
+                span_fn.span_data.input = tool_call.arguments
+            try:
+                _, _, result = await asyncio.gather(
+                    hooks.on_tool_start(context_wrapper, agent, func_tool),
+                    (
+                        agent.hooks.on_tool_start(context_wrapper, agent, func_tool)
+                        if agent.hooks
+                        else _utils.noop_coroutine()
+                    ),
+                    func_tool.on_invoke_tool(context_wrapper, tool_call.arguments),
+                )
+
+                await asyncio.gather(
+                    hooks.on_tool_end(context_wrapper, agent, func_tool, result),
+                    (
+                        agent.hooks.on_tool_end(context_wrapper, agent, func_tool, result)
+                        if agent.hooks
+                        else _utils.noop_coroutine()
+                    ),
+                )
+            except Exception as e:
+                _utils.attach_error_to_current_span(
+                    SpanError(
+                        message="Error running tool",
+                        data={"tool_name": func_tool.name, "error": str(e)},
+                    )
+                )
+                if isinstance(e, AgentsException):
+                    raise e
+                raise UserError(f"Error running tool {func_tool.name}: {e}") from e
+
+            if config.trace_include_sensitive_data:
+                span_fn.span_data.output = result
+        return result
+
+    @classmethod
+    def maybe_start_function_tool_call(
+        cls,
+        *,
+        agent: Agent[TContext],
+        tool_call: ResponseFunctionToolCall,
+        handoffs: list[Handoff],
+        hooks: RunHooks[TContext],
+        context_wrapper: RunContextWrapper[TContext],
+        config: RunConfig,
+    ) -> asyncio.Task[Any] | None:
+        """Starts running a function tool call in the background, before the rest of the model
+        response is available. Returns None if the call isn't for a known function tool (e.g. it's
+        a handoff), in which case it's left to the regular processing of the full response.
+        """
+        if any(handoff.tool_name == tool_call.name for handoff in handoffs):
+            return None
+
+        function_tool = next(
+            (
+                tool
+                for tool in agent.tools
+                if isinstance(tool, FunctionTool) and tool.name == tool_call.name
+            ),
+            None,
+        )
+        if function_tool is None:
+            return None
+
+        return asyncio.create_task(
+            cls.execute_function_tool_call(
+                agent=agent,
+                tool_run=ToolRunFunction(tool_call=tool_call, function_tool=function_tool),
+                hooks=hooks,
+                context_wrapper=context_wrapper,
+                config=config,
+            )
+        )
+
     @classmethod
     async def execute_computer_actions(
         cls,
@@ -539,13 +620,17 @@ class RunImpl:
                     )
                     raise UserError(f"Invalid input filter result: {filtered}")
 
-                original_input = (
-                    filtered.input_history
-                    if isinstance(filtered.input_history, str)
-                    else list(filtered.input_history)
-                )
-                pre_step_items = list(filtered.pre_handoff_items)
-                new_step_items = list(filtered.new_items)
+                # Only copy back the parts that the filter changed
+                if filtered.input_history is not handoff_input_data.input_history:
+                    original_input = (
+                        filtered.input_history
+                        if isinstance(filtered.input_history, str)
+                        else list(filtered.input_history)
+                    )
+                if filtered.pre_handoff_items is not handoff_input_data.pre_handoff_items:
+                    pre_step_items = list(filtered.pre_handoff_items)
+                if filtered.new_items is not handoff_input_data.new_items:
+                    new_step_items = list(filtered.new_items)
 
         return SingleStepResult(
             original_input=original_input,
@@ -603,8 +688,15 @@ class RunImpl:
         context: RunContextWrapper[TContext],
     ) -> InputGuardrailResult:
         with guardrail_span(guardrail.get_name()) as span_guardrail:
+            start = time.perf_counter()
             result = await guardrail.run(agent, input, context)
+            result.latency = time.perf_counter() - start
+            if not result.cache_hit:
+                guardrail.stats.record(result.latency, result.output.tripwire_triggered)
             span_guardrail.span_data.triggered = result.output.tripwire_triggered
+            if result.cache_hit is not None:
+                span_guardrail.span_data.cache_hit = result.cache_hit
+                span_guardrail.span_data.cache_hit_rate = guardrail.stats.cache_hit_rate
             return result
 
     @classmethod
@@ -616,12 +708,19 @@ class RunImpl:
         context: RunContextWrapper[TContext],
     ) -> OutputGuardrailResult:
         with guardrail_span(guardrail.get_name()) as span_guardrail:
+            start = time.perf_counter()
             result = await guardrail.run(agent=agent, agent_output=agent_output, context=context)
+            result.latency = time.perf_counter() - start
+            if not result.cache_hit:
+                guardrail.stats.record(result.latency, result.output.tripwire_triggered)
             span_guardrail.span_data.triggered = result.output.tripwire_triggered
+            if result.cache_hit is not None:
+                span_guardrail.span_data.cache_hit = result.cache_hit
+                span_guardrail.span_data.cache_hit_rate = guardrail.stats.cache_hit_rate
             return result
 
     @classmethod
-    def stream_step_result_to_queue(
+    async def stream_step_result_to_queue(
         cls,
         step_result: SingleStepResult,
         queue: asyncio.Queue[StreamEvent | QueueCompleteSentinel],
@@ -644,7 +743,147 @@ class RunImpl:
                 event = None
 
             if event:
-                queue.put_nowait(event)
+                await queue.put(event)
+
+
+class PartialOutputTracker:
+    """Builds `PartialOutputStreamEvent`s from the text deltas of a streamed model response. The
+    text is parsed incrementally, so each delta only costs as much as the delta itself to parse.
+    """
+
+    def __init__(self, agent: Agent[Any], output_schema: AgentOutputSchema):
+        self.agent = agent
+        self.output_schema = output_schema
+        self._parser: IncrementalJsonParser | None = None
+        self._last_output: Any = None
+        self._has_output = False
+
+    def on_event(self, event: TResponseStreamEvent) -> PartialOutputStreamEvent | None:
+        """Processes a raw stream event, returning a partial output event if the output changed."""
+        if isinstance(event, ResponseContentPartAddedEvent):
+            # The structured output is the text of a single content part
+            self._parser = IncrementalJsonParser()
+            self._last_output = None
+            self._has_output = False
+            return None
+
+        if not isinstance(event, ResponseTextDeltaEvent) or not self._parser or not event.delta:
+            return None
+
+        try:
+            self._parser.feed(event.delta)
+            partial_value = self._parser.snapshot()
+        except IncrementalJsonError as e:
+            logger.debug(f"Not streaming partial output, the output isn't valid JSON: {e}")
+            self._parser = None
+            return None
+
+        try:
+            output = self.output_schema.validate_partial(partial_value)
+        except ValueError:
+            return None
+
+        if self._has_output and output == self._last_output:
+            return None
+        self._last_output = output
+        self._has_output = True
+        return PartialOutputStreamEvent(output=output, agent=self.agent)
+
+
+@dataclass
+class _StreamingGuardrailState:
+    guardrail: StreamingOutputGuardrail[Any]
+    checked_length: int = 0
+    task: asyncio.Task[OutputGuardrailResult] | None = None
+
+
+class StreamingOutputGuardrailChecker:
+    """Runs streaming output guardrails on windows of the text deltas of a streamed model
+    response. The guardrails run in the background, so checking a window doesn't hold up the
+    stream, and their results are checked as the next events arrive.
+    """
+
+    def __init__(
+        self,
+        guardrails: list[StreamingOutputGuardrail[Any]],
+        agent: Agent[Any],
+        context_wrapper: RunContextWrapper[Any],
+    ):
+        self.agent = agent
+        self.context_wrapper = context_wrapper
+        self.results: list[OutputGuardrailResult] = []
+        self._states = [_StreamingGuardrailState(guardrail) for guardrail in guardrails]
+        self._text_parts: list[str] = []
+        self._text_length = 0
+
+    def on_event(self, event: TResponseStreamEvent) -> None:
+        """Processes a raw stream event, starting the guardrails whose window is full. Raises
+        `OutputGuardrailTripwireTriggered` if a guardrail that finished triggered its tripwire.
+        """
+        if isinstance(event, ResponseTextDeltaEvent) and event.delta:
+            self._text_parts.append(event.delta)
+            self._text_length += len(event.delta)
+
+        for state in self._states:
+            if state.task is not None:
+                if not state.task.done():
+                    continue
+                self._check_result(state.task.result())
+                state.task = None
+            if self._text_length - state.checked_length >= state.guardrail.min_window_chars:
+                state.task = asyncio.create_task(self._run(state, is_final=False))
+
+    async def finish(self) -> None:
+        """Waits for the guardrails that are running, then checks the rest of the text. Raises
+        `OutputGuardrailTripwireTriggered` if a guardrail triggered its tripwire.
+        """
+        for state in self._states:
+            if state.task is not None:
+                self._check_result(await state.task)
+                state.task = None
+
+        final_runs = [
+            self._run(state, is_final=True)
+            for state in self._states
+            if state.checked_length < self._text_length
+        ]
+        if final_runs:
+            for result in await asyncio.gather(*final_runs):
+                self._check_result(result)
+
+    def cancel(self) -> None:
+        """Cancels the guardrails that are running."""
+        for state in self._states:
+            if state.task is not None:
+                state.task.cancel()
+
+    def _text(self) -> str:
+        if len(self._text_parts) > 1:
+            self._text_parts = ["".join(self._text_parts)]
+        return self._text_parts[0] if self._text_parts else ""
+
+    def _run(
+        self, state: _StreamingGuardrailState, is_final: bool
+    ) -> Coroutine[Any, Any, OutputGuardrailResult]:
+        text = self._text()
+        window = StreamedTextWindow(
+            delta=text[state.checked_length :], text=text, is_final=is_final
+        )
+        state.checked_length = len(text)
+        return RunImpl.run_single_output_guardrail(
+            state.guardrail, self.agent, window, self.context_wrapper
+        )
+
+    def _check_result(self, result: OutputGuardrailResult) -> None:
+        self.results.append(result)
+        if result.output.tripwire_triggered:
+            _utils.attach_error_to_current_span(
+                SpanError(
+                    message="Guardrail tripwire triggered",
+                    data={"guardrail": result.guardrail.get_name()},
+                )
+            )
+            raise OutputGuardrailTripwireTriggered(result)
 
 
 class TraceCtxManager:
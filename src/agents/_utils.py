@@ -59,3 +59,14 @@ def attach_error_to_current_span(error: SpanError) -> None:
 
 async def noop_coroutine() -> None:
     pass
+
+
+def copy_json(value: Any) -> Any:
+    """Deep-copies JSON-like data, i.e. nested dicts and lists. Much faster than `copy.deepcopy`
+    for the dicts that input items and messages are made of.
+    """
+    if isinstance(value, dict):
+        return {key: copy_json(item) for key, item in value.items()}
+    if isinstance(value, list):
+        return [copy_json(item) for item in value]
+    return value
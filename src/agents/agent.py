@@ -85,7 +85,8 @@ class Agent(Generic[TContext]):
 
     output_guardrails: list[OutputGuardrail[TContext]] = field(default_factory=list)
     """A list of checks that run on the final output of the agent, after generating a response.
-    Runs only if the agent produces a final output.
+    Runs only if the agent produces a final output. `StreamingOutputGuardrail`s instead check the
+    agent's responses as they stream in.
     """
 
     output_type: type[Any] | None = None
@@ -1,3 +1,5 @@
+import threading
+from collections import OrderedDict
 from dataclasses import dataclass
 from typing import Any
 
@@ -6,11 +8,15 @@ from typing_extensions import TypedDict, get_args, get_origin
 
 from . import _utils
 from .exceptions import ModelBehaviorError, UserError
+from .schema_cache import get_schema_cache, type_schema_key
 from .strict_schema import ensure_strict_json_schema
 from .tracing import SpanError
 
 _WRAPPER_DICT_KEY = "response"
 
+# The number of output types whose type adapter and schema are kept in memory
+_MAX_BUILT_SCHEMAS = 256
+
 
 @dataclass(init=False)
 class AgentOutputSchema:
@@ -47,31 +53,11 @@ class AgentOutputSchema:
         self.output_type = output_type
         self.strict_json_schema = strict_json_schema
 
-        if output_type is None or output_type is str:
-            self._is_wrapped = False
-            self._type_adapter = TypeAdapter(output_type)
-            self._output_schema = self._type_adapter.json_schema()
-            return
-
-        # We should wrap for things that are not plain text, and for things that would definitely
-        # not be a JSON Schema object.
-        self._is_wrapped = not _is_subclass_of_base_model_or_dict(output_type)
-
-        if self._is_wrapped:
-            OutputType = TypedDict(
-                "OutputType",
-                {
-                    _WRAPPER_DICT_KEY: output_type,  # type: ignore
-                },
-            )
-            self._type_adapter = TypeAdapter(OutputType)
-            self._output_schema = self._type_adapter.json_schema()
-        else:
-            self._type_adapter = TypeAdapter(output_type)
-            self._output_schema = self._type_adapter.json_schema()
-
-        if self.strict_json_schema:
-            self._output_schema = ensure_strict_json_schema(self._output_schema)
+        built = _get_built_schema(output_type, strict_json_schema)
+        self._is_wrapped = built.is_wrapped
+        self._type_adapter = built.type_adapter
+        # Each instance gets its own copy, so callers can change the schema they get
+        self._output_schema = _utils.copy_json(built.output_schema)
 
     def is_plain_text(self) -> bool:
         """Whether the output type is plain text (versus a JSON object)."""
@@ -113,11 +99,101 @@ class AgentOutputSchema:
             return validated[_WRAPPER_DICT_KEY]
         return validated
 
+    def validate_partial(self, partial_value: Any) -> Any:
+        """Validate a partially streamed output, as parsed by an `IncrementalJsonParser`, against
+        the output type. Incomplete trailing strings and list items are allowed, but all required
+        fields must be present. Returns the validated object, or raises a `ValueError` (such as a
+        pydantic `ValidationError`) if the output doesn't validate yet.
+        """
+        validated = self._type_adapter.validate_python(
+            partial_value, experimental_allow_partial="trailing-strings"
+        )
+        if self._is_wrapped:
+            if not isinstance(validated, dict) or _WRAPPER_DICT_KEY not in validated:
+                raise ValueError(f"Could not find key {_WRAPPER_DICT_KEY} in partial output")
+            return validated[_WRAPPER_DICT_KEY]
+        return validated
+
     def output_type_name(self) -> str:
         """The name of the output type."""
         return _type_to_str(self.output_type)
 
 
+@dataclass(frozen=True)
+class _BuiltSchema:
+    is_wrapped: bool
+    type_adapter: TypeAdapter[Any]
+    output_schema: dict[str, Any]
+
+
+_built_schemas: OrderedDict[tuple[Any, bool], _BuiltSchema] = OrderedDict()
+_built_schemas_lock = threading.Lock()
+
+
+def _get_built_schema(output_type: type[Any], strict_json_schema: bool) -> _BuiltSchema:
+    """Returns the type adapter and schema of an output type. Agents build an `AgentOutputSchema`
+    on every run, so the most recently used output types are kept in memory instead of building
+    their type adapter and hashing their source again each time.
+    """
+    key = (output_type, strict_json_schema)
+    try:
+        hash(key)
+    except TypeError:
+        # E.g. Annotated types with unhashable metadata
+        return _build_schema(output_type, strict_json_schema)
+
+    with _built_schemas_lock:
+        built = _built_schemas.get(key)
+        if built is not None:
+            _built_schemas.move_to_end(key)
+            return built
+
+    built = _build_schema(output_type, strict_json_schema)
+    with _built_schemas_lock:
+        _built_schemas[key] = built
+        while len(_built_schemas) > _MAX_BUILT_SCHEMAS:
+            _built_schemas.popitem(last=False)
+    return built
+
+
+def _build_schema(output_type: type[Any], strict_json_schema: bool) -> _BuiltSchema:
+    if output_type is None or output_type is str:
+        type_adapter: TypeAdapter[Any] = TypeAdapter(output_type)
+        return _BuiltSchema(False, type_adapter, type_adapter.json_schema())
+
+    # We should wrap for things that are not plain text, and for things that would definitely
+    # not be a JSON Schema object.
+    is_wrapped = not _is_subclass_of_base_model_or_dict(output_type)
+
+    if is_wrapped:
+        OutputType = TypedDict(
+            "OutputType",
+            {
+                _WRAPPER_DICT_KEY: output_type,  # type: ignore
+            },
+        )
+        type_adapter = TypeAdapter(OutputType)
+    else:
+        type_adapter = TypeAdapter(output_type)
+
+    cache = get_schema_cache()
+    cache_key = (
+        type_schema_key(output_type, strict_json_schema=strict_json_schema)
+        if cache is not None
+        else None
+    )
+    cached_schema = cache.get(cache_key) if cache is not None and cache_key else None
+    if cached_schema is not None:
+        return _BuiltSchema(is_wrapped, type_adapter, cached_schema)
+
+    output_schema = type_adapter.json_schema()
+    if strict_json_schema:
+        output_schema = ensure_strict_json_schema(output_schema)
+    if cache is not None and cache_key:
+        cache.set(cache_key, output_schema)
+    return _BuiltSchema(is_wrapped, type_adapter, output_schema)
+
+
 def _is_subclass_of_base_model_or_dict(t: Any) -> bool:
     if not isinstance(t, type):
         return False
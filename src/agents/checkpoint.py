@@ -0,0 +1,315 @@
+from __future__ import annotations
+
+import abc
+import asyncio
+import os
+import sqlite3
+import tempfile
+import threading
+import time
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any
+
+from openai.types.responses import (
+    ResponseComputerToolCall,
+    ResponseFileSearchToolCall,
+    ResponseFunctionToolCall,
+    ResponseFunctionWebSearch,
+    ResponseOutputMessage,
+)
+from openai.types.responses.response_reasoning_item import ResponseReasoningItem
+from pydantic import BaseModel
+
+from .agent import Agent
+from .exceptions import UserError
+from .handoffs import Handoff
+from .items import (
+    HandoffCallItem,
+    HandoffOutputItem,
+    MessageOutputItem,
+    ReasoningItem,
+    RunItem,
+    ToolCallItem,
+    ToolCallOutputItem,
+    TResponseInputItem,
+)
+from .json_codec import get_json_codec
+from .usage import Usage
+
+_TOOL_CALL_TYPES: dict[str, type[BaseModel]] = {
+    "function_call": ResponseFunctionToolCall,
+    "computer_call": ResponseComputerToolCall,
+    "file_search_call": ResponseFileSearchToolCall,
+    "web_search_call": ResponseFunctionWebSearch,
+}
+
+
+@dataclass
+class RunCheckpoint:
+    """The state of a run after a completed turn, from which `Runner.resume()` can continue it.
+    Contains only JSON-compatible data, so it can be stored anywhere.
+    """
+
+    run_id: str
+    """The ID of the run, from `RunConfig.run_id`."""
+
+    agent_name: str
+    """The name of the agent that runs the next turn."""
+
+    original_input: str | list[TResponseInputItem]
+    """The input of the run. May have been changed by handoff input filters."""
+
+    generated_items: list[dict[str, Any]]
+    """The items generated by the run so far, as JSON-compatible dicts."""
+
+    usage: Usage
+    """The usage of the run so far."""
+
+    current_turn: int
+    """The number of turns that were completed."""
+
+    created_at: float = field(default_factory=time.time)
+    """When the checkpoint was made, as a Unix timestamp."""
+
+    @classmethod
+    def from_run(
+        cls,
+        *,
+        run_id: str,
+        agent: Agent[Any],
+        original_input: str | list[TResponseInputItem],
+        generated_items: list[RunItem],
+        usage: Usage,
+        current_turn: int,
+    ) -> RunCheckpoint:
+        """Creates a checkpoint from the state of a run."""
+        return cls(
+            run_id=run_id,
+            agent_name=agent.name,
+            original_input=original_input,
+            generated_items=[_dump_run_item(item) for item in generated_items],
+            usage=Usage(**vars(usage)),
+            current_turn=current_turn,
+        )
+
+    def to_json(self) -> bytes:
+        """Encodes the checkpoint as JSON."""
+        return get_json_codec().dumps(
+            {
+                "run_id": self.run_id,
+                "agent_name": self.agent_name,
+                "original_input": self.original_input,
+                "generated_items": self.generated_items,
+                "usage": vars(self.usage),
+                "current_turn": self.current_turn,
+                "created_at": self.created_at,
+            }
+        )
+
+    @classmethod
+    def from_json(cls, data: str | bytes) -> RunCheckpoint:
+        """Decodes a checkpoint from JSON, as encoded by `to_json()`."""
+        values = get_json_codec().loads(data)
+        values["usage"] = Usage(**values["usage"])
+        return cls(**values)
+
+    def restore_items(self, agents: dict[str, Agent[Any]]) -> list[RunItem]:
+        """Recreates the generated items.
+
+        Args:
+            agents: The agents of the run, by name.
+        """
+        return [_load_run_item(data, agents) for data in self.generated_items]
+
+
+class CheckpointStore(abc.ABC):
+    """Stores run checkpoints. Set one with `RunConfig.checkpoint_store` to checkpoint runs."""
+
+    @abc.abstractmethod
+    async def save(self, checkpoint: RunCheckpoint) -> None:
+        """Saves a checkpoint, replacing any earlier checkpoint of the same run."""
+        pass
+
+    @abc.abstractmethod
+    async def load(self, run_id: str) -> RunCheckpoint | None:
+        """Returns the latest checkpoint of a run, or None if there is none."""
+        pass
+
+    @abc.abstractmethod
+    async def delete(self, run_id: str) -> None:
+        """Deletes the checkpoint of a run, if there is one."""
+        pass
+
+
+class FileCheckpointStore(CheckpointStore):
+    """Stores each run's checkpoint as a JSON file in a directory. Checkpoints are written to a
+    temporary file first, which then replaces the previous checkpoint, so a crash while saving
+    never leaves a partial checkpoint behind.
+    """
+
+    def __init__(self, directory: str | Path):
+        """
+        Args:
+            directory: The directory to store checkpoints in. Created if it doesn't exist.
+        """
+        self.directory = Path(directory)
+        self.directory.mkdir(parents=True, exist_ok=True)
+
+    async def save(self, checkpoint: RunCheckpoint) -> None:
+        await asyncio.to_thread(self._save, checkpoint.run_id, checkpoint.to_json())
+
+    async def load(self, run_id: str) -> RunCheckpoint | None:
+        data = await asyncio.to_thread(self._load, run_id)
+        return RunCheckpoint.from_json(data) if data is not None else None
+
+    async def delete(self, run_id: str) -> None:
+        await asyncio.to_thread(self._path(run_id).unlink, missing_ok=True)
+
+    def _path(self, run_id: str) -> Path:
+        if not run_id or os.sep in run_id or (os.altsep and os.altsep in run_id):
+            raise UserError(f"Invalid run ID for a file checkpoint: {run_id!r}")
+        return self.directory / f"{run_id}.json"
+
+    def _save(self, run_id: str, data: bytes) -> None:
+        path = self._path(run_id)
+        fd, temp_path = tempfile.mkstemp(dir=self.directory, prefix=f".{run_id}.")
+        try:
+            with os.fdopen(fd, "wb") as f:
+                f.write(data)
+            os.replace(temp_path, path)
+        except BaseException:
+            Path(temp_path).unlink(missing_ok=True)
+            raise
+
+    def _load(self, run_id: str) -> bytes | None:
+        try:
+            return self._path(run_id).read_bytes()
+        except FileNotFoundError:
+            return None
+
+
+class SQLiteCheckpointStore(CheckpointStore):
+    """Stores checkpoints in a SQLite database, one row per run. The database calls run in a
+    worker thread, so they don't block the event loop.
+    """
+
+    def __init__(self, db_path: str | Path, table: str = "agent_run_checkpoints"):
+        """
+        Args:
+            db_path: The path to the database file.
+            table: The name of the table to store checkpoints in.
+        """
+        self.db_path = db_path
+        self.table = table
+        self._lock = threading.Lock()
+        self._connection = sqlite3.connect(str(db_path), check_same_thread=False)
+        with self._lock, self._connection:
+            self._connection.execute("PRAGMA journal_mode=WAL")
+            self._connection.execute(
+                f"CREATE TABLE IF NOT EXISTS {table} "
+                "(run_id TEXT PRIMARY KEY, data BLOB NOT NULL, updated_at REAL NOT NULL)"
+            )
+
+    async def save(self, checkpoint: RunCheckpoint) -> None:
+        await asyncio.to_thread(self._save, checkpoint.run_id, checkpoint.to_json())
+
+    async def load(self, run_id: str) -> RunCheckpoint | None:
+        data = await asyncio.to_thread(self._load, run_id)
+        return RunCheckpoint.from_json(data) if data is not None else None
+
+    async def delete(self, run_id: str) -> None:
+        await asyncio.to_thread(self._delete, run_id)
+
+    def close(self) -> None:
+        """Closes the database connection."""
+        with self._lock:
+            self._connection.close()
+
+    def _save(self, run_id: str, data: bytes) -> None:
+        with self._lock, self._connection:
+            self._connection.execute(
+                f"INSERT OR REPLACE INTO {self.table} (run_id, data, updated_at) VALUES (?, ?, ?)",
+                (run_id, data, time.time()),
+            )
+
+    def _load(self, run_id: str) -> bytes | None:
+        with self._lock:
+            row = self._connection.execute(
+                f"SELECT data FROM {self.table} WHERE run_id = ?", (run_id,)
+            ).fetchone()
+        return row[0] if row else None
+
+    def _delete(self, run_id: str) -> None:
+        with self._lock, self._connection:
+            self._connection.execute(f"DELETE FROM {self.table} WHERE run_id = ?", (run_id,))
+
+
+def find_agents(
+    starting_agent: Agent[Any], extra_agents: list[Agent[Any]] | None = None
+) -> dict[str, Agent[Any]]:
+    """Returns the agents that can be reached from an agent through handoffs, by name. Agents that
+    are only reached through `Handoff` objects can't be discovered, so they have to be passed in
+    `extra_agents`.
+    """
+    agents: dict[str, Agent[Any]] = {}
+    pending = [starting_agent, *(extra_agents or [])]
+    while pending:
+        agent = pending.pop()
+        if agent.name in agents:
+            continue
+        agents[agent.name] = agent
+        pending.extend(handoff for handoff in agent.handoffs if not isinstance(handoff, Handoff))
+    return agents
+
+
+def _dump_run_item(item: RunItem) -> dict[str, Any]:
+    data: dict[str, Any] = {
+        "type": item.type,
+        "agent": item.agent.name,
+        "raw_item": item.to_input_item(),
+    }
+    if isinstance(item, ToolCallOutputItem):
+        data["output"] = item.output
+    elif isinstance(item, HandoffOutputItem):
+        data["source_agent"] = item.source_agent.name
+        data["target_agent"] = item.target_agent.name
+    return data
+
+
+def _load_run_item(data: dict[str, Any], agents: dict[str, Agent[Any]]) -> RunItem:
+    def get_agent(name: str) -> Agent[Any]:
+        if name not in agents:
+            raise UserError(
+                f"Agent {name!r} from the checkpoint can't be found. Pass it to `Runner.resume()` "
+                "in `agents`."
+            )
+        return agents[name]
+
+    agent = get_agent(data["agent"])
+    raw_item = data["raw_item"]
+    item_type = data["type"]
+    if item_type == "message_output_item":
+        return MessageOutputItem(agent=agent, raw_item=ResponseOutputMessage(**raw_item))
+    elif item_type == "handoff_call_item":
+        return HandoffCallItem(agent=agent, raw_item=ResponseFunctionToolCall(**raw_item))
+    elif item_type == "handoff_output_item":
+        return HandoffOutputItem(
+            agent=agent,
+            raw_item=raw_item,
+            source_agent=get_agent(data["source_agent"]),
+            target_agent=get_agent(data["target_agent"]),
+        )
+    elif item_type == "tool_call_item":
+        tool_call_type = _TOOL_CALL_TYPES.get(raw_item.get("type"))
+        if tool_call_type is None:
+            raise UserError(f"Unknown tool call type in checkpoint: {raw_item.get('type')}")
+        return ToolCallItem(
+            agent=agent,
+            raw_item=tool_call_type(**raw_item),  # type: ignore[arg-type]
+        )
+    elif item_type == "tool_call_output_item":
+        return ToolCallOutputItem(agent=agent, raw_item=raw_item, output=data["output"])
+    elif item_type == "reasoning_item":
+        return ReasoningItem(agent=agent, raw_item=ResponseReasoningItem(**raw_item))
+    raise UserError(f"Unknown item type in checkpoint: {item_type}")
@@ -0,0 +1,134 @@
+from __future__ import annotations
+
+import inspect
+from dataclasses import dataclass
+from typing import TYPE_CHECKING, Any, Callable
+
+from typing_extensions import TypeAlias
+
+from ._utils import MaybeAwaitable
+from .exceptions import UserError
+from .items import ItemHelpers, RunItem, TResponseInputItem
+from .logger import logger
+from .token_estimator import TokenEstimator
+
+if TYPE_CHECKING:
+    from .run_context import RunContextWrapper
+
+
+@dataclass(frozen=True)
+class CompactionInputData:
+    input_items: tuple[TResponseInputItem, ...]
+    """
+    The input items for the next model call, oldest first: the run's input, followed by the items
+    generated so far.
+    """
+
+    estimated_tokens: int
+    """
+    The estimated number of tokens in `input_items`.
+    """
+
+    threshold_tokens: int
+    """
+    The number of tokens above which the input is compacted. A compaction filter should aim to
+    bring the input below this.
+    """
+
+    run_context: RunContextWrapper[Any] | None = None
+    """
+    The context of the run whose input is compacted. A filter that calls a model, e.g. to write a
+    summary, should add the usage of that call to `run_context.usage`.
+    """
+
+
+CompactionFilter: TypeAlias = Callable[[CompactionInputData], MaybeAwaitable[CompactionInputData]]
+"""A function that compacts the input for the next model call, e.g. by summarizing or dropping
+older items. See `agents.extensions.compaction_filters` for common ones."""
+
+
+class InputCompactor:
+    """Builds the input for each model call of a run, compacting it with a compaction filter once
+    it's estimated to be above the threshold.
+
+    The input of a turn is the input of the previous turn plus the items generated since, so the
+    input of the previous turn, compacted or not, is cached along with its token estimate. Each
+    turn only converts and estimates the new items, and a compacted prefix is reused until the input
+    outgrows the threshold again.
+    """
+
+    def __init__(
+        self,
+        compaction_filter: CompactionFilter,
+        threshold_tokens: int,
+        token_estimator: TokenEstimator,
+        run_context: RunContextWrapper[Any] | None = None,
+    ):
+        self.compaction_filter = compaction_filter
+        self.threshold_tokens = threshold_tokens
+        self.token_estimator = token_estimator
+        self.run_context = run_context
+        self.compactions = 0
+        """How often the input was compacted."""
+        self._source_input: str | list[TResponseInputItem] | None = None
+        self._source_items: list[RunItem] = []
+        self._prefix: list[TResponseInputItem] = []
+        self._prefix_tokens = 0
+
+    async def get_input(
+        self,
+        original_input: str | list[TResponseInputItem],
+        generated_items: list[RunItem],
+    ) -> list[TResponseInputItem]:
+        """Returns the input for the next model call."""
+        if self._is_cached_prefix(original_input, generated_items):
+            prefix, prefix_tokens = self._prefix, self._prefix_tokens
+            new_items = generated_items[len(self._source_items) :]
+        else:
+            prefix = ItemHelpers.input_to_new_input_list(original_input)
+            prefix_tokens = self.token_estimator.estimate_items(prefix)
+            new_items = generated_items
+
+        new_input_items = [item.to_input_item() for item in new_items]
+        input = prefix + new_input_items
+        tokens = prefix_tokens + self.token_estimator.estimate_items(new_input_items)
+
+        if tokens > self.threshold_tokens:
+            input = await self._compact(input, tokens)
+            tokens = self.token_estimator.estimate_items(input)
+            logger.debug(f"Compacted the input to {len(input)} items, ~{tokens} tokens")
+
+        self._source_input = original_input
+        self._source_items = list(generated_items)
+        self._prefix = input
+        self._prefix_tokens = tokens
+        return list(input)
+
+    def _is_cached_prefix(
+        self,
+        original_input: str | list[TResponseInputItem],
+        generated_items: list[RunItem],
+    ) -> bool:
+        # Handoff input filters replace the original input and generated items, which starts over
+        return (
+            original_input is self._source_input
+            and len(generated_items) >= len(self._source_items)
+            and all(a is b for a, b in zip(generated_items, self._source_items))
+        )
+
+    async def _compact(
+        self, input: list[TResponseInputItem], tokens: int
+    ) -> list[TResponseInputItem]:
+        data = CompactionInputData(
+            input_items=tuple(input),
+            estimated_tokens=tokens,
+            threshold_tokens=self.threshold_tokens,
+            run_context=self.run_context,
+        )
+        result = self.compaction_filter(data)
+        if inspect.isawaitable(result):
+            result = await result
+        if not isinstance(result, CompactionInputData):
+            raise UserError(f"Invalid compaction filter result: {result}")
+        self.compactions += 1
+        return list(result.input_items)
@@ -2,6 +2,7 @@ from typing import TYPE_CHECKING
 
 if TYPE_CHECKING:
     from .guardrail import InputGuardrailResult, OutputGuardrailResult
+    from .usage import Usage
 
 
 class AgentsException(Exception):
@@ -43,8 +44,13 @@ class InputGuardrailTripwireTriggered(AgentsException):
     guardrail_result: "InputGuardrailResult"
     """The result data of the guardrail that was triggered."""
 
+    usage: "Usage | None"
+    """The usage of the run when the tripwire was triggered, including the model call that was
+    cancelled because of it. Set by `Runner.run()`."""
+
     def __init__(self, guardrail_result: "InputGuardrailResult"):
         self.guardrail_result = guardrail_result
+        self.usage = None
         super().__init__(
             f"Guardrail {guardrail_result.guardrail.__class__.__name__} triggered tripwire"
         )
@@ -0,0 +1,128 @@
+"""Contains common compaction filters, for use with `RunConfig.input_compaction_filter`."""
+
+from __future__ import annotations
+
+import weakref
+from dataclasses import replace
+from typing import Any
+
+from ..agent import Agent
+from ..compaction import CompactionFilter, CompactionInputData
+from ..items import TResponseInputItem
+
+_TOOL_CALL_TYPES = ("function_call", "computer_call")
+_TOOL_OUTPUT_TYPES = ("function_call_output", "computer_call_output")
+
+_DEFAULT_SUMMARIZER_INSTRUCTIONS = (
+    "You summarize conversations between a user and an AI assistant. Write a concise summary of "
+    "the conversation so far that keeps every fact, decision, open question and tool result the "
+    "assistant needs to continue it. Only reply with the summary."
+)
+
+
+def drop_old_tool_outputs(
+    keep_last: int = 3, placeholder: str = "[Tool output removed to save space]"
+) -> CompactionFilter:
+    """Returns a compaction filter that replaces the output of all but the last `keep_last`
+    function calls with a placeholder. The calls themselves are kept, so the model still knows
+    which tools it used.
+    """
+
+    def _filter(data: CompactionInputData) -> CompactionInputData:
+        output_indexes = [
+            index
+            for index, item in enumerate(data.input_items)
+            if item.get("type") == "function_call_output"
+        ]
+        to_drop = set(output_indexes[: max(len(output_indexes) - keep_last, 0)])
+        if not to_drop:
+            return data
+
+        input_items: list[TResponseInputItem] = [
+            {**item, "output": placeholder} if index in to_drop else item  # type: ignore
+            for index, item in enumerate(data.input_items)
+        ]
+        return replace(data, input_items=tuple(input_items))
+
+    return _filter
+
+
+def summarize_older_items(
+    summarizer: Agent[Any] | None = None, keep_last: int = 10
+) -> CompactionFilter:
+    """Returns a compaction filter that replaces all but the last `keep_last` items with a summary,
+    written by the `summarizer` agent. The kept items never start in the middle of a tool call, so
+    slightly more items may be kept.
+
+    The latest summary of each run is cached along with the items it covers. When the older items
+    start with those items, or with the summary itself, only the items after them are summarized,
+    along with the previous summary, and the summarizer doesn't run at all if there are none.
+    Summaries are never reused across runs, and the usage of the summarizer is added to the usage
+    of the run.
+
+    Args:
+        summarizer: The agent that writes the summary. It's run with the older items, followed by a
+            request to summarize them. Defaults to an agent with summarization instructions and the
+            default model.
+        keep_last: The number of most recent items to keep as they are.
+    """
+    agent = summarizer or Agent(name="Summarizer", instructions=_DEFAULT_SUMMARIZER_INSTRUCTIONS)
+    # By the id of the run context: the items that the run's latest summary covers, and the summary.
+    # Entries are removed once the run context is garbage collected.
+    cache: dict[int, tuple[list[TResponseInputItem], TResponseInputItem]] = {}
+
+    async def _filter(data: CompactionInputData) -> CompactionInputData:
+        from ..run import Runner
+
+        run_context = data.run_context
+        cached = cache.get(id(run_context)) if run_context is not None else None
+
+        items = data.input_items
+        split = max(len(items) - keep_last, 0)
+        # Don't separate tool calls from their outputs
+        while split > 0 and (
+            items[split].get("type") in _TOOL_OUTPUT_TYPES
+            or items[split - 1].get("type") in _TOOL_CALL_TYPES
+        ):
+            split -= 1
+        if split == 0:
+            return data
+
+        older_items = list(items[:split])
+        summary: TResponseInputItem | None = None
+        covered: list[TResponseInputItem] = []
+        if cached is not None:
+            # The older items either start with the items of the latest summary, e.g. when a
+            # session's history is compacted again on the next run, or with the summary itself,
+            # when a compacted input is still above the threshold
+            cached_items, cached_summary = cached
+            if older_items[: len(cached_items)] == cached_items:
+                summary, covered, older_items = (
+                    cached_summary,
+                    cached_items,
+                    older_items[len(cached_items) :],
+                )
+            elif older_items[0] == cached_summary:
+                summary, covered, older_items = cached_summary, cached_items, older_items[1:]
+
+        if summary is None or older_items:
+            # Only the items that the latest summary doesn't cover are summarized along with it
+            summarized_items = ([summary] if summary is not None else []) + older_items
+            request: TResponseInputItem = {
+                "role": "user",
+                "content": "Summarize the conversation so far.",
+            }
+            result = await Runner.run(agent, summarized_items + [request])
+            summary = {
+                "role": "user",
+                "content": f"Summary of the earlier conversation:\n{result.final_output}",
+            }
+            if run_context is not None:
+                for response in result.raw_responses:
+                    run_context.usage.add(response.usage)
+                if id(run_context) not in cache:
+                    weakref.finalize(run_context, cache.pop, id(run_context), None)
+                cache[id(run_context)] = (covered + older_items, summary)
+        return replace(data, input_items=(dict(summary), *items[split:]))  # type: ignore[arg-type]
+
+    return _filter
@@ -1,67 +1,121 @@
 from __future__ import annotations
 
-from ..handoffs import HandoffInputData
-from ..items import (
-    HandoffCallItem,
-    HandoffOutputItem,
-    RunItem,
-    ToolCallItem,
-    ToolCallOutputItem,
-    TResponseInputItem,
-)
+from dataclasses import dataclass
+
+from ..handoffs import HandoffInputData, HandoffInputFilter
+from ..items import RunItem, TResponseInputItem
 
 """Contains common handoff input filters, for convenience. """
 
 
-def remove_all_tools(handoff_input_data: HandoffInputData) -> HandoffInputData:
-    """Filters out all tool items: file search, web search and function calls+output."""
+@dataclass(frozen=True)
+class ItemTypeFilter:
+    """A handoff input filter that removes items by type, in a single pass over each part of the
+    input. Items are matched on their type tag, i.e. the `type` key of input items and the `type`
+    of run items. Parts that have no items to remove are passed on as is, rather than copied.
 
-    history = handoff_input_data.input_history
-    new_items = handoff_input_data.new_items
+    `compose()` merges consecutive item type filters, so that they're applied in one pass.
+    """
 
-    filtered_history = (
-        _remove_tool_types_from_input(history) if isinstance(history, tuple) else history
-    )
-    filtered_pre_handoff_items = _remove_tools_from_items(handoff_input_data.pre_handoff_items)
-    filtered_new_items = _remove_tools_from_items(new_items)
+    input_types: frozenset[str] = frozenset()
+    """The types of the input history items to remove, e.g. `function_call`."""
 
-    return HandoffInputData(
-        input_history=filtered_history,
-        pre_handoff_items=filtered_pre_handoff_items,
-        new_items=filtered_new_items,
-    )
+    run_item_types: frozenset[str] = frozenset()
+    """The types of the run items to remove, e.g. `tool_call_item`."""
 
+    def __call__(self, handoff_input_data: HandoffInputData) -> HandoffInputData:
+        history = handoff_input_data.input_history
+        filtered_history = (
+            _remove_input_types(history, self.input_types)
+            if isinstance(history, tuple)
+            else history
+        )
+        filtered_pre_handoff_items = _remove_run_item_types(
+            handoff_input_data.pre_handoff_items, self.run_item_types
+        )
+        filtered_new_items = _remove_run_item_types(
+            handoff_input_data.new_items, self.run_item_types
+        )
 
-def _remove_tools_from_items(items: tuple[RunItem, ...]) -> tuple[RunItem, ...]:
-    filtered_items = []
-    for item in items:
         if (
-            isinstance(item, HandoffCallItem)
-            or isinstance(item, HandoffOutputItem)
-            or isinstance(item, ToolCallItem)
-            or isinstance(item, ToolCallOutputItem)
+            filtered_history is history
+            and filtered_pre_handoff_items is handoff_input_data.pre_handoff_items
+            and filtered_new_items is handoff_input_data.new_items
         ):
-            continue
-        filtered_items.append(item)
-    return tuple(filtered_items)
+            return handoff_input_data
+
+        return HandoffInputData(
+            input_history=filtered_history,
+            pre_handoff_items=filtered_pre_handoff_items,
+            new_items=filtered_new_items,
+        )
+
+    def merge(self, other: ItemTypeFilter) -> ItemTypeFilter:
+        """Returns a filter that removes the items removed by either filter."""
+        return ItemTypeFilter(
+            input_types=self.input_types | other.input_types,
+            run_item_types=self.run_item_types | other.run_item_types,
+        )
+
+
+remove_all_tools = ItemTypeFilter(
+    input_types=frozenset(
+        {
+            "function_call",
+            "function_call_output",
+            "computer_call",
+            "computer_call_output",
+            "file_search_call",
+            "web_search_call",
+        }
+    ),
+    run_item_types=frozenset(
+        {"handoff_call_item", "handoff_output_item", "tool_call_item", "tool_call_output_item"}
+    ),
+)
+"""Filters out all tool items: file search, web search and function calls+output."""
+
+
+def compose(*filters: HandoffInputFilter) -> HandoffInputFilter:
+    """Returns a handoff input filter that applies the given filters in order. Consecutive
+    `ItemTypeFilter`s are merged, so that their items are removed in a single pass.
+    """
+    steps: list[HandoffInputFilter] = []
+    for input_filter in filters:
+        previous = steps[-1] if steps else None
+        if isinstance(input_filter, ItemTypeFilter) and isinstance(previous, ItemTypeFilter):
+            steps[-1] = previous.merge(input_filter)
+        else:
+            steps.append(input_filter)
+
+    if len(steps) == 1:
+        return steps[0]
+    return _ComposedFilter(steps)
+
+
+@dataclass(frozen=True)
+class _ComposedFilter:
+    steps: list[HandoffInputFilter]
+
+    def __call__(self, handoff_input_data: HandoffInputData) -> HandoffInputData:
+        for step in self.steps:
+            handoff_input_data = step(handoff_input_data)
+        return handoff_input_data
+
+
+def _remove_run_item_types(
+    items: tuple[RunItem, ...], types: frozenset[str]
+) -> tuple[RunItem, ...]:
+    if not types:
+        return items
+    filtered_items = tuple(item for item in items if item.type not in types)
+    return filtered_items if len(filtered_items) < len(items) else items
 
 
-def _remove_tool_types_from_input(
-    items: tuple[TResponseInputItem, ...],
+def _remove_input_types(
+    items: tuple[TResponseInputItem, ...], types: frozenset[str]
 ) -> tuple[TResponseInputItem, ...]:
-    tool_types = [
-        "function_call",
-        "function_call_output",
-        "computer_call",
-        "computer_call_output",
-        "file_search_call",
-        "web_search_call",
-    ]
-
-    filtered_items: list[TResponseInputItem] = []
-    for item in items:
-        itype = item.get("type")
-        if itype in tool_types:
-            continue
-        filtered_items.append(item)
-    return tuple(filtered_items)
+    if not types:
+        return items
+    filtered_items = tuple(item for item in items if item.get("type") not in types)
+    return filtered_items if len(filtered_items) < len(items) else items
@@ -0,0 +1,216 @@
+"""Serves a streamed agent run as Server-Sent Events, from any ASGI framework."""
+
+from __future__ import annotations
+
+import asyncio
+from collections.abc import Awaitable, MutableMapping
+from typing import Any, Callable
+
+from openai.types.responses import ResponseFunctionCallArgumentsDeltaEvent, ResponseTextDeltaEvent
+from pydantic_core import to_json
+
+from ..logger import logger
+from ..result import RunResultStreaming
+from ..stream_events import StreamEvent
+
+ASGIScope = MutableMapping[str, Any]
+ASGIMessage = MutableMapping[str, Any]
+ASGIReceive = Callable[[], Awaitable[ASGIMessage]]
+ASGISend = Callable[[ASGIMessage], Awaitable[None]]
+
+# Text and function call argument deltas are by far the most frequent events, so their frames are
+# filled into pre-encoded templates instead of serializing the whole event. The JSON matches
+# `event.data.model_dump_json()`.
+_TEXT_DELTA_TEMPLATE = (
+    b'event: raw_response_event\ndata: {"content_index":%d,"delta":%b,"item_id":%b,'
+    b'"output_index":%d,"type":"response.output_text.delta"}\n\n'
+)
+_ARGUMENTS_DELTA_TEMPLATE = (
+    b'event: raw_response_event\ndata: {"delta":%b,"item_id":%b,"output_index":%d,'
+    b'"type":"response.function_call_arguments.delta"}\n\n'
+)
+_TEXT_DELTA_FIELDS = {"content_index", "delta", "item_id", "output_index", "type"}
+_ARGUMENTS_DELTA_FIELDS = {"delta", "item_id", "output_index", "type"}
+# The templates are only valid if the event types have exactly the fields they expect
+_USE_TEMPLATES = (
+    set(ResponseTextDeltaEvent.model_fields) == _TEXT_DELTA_FIELDS
+    and set(ResponseFunctionCallArgumentsDeltaEvent.model_fields) == _ARGUMENTS_DELTA_FIELDS
+)
+
+_SSE_HEADERS = [
+    (b"content-type", b"text/event-stream"),
+    (b"cache-control", b"no-cache"),
+    # Stop proxies like nginx from buffering the stream
+    (b"x-accel-buffering", b"no"),
+]
+
+
+def encode_sse_event(event: StreamEvent) -> bytes:
+    """Encodes a stream event as a Server-Sent Events frame. The SSE event name is the event's
+    `type`, and the data is the event as JSON:
+    - `raw_response_event`: the raw Responses API event.
+    - `run_item_stream_event`: `{"name": ..., "item": {"type": ..., "agent": ..., "raw_item": ...}}`
+    - `agent_updated_stream_event`: `{"new_agent": ...}`, with the new agent's name.
+    - `partial_output_stream_event`: `{"output": ..., "agent": ...}`
+    """
+    if event.type == "raw_response_event":
+        data = event.data
+        if _USE_TEMPLATES and not data.model_extra:
+            if isinstance(data, ResponseTextDeltaEvent):
+                return _TEXT_DELTA_TEMPLATE % (
+                    data.content_index,
+                    to_json(data.delta),
+                    to_json(data.item_id),
+                    data.output_index,
+                )
+            if isinstance(data, ResponseFunctionCallArgumentsDeltaEvent):
+                return _ARGUMENTS_DELTA_TEMPLATE % (
+                    to_json(data.delta),
+                    to_json(data.item_id),
+                    data.output_index,
+                )
+        return _frame(b"raw_response_event", to_json(data))
+    elif event.type == "run_item_stream_event":
+        item = event.item
+        payload: dict[str, Any] = {
+            "name": event.name,
+            "item": {"type": item.type, "agent": item.agent.name, "raw_item": item.raw_item},
+        }
+        return _frame(b"run_item_stream_event", to_json(payload, fallback=str))
+    elif event.type == "agent_updated_stream_event":
+        return _frame(b"agent_updated_stream_event", to_json({"new_agent": event.new_agent.name}))
+    else:
+        payload = {"output": event.output, "agent": event.agent.name}
+        return _frame(b"partial_output_stream_event", to_json(payload, fallback=str))
+
+
+class SSEStreamingResponse:
+    """An ASGI application that streams a run to the client as Server-Sent Events. Return it from
+    an endpoint of any ASGI framework (e.g. Starlette or FastAPI), or mount it directly:
+
+    ```python
+    result = Runner.run_streamed(agent, input)
+    return SSEStreamingResponse(result)
+    ```
+
+    Every stream event is encoded with `encode_sse_event()`. Frames are batched: all the events
+    that are already waiting are written as one chunk, up to `max_chunk_bytes`. Once the run is
+    complete, a `run_complete` event is sent with `{"final_output": ...}`, or an `error` event with
+    `{"error": ..., "message": ...}` if the run failed. The error is the exception's type, and the
+    message is generic, so that no details of the error are sent to the client; the error itself
+    is logged.
+
+    If the client disconnects, or a write to it fails, the run is cancelled.
+    """
+
+    def __init__(
+        self,
+        result: RunResultStreaming,
+        *,
+        max_chunk_bytes: int = 64 * 1024,
+        coalesce_window: float | None = None,
+        coalesce_max_chars: int | None = None,
+        headers: list[tuple[bytes, bytes]] | None = None,
+    ):
+        """
+        Args:
+            result: The streamed run to send to the client.
+            max_chunk_bytes: The maximum size of a chunk of frames written at once. A single frame
+                larger than this is still written as a whole.
+            coalesce_window: Passed to `RunResultStreaming.stream_events()`, to coalesce text
+                deltas.
+            coalesce_max_chars: Passed to `RunResultStreaming.stream_events()`, to coalesce text
+                deltas.
+            headers: Extra headers to send with the response.
+        """
+        self.result = result
+        self.max_chunk_bytes = max_chunk_bytes
+        self.coalesce_window = coalesce_window
+        self.coalesce_max_chars = coalesce_max_chars
+        self.headers = headers or []
+        self._disconnected = False
+
+    async def __call__(self, scope: ASGIScope, receive: ASGIReceive, send: ASGISend) -> None:
+        await send(
+            {"type": "http.response.start", "status": 200, "headers": _SSE_HEADERS + self.headers}
+        )
+
+        stream_task = asyncio.create_task(self._stream(send))
+        disconnect_task = asyncio.create_task(_wait_for_disconnect(receive))
+        try:
+            await asyncio.wait({stream_task, disconnect_task}, return_when=asyncio.FIRST_COMPLETED)
+        finally:
+            disconnect_task.cancel()
+            if not stream_task.done():
+                logger.debug("SSE client disconnected, cancelling the run")
+                self._disconnected = True
+                stream_task.cancel()
+                self.result._cleanup_tasks()
+                await asyncio.gather(stream_task, return_exceptions=True)
+
+        if not stream_task.cancelled() and stream_task.exception() is not None:
+            # Writing to the client failed, e.g. because it disconnected
+            logger.debug("Could not write to the SSE client, cancelling the run")
+            self.result._cleanup_tasks()
+            stream_task.result()
+
+    async def _stream(self, send: ASGISend) -> None:
+        queue = self.result._event_queue
+        chunk: list[bytes] = []
+        chunk_size = 0
+        events = self.result.stream_events(
+            coalesce_window=self.coalesce_window, coalesce_max_chars=self.coalesce_max_chars
+        )
+        try:
+            while True:
+                # Errors from the run are reported to the client, but errors from `send()` aren't
+                # caught here: there's no one left to report them to
+                try:
+                    event = await events.__anext__()
+                except StopAsyncIteration:
+                    payload = {"final_output": self.result.final_output}
+                    chunk.append(_frame(b"run_complete", to_json(payload, fallback=str)))
+                    break
+                except Exception as e:
+                    logger.error(f"Error in the streamed agent run: {e}")
+                    # The error message may contain sensitive details, so the client only gets a
+                    # generic one
+                    payload = {
+                        "error": type(e).__name__,
+                        "message": "An error occurred while running the agent.",
+                    }
+                    chunk.append(_frame(b"error", to_json(payload)))
+                    break
+
+                frame = encode_sse_event(event)
+                chunk.append(frame)
+                chunk_size += len(frame)
+                # Write once no more events are waiting, so the client never waits on a batch
+                if chunk_size >= self.max_chunk_bytes or queue.empty():
+                    await send(
+                        {"type": "http.response.body", "body": b"".join(chunk), "more_body": True}
+                    )
+                    chunk.clear()
+                    chunk_size = 0
+        finally:
+            # Releases the run's event queue if writing to the client failed
+            aclose = getattr(events, "aclose", None)
+            if aclose:
+                await aclose()
+
+        if self._disconnected:
+            # `stream_events()` ends quietly when it's cancelled, but there's no one to send to
+            return
+
+        await send({"type": "http.response.body", "body": b"".join(chunk), "more_body": False})
+
+
+async def _wait_for_disconnect(receive: ASGIReceive) -> None:
+    while True:
+        message = await receive()
+        if message["type"] == "http.disconnect":
+            return
+
+
+def _frame(event_name: bytes, data: bytes) -> bytes:
+    return b"event: " + event_name + b"\ndata: " + data + b"\n\n"
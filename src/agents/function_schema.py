@@ -4,16 +4,17 @@ import contextlib
 import inspect
 import logging
 import re
-from dataclasses import dataclass
+from dataclasses import dataclass, field
 from typing import Any, Callable, Literal, get_args, get_origin, get_type_hints
 
-from griffe import Docstring, DocstringSectionKind
 from pydantic import BaseModel, Field, create_model
 
 from .exceptions import UserError
 from .run_context import RunContextWrapper
 from .strict_schema import ensure_strict_json_schema
 
+_ArgKind = Literal["positional", "keyword", "var_positional", "var_keyword"]
+
 
 @dataclass
 class FuncSchema:
@@ -34,13 +35,11 @@ class FuncSchema:
     takes_context: bool = False
     """Whether the function takes a RunContextWrapper argument (must be the first argument)."""
 
-    def to_call_args(self, data: BaseModel) -> tuple[list[Any], dict[str, Any]]:
-        """
-        Converts validated data from the Pydantic model into (args, kwargs), suitable for calling
-        the original function.
-        """
-        positional_args: list[Any] = []
-        keyword_args: dict[str, Any] = {}
+    _call_plan: list[tuple[str, _ArgKind]] = field(init=False, repr=False, compare=False)
+    """How each parameter is passed to the function, computed once from the signature."""
+
+    def __post_init__(self) -> None:
+        self._call_plan = []
         seen_var_positional = False
 
         # Use enumerate() so we can skip the first parameter if it's context.
@@ -49,23 +48,46 @@ class FuncSchema:
             if self.takes_context and idx == 0:
                 continue
 
-            value = getattr(data, name, None)
             if param.kind == param.VAR_POSITIONAL:
                 # e.g. *args: extend positional args and mark that *args is now seen
-                positional_args.extend(value or [])
+                self._call_plan.append((name, "var_positional"))
                 seen_var_positional = True
             elif param.kind == param.VAR_KEYWORD:
                 # e.g. **kwargs handling
-                keyword_args.update(value or {})
+                self._call_plan.append((name, "var_keyword"))
             elif param.kind in (param.POSITIONAL_ONLY, param.POSITIONAL_OR_KEYWORD):
                 # Before *args, add to positional args. After *args, add to keyword args.
-                if not seen_var_positional:
-                    positional_args.append(value)
-                else:
-                    keyword_args[name] = value
+                self._call_plan.append((name, "keyword" if seen_var_positional else "positional"))
             else:
                 # For KEYWORD_ONLY parameters, always use keyword args.
+                self._call_plan.append((name, "keyword"))
+
+    def validate_json(self, json_str: str) -> BaseModel:
+        """Parses and validates the JSON arguments of a tool call in one pass. An empty string is
+        treated as no arguments. Raises a pydantic `ValidationError` if the JSON is invalid or
+        doesn't match the parameters.
+        """
+        return self.params_pydantic_model.model_validate_json(json_str or "{}")
+
+    def to_call_args(self, data: BaseModel) -> tuple[list[Any], dict[str, Any]]:
+        """
+        Converts validated data from the Pydantic model into (args, kwargs), suitable for calling
+        the original function.
+        """
+        positional_args: list[Any] = []
+        keyword_args: dict[str, Any] = {}
+        values = data.__dict__
+
+        for name, kind in self._call_plan:
+            value = values.get(name)
+            if kind == "positional":
+                positional_args.append(value)
+            elif kind == "keyword":
                 keyword_args[name] = value
+            elif kind == "var_positional":
+                positional_args.extend(value or [])
+            else:
+                keyword_args.update(value or {})
         return positional_args, keyword_args
 
 
@@ -158,6 +180,9 @@ def generate_func_documentation(
     if not doc:
         return FuncDocumentation(name=name, description=None, param_descriptions=None)
 
+    # Imported here, because griffe takes a while to import and is only needed for docstrings
+    from griffe import Docstring, DocstringSectionKind
+
     with _suppress_griffe_logging():
         docstring = Docstring(doc, lineno=1, parser=style or _detect_docstring_style(doc))
         parsed = docstring.parse()
@@ -219,7 +244,7 @@ def function_schema(
         doc_info = None
         param_descs = {}
 
-    func_name = name_override or doc_info.name if doc_info else func.__name__
+    func_name = name_override or (doc_info.name if doc_info else func.__name__)
 
     # 2. Inspect function signature and get type hints
     sig = inspect.signature(func)
@@ -1,20 +1,90 @@
 from __future__ import annotations
 
 import inspect
+import math
+from collections import deque
 from collections.abc import Awaitable
-from dataclasses import dataclass
-from typing import TYPE_CHECKING, Any, Callable, Generic, Union, overload
+from dataclasses import dataclass, field
+from typing import TYPE_CHECKING, Any, Callable, Generic, Literal, Union, overload
 
-from typing_extensions import TypeVar
+from typing_extensions import TypeAlias, TypeVar
 
 from ._utils import MaybeAwaitable
 from .exceptions import UserError
+from .guardrail_cache import GuardrailCache, guardrail_cache_key
 from .items import TResponseInputItem
 from .run_context import RunContextWrapper, TContext
 
 if TYPE_CHECKING:
     from .agent import Agent
 
+InputGuardrailStrategy: TypeAlias = Literal["parallel", "sequential", "race_with_budget"]
+"""How the input guardrails of a run are scheduled relative to the first model call. See
+`RunConfig.input_guardrail_strategy`."""
+
+
+@dataclass
+class GuardrailStats:
+    """Latency statistics of a guardrail, across all the runs in the process. Useful to choose an
+    input guardrail strategy, or its budget. Only guardrails that ran to completion are counted,
+    and results found in the guardrail's cache are only counted in `cache_hits`.
+    """
+
+    runs: int = 0
+    """The number of times the guardrail ran."""
+
+    tripwires_triggered: int = 0
+    """The number of times the guardrail triggered its tripwire."""
+
+    total_latency: float = 0.0
+    """The total time the guardrail took, in seconds."""
+
+    max_latency: float = 0.0
+    """The longest time the guardrail took, in seconds."""
+
+    recent_latencies: deque[float] = field(default_factory=lambda: deque(maxlen=1000))
+    """The latencies of the most recent runs, in seconds."""
+
+    cache_hits: int = 0
+    """The number of runs whose output was found in the guardrail's cache."""
+
+    cache_misses: int = 0
+    """The number of runs whose output wasn't in the guardrail's cache."""
+
+    @property
+    def cache_hit_rate(self) -> float:
+        """The share of the cache lookups that found an output, between 0 and 1."""
+        lookups = self.cache_hits + self.cache_misses
+        return self.cache_hits / lookups if lookups else 0.0
+
+    @property
+    def mean_latency(self) -> float:
+        """The average time the guardrail took, in seconds."""
+        return self.total_latency / self.runs if self.runs else 0.0
+
+    def latency_percentile(self, percentile: float) -> float:
+        """Returns a percentile (between 0 and 100) of the recent latencies, in seconds."""
+        if not self.recent_latencies:
+            return 0.0
+        latencies = sorted(self.recent_latencies)
+        index = math.ceil(percentile / 100 * len(latencies)) - 1
+        return latencies[min(max(index, 0), len(latencies) - 1)]
+
+    def record(self, latency: float, tripwire_triggered: bool) -> None:
+        """Records a run of the guardrail."""
+        self.runs += 1
+        self.tripwires_triggered += int(tripwire_triggered)
+        self.total_latency += latency
+        self.max_latency = max(self.max_latency, latency)
+        self.recent_latencies.append(latency)
+
+    def record_cache_lookup(self, hit: bool) -> None:
+        """Records a lookup of the guardrail's output in its cache."""
+        if hit:
+            self.cache_hits += 1
+        else:
+            self.cache_misses += 1
+
 
 @dataclass
 class GuardrailFunctionOutput:
@@ -44,6 +114,12 @@ class InputGuardrailResult:
     output: GuardrailFunctionOutput
     """The output of the guardrail function."""
 
+    latency: float = 0.0
+    """How long the guardrail took to run, in seconds."""
+
+    cache_hit: bool | None = None
+    """Whether the output was found in the guardrail's cache, or None if it has no cache."""
+
 
 @dataclass
 class OutputGuardrailResult:
@@ -67,6 +143,12 @@ class OutputGuardrailResult:
     output: GuardrailFunctionOutput
     """The output of the guardrail function."""
 
+    latency: float = 0.0
+    """How long the guardrail took to run, in seconds."""
+
+    cache_hit: bool | None = None
+    """Whether the output was found in the guardrail's cache, or None if it has no cache."""
+
 
 @dataclass
 class InputGuardrail(Generic[TContext]):
@@ -96,6 +178,16 @@ class InputGuardrail(Generic[TContext]):
     function's name.
     """
 
+    cache: GuardrailCache | None = None
+    """If set, the outputs of the guardrail function are cached, keyed on the guardrail's name and
+    the content of the input. See `GuardrailCache`.
+    """
+
+    stats: GuardrailStats = field(
+        default_factory=GuardrailStats, init=False, repr=False, compare=False
+    )
+    """Latency statistics of the guardrail, across all the runs in the process."""
+
     def get_name(self) -> str:
         if self.name:
             return self.name
@@ -111,17 +203,22 @@ class InputGuardrail(Generic[TContext]):
         if not callable(self.guardrail_function):
             raise UserError(f"Guardrail function must be callable, got {self.guardrail_function}")
 
+        key = guardrail_cache_key(self.get_name(), input) if self.cache else None
+        cache_hit: bool | None = None
+        if self.cache and key is not None:
+            cached = await self.cache.get(key)
+            cache_hit = cached is not None
+            self.stats.record_cache_lookup(cache_hit)
+            if cached is not None:
+                return InputGuardrailResult(guardrail=self, output=cached, cache_hit=True)
+
         output = self.guardrail_function(context, agent, input)
         if inspect.isawaitable(output):
-            return InputGuardrailResult(
-                guardrail=self,
-                output=await output,
-            )
+            output = await output
 
-        return InputGuardrailResult(
-            guardrail=self,
-            output=output,
-        )
+        if self.cache and key is not None:
+            await self.cache.set(key, output)
+        return InputGuardrailResult(guardrail=self, output=output, cache_hit=cache_hit)
 
 
 @dataclass
@@ -150,6 +247,16 @@ class OutputGuardrail(Generic[TContext]):
     function's name.
     """
 
+    cache: GuardrailCache | None = None
+    """If set, the outputs of the guardrail function are cached, keyed on the guardrail's name and
+    the content of the agent output. See `GuardrailCache`.
+    """
+
+    stats: GuardrailStats = field(
+        default_factory=GuardrailStats, init=False, repr=False, compare=False
+    )
+    """Latency statistics of the guardrail, across all the runs in the process."""
+
     def get_name(self) -> str:
         if self.name:
             return self.name
@@ -162,23 +269,71 @@ class OutputGuardrail(Generic[TContext]):
         if not callable(self.guardrail_function):
             raise UserError(f"Guardrail function must be callable, got {self.guardrail_function}")
 
+        key = guardrail_cache_key(self.get_name(), agent_output) if self.cache else None
+        cache_hit: bool | None = None
+        if self.cache and key is not None:
+            cached = await self.cache.get(key)
+            cache_hit = cached is not None
+            self.stats.record_cache_lookup(cache_hit)
+            if cached is not None:
+                return OutputGuardrailResult(
+                    guardrail=self,
+                    agent=agent,
+                    agent_output=agent_output,
+                    output=cached,
+                    cache_hit=True,
+                )
+
         output = self.guardrail_function(context, agent, agent_output)
         if inspect.isawaitable(output):
-            return OutputGuardrailResult(
-                guardrail=self,
-                agent=agent,
-                agent_output=agent_output,
-                output=await output,
-            )
+            output = await output
 
+        if self.cache and key is not None:
+            await self.cache.set(key, output)
         return OutputGuardrailResult(
             guardrail=self,
             agent=agent,
             agent_output=agent_output,
             output=output,
+            cache_hit=cache_hit,
         )
 
 
+@dataclass
+class StreamedTextWindow:
+    """A window of the text that a model is streaming, checked by a `StreamingOutputGuardrail`."""
+
+    delta: str
+    """The text that arrived since the guardrail's previous window."""
+
+    text: str
+    """All the text of the model response so far, including `delta`."""
+
+    is_final: bool
+    """Whether the response has finished streaming, i.e. this is the last window."""
+
+
+@dataclass
+class StreamingOutputGuardrail(OutputGuardrail[TContext]):
+    """An output guardrail that checks the text of an agent's responses while they stream in with
+    `Runner.run_streamed()`, rather than the final output once it's complete. If it triggers its
+    tripwire, the model's stream is closed right away and an `OutputGuardrailTripwireTriggered`
+    exception is raised.
+
+    The guardrail function receives a `StreamedTextWindow` as the agent output. Windows are
+    batched: the guardrail runs once at least `min_window_chars` characters arrived since its
+    previous window, and only one run is in flight at a time, so text that arrives meanwhile goes
+    into the next window. The rest of the text is checked once the response is complete.
+
+    Streaming output guardrails go in `Agent.output_guardrails` or `RunConfig.output_guardrails`,
+    and check every response of the agent when streaming. With `Runner.run()`, they check the
+    text of the final response, in a single window.
+    """
+
+    min_window_chars: int = 200
+    """The number of new characters to wait for before checking a window."""
+
+
 TContext_co = TypeVar("TContext_co", bound=Any, covariant=True)
 
 # For InputGuardrail
@@ -208,6 +363,7 @@ def input_guardrail(
 def input_guardrail(
     *,
     name: str | None = None,
+    cache: GuardrailCache | None = None,
 ) -> Callable[
     [_InputGuardrailFuncSync[TContext_co] | _InputGuardrailFuncAsync[TContext_co]],
     InputGuardrail[TContext_co],
@@ -220,6 +376,7 @@ def input_guardrail(
     | None = None,
     *,
     name: str | None = None,
+    cache: GuardrailCache | None = None,
 ) -> (
     InputGuardrail[TContext_co]
     | Callable[
@@ -241,7 +398,7 @@ def input_guardrail(
     def decorator(
         f: _InputGuardrailFuncSync[TContext_co] | _InputGuardrailFuncAsync[TContext_co],
     ) -> InputGuardrail[TContext_co]:
-        return InputGuardrail(guardrail_function=f, name=name)
+        return InputGuardrail(guardrail_function=f, name=name, cache=cache)
 
     if func is not None:
         # Decorator was used without parentheses
@@ -277,6 +434,7 @@ def output_guardrail(
 def output_guardrail(
     *,
     name: str | None = None,
+    cache: GuardrailCache | None = None,
 ) -> Callable[
     [_OutputGuardrailFuncSync[TContext_co] | _OutputGuardrailFuncAsync[TContext_co]],
     OutputGuardrail[TContext_co],
@@ -289,6 +447,7 @@ def output_guardrail(
     | None = None,
     *,
     name: str | None = None,
+    cache: GuardrailCache | None = None,
 ) -> (
     OutputGuardrail[TContext_co]
     | Callable[
@@ -310,7 +469,7 @@ def output_guardrail(
     def decorator(
         f: _OutputGuardrailFuncSync[TContext_co] | _OutputGuardrailFuncAsync[TContext_co],
     ) -> OutputGuardrail[TContext_co]:
-        return OutputGuardrail(guardrail_function=f, name=name)
+        return OutputGuardrail(guardrail_function=f, name=name, cache=cache)
 
     if func is not None:
         # Decorator was used without parentheses
@@ -0,0 +1,246 @@
+from __future__ import annotations
+
+import asyncio
+import copy
+import dataclasses
+import hashlib
+import json
+import sqlite3
+import threading
+import time
+from abc import ABC, abstractmethod
+from collections import OrderedDict
+from pathlib import Path
+from typing import TYPE_CHECKING, Any
+
+from .json_codec import get_json_codec
+from .logger import logger
+
+if TYPE_CHECKING:
+    from .guardrail import GuardrailFunctionOutput
+
+
+class GuardrailCache(ABC):
+    """Caches the outputs of guardrail functions, so that a guardrail doesn't run again for input
+    or output it has already checked. Set it on a guardrail with `InputGuardrail.cache` or
+    `OutputGuardrail.cache`.
+
+    Outputs are keyed on the guardrail's name and a hash of the input or output it checked. The
+    run context isn't part of the key, so only cache guardrails whose result doesn't depend on it.
+    """
+
+    @abstractmethod
+    async def get(self, key: str) -> GuardrailFunctionOutput | None:
+        """Returns the cached output for a key, or None if there is none or it has expired."""
+        pass
+
+    @abstractmethod
+    async def set(self, key: str, output: GuardrailFunctionOutput) -> None:
+        """Caches the output for a key."""
+        pass
+
+    @abstractmethod
+    async def clear(self) -> None:
+        """Deletes all the cached outputs."""
+        pass
+
+
+class InMemoryGuardrailCache(GuardrailCache):
+    """Keeps guardrail outputs in memory, for the lifetime of the process. Outputs are stored and
+    returned as deep copies, so `output_info` can be any object that can be copied, and changing a
+    returned output doesn't change the cached one. Outputs that can't be copied aren't cached.
+    """
+
+    def __init__(self, max_size: int = 1024, ttl: float | None = None):
+        """
+        Args:
+            max_size: The maximum number of outputs to keep. Once it's reached, the least recently
+                used output is evicted.
+            ttl: How long an output stays in the cache, in seconds. If not set, outputs are only
+                evicted when the cache is full.
+        """
+        self.max_size = max_size
+        self.ttl = ttl
+        self._entries: OrderedDict[str, tuple[float | None, GuardrailFunctionOutput]] = (
+            OrderedDict()
+        )
+
+    async def get(self, key: str) -> GuardrailFunctionOutput | None:
+        entry = self._entries.get(key)
+        if entry is None:
+            return None
+        expires_at, output = entry
+        if expires_at is not None and expires_at <= time.monotonic():
+            del self._entries[key]
+            return None
+        self._entries.move_to_end(key)
+        return copy.deepcopy(output)
+
+    async def set(self, key: str, output: GuardrailFunctionOutput) -> None:
+        try:
+            output = copy.deepcopy(output)
+        except Exception as e:
+            logger.debug(f"Not caching guardrail output that can't be copied: {e}")
+            return
+        expires_at = time.monotonic() + self.ttl if self.ttl is not None else None
+        self._entries[key] = (expires_at, output)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_size:
+            self._entries.popitem(last=False)
+
+    async def clear(self) -> None:
+        self._entries.clear()
+
+
+class SQLiteGuardrailCache(GuardrailCache):
+    """Stores guardrail outputs in a SQLite database, so they're shared by the processes on a
+    machine and survive restarts. The database calls run in a worker thread, so they don't block
+    the event loop.
+
+    Outputs are stored as JSON: a Pydantic model or dataclass in `output_info` is returned as a
+    dict. Outputs whose `output_info` can't be converted to JSON aren't cached.
+
+    Expired and least recently used outputs are deleted in batches rather than on every `set()`:
+    every `max_size / 10` new outputs, or every 1000 if the size isn't limited. So each process can
+    take the cache up to 10% above `max_size` until its next batch.
+    """
+
+    def __init__(
+        self,
+        db_path: str | Path,
+        *,
+        max_size: int | None = None,
+        ttl: float | None = None,
+        table: str = "guardrail_cache",
+    ):
+        """
+        Args:
+            db_path: The path to the database file.
+            max_size: The maximum number of outputs to keep. Once it's reached, the least recently
+                used outputs are evicted. If not set, the cache isn't limited in size.
+            ttl: How long an output stays in the cache, in seconds. If not set, outputs don't
+                expire.
+            table: The name of the table to store outputs in.
+        """
+        self.db_path = db_path
+        self.max_size = max_size
+        self.ttl = ttl
+        self.table = table
+        self._eviction_interval = max(1, max_size // 10) if max_size is not None else 1000
+        self._sets_since_eviction = 0
+        self._lock = threading.Lock()
+        self._connection = sqlite3.connect(str(db_path), check_same_thread=False)
+        with self._lock, self._connection:
+            self._connection.execute("PRAGMA journal_mode=WAL")
+            self._connection.execute(
+                f"CREATE TABLE IF NOT EXISTS {table} (key TEXT PRIMARY KEY, data BLOB NOT NULL, "
+                "expires_at REAL, used_at REAL NOT NULL)"
+            )
+            self._connection.execute(
+                f"CREATE INDEX IF NOT EXISTS {table}_used_at ON {table} (used_at)"
+            )
+
+    async def get(self, key: str) -> GuardrailFunctionOutput | None:
+        data = await asyncio.to_thread(self._get, key)
+        if data is None:
+            return None
+
+        from .guardrail import GuardrailFunctionOutput
+
+        value = get_json_codec().loads(data)
+        return GuardrailFunctionOutput(
+            output_info=value["output_info"], tripwire_triggered=value["tripwire_triggered"]
+        )
+
+    async def set(self, key: str, output: GuardrailFunctionOutput) -> None:
+        try:
+            output_info = json.loads(json.dumps(output.output_info, default=_to_json))
+        except (TypeError, ValueError) as e:
+            logger.debug(f"Not caching guardrail output that can't be converted to JSON: {e}")
+            return
+        data = get_json_codec().dumps(
+            {"output_info": output_info, "tripwire_triggered": output.tripwire_triggered}
+        )
+        await asyncio.to_thread(self._set, key, data)
+
+    async def clear(self) -> None:
+        await asyncio.to_thread(self._clear)
+
+    def close(self) -> None:
+        """Closes the database connection."""
+        with self._lock:
+            self._connection.close()
+
+    def _get(self, key: str) -> bytes | None:
+        now = time.time()
+        with self._lock, self._connection:
+            row = self._connection.execute(
+                f"SELECT data FROM {self.table} "
+                "WHERE key = ? AND (expires_at IS NULL OR expires_at > ?)",
+                (key, now),
+            ).fetchone()
+            if row:
+                self._connection.execute(
+                    f"UPDATE {self.table} SET used_at = ? WHERE key = ?", (now, key)
+                )
+        return row[0] if row else None
+
+    def _set(self, key: str, data: bytes) -> None:
+        now = time.time()
+        expires_at = now + self.ttl if self.ttl is not None else None
+        with self._lock, self._connection:
+            self._connection.execute(
+                f"INSERT OR REPLACE INTO {self.table} (key, data, expires_at, used_at) "
+                "VALUES (?, ?, ?, ?)",
+                (key, data, expires_at, now),
+            )
+            self._sets_since_eviction += 1
+            if self._sets_since_eviction >= self._eviction_interval:
+                self._sets_since_eviction = 0
+                self._evict(now)
+
+    def _evict(self, now: float) -> None:
+        if self.ttl is not None:
+            self._connection.execute(
+                f"DELETE FROM {self.table} WHERE expires_at IS NOT NULL AND expires_at <= ?",
+                (now,),
+            )
+        if self.max_size is None:
+            return
+        (count,) = self._connection.execute(f"SELECT COUNT(*) FROM {self.table}").fetchone()
+        if count > self.max_size:
+            # Walks the used_at index from the oldest end, so only the evicted rows are read
+            self._connection.execute(
+                f"DELETE FROM {self.table} WHERE key IN "
+                f"(SELECT key FROM {self.table} ORDER BY used_at LIMIT ?)",
+                (count - self.max_size,),
+            )
+
+    def _clear(self) -> None:
+        with self._lock, self._connection:
+            self._connection.execute(f"DELETE FROM {self.table}")
+
+
+def guardrail_cache_key(guardrail_name: str, value: Any) -> str | None:
+    """Returns the cache key for a guardrail's output on some input or agent output, or None if
+    the value can't be converted to JSON, and so can't be cached.
+
+    The key is a hash of the guardrail name and of the value as canonical JSON, i.e. with sorted
+    keys, so equal values have the same key. Pydantic models and dataclasses are hashed by their
+    fields.
+    """
+    try:
+        canonical = json.dumps(
+            value, sort_keys=True, separators=(",", ":"), ensure_ascii=False, default=_to_json
+        )
+    except (TypeError, ValueError):
+        return None
+    return hashlib.sha256(f"{guardrail_name}\0{canonical}".encode()).hexdigest()
+
+
+def _to_json(value: Any) -> Any:
+    if hasattr(value, "model_dump") and not isinstance(value, type):
+        return value.model_dump(mode="json")
+    if dataclasses.is_dataclass(value) and not isinstance(value, type):
+        return dataclasses.asdict(value)
+    raise TypeError(f"Object of type {type(value).__name__} is not JSON serializable")
@@ -2,8 +2,8 @@ from __future__ import annotations
 
 import abc
 import copy
-from dataclasses import dataclass
-from typing import TYPE_CHECKING, Any, Generic, Literal, TypeVar, Union
+from dataclasses import dataclass, field
+from typing import TYPE_CHECKING, Any, Generic, Literal, TypeVar, Union, cast
 
 from openai.types.responses import (
     Response,
@@ -23,6 +23,7 @@ from openai.types.responses.response_reasoning_item import ResponseReasoningItem
 from pydantic import BaseModel
 from typing_extensions import TypeAlias
 
+from . import _utils
 from .exceptions import AgentsException, ModelBehaviorError
 from .usage import Usage
 
@@ -55,6 +56,12 @@ class RunItemBase(Generic[T], abc.ABC):
     (i.e. `openai.types.responses.ResponseInputItemParam`).
     """
 
+    _input_item: TResponseInputItem | None = field(
+        default=None, init=False, repr=False, compare=False
+    )
+    """The converted input item, so that output items are only dumped once per run, rather than
+    once per turn."""
+
     def to_input_item(self) -> TResponseInputItem:
         """Converts this item into an input item suitable for passing to the model."""
         if isinstance(self.raw_item, dict):
@@ -62,7 +69,11 @@ class RunItemBase(Generic[T], abc.ABC):
             return self.raw_item  # type: ignore
         elif isinstance(self.raw_item, BaseModel):
             # All output items are Pydantic models that can be converted to input items.
-            return self.raw_item.model_dump(exclude_unset=True)  # type: ignore
+            if self._input_item is None:
+                self._input_item = self.raw_item.model_dump(exclude_unset=True)  # type: ignore
+            # Callers such as sessions and filters may change the item, including its nested
+            # content, so they get their own deep copy
+            return cast(TResponseInputItem, _utils.copy_json(self._input_item))
         else:
             raise AgentsException(f"Unexpected raw item type: {type(self.raw_item)}")
 
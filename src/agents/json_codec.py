@@ -0,0 +1,88 @@
+from __future__ import annotations
+
+import abc
+import json
+from typing import Any
+
+from pydantic import BaseModel
+
+
+class JSONCodec(abc.ABC):
+    """Encodes and decodes the JSON that the SDK produces and consumes itself, e.g. sessions,
+    checkpoints, trace exports and debug logs. Set the codec to use with `set_json_codec()`.
+    """
+
+    @abc.abstractmethod
+    def dumps(self, obj: Any) -> bytes:
+        """Encodes an object as compact JSON. Pydantic models are encoded with `model_dump()`."""
+        pass
+
+    @abc.abstractmethod
+    def loads(self, data: str | bytes) -> Any:
+        """Decodes JSON. Raises a `ValueError` if the JSON is invalid."""
+        pass
+
+    def dumps_pretty(self, obj: Any) -> str:
+        """Encodes an object as indented JSON, for logging."""
+        return json.dumps(obj, indent=2, default=_default)
+
+
+class StdlibJSONCodec(JSONCodec):
+    """A codec that uses the `json` module from the standard library."""
+
+    def dumps(self, obj: Any) -> bytes:
+        return json.dumps(obj, separators=(",", ":"), ensure_ascii=False, default=_default).encode()
+
+    def loads(self, data: str | bytes) -> Any:
+        return json.loads(data)
+
+
+class OrjsonCodec(JSONCodec):
+    """A codec that uses [orjson](https://github.com/ijl/orjson), which is several times faster
+    than the standard library. Used by default if `orjson` is installed.
+    """
+
+    def __init__(self) -> None:
+        import orjson
+
+        self._orjson = orjson
+        self._options = orjson.OPT_NON_STR_KEYS
+
+    def dumps(self, obj: Any) -> bytes:
+        return self._orjson.dumps(obj, default=_default, option=self._options)
+
+    def loads(self, data: str | bytes) -> Any:
+        return self._orjson.loads(data)
+
+    def dumps_pretty(self, obj: Any) -> str:
+        option = self._options | self._orjson.OPT_INDENT_2
+        return self._orjson.dumps(obj, default=_default, option=option).decode()
+
+
+def _default(obj: Any) -> Any:
+    if isinstance(obj, BaseModel):
+        return obj.model_dump()
+    raise TypeError(f"Object of type {type(obj).__name__} is not JSON serializable")
+
+
+def _default_codec() -> JSONCodec:
+    try:
+        return OrjsonCodec()
+    except ImportError:
+        return StdlibJSONCodec()
+
+
+_codec: JSONCodec = _default_codec()
+
+
+def get_json_codec() -> JSONCodec:
+    """Returns the JSON codec that the SDK uses."""
+    return _codec
+
+
+def set_json_codec(codec: JSONCodec) -> None:
+    """Sets the JSON codec that the SDK uses. By default, that's an `OrjsonCodec` if `orjson` is
+    installed, and a `StdlibJSONCodec` otherwise.
+    """
+    global _codec
+    _codec = codec
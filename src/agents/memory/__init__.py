@@ -0,0 +1,8 @@
+from .session import InMemorySession, Session
+from .sqlite_session import SQLiteSession
+
+__all__ = [
+    "Session",
+    "InMemorySession",
+    "SQLiteSession",
+]
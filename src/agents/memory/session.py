@@ -0,0 +1,82 @@
+from __future__ import annotations
+
+import abc
+from typing import cast
+
+from .. import _utils
+from ..items import TResponseInputItem
+
+
+class Session(abc.ABC):
+    """Stores the conversation history of a session, so that it can be carried across runs. Pass a
+    session to a run with `RunConfig.session`: the run starts with the session's items before its
+    input, and appends the input and the items it generates to the session after every turn.
+    """
+
+    session_id: str
+    """The ID of the session."""
+
+    @abc.abstractmethod
+    async def get_items(self, limit: int | None = None) -> list[TResponseInputItem]:
+        """Returns the items in the session, oldest first.
+
+        Args:
+            limit: If set, only the most recent `limit` items are returned.
+        """
+        pass
+
+    @abc.abstractmethod
+    async def add_items(self, items: list[TResponseInputItem]) -> None:
+        """Appends items to the session. The items are owned by the session afterwards, so callers
+        shouldn't mutate them.
+        """
+        pass
+
+    @abc.abstractmethod
+    async def pop_item(self) -> TResponseInputItem | None:
+        """Removes and returns the most recent item in the session, or None if it's empty."""
+        pass
+
+    @abc.abstractmethod
+    async def clear_session(self) -> None:
+        """Removes all the items in the session."""
+        pass
+
+
+class InMemorySession(Session):
+    """A session that keeps its items in memory, for as long as the session object is kept. To
+    share items between session objects, e.g. one per request, pass them the same `store`.
+    """
+
+    def __init__(
+        self,
+        session_id: str,
+        store: dict[str, list[TResponseInputItem]] | None = None,
+    ):
+        """
+        Args:
+            session_id: The ID of the session.
+            store: Where the items of the sessions are kept, by session ID. If not set, the session
+                keeps its items to itself. A shared store is never pruned: call `clear_session()`
+                on sessions that are no longer needed.
+        """
+        self.session_id = session_id
+        self._store = store if store is not None else {}
+
+    async def get_items(self, limit: int | None = None) -> list[TResponseInputItem]:
+        items = self._store.get(self.session_id, [])
+        if limit is not None:
+            items = items[-limit:] if limit > 0 else []
+        # Callers get copies, so that changing them doesn't change the session's history
+        return [cast(TResponseInputItem, _utils.copy_json(item)) for item in items]
+
+    async def add_items(self, items: list[TResponseInputItem]) -> None:
+        if items:
+            self._store.setdefault(self.session_id, []).extend(items)
+
+    async def pop_item(self) -> TResponseInputItem | None:
+        items = self._store.get(self.session_id)
+        return items.pop() if items else None
+
+    async def clear_session(self) -> None:
+        self._store.pop(self.session_id, None)
@@ -0,0 +1,132 @@
+from __future__ import annotations
+
+import asyncio
+import sqlite3
+import threading
+import time
+from pathlib import Path
+
+from ..items import TResponseInputItem
+from ..json_codec import get_json_codec
+from .session import Session
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS {sessions_table} (
+    session_id TEXT PRIMARY KEY,
+    created_at REAL NOT NULL
+);
+CREATE TABLE IF NOT EXISTS {items_table} (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    session_id TEXT NOT NULL,
+    item_data BLOB NOT NULL
+);
+CREATE INDEX IF NOT EXISTS {items_table}_session_id ON {items_table} (session_id, id);
+"""
+
+
+class SQLiteSession(Session):
+    """A session that stores its items in a SQLite database. The database runs in WAL mode, so
+    that reading a session doesn't block writes to other sessions. The items a turn generates are
+    written in a single transaction, and items are indexed by session ID, so loading the most recent
+    items of a session doesn't scan the others.
+
+    The database calls run in a worker thread, so they don't block the event loop.
+    """
+
+    def __init__(
+        self,
+        session_id: str,
+        db_path: str | Path = ":memory:",
+        sessions_table: str = "agent_sessions",
+        items_table: str = "agent_session_items",
+    ):
+        """
+        Args:
+            session_id: The ID of the session.
+            db_path: The path to the database file. Defaults to an in-memory database, which only
+                lives as long as this object.
+            sessions_table: The name of the table that lists the sessions.
+            items_table: The name of the table that stores the items of the sessions.
+        """
+        self.session_id = session_id
+        self.db_path = db_path
+        self.sessions_table = sessions_table
+        self.items_table = items_table
+        self._lock = threading.Lock()
+        self._connection = sqlite3.connect(str(db_path), check_same_thread=False)
+        with self._lock:
+            self._connection.execute("PRAGMA journal_mode=WAL")
+            self._connection.execute("PRAGMA synchronous=NORMAL")
+            self._connection.executescript(
+                _SCHEMA.format(sessions_table=sessions_table, items_table=items_table)
+            )
+
+    async def get_items(self, limit: int | None = None) -> list[TResponseInputItem]:
+        return await asyncio.to_thread(self._get_items, limit)
+
+    async def add_items(self, items: list[TResponseInputItem]) -> None:
+        if items:
+            await asyncio.to_thread(self._add_items, items)
+
+    async def pop_item(self) -> TResponseInputItem | None:
+        return await asyncio.to_thread(self._pop_item)
+
+    async def clear_session(self) -> None:
+        await asyncio.to_thread(self._clear_session)
+
+    def close(self) -> None:
+        """Closes the database connection."""
+        with self._lock:
+            self._connection.close()
+
+    def _get_items(self, limit: int | None) -> list[TResponseInputItem]:
+        if limit is None:
+            query = f"SELECT item_data FROM {self.items_table} WHERE session_id = ? ORDER BY id"
+            params: tuple[object, ...] = (self.session_id,)
+        else:
+            # Read the most recent items through the index, then put them back in order
+            query = (
+                f"SELECT item_data FROM (SELECT id, item_data FROM {self.items_table} "
+                "WHERE session_id = ? ORDER BY id DESC LIMIT ?) ORDER BY id"
+            )
+            params = (self.session_id, max(limit, 0))
+
+        with self._lock:
+            rows = self._connection.execute(query, params).fetchall()
+        codec = get_json_codec()
+        return [codec.loads(item_data) for (item_data,) in rows]
+
+    def _add_items(self, items: list[TResponseInputItem]) -> None:
+        codec = get_json_codec()
+        rows = [(self.session_id, codec.dumps(item)) for item in items]
+        with self._lock, self._connection:
+            self._connection.execute(
+                f"INSERT OR IGNORE INTO {self.sessions_table} (session_id, created_at) "
+                "VALUES (?, ?)",
+                (self.session_id, time.time()),
+            )
+            self._connection.executemany(
+                f"INSERT INTO {self.items_table} (session_id, item_data) VALUES (?, ?)", rows
+            )
+
+    def _pop_item(self) -> TResponseInputItem | None:
+        with self._lock, self._connection:
+            row = self._connection.execute(
+                f"SELECT id, item_data FROM {self.items_table} WHERE session_id = ? "
+                "ORDER BY id DESC LIMIT 1",
+                (self.session_id,),
+            ).fetchone()
+            if row is None:
+                return None
+            self._connection.execute(f"DELETE FROM {self.items_table} WHERE id = ?", (row[0],))
+        item: TResponseInputItem = get_json_codec().loads(row[1])
+        return item
+
+    def _clear_session(self) -> None:
+        with self._lock, self._connection:
+            self._connection.execute(
+                f"DELETE FROM {self.items_table} WHERE session_id = ?", (self.session_id,)
+            )
+            self._connection.execute(
+                f"DELETE FROM {self.sessions_table} WHERE session_id = ?", (self.session_id,)
+            )
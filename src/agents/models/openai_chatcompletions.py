@@ -2,7 +2,10 @@ from __future__ import annotations
 
 import dataclasses
 import json
+import logging
+import threading
 import time
+from collections import OrderedDict
 from collections.abc import AsyncIterator, Iterable
 from dataclasses import dataclass, field
 from typing import TYPE_CHECKING, Any, Literal, cast, overload
@@ -54,11 +57,12 @@ from openai.types.responses import (
 )
 from openai.types.responses.response_input_param import FunctionCallOutput, ItemReference, Message
 
-from .. import _debug
+from .. import _debug, _utils
 from ..agent_output import AgentOutputSchema
 from ..exceptions import AgentsException, UserError
 from ..handoffs import Handoff
 from ..items import ModelResponse, TResponseInputItem, TResponseOutputItem, TResponseStreamEvent
+from ..json_codec import get_json_codec
 from ..logger import logger
 from ..tool import FunctionTool, Tool
 from ..tracing import generation_span
@@ -77,12 +81,42 @@ _USER_AGENT = f"Agents/Python {__version__}"
 _HEADERS = {"User-Agent": _USER_AGENT}
 
 
+@dataclass
+class _StreamingFunctionCall:
+    """Accumulates the deltas of a single streamed tool call. Appending to lists keeps streaming
+    linear in the length of the output; the strings are only joined once the stream is done.
+    """
+
+    name_parts: list[str] = field(default_factory=list)
+    arguments_parts: list[str] = field(default_factory=list)
+    call_id_parts: list[str] = field(default_factory=list)
+    output_index: int | None = None
+    """The output index of the tool call, set once its `response.output_item.added` event has been
+    emitted."""
+
+    def to_output_item(self, arguments: str | None = None) -> ResponseFunctionToolCall:
+        return ResponseFunctionToolCall(
+            id=FAKE_RESPONSES_ID,
+            call_id="".join(self.call_id_parts),
+            arguments="".join(self.arguments_parts) if arguments is None else arguments,
+            name="".join(self.name_parts),
+            type="function_call",
+        )
+
+
 @dataclass
 class _StreamingState:
     started: bool = False
     text_content_index_and_output: tuple[int, ResponseOutputText] | None = None
+    text_parts: list[str] = field(default_factory=list)
     refusal_content_index_and_output: tuple[int, ResponseOutputRefusal] | None = None
-    function_calls: dict[int, ResponseFunctionToolCall] = field(default_factory=dict)
+    refusal_parts: list[str] = field(default_factory=list)
+    function_calls: dict[int, _StreamingFunctionCall] = field(default_factory=dict)
+    message_output_index: int | None = None
+    """The output index of the assistant message, set once its first content part has started."""
+    next_output_index: int = 0
+    """Output indices are assigned in the order the items start, which is also the order of the
+    final response output."""
 
 
 class OpenAIChatCompletionsModel(Model):
@@ -93,6 +127,7 @@ class OpenAIChatCompletionsModel(Model):
     ) -> None:
         self.model = model
         self._client = openai_client
+        self._messages_cache = _ItemsToMessagesCache()
 
     def _non_null_or_not_given(self, value: Any) -> Any:
         return value if value is not None else NOT_GIVEN
@@ -127,10 +162,9 @@ class OpenAIChatCompletionsModel(Model):
 
             if _debug.DONT_LOG_MODEL_DATA:
                 logger.debug("Received model response")
-            else:
-                logger.debug(
-                    f"LLM resp:\n{json.dumps(response.choices[0].message.model_dump(), indent=2)}\n"
-                )
+            elif logger.isEnabledFor(logging.DEBUG):
+                message = response.choices[0].message.model_dump()
+                logger.debug(f"LLM resp:\n{get_json_codec().dumps_pretty(message)}\n")
 
             usage = (
                 Usage(
@@ -191,197 +225,187 @@ class OpenAIChatCompletionsModel(Model):
             usage: CompletionUsage | None = None
             state = _StreamingState()
 
-            async for chunk in stream:
-                if not state.started:
-                    state.started = True
-                    yield ResponseCreatedEvent(
-                        response=response,
-                        type="response.created",
-                    )
-
-                # The usage is only available in the last chunk
-                usage = chunk.usage
-
-                if not chunk.choices or not chunk.choices[0].delta:
-                    continue
-
-                delta = chunk.choices[0].delta
-
-                # Handle text
-                if delta.content:
-                    if not state.text_content_index_and_output:
-                        # Initialize a content tracker for streaming text
-                        state.text_content_index_and_output = (
-                            0 if not state.refusal_content_index_and_output else 1,
-                            ResponseOutputText(
-                                text="",
-                                type="output_text",
-                                annotations=[],
-                            ),
-                        )
-                        # Start a new assistant message stream
-                        assistant_item = ResponseOutputMessage(
-                            id=FAKE_RESPONSES_ID,
-                            content=[],
-                            role="assistant",
-                            type="message",
-                            status="in_progress",
+            try:
+                async for chunk in stream:
+                    if not state.started:
+                        state.started = True
+                        yield ResponseCreatedEvent(
+                            response=response,
+                            type="response.created",
                         )
-                        # Notify consumers of the start of a new output message + first content part
-                        yield ResponseOutputItemAddedEvent(
-                            item=assistant_item,
-                            output_index=0,
-                            type="response.output_item.added",
-                        )
-                        yield ResponseContentPartAddedEvent(
+
+                    # The usage is only available in the last chunk
+                    usage = chunk.usage
+
+                    if not chunk.choices or not chunk.choices[0].delta:
+                        continue
+
+                    delta = chunk.choices[0].delta
+
+                    # Handle text
+                    if delta.content:
+                        if state.message_output_index is None:
+                            # Tool calls seen so far start before the message
+                            for event in self._start_named_function_calls_events(state):
+                                yield event
+                        message_index = self._message_output_index(state)
+                        if not state.text_content_index_and_output:
+                            # Initialize a content tracker for streaming text
+                            state.text_content_index_and_output = (
+                                0 if not state.refusal_content_index_and_output else 1,
+                                ResponseOutputText(
+                                    text="",
+                                    type="output_text",
+                                    annotations=[],
+                                ),
+                            )
+                            # Start a new assistant message stream
+                            assistant_item = ResponseOutputMessage(
+                                id=FAKE_RESPONSES_ID,
+                                content=[],
+                                role="assistant",
+                                type="message",
+                                status="in_progress",
+                            )
+                            # Notify consumers of the start of a new output message + first
+                            # content part
+                            yield ResponseOutputItemAddedEvent(
+                                item=assistant_item,
+                                output_index=message_index,
+                                type="response.output_item.added",
+                            )
+                            yield ResponseContentPartAddedEvent(
+                                content_index=state.text_content_index_and_output[0],
+                                item_id=FAKE_RESPONSES_ID,
+                                output_index=message_index,
+                                part=ResponseOutputText(
+                                    text="",
+                                    type="output_text",
+                                    annotations=[],
+                                ),
+                                type="response.content_part.added",
+                            )
+                        # Emit the delta for this segment of content
+                        yield ResponseTextDeltaEvent(
                             content_index=state.text_content_index_and_output[0],
+                            delta=delta.content,
                             item_id=FAKE_RESPONSES_ID,
-                            output_index=0,
-                            part=ResponseOutputText(
-                                text="",
-                                type="output_text",
-                                annotations=[],
-                            ),
-                            type="response.content_part.added",
-                        )
-                    # Emit the delta for this segment of content
-                    yield ResponseTextDeltaEvent(
-                        content_index=state.text_content_index_and_output[0],
-                        delta=delta.content,
-                        item_id=FAKE_RESPONSES_ID,
-                        output_index=0,
-                        type="response.output_text.delta",
-                    )
-                    # Accumulate the text into the response part
-                    state.text_content_index_and_output[1].text += delta.content
-
-                # Handle refusals (model declines to answer)
-                if delta.refusal:
-                    if not state.refusal_content_index_and_output:
-                        # Initialize a content tracker for streaming refusal text
-                        state.refusal_content_index_and_output = (
-                            0 if not state.text_content_index_and_output else 1,
-                            ResponseOutputRefusal(refusal="", type="refusal"),
-                        )
-                        # Start a new assistant message if one doesn't exist yet (in-progress)
-                        assistant_item = ResponseOutputMessage(
-                            id=FAKE_RESPONSES_ID,
-                            content=[],
-                            role="assistant",
-                            type="message",
-                            status="in_progress",
+                            output_index=message_index,
+                            type="response.output_text.delta",
                         )
-                        # Notify downstream that assistant message + first content part are starting
-                        yield ResponseOutputItemAddedEvent(
-                            item=assistant_item,
-                            output_index=0,
-                            type="response.output_item.added",
-                        )
-                        yield ResponseContentPartAddedEvent(
+                        # Accumulate the text; it's joined into the response part at the end
+                        state.text_parts.append(delta.content)
+
+                    # Handle refusals (model declines to answer)
+                    if delta.refusal:
+                        if state.message_output_index is None:
+                            # Tool calls seen so far start before the message
+                            for event in self._start_named_function_calls_events(state):
+                                yield event
+                        message_index = self._message_output_index(state)
+                        if not state.refusal_content_index_and_output:
+                            # Initialize a content tracker for streaming refusal text
+                            state.refusal_content_index_and_output = (
+                                0 if not state.text_content_index_and_output else 1,
+                                ResponseOutputRefusal(refusal="", type="refusal"),
+                            )
+                            # Start a new assistant message if one doesn't exist yet (in-progress)
+                            assistant_item = ResponseOutputMessage(
+                                id=FAKE_RESPONSES_ID,
+                                content=[],
+                                role="assistant",
+                                type="message",
+                                status="in_progress",
+                            )
+                            # Notify downstream that assistant message + first content part
+                            # are starting
+                            yield ResponseOutputItemAddedEvent(
+                                item=assistant_item,
+                                output_index=message_index,
+                                type="response.output_item.added",
+                            )
+                            yield ResponseContentPartAddedEvent(
+                                content_index=state.refusal_content_index_and_output[0],
+                                item_id=FAKE_RESPONSES_ID,
+                                output_index=message_index,
+                                part=ResponseOutputText(
+                                    text="",
+                                    type="output_text",
+                                    annotations=[],
+                                ),
+                                type="response.content_part.added",
+                            )
+                        # Emit the delta for this segment of refusal
+                        yield ResponseRefusalDeltaEvent(
                             content_index=state.refusal_content_index_and_output[0],
+                            delta=delta.refusal,
                             item_id=FAKE_RESPONSES_ID,
-                            output_index=0,
-                            part=ResponseOutputText(
-                                text="",
-                                type="output_text",
-                                annotations=[],
-                            ),
-                            type="response.content_part.added",
+                            output_index=message_index,
+                            type="response.refusal.delta",
                         )
-                    # Emit the delta for this segment of refusal
-                    yield ResponseRefusalDeltaEvent(
-                        content_index=state.refusal_content_index_and_output[0],
-                        delta=delta.refusal,
-                        item_id=FAKE_RESPONSES_ID,
-                        output_index=0,
-                        type="response.refusal.delta",
-                    )
-                    # Accumulate the refusal string in the output part
-                    state.refusal_content_index_and_output[1].refusal += delta.refusal
-
-                # Handle tool calls
-                # Because we don't know the name of the function until the end of the stream, we'll
-                # save everything and yield events at the end
-                if delta.tool_calls:
-                    for tc_delta in delta.tool_calls:
-                        if tc_delta.index not in state.function_calls:
-                            state.function_calls[tc_delta.index] = ResponseFunctionToolCall(
-                                id=FAKE_RESPONSES_ID,
-                                arguments="",
-                                name="",
-                                type="function_call",
-                                call_id="",
-                            )
-                        tc_function = tc_delta.function
-
-                        state.function_calls[tc_delta.index].arguments += (
-                            tc_function.arguments if tc_function else ""
-                        ) or ""
-                        state.function_calls[tc_delta.index].name += (
-                            tc_function.name if tc_function else ""
-                        ) or ""
-                        state.function_calls[tc_delta.index].call_id += tc_delta.id or ""
-
-            function_call_starting_index = 0
-            if state.text_content_index_and_output:
-                function_call_starting_index += 1
-                # Send end event for this content part
-                yield ResponseContentPartDoneEvent(
-                    content_index=state.text_content_index_and_output[0],
-                    item_id=FAKE_RESPONSES_ID,
-                    output_index=0,
-                    part=state.text_content_index_and_output[1],
-                    type="response.content_part.done",
-                )
-
-            if state.refusal_content_index_and_output:
-                function_call_starting_index += 1
-                # Send end event for this content part
-                yield ResponseContentPartDoneEvent(
-                    content_index=state.refusal_content_index_and_output[0],
-                    item_id=FAKE_RESPONSES_ID,
-                    output_index=0,
-                    part=state.refusal_content_index_and_output[1],
-                    type="response.content_part.done",
-                )
-
-            # Actually send events for the function calls
-            for function_call in state.function_calls.values():
-                # First, a ResponseOutputItemAdded for the function call
-                yield ResponseOutputItemAddedEvent(
-                    item=ResponseFunctionToolCall(
-                        id=FAKE_RESPONSES_ID,
-                        call_id=function_call.call_id,
-                        arguments=function_call.arguments,
-                        name=function_call.name,
-                        type="function_call",
-                    ),
-                    output_index=function_call_starting_index,
-                    type="response.output_item.added",
-                )
-                # Then, yield the args
-                yield ResponseFunctionCallArgumentsDeltaEvent(
-                    delta=function_call.arguments,
-                    item_id=FAKE_RESPONSES_ID,
-                    output_index=function_call_starting_index,
-                    type="response.function_call_arguments.delta",
-                )
-                # Finally, the ResponseOutputItemDone
-                yield ResponseOutputItemDoneEvent(
-                    item=ResponseFunctionToolCall(
-                        id=FAKE_RESPONSES_ID,
-                        call_id=function_call.call_id,
-                        arguments=function_call.arguments,
-                        name=function_call.name,
-                        type="function_call",
-                    ),
-                    output_index=function_call_starting_index,
-                    type="response.output_item.done",
-                )
-
-            # Finally, send the Response completed event
-            outputs: list[ResponseOutputItem] = []
-            if state.text_content_index_and_output or state.refusal_content_index_and_output:
+                        # Accumulate the refusal; it's joined into the output part at the end
+                        state.refusal_parts.append(delta.refusal)
+
+                    # Handle tool calls
+                    # A tool call is announced once its name is complete, and from then on each
+                    # arguments delta is forwarded as it arrives.
+                    if delta.tool_calls:
+                        for tc_delta in delta.tool_calls:
+                            streaming_call = state.function_calls.get(tc_delta.index)
+                            if streaming_call is None:
+                                streaming_call = _StreamingFunctionCall()
+                                state.function_calls[tc_delta.index] = streaming_call
+                            # A delta for another tool call means the names of the calls before it
+                            # are complete
+                            for event in self._start_named_function_calls_events(
+                                state, exclude=streaming_call
+                            ):
+                                yield event
+
+                            tc_function = tc_delta.function
+                            arguments_delta = tc_function.arguments if tc_function else None
+                            name_delta = tc_function.name if tc_function else None
+
+                            if arguments_delta:
+                                streaming_call.arguments_parts.append(arguments_delta)
+                            if name_delta:
+                                streaming_call.name_parts.append(name_delta)
+                            if tc_delta.id:
+                                streaming_call.call_id_parts.append(tc_delta.id)
+
+                            if streaming_call.output_index is None:
+                                # The name can be split over several chunks, so it's only complete
+                                # once a chunk for the call arrives without a piece of it. The
+                                # announcement flushes the arguments buffered so far.
+                                if streaming_call.name_parts and not name_delta:
+                                    for event in self._start_function_call_events(
+                                        state, streaming_call
+                                    ):
+                                        yield event
+                            elif arguments_delta:
+                                yield ResponseFunctionCallArgumentsDeltaEvent(
+                                    delta=arguments_delta,
+                                    item_id=FAKE_RESPONSES_ID,
+                                    output_index=streaming_call.output_index,
+                                    type="response.function_call_arguments.delta",
+                                )
+            finally:
+                # Release the connection if the stream is closed before it's done, e.g. because a
+                # streaming output guardrail was triggered
+                if isinstance(stream, AsyncStream):
+                    await stream.close()
+
+            # Tool calls whose name was still streaming when the stream ended haven't been
+            # announced yet
+            for streaming_call in state.function_calls.values():
+                if streaming_call.output_index is None:
+                    for event in self._start_function_call_events(state, streaming_call):
+                        yield event
+
+            # The output items, keyed by their output index
+            outputs: dict[int, ResponseOutputItem] = {}
+            if state.message_output_index is not None:
+                message_index = state.message_output_index
                 assistant_msg = ResponseOutputMessage(
                     id=FAKE_RESPONSES_ID,
                     content=[],
@@ -389,23 +413,49 @@ class OpenAIChatCompletionsModel(Model):
                     type="message",
                     status="completed",
                 )
+
                 if state.text_content_index_and_output:
+                    state.text_content_index_and_output[1].text = "".join(state.text_parts)
                     assistant_msg.content.append(state.text_content_index_and_output[1])
+                    # Send end event for this content part
+                    yield ResponseContentPartDoneEvent(
+                        content_index=state.text_content_index_and_output[0],
+                        item_id=FAKE_RESPONSES_ID,
+                        output_index=message_index,
+                        part=state.text_content_index_and_output[1],
+                        type="response.content_part.done",
+                    )
+
                 if state.refusal_content_index_and_output:
+                    state.refusal_content_index_and_output[1].refusal = "".join(state.refusal_parts)
                     assistant_msg.content.append(state.refusal_content_index_and_output[1])
-                outputs.append(assistant_msg)
+                    # Send end event for this content part
+                    yield ResponseContentPartDoneEvent(
+                        content_index=state.refusal_content_index_and_output[0],
+                        item_id=FAKE_RESPONSES_ID,
+                        output_index=message_index,
+                        part=state.refusal_content_index_and_output[1],
+                        type="response.content_part.done",
+                    )
 
-                # send a ResponseOutputItemDone for the assistant message
+                outputs[message_index] = assistant_msg
+
+            for streaming_call in state.function_calls.values():
+                assert streaming_call.output_index is not None
+                outputs[streaming_call.output_index] = streaming_call.to_output_item()
+
+            # Send a ResponseOutputItemDone for each item, in output order
+            output_items: list[ResponseOutputItem] = []
+            for output_index in sorted(outputs):
+                output_items.append(outputs[output_index])
                 yield ResponseOutputItemDoneEvent(
-                    item=assistant_msg,
-                    output_index=0,
+                    item=outputs[output_index],
+                    output_index=output_index,
                     type="response.output_item.done",
                 )
 
-            for function_call in state.function_calls.values():
-                outputs.append(function_call)
-
-            final_response = response.model_copy(update={"output": outputs, "usage": usage})
+            # Finally, send the Response completed event
+            final_response = response.model_copy(update={"output": output_items, "usage": usage})
 
             yield ResponseCompletedEvent(
                 response=final_response,
@@ -420,6 +470,56 @@ class OpenAIChatCompletionsModel(Model):
                     "output_tokens": usage.completion_tokens,
                 }
 
+    def _message_output_index(self, state: _StreamingState) -> int:
+        """Returns the output index of the assistant message, assigning the next one if the message
+        hasn't started yet."""
+        if state.message_output_index is None:
+            state.message_output_index = state.next_output_index
+            state.next_output_index += 1
+        return state.message_output_index
+
+    def _start_named_function_calls_events(
+        self, state: _StreamingState, exclude: _StreamingFunctionCall | None = None
+    ) -> list[TResponseStreamEvent]:
+        """Returns the events that announce the tool calls that have a name but haven't been
+        announced yet, other than `exclude`."""
+        events: list[TResponseStreamEvent] = []
+        for streaming_call in state.function_calls.values():
+            if (
+                streaming_call is not exclude
+                and streaming_call.output_index is None
+                and streaming_call.name_parts
+            ):
+                events.extend(self._start_function_call_events(state, streaming_call))
+        return events
+
+    def _start_function_call_events(
+        self, state: _StreamingState, streaming_call: _StreamingFunctionCall
+    ) -> list[TResponseStreamEvent]:
+        """Assigns the tool call the next output index, and returns the events that announce it: a
+        `response.output_item.added`, followed by a delta with any arguments received so far.
+        """
+        streaming_call.output_index = state.next_output_index
+        state.next_output_index += 1
+
+        events: list[TResponseStreamEvent] = [
+            ResponseOutputItemAddedEvent(
+                item=streaming_call.to_output_item(arguments=""),
+                output_index=streaming_call.output_index,
+                type="response.output_item.added",
+            )
+        ]
+        if streaming_call.arguments_parts:
+            events.append(
+                ResponseFunctionCallArgumentsDeltaEvent(
+                    delta="".join(streaming_call.arguments_parts),
+                    item_id=FAKE_RESPONSES_ID,
+                    output_index=streaming_call.output_index,
+                    type="response.function_call_arguments.delta",
+                )
+            )
+        return events
+
     @overload
     async def _fetch_response(
         self,
@@ -460,7 +560,7 @@ class OpenAIChatCompletionsModel(Model):
         tracing: ModelTracing,
         stream: bool = False,
     ) -> ChatCompletion | tuple[Response, AsyncStream[ChatCompletionChunk]]:
-        converted_messages = _Converter.items_to_messages(input)
+        converted_messages = self._messages_cache.items_to_messages(input)
 
         if system_instructions:
             converted_messages.insert(
@@ -486,10 +586,11 @@ class OpenAIChatCompletionsModel(Model):
 
         if _debug.DONT_LOG_MODEL_DATA:
             logger.debug("Calling LLM")
-        else:
+        elif logger.isEnabledFor(logging.DEBUG):
+            codec = get_json_codec()
             logger.debug(
-                f"{json.dumps(converted_messages, indent=2)}\n"
-                f"Tools:\n{json.dumps(converted_tools, indent=2)}\n"
+                f"{codec.dumps_pretty(converted_messages)}\n"
+                f"Tools:\n{codec.dumps_pretty(converted_tools)}\n"
                 f"Stream: {stream}\n"
                 f"Tool choice: {tool_choice}\n"
                 f"Response format: {response_format}\n"
@@ -763,6 +864,22 @@ class _Converter:
             ]
 
         result: list[ChatCompletionMessageParam] = []
+        cls._convert_items(items, result)
+        return result
+
+    @classmethod
+    def _convert_items(
+        cls,
+        items: Iterable[TResponseInputItem],
+        result: list[ChatCompletionMessageParam],
+        boundaries: list[tuple[int, int]] | None = None,
+        offset: int = 0,
+    ) -> None:
+        """Converts `items`, appending the messages to `result`. If `boundaries` is provided, we
+        record an `(item_count, message_count)` pair after every item that leaves no assistant
+        message pending, i.e. every point from which conversion can be resumed. `offset` is the
+        number of items that were converted into `result` before this call.
+        """
         current_assistant_msg: ChatCompletionAssistantMessageParam | None = None
 
         def flush_assistant_message() -> None:
@@ -781,7 +898,7 @@ class _Converter:
                 current_assistant_msg["tool_calls"] = []
             return current_assistant_msg
 
-        for item in items:
+        for index, item in enumerate(items, start=offset + 1):
             # 1) Check easy input message
             if easy_msg := cls.maybe_easy_input_message(item):
                 role = easy_msg["role"]
@@ -918,8 +1035,120 @@ class _Converter:
             else:
                 raise UserError(f"Unhandled item type or structure: {item}")
 
+            if boundaries is not None and current_assistant_msg is None:
+                boundaries.append((index, len(result)))
+
         flush_assistant_message()
-        return result
+
+
+@dataclass
+class _CachedConversion:
+    items: list[TResponseInputItem]
+    """The input items that were converted."""
+
+    messages: list[ChatCompletionMessageParam]
+    """The messages produced from `items`."""
+
+    boundaries: list[tuple[int, int]]
+    """`(item_count, message_count)` pairs from which conversion can be resumed."""
+
+
+class _ItemsToMessagesCache:
+    """Memoizes `_Converter.items_to_messages` across the turns of a conversation. Each model
+    instance has its own cache, so conversations are only kept for as long as the model is.
+    `OpenAIProvider` reuses its models, so the cache lasts across the turns of a run, and across
+    the runs that share the provider.
+
+    Each turn of an agent run sends the whole conversation so far, so most of the input is a prefix
+    that was already converted on the previous turn. We keep the most recent conversions, find the
+    one that shares the longest prefix with the new input, reuse its messages and only convert the
+    remaining items.
+
+    Items are matched by identity first, and by value otherwise, because the runner passes fresh
+    copies of the same history on every turn. The comparison stops at the first item that differs,
+    so conversations that don't share a prefix are cheap to skip. Callers get deep copies of the
+    cached messages, including their `content` and `tool_calls` lists, so they can change them
+    without affecting later calls.
+
+    Each conversation takes up one entry, so `max_entries` bounds the number of concurrent
+    conversations that get hits.
+    """
+
+    def __init__(self, max_entries: int = 16) -> None:
+        self._max_entries = max_entries
+        self._entries: OrderedDict[int, _CachedConversion] = OrderedDict()
+        self._next_key = 0
+        self._lock = threading.Lock()
+
+    def items_to_messages(
+        self, items: str | Iterable[TResponseInputItem]
+    ) -> list[ChatCompletionMessageParam]:
+        if isinstance(items, str):
+            return _Converter.items_to_messages(items)
+
+        item_list = list(items)
+        with self._lock:
+            key, matched, resume_at = self._find_longest_prefix(item_list)
+            entry = self._entries.get(key) if key is not None else None
+
+        if entry is not None:
+            item_count, message_count = resume_at
+            messages = entry.messages[:message_count]
+            boundaries = [b for b in entry.boundaries if b[0] <= item_count]
+        else:
+            item_count = 0
+            messages = []
+            boundaries = []
+
+        _Converter._convert_items(item_list[item_count:], messages, boundaries, offset=item_count)
+
+        with self._lock:
+            # The new input extends the cached one, so the old entry is no longer useful.
+            if key is not None and entry is not None and matched == len(entry.items):
+                self._entries.pop(key, None)
+            self._entries[self._next_key] = _CachedConversion(
+                items=item_list, messages=messages, boundaries=boundaries
+            )
+            self._next_key += 1
+            while len(self._entries) > self._max_entries:
+                self._entries.popitem(last=False)
+
+        return [cast(ChatCompletionMessageParam, _utils.copy_json(message)) for message in messages]
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+    def _find_longest_prefix(
+        self, items: list[TResponseInputItem]
+    ) -> tuple[int | None, int, tuple[int, int]]:
+        """Returns the key of the entry that shares the longest resumable prefix with `items`,
+        the number of matching items, and the `(item_count, message_count)` boundary to resume
+        from.
+        """
+        best_key: int | None = None
+        best_matched = 0
+        best_boundary = (0, 0)
+        for key, entry in reversed(self._entries.items()):
+            if not entry.boundaries or best_boundary[0] >= entry.boundaries[-1][0]:
+                continue
+
+            cached_items = entry.items
+            limit = min(len(items), len(cached_items))
+            matched = 0
+            while matched < limit and (
+                items[matched] is cached_items[matched] or items[matched] == cached_items[matched]
+            ):
+                matched += 1
+
+            boundary = next((b for b in reversed(entry.boundaries) if b[0] <= matched), None)
+            if boundary is not None and boundary[0] > best_boundary[0]:
+                best_key, best_matched, best_boundary = key, matched, boundary
+            if matched == len(cached_items):
+                # The input extends this conversation, which is the usual case on a new turn
+                break
+
+        return best_key, best_matched, best_boundary
 
 
 class ToolConverter:
@@ -54,12 +54,19 @@ class OpenAIProvider(ModelProvider):
         else:
             self._use_responses = _openai_shared.get_use_responses_by_default()
 
+        # Chat Completions models are reused across turns and runs, so that their cache of
+        # converted messages is still there on the next turn.
+        self._chat_completions_models: dict[str, OpenAIChatCompletionsModel] = {}
+
     def get_model(self, model_name: str | None) -> Model:
         if model_name is None:
             model_name = DEFAULT_MODEL
 
-        return (
-            OpenAIResponsesModel(model=model_name, openai_client=self._client)
-            if self._use_responses
-            else OpenAIChatCompletionsModel(model=model_name, openai_client=self._client)
-        )
+        if self._use_responses:
+            return OpenAIResponsesModel(model=model_name, openai_client=self._client)
+
+        model = self._chat_completions_models.get(model_name)
+        if model is None:
+            model = OpenAIChatCompletionsModel(model=model_name, openai_client=self._client)
+            self._chat_completions_models[model_name] = model
+        return model
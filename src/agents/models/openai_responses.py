@@ -1,6 +1,6 @@
 from __future__ import annotations
 
-import json
+import logging
 from collections.abc import AsyncIterator
 from dataclasses import dataclass
 from typing import TYPE_CHECKING, Any, Literal, overload
@@ -22,6 +22,7 @@ from ..agent_output import AgentOutputSchema
 from ..exceptions import UserError
 from ..handoffs import Handoff
 from ..items import ItemHelpers, ModelResponse, TResponseInputItem
+from ..json_codec import get_json_codec
 from ..logger import logger
 from ..tool import ComputerTool, FileSearchTool, FunctionTool, Tool, WebSearchTool
 from ..tracing import SpanError, response_span
@@ -84,11 +85,9 @@ class OpenAIResponsesModel(Model):
 
                 if _debug.DONT_LOG_MODEL_DATA:
                     logger.debug("LLM responsed")
-                else:
-                    logger.debug(
-                        "LLM resp:\n"
-                        f"{json.dumps([x.model_dump() for x in response.output], indent=2)}\n"
-                    )
+                elif logger.isEnabledFor(logging.DEBUG):
+                    output = [x.model_dump() for x in response.output]
+                    logger.debug(f"LLM resp:\n{get_json_codec().dumps_pretty(output)}\n")
 
                 usage = (
                     Usage(
@@ -149,10 +148,16 @@ class OpenAIResponsesModel(Model):
 
                 final_response: Response | None = None
 
-                async for chunk in stream:
-                    if isinstance(chunk, ResponseCompletedEvent):
-                        final_response = chunk.response
-                    yield chunk
+                try:
+                    async for chunk in stream:
+                        if isinstance(chunk, ResponseCompletedEvent):
+                            final_response = chunk.response
+                        yield chunk
+                finally:
+                    # Release the connection if the stream is closed before it's done, e.g.
+                    # because a streaming output guardrail was triggered
+                    if isinstance(stream, AsyncStream):
+                        await stream.close()
 
                 if final_response and tracing.include_data():
                     span_response.span_data.response = final_response
@@ -216,11 +221,12 @@ class OpenAIResponsesModel(Model):
 
         if _debug.DONT_LOG_MODEL_DATA:
             logger.debug("Calling LLM")
-        else:
+        elif logger.isEnabledFor(logging.DEBUG):
+            codec = get_json_codec()
             logger.debug(
                 f"Calling LLM {self.model} with input:\n"
-                f"{json.dumps(list_input, indent=2)}\n"
-                f"Tools:\n{json.dumps(converted_tools.tools, indent=2)}\n"
+                f"{codec.dumps_pretty(list_input)}\n"
+                f"Tools:\n{codec.dumps_pretty(converted_tools.tools)}\n"
                 f"Stream: {stream}\n"
                 f"Tool choice: {tool_choice}\n"
                 f"Response format: {response_format}\n"
@@ -16,6 +16,7 @@ from .guardrail import InputGuardrailResult, OutputGuardrailResult
 from .items import ItemHelpers, ModelResponse, RunItem, TResponseInputItem
 from .logger import logger
 from .stream_events import StreamEvent
+from .stream_queue import StreamEventQueue, StreamQueueStats, TextDeltaCoalescer
 from .tracing import Trace
 
 if TYPE_CHECKING:
@@ -120,9 +121,7 @@ class RunResultStreaming(RunResultBase):
     """Whether the agent has finished running."""
 
     # Queues that the background run_loop writes to
-    _event_queue: asyncio.Queue[StreamEvent | QueueCompleteSentinel] = field(
-        default_factory=asyncio.Queue, repr=False
-    )
+    _event_queue: StreamEventQueue = field(default_factory=StreamEventQueue, repr=False)
     _input_guardrail_queue: asyncio.Queue[InputGuardrailResult] = field(
         default_factory=asyncio.Queue, repr=False
     )
@@ -133,6 +132,11 @@ class RunResultStreaming(RunResultBase):
     _output_guardrails_task: asyncio.Task[Any] | None = field(default=None, repr=False)
     _stored_exception: Exception | None = field(default=None, repr=False)
 
+    # The results of the streaming output guardrails on the latest model response
+    _streaming_output_guardrail_results: list[OutputGuardrailResult] = field(
+        default_factory=list, repr=False
+    )
+
     @property
     def last_agent(self) -> Agent[Any]:
         """The last agent that was run. Updates as the agent run progresses, so the true last agent
@@ -140,47 +144,94 @@ class RunResultStreaming(RunResultBase):
         """
         return self.current_agent
 
-    async def stream_events(self) -> AsyncIterator[StreamEvent]:
+    @property
+    def queue_stats(self) -> StreamQueueStats:
+        """Statistics about the queue of events waiting to be read from `stream_events()`, such as
+        its high-water mark. See `RunConfig.stream_queue_max_size`.
+        """
+        return self._event_queue.stats
+
+    async def stream_events(
+        self,
+        *,
+        coalesce_window: float | None = None,
+        coalesce_max_chars: int | None = None,
+    ) -> AsyncIterator[StreamEvent]:
         """Stream deltas for new items as they are generated. We're using the types from the
         OpenAI Responses API, so these are semantic events: each event has a `type` field that
         describes the type of the event, along with the data for that event.
 
+        Consecutive `response.output_text.delta` events can be coalesced into one event, which
+        helps if each event is forwarded as a separate write (e.g. a websocket frame). Coalescing
+        is enabled if either argument is set, and never changes the order of events.
+
         This will raise:
         - A MaxTurnsExceeded exception if the agent exceeds the max_turns limit.
         - A GuardrailTripwireTriggered exception if a guardrail is tripped.
-        """
-        while True:
-            self._check_errors()
-            if self._stored_exception:
-                logger.debug("Breaking due to stored exception")
-                self.is_complete = True
-                break
-
-            if self.is_complete and self._event_queue.empty():
-                break
-
-            try:
-                item = await self._event_queue.get()
-            except asyncio.CancelledError:
-                break
 
-            if isinstance(item, QueueCompleteSentinel):
-                self._event_queue.task_done()
-                # Check for errors, in case the queue was completed due to an exception
+        Args:
+            coalesce_window: How long to wait for more text deltas after the first one, in
+                seconds, e.g. 0.02. If not set but `coalesce_max_chars` is, only deltas that are
+                already waiting are coalesced.
+            coalesce_max_chars: Stop coalescing once the text of a delta reaches this many
+                characters.
+        """
+        coalescer = (
+            TextDeltaCoalescer(self._event_queue, coalesce_window, coalesce_max_chars)
+            if coalesce_window is not None or coalesce_max_chars is not None
+            else None
+        )
+        try:
+            while True:
                 self._check_errors()
-                break
+                if self._stored_exception:
+                    logger.debug("Breaking due to stored exception")
+                    self.is_complete = True
+                    break
+
+                if (
+                    self.is_complete
+                    and self._event_queue.empty()
+                    and not (coalescer and coalescer.has_buffered_events)
+                ):
+                    break
+
+                try:
+                    item = await (coalescer.get() if coalescer else self._event_queue.get())
+                except asyncio.CancelledError:
+                    break
+
+                if isinstance(item, QueueCompleteSentinel):
+                    self._event_queue.task_done()
+                    # Check for errors, in case the queue was completed due to an exception
+                    self._check_errors()
+                    break
+
+                yield item
+                self._event_queue.task_done()
+        finally:
+            # Don't leave a pending get() behind if the consumer stops early
+            if coalescer:
+                coalescer.close()
+            # Nothing reads from the queue anymore, so a bounded queue must not block the run
+            self._event_queue.release()
 
-            yield item
-            self._event_queue.task_done()
+        self._finish_stream()
 
+        if self._stored_exception:
+            raise self._stored_exception
+
+    def _finish_stream(self):
         if self._trace:
-            self._trace.finish(reset_current=True)
+            try:
+                self._trace.finish(reset_current=True)
+            except ValueError:
+                # The trace was made current in another context, e.g. when a `StreamMultiplexer`
+                # consumes runs started by other tasks. It's finished, it just can't be reset here.
+                logger.debug("Could not reset the current trace from this context")
 
         self._cleanup_tasks()
 
-        if self._stored_exception:
-            raise self._stored_exception
-
     def _check_errors(self):
         if self.current_turn > self.max_turns:
             self._stored_exception = MaxTurnsExceeded(f"Max turns ({self.max_turns}) exceeded")
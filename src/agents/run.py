@@ -2,48 +2,73 @@ from __future__ import annotations
 
 import asyncio
 import copy
+import functools
+import uuid
+from collections.abc import Awaitable, Callable
 from dataclasses import dataclass, field
 from typing import Any, cast
 
-from openai.types.responses import ResponseCompletedEvent
+from openai.types.responses import (
+    ResponseCompletedEvent,
+    ResponseFunctionToolCall,
+    ResponseOutputItemDoneEvent,
+)
 
 from . import Model, _utils
 from ._run_impl import (
     NextStepFinalOutput,
     NextStepHandoff,
     NextStepRunAgain,
+    PartialOutputTracker,
     QueueCompleteSentinel,
     RunImpl,
     SingleStepResult,
+    StreamingOutputGuardrailChecker,
     TraceCtxManager,
     get_model_tracing_impl,
 )
 from .agent import Agent
 from .agent_output import AgentOutputSchema
+from .checkpoint import CheckpointStore, RunCheckpoint, find_agents
+from .compaction import CompactionFilter, InputCompactor
 from .exceptions import (
     AgentsException,
     InputGuardrailTripwireTriggered,
     MaxTurnsExceeded,
     ModelBehaviorError,
     OutputGuardrailTripwireTriggered,
+    UserError,
+)
+from .guardrail import (
+    InputGuardrail,
+    InputGuardrailResult,
+    InputGuardrailStrategy,
+    OutputGuardrail,
+    OutputGuardrailResult,
+    StreamedTextWindow,
+    StreamingOutputGuardrail,
 )
-from .guardrail import InputGuardrail, InputGuardrailResult, OutputGuardrail, OutputGuardrailResult
 from .handoffs import Handoff, HandoffInputFilter, handoff
 from .items import ItemHelpers, ModelResponse, RunItem, TResponseInputItem
 from .lifecycle import RunHooks
 from .logger import logger
+from .memory import Session
 from .model_settings import ModelSettings
 from .models.interface import ModelProvider
 from .models.openai_provider import OpenAIProvider
 from .result import RunResult, RunResultStreaming
 from .run_context import RunContextWrapper, TContext
 from .stream_events import AgentUpdatedStreamEvent, RawResponsesStreamEvent
-from .tracing import Span, SpanError, agent_span, get_current_trace, trace
+from .stream_queue import StreamEventQueue, StreamQueueOverflowPolicy
+from .token_estimator import TokenEstimator
+from .tracing import Span, SpanError, agent_span, custom_span, get_current_trace, trace
 from .tracing.span_data import AgentSpanData
 from .usage import Usage
 
 DEFAULT_MAX_TURNS = 10
 
+_TOOL_OUTPUT_TYPES = ("function_call_output", "computer_call_output")
+
 
 @dataclass
 class RunConfig:
@@ -74,6 +99,25 @@ class RunConfig:
     output_guardrails: list[OutputGuardrail[Any]] | None = None
     """A list of output guardrails to run on the final output of the run."""
 
+    input_guardrail_strategy: InputGuardrailStrategy = "parallel"
+    """Only applies to `Runner.run()` and `Runner.run_streamed()`. When the first model call starts,
+    relative to the input guardrails:
+    - `parallel` (the default): right away, alongside the guardrails. This is the fastest, but if a
+      guardrail trips, the model call was partly or fully paid for.
+    - `sequential`: once all the guardrails have passed. A tripped guardrail never costs a model
+      call, but every run waits for the slowest guardrail.
+    - `race_with_budget`: once all the guardrails have passed, or after
+      `input_guardrail_budget` seconds, whichever comes first. The guardrails keep running
+      alongside the model call after that.
+
+    Each guardrail's `stats` records how long it takes, to help choose a strategy and budget.
+    """
+
+    input_guardrail_budget: float = 0.2
+    """Only applies if `input_guardrail_strategy` is `race_with_budget`. How long to wait for the
+    input guardrails before starting the first model call, in seconds.
+    """
+
     tracing_disabled: bool = False
     """Whether tracing is disabled for the agent run. If disabled, we will not trace the agent run.
     """
@@ -103,6 +147,85 @@ class RunConfig:
     An optional dictionary of additional metadata to include with the trace.
     """
 
+    run_tools_while_streaming: bool = False
+    """Only applies to `Runner.run_streamed()`. If True, function tool calls start running as soon
+    as the model finishes streaming them, instead of after the entire response has been streamed.
+    This reduces latency when the model makes several tool calls in one response. Tool outputs are
+    still added to the run in the order the model called the tools.
+    """
+
+    stream_partial_output: bool = False
+    """Only applies to `Runner.run_streamed()`. If True, agents with a structured `output_type`
+    send `PartialOutputStreamEvent`s as their output streams in, each containing the output parsed
+    and validated so far.
+    """
+
+    stream_queue_max_size: int = 0
+    """Only applies to `Runner.run_streamed()`. The number of events that can wait to be read from
+    `stream_events()` before `stream_queue_overflow_policy` applies. If 0 (the default), the queue
+    is unbounded, so a slow consumer can make it grow without limit.
+    """
+
+    stream_queue_overflow_policy: StreamQueueOverflowPolicy = "block"
+    """Only applies to `Runner.run_streamed()`. What to do with new events when the queue set up by
+    `stream_queue_max_size` is full: wait for the consumer (`block`), merge text deltas
+    (`coalesce_text_deltas`), or drop raw response events while still delivering run item events
+    (`drop_raw_events`).
+    """
+
+    session: Session | None = None
+    """A session to carry the conversation across runs. If set, the run's input is preceded by the
+    items already in the session, and the input and the items generated by each turn are appended
+    to the session as the run progresses.
+    """
+
+    session_history_limit: int | None = None
+    """Only applies if `session` is set. If set, only the most recent `session_history_limit` items
+    of the session are loaded at the start of the run, rather than the whole history.
+    """
+
+    input_compaction_filter: CompactionFilter | None = None
+    """A filter that compacts the input before a model call, once the input is estimated to be
+    above `compaction_threshold_tokens`. The compacted input is reused by later turns of the run,
+    and only affects what's sent to the model: the run's result still contains all the items. See
+    `agents.extensions.compaction_filters` for common filters.
+    """
+
+    compaction_threshold_tokens: int = 100_000
+    """Only applies if `input_compaction_filter` is set. The number of input tokens above which the
+    input is compacted, as estimated by the run's token estimator.
+    """
+
+    token_estimator: TokenEstimator | None = None
+    """Estimates token counts for the run, e.g. for compaction. Available to tools and hooks as
+    `RunContextWrapper.token_estimator`. Defaults to `get_default_token_estimator()`, a fast
+    heuristic.
+    """
+
+    checkpoint_store: CheckpointStore | None = None
+    """If set, a checkpoint of the run is saved to this store after every turn that doesn't end the
+    run, and deleted once the run completes. An interrupted run can then be continued with
+    `Runner.resume()`.
+    """
+
+    run_id: str | None = None
+    """Only applies if `checkpoint_store` is set. The ID that the run's checkpoint is stored under.
+    If not provided, a random ID is generated, so set it if you want to resume the run later.
+    """
+
+
+@dataclass
+class _ModelCallProgress:
+    """How far the model call of a turn got, so that a turn cancelled by an input guardrail
+    tripwire can be recorded accurately.
+    """
+
+    sent: bool = False
+    """Whether the request was handed to the model, so its input tokens may already be billed."""
+
+    finished: bool = False
+    """Whether the response came back, so the request is already counted in the usage."""
+
 
 class Runner:
     @classmethod
@@ -144,6 +267,72 @@ class Runner:
             A run result containing all the inputs, guardrail results and the output of the last
             agent. Agents may perform handoffs, so we don't know the specific type of the output.
         """
+        return await cls._run(
+            starting_agent,
+            input,
+            context=context,
+            max_turns=max_turns,
+            hooks=hooks,
+            run_config=run_config,
+        )
+
+    @classmethod
+    async def resume(
+        cls,
+        starting_agent: Agent[TContext],
+        checkpoint: RunCheckpoint,
+        *,
+        agents: list[Agent[Any]] | None = None,
+        context: TContext | None = None,
+        max_turns: int = DEFAULT_MAX_TURNS,
+        hooks: RunHooks[TContext] | None = None,
+        run_config: RunConfig | None = None,
+    ) -> RunResult:
+        """Continue a run from a checkpoint, saved by a run with `RunConfig.checkpoint_store`.
+        The run continues with the agent that would have run the next turn, with the input, items
+        and usage of the checkpoint. Input guardrails aren't run again.
+
+        Args:
+            starting_agent: The starting agent of the original run. The agents of the checkpoint
+                are looked up by name among the agents reachable from it through handoffs.
+            checkpoint: The checkpoint to continue from, e.g. from `CheckpointStore.load()`.
+            agents: Additional agents to look up by name, for agents that are only reachable
+                through `Handoff` objects.
+            context: The context to run the agent with.
+            max_turns: The maximum number of turns of the run, including the turns before the
+                checkpoint.
+            hooks: An object that receives callbacks on various lifecycle events.
+            run_config: Global settings for the entire agent run. The checkpoint's run ID is used
+                for further checkpoints.
+
+        Returns:
+            A run result, like `Runner.run()`. `raw_responses` only contains the model responses
+            since the checkpoint.
+        """
+        return await cls._run(
+            starting_agent,
+            checkpoint.original_input,
+            context=context,
+            max_turns=max_turns,
+            hooks=hooks,
+            run_config=run_config,
+            checkpoint=checkpoint,
+            agents=find_agents(starting_agent, agents),
+        )
+
+    @classmethod
+    async def _run(
+        cls,
+        starting_agent: Agent[TContext],
+        input: str | list[TResponseInputItem],
+        *,
+        context: TContext | None,
+        max_turns: int,
+        hooks: RunHooks[TContext] | None,
+        run_config: RunConfig | None,
+        checkpoint: RunCheckpoint | None = None,
+        agents: dict[str, Agent[Any]] | None = None,
+    ) -> RunResult:
         if hooks is None:
             hooks = RunHooks[Any]()
         if run_config is None:
@@ -158,12 +347,15 @@ class Runner:
         ):
             current_turn = 0
             original_input: str | list[TResponseInputItem] = copy.deepcopy(input)
+            # The items that still have to be appended to the session, if there is one
+            unsaved_session_items: list[TResponseInputItem] = []
             generated_items: list[RunItem] = []
             model_responses: list[ModelResponse] = []
 
-            context_wrapper: RunContextWrapper[TContext] = RunContextWrapper(
-                context=context,  # type: ignore
+            context_wrapper: RunContextWrapper[TContext] = cls._get_context_wrapper(
+                context, run_config
             )
+            input_compactor = cls._get_input_compactor(run_config, context_wrapper)
 
             input_guardrail_results: list[InputGuardrailResult] = []
 
@@ -171,6 +363,22 @@ class Runner:
             current_agent = starting_agent
             should_run_agent_start_hooks = True
 
+            run_id = cls._get_run_id(run_config, checkpoint)
+            if checkpoint is not None:
+                assert agents is not None
+                generated_items = checkpoint.restore_items(agents)
+                if checkpoint.agent_name not in agents:
+                    raise UserError(
+                        f"Agent {checkpoint.agent_name!r} from the checkpoint can't be found. Pass "
+                        "it to `Runner.resume()` in `agents`."
+                    )
+                current_agent = agents[checkpoint.agent_name]
+                current_turn = checkpoint.current_turn
+                context_wrapper.usage.add(checkpoint.usage)
+            elif run_config.session:
+                unsaved_session_items = ItemHelpers.input_to_new_input_list(input)
+                original_input = await cls._load_session_history(run_config) + unsaved_session_items
+
             try:
                 while True:
                     # Start an agent span if we don't have one. This span is ended if the current
@@ -207,7 +415,7 @@ class Runner:
                     )
 
                     if current_turn == 1:
-                        input_guardrail_results, turn_result = await asyncio.gather(
+                        input_guardrail_results, turn_result = await cls._run_first_turn(
                             cls._run_input_guardrails(
                                 starting_agent,
                                 starting_agent.input_guardrails
@@ -215,7 +423,8 @@ class Runner:
                                 copy.deepcopy(input),
                                 context_wrapper,
                             ),
-                            cls._run_single_turn(
+                            functools.partial(
+                                cls._run_single_turn,
                                 agent=current_agent,
                                 original_input=original_input,
                                 generated_items=generated_items,
@@ -223,7 +432,12 @@ class Runner:
                                 context_wrapper=context_wrapper,
                                 run_config=run_config,
                                 should_run_agent_start_hooks=should_run_agent_start_hooks,
+                                input_compactor=input_compactor,
                             ),
+                            agent=current_agent,
+                            original_input=original_input,
+                            context_wrapper=context_wrapper,
+                            run_config=run_config,
                         )
                     else:
                         turn_result = await cls._run_single_turn(
@@ -234,6 +448,7 @@ class Runner:
                             context_wrapper=context_wrapper,
                             run_config=run_config,
                             should_run_agent_start_hooks=should_run_agent_start_hooks,
+                            input_compactor=input_compactor,
                         )
                     should_run_agent_start_hooks = False
 
@@ -241,13 +456,24 @@ class Runner:
                     original_input = turn_result.original_input
                     generated_items = turn_result.generated_items
 
+                    if run_config.session:
+                        await cls._save_to_session(
+                            run_config.session, unsaved_session_items, turn_result
+                        )
+                        unsaved_session_items = []
+
                     if isinstance(turn_result.next_step, NextStepFinalOutput):
                         output_guardrail_results = await cls._run_output_guardrails(
                             current_agent.output_guardrails + (run_config.output_guardrails or []),
                             current_agent,
                             turn_result.next_step.output,
                             context_wrapper,
+                            output_text=ItemHelpers.text_message_outputs(
+                                turn_result.new_step_items
+                            ),
                         )
+                        if run_config.checkpoint_store and run_id:
+                            await run_config.checkpoint_store.delete(run_id)
                         return RunResult(
                             input=original_input,
                             new_items=generated_items,
@@ -268,6 +494,16 @@ class Runner:
                         raise AgentsException(
                             f"Unknown next step type: {type(turn_result.next_step)}"
                         )
+
+                    if run_config.checkpoint_store and run_id:
+                        await cls._save_checkpoint(
+                            run_config.checkpoint_store,
+                            run_id,
+                            current_agent,
+                            turn_result,
+                            context_wrapper,
+                            current_turn,
+                        )
             finally:
                 if current_span:
                     current_span.finish(reset_current=True)
@@ -390,9 +626,7 @@ class Runner:
             new_trace.start(mark_as_current=True)
 
         output_schema = cls._get_output_schema(starting_agent)
-        context_wrapper: RunContextWrapper[TContext] = RunContextWrapper(
-            context=context  # type: ignore
-        )
+        context_wrapper: RunContextWrapper[TContext] = cls._get_context_wrapper(context, run_config)
 
         streamed_result = RunResultStreaming(
             input=copy.deepcopy(input),
@@ -407,6 +641,10 @@ class Runner:
             output_guardrail_results=[],
             _current_agent_output_schema=output_schema,
             _trace=new_trace,
+            _event_queue=StreamEventQueue(
+                max_size=run_config.stream_queue_max_size,
+                overflow_policy=run_config.stream_queue_overflow_policy,
+            ),
         )
 
         # Kick off the actual agent loop in the background and return the streamed result object.
@@ -458,6 +696,8 @@ class Runner:
                         ),
                     )
                 queue.put_nowait(result)
+                # Wake up a consumer waiting for events, so that a tripwire is seen right away
+                streamed_result._event_queue.notify_put_listener()
                 guardrail_results.append(result)
         except Exception:
             for t in guardrail_tasks:
@@ -481,8 +721,11 @@ class Runner:
         current_agent = starting_agent
         current_turn = 0
         should_run_agent_start_hooks = True
+        unsaved_session_items: list[TResponseInputItem] = []
+        input_compactor = cls._get_input_compactor(run_config, context_wrapper)
+        run_id = cls._get_run_id(run_config, None)
 
-        streamed_result._event_queue.put_nowait(AgentUpdatedStreamEvent(new_agent=current_agent))
+        await streamed_result._event_queue.put(AgentUpdatedStreamEvent(new_agent=current_agent))
 
         try:
             while True:
@@ -533,7 +776,26 @@ class Runner:
                             current_span,
                         )
                     )
+                    if run_config.input_guardrail_strategy != "parallel":
+                        await cls._wait_for_input_guardrails(
+                            streamed_result._input_guardrails_task, run_config
+                        )
+                        if cls._input_guardrails_blocked(
+                            streamed_result, current_agent, context_wrapper
+                        ):
+                            # The stream raises the guardrail's error
+                            streamed_result.is_complete = True
+                            streamed_result._event_queue.put_nowait(QueueCompleteSentinel())
+                            break
                 try:
+                    if current_turn == 1 and run_config.session:
+                        unsaved_session_items = ItemHelpers.input_to_new_input_list(
+                            streamed_result.input
+                        )
+                        streamed_result.input = (
+                            await cls._load_session_history(run_config) + unsaved_session_items
+                        )
+
                     turn_result = await cls._run_single_turn_streamed(
                         streamed_result,
                         current_agent,
@@ -541,6 +803,7 @@ class Runner:
                         context_wrapper,
                         run_config,
                         should_run_agent_start_hooks,
+                        input_compactor,
                     )
                     should_run_agent_start_hooks = False
 
@@ -550,12 +813,18 @@ class Runner:
                     streamed_result.input = turn_result.original_input
                     streamed_result.new_items = turn_result.generated_items
 
+                    if run_config.session:
+                        await cls._save_to_session(
+                            run_config.session, unsaved_session_items, turn_result
+                        )
+                        unsaved_session_items = []
+
                     if isinstance(turn_result.next_step, NextStepHandoff):
                         current_agent = turn_result.next_step.new_agent
                         current_span.finish(reset_current=True)
                         current_span = None
                         should_run_agent_start_hooks = True
-                        streamed_result._event_queue.put_nowait(
+                        await streamed_result._event_queue.put(
                             AgentUpdatedStreamEvent(new_agent=current_agent)
                         )
                     elif isinstance(turn_result.next_step, NextStepFinalOutput):
@@ -575,12 +844,32 @@ class Runner:
                             # Exceptions will be checked in the stream_events loop
                             output_guardrail_results = []
 
-                        streamed_result.output_guardrail_results = output_guardrail_results
+                        if run_config.checkpoint_store and run_id:
+                            await run_config.checkpoint_store.delete(run_id)
+                        # The streaming output guardrails checked the final output as it streamed
+                        streamed_result.output_guardrail_results = (
+                            streamed_result._streaming_output_guardrail_results
+                            + output_guardrail_results
+                        )
                         streamed_result.final_output = turn_result.next_step.output
                         streamed_result.is_complete = True
                         streamed_result._event_queue.put_nowait(QueueCompleteSentinel())
                     elif isinstance(turn_result.next_step, NextStepRunAgain):
                         pass
+
+                    if (
+                        run_config.checkpoint_store
+                        and run_id
+                        and not isinstance(turn_result.next_step, NextStepFinalOutput)
+                    ):
+                        await cls._save_checkpoint(
+                            run_config.checkpoint_store,
+                            run_id,
+                            current_agent,
+                            turn_result,
+                            context_wrapper,
+                            current_turn,
+                        )
                 except Exception as e:
                     if current_span:
                         _utils.attach_error_to_span(
@@ -608,6 +897,7 @@ class Runner:
         context_wrapper: RunContextWrapper[TContext],
         run_config: RunConfig,
         should_run_agent_start_hooks: bool,
+        input_compactor: InputCompactor | None = None,
     ) -> SingleStepResult:
         if should_run_agent_start_hooks:
             await asyncio.gather(
@@ -632,11 +922,37 @@ class Runner:
         model_settings = agent.model_settings.resolve(run_config.model_settings)
         final_response: ModelResponse | None = None
 
-        input = ItemHelpers.input_to_new_input_list(streamed_result.input)
-        input.extend([item.to_input_item() for item in streamed_result.new_items])
+        if input_compactor:
+            input = await input_compactor.get_input(
+                streamed_result.input, streamed_result.new_items
+            )
+        else:
+            input = ItemHelpers.input_to_new_input_list(streamed_result.input)
+            input.extend([item.to_input_item() for item in streamed_result.new_items])
+
+        # Function tool calls that were started while the response was still streaming, by call ID
+        started_tool_calls: dict[str, asyncio.Task[Any]] = {}
+
+        streaming_guardrails = [
+            guardrail
+            for guardrail in agent.output_guardrails + (run_config.output_guardrails or [])
+            if isinstance(guardrail, StreamingOutputGuardrail)
+        ]
+        guardrail_checker = (
+            StreamingOutputGuardrailChecker(streaming_guardrails, agent, context_wrapper)
+            if streaming_guardrails
+            else None
+        )
+
+        partial_output_tracker = (
+            PartialOutputTracker(agent, output_schema)
+            if run_config.stream_partial_output
+            and output_schema
+            and not output_schema.is_plain_text()
+            else None
+        )
 
-        # 1. Stream the output events
-        async for event in model.stream_response(
+        stream = model.stream_response(
             system_prompt,
             input,
             model_settings,
@@ -646,44 +962,89 @@ class Runner:
             get_model_tracing_impl(
                 run_config.tracing_disabled, run_config.trace_include_sensitive_data
             ),
-        ):
-            if isinstance(event, ResponseCompletedEvent):
-                usage = (
-                    Usage(
-                        requests=1,
-                        input_tokens=event.response.usage.input_tokens,
-                        output_tokens=event.response.usage.output_tokens,
-                        total_tokens=event.response.usage.total_tokens,
-                    )
-                    if event.response.usage
-                    else Usage()
-                )
-                final_response = ModelResponse(
-                    output=event.response.output,
-                    usage=usage,
-                    referenceable_id=event.response.id,
-                )
-
-            streamed_result._event_queue.put_nowait(RawResponsesStreamEvent(data=event))
-
-        # 2. At this point, the streaming is complete for this turn of the agent loop.
-        if not final_response:
-            raise ModelBehaviorError("Model did not produce a final response!")
-
-        # 3. Now, we can process the turn as we do in the non-streaming case
-        single_step_result = await cls._get_single_step_result_from_response(
-            agent=agent,
-            original_input=streamed_result.input,
-            pre_step_items=streamed_result.new_items,
-            new_response=final_response,
-            output_schema=output_schema,
-            handoffs=handoffs,
-            hooks=hooks,
-            context_wrapper=context_wrapper,
-            run_config=run_config,
         )
+        try:
+            # 1. Stream the output events
+            async for event in stream:
+                if guardrail_checker:
+                    # Raises if a guardrail tripped, before the event reaches the consumer
+                    guardrail_checker.on_event(event)
+
+                if isinstance(event, ResponseCompletedEvent):
+                    usage = (
+                        Usage(
+                            requests=1,
+                            input_tokens=event.response.usage.input_tokens,
+                            output_tokens=event.response.usage.output_tokens,
+                            total_tokens=event.response.usage.total_tokens,
+                        )
+                        if event.response.usage
+                        else Usage()
+                    )
+                    final_response = ModelResponse(
+                        output=event.response.output,
+                        usage=usage,
+                        referenceable_id=event.response.id,
+                    )
+                elif (
+                    run_config.run_tools_while_streaming
+                    and isinstance(event, ResponseOutputItemDoneEvent)
+                    and isinstance(event.item, ResponseFunctionToolCall)
+                    and event.item.call_id not in started_tool_calls
+                ):
+                    task = RunImpl.maybe_start_function_tool_call(
+                        agent=agent,
+                        tool_call=event.item,
+                        handoffs=handoffs,
+                        hooks=hooks,
+                        context_wrapper=context_wrapper,
+                        config=run_config,
+                    )
+                    if task:
+                        started_tool_calls[event.item.call_id] = task
+
+                await streamed_result._event_queue.put(RawResponsesStreamEvent(data=event))
+                if partial_output_tracker:
+                    partial_output_event = partial_output_tracker.on_event(event)
+                    if partial_output_event:
+                        await streamed_result._event_queue.put(partial_output_event)
+
+            # 2. At this point, the streaming is complete for this turn of the agent loop.
+            if not final_response:
+                raise ModelBehaviorError("Model did not produce a final response!")
+
+            if guardrail_checker:
+                await guardrail_checker.finish()
+                streamed_result._streaming_output_guardrail_results = guardrail_checker.results
+            else:
+                streamed_result._streaming_output_guardrail_results = []
+
+            # 3. Now, we can process the turn as we do in the non-streaming case
+            single_step_result = await cls._get_single_step_result_from_response(
+                agent=agent,
+                original_input=streamed_result.input,
+                pre_step_items=streamed_result.new_items,
+                new_response=final_response,
+                output_schema=output_schema,
+                handoffs=handoffs,
+                hooks=hooks,
+                context_wrapper=context_wrapper,
+                run_config=run_config,
+                started_tool_calls=started_tool_calls,
+            )
+        except BaseException:
+            # Don't leave tools or guardrails running in the background if the turn failed
+            for task in started_tool_calls.values():
+                task.cancel()
+            if guardrail_checker:
+                guardrail_checker.cancel()
+            # Closes the model's stream if it's still open, e.g. when a guardrail tripped
+            aclose = getattr(stream, "aclose", None)
+            if aclose:
+                await aclose()
+            raise
 
-        RunImpl.stream_step_result_to_queue(single_step_result, streamed_result._event_queue)
+        await RunImpl.stream_step_result_to_queue(single_step_result, streamed_result._event_queue)
         return single_step_result
 
     @classmethod
@@ -697,6 +1058,8 @@ class Runner:
         context_wrapper: RunContextWrapper[TContext],
         run_config: RunConfig,
         should_run_agent_start_hooks: bool,
+        input_compactor: InputCompactor | None = None,
+        model_call: _ModelCallProgress | None = None,
     ) -> SingleStepResult:
         # Ensure we run the hooks before anything else
         if should_run_agent_start_hooks:
@@ -713,9 +1076,14 @@ class Runner:
 
         output_schema = cls._get_output_schema(agent)
         handoffs = cls._get_handoffs(agent)
-        input = ItemHelpers.input_to_new_input_list(original_input)
-        input.extend([generated_item.to_input_item() for generated_item in generated_items])
-
+        if input_compactor:
+            input = await input_compactor.get_input(original_input, generated_items)
+        else:
+            input = ItemHelpers.input_to_new_input_list(original_input)
+            input.extend([generated_item.to_input_item() for generated_item in generated_items])
+
+        if model_call is not None:
+            model_call.sent = True
         new_response = await cls._get_new_response(
             agent,
             system_prompt,
@@ -725,6 +1093,8 @@ class Runner:
             context_wrapper,
             run_config,
         )
+        if model_call is not None:
+            model_call.finished = True
 
         return await cls._get_single_step_result_from_response(
             agent=agent,
@@ -751,6 +1121,7 @@ class Runner:
         hooks: RunHooks[TContext],
         context_wrapper: RunContextWrapper[TContext],
         run_config: RunConfig,
+        started_tool_calls: dict[str, asyncio.Task[Any]] | None = None,
     ) -> SingleStepResult:
         processed_response = RunImpl.process_model_response(
             agent=agent,
@@ -768,7 +1139,207 @@ class Runner:
             hooks=hooks,
             context_wrapper=context_wrapper,
             run_config=run_config,
+            started_tool_calls=started_tool_calls,
+        )
+
+    @classmethod
+    async def _load_session_history(cls, run_config: RunConfig) -> list[TResponseInputItem]:
+        assert run_config.session is not None
+        history = await run_config.session.get_items(limit=run_config.session_history_limit)
+        if run_config.session_history_limit is not None:
+            # The window may start between a tool call and its output. An output without its call
+            # is rejected by the model, so it's dropped.
+            start = 0
+            while start < len(history) and history[start].get("type") in _TOOL_OUTPUT_TYPES:
+                start += 1
+            history = history[start:]
+        return history
+
+    @classmethod
+    async def _save_to_session(
+        cls,
+        session: Session,
+        input_items: list[TResponseInputItem],
+        turn_result: SingleStepResult,
+    ) -> None:
+        """Appends the items of a turn to the session, after the run's input on the first turn."""
+        new_items = [item.to_input_item() for item in turn_result.new_step_items]
+        await session.add_items(input_items + new_items)
+
+    @classmethod
+    def _get_run_id(cls, run_config: RunConfig, checkpoint: RunCheckpoint | None) -> str | None:
+        if checkpoint is not None:
+            return checkpoint.run_id
+        if run_config.checkpoint_store is None:
+            return None
+        return run_config.run_id or f"run_{uuid.uuid4().hex}"
+
+    @classmethod
+    async def _save_checkpoint(
+        cls,
+        store: CheckpointStore,
+        run_id: str,
+        next_agent: Agent[Any],
+        turn_result: SingleStepResult,
+        context_wrapper: RunContextWrapper[Any],
+        current_turn: int,
+    ) -> None:
+        checkpoint = RunCheckpoint.from_run(
+            run_id=run_id,
+            agent=next_agent,
+            original_input=turn_result.original_input,
+            generated_items=turn_result.generated_items,
+            usage=context_wrapper.usage,
+            current_turn=current_turn,
         )
+        await store.save(checkpoint)
+
+    @classmethod
+    async def _run_first_turn(
+        cls,
+        guardrails: Awaitable[list[InputGuardrailResult]],
+        turn: Callable[..., Awaitable[SingleStepResult]],
+        *,
+        agent: Agent[Any],
+        original_input: str | list[TResponseInputItem],
+        context_wrapper: RunContextWrapper[Any],
+        run_config: RunConfig,
+    ) -> tuple[list[InputGuardrailResult], SingleStepResult]:
+        """Runs the input guardrails and the first turn, which starts according to the run's input
+        guardrail strategy. Once both are running, if either fails, the other is cancelled right
+        away: in particular, a guardrail tripwire cancels the model call and any tools it started,
+        rather than letting them run to completion in the background.
+
+        `turn` is called with a `model_call` keyword argument, which tracks how far its model call
+        got.
+        """
+        model_call = _ModelCallProgress()
+        guardrails_task = asyncio.ensure_future(guardrails)
+        if await cls._wait_for_input_guardrails(guardrails_task, run_config):
+            try:
+                guardrail_results = guardrails_task.result()
+            except InputGuardrailTripwireTriggered as e:
+                cls._record_cancelled_turn(
+                    agent, original_input, context_wrapper, e.guardrail_result, model_call
+                )
+                e.usage = context_wrapper.usage
+                raise
+            return guardrail_results, await turn(model_call=model_call)
+
+        turn_task = asyncio.ensure_future(turn(model_call=model_call))
+        tasks = {guardrails_task, turn_task}
+        try:
+            await asyncio.wait(tasks, return_when=asyncio.FIRST_EXCEPTION)
+        finally:
+            # Also cancels both tasks if the run itself is cancelled
+            pending = [task for task in tasks if not task.done()]
+            for task in pending:
+                task.cancel()
+            if pending:
+                await asyncio.gather(*pending, return_exceptions=True)
+
+        guardrails_error = None if guardrails_task.cancelled() else guardrails_task.exception()
+        turn_error = None if turn_task.cancelled() else turn_task.exception()
+        if isinstance(guardrails_error, InputGuardrailTripwireTriggered):
+            if turn_task.cancelled():
+                cls._record_cancelled_turn(
+                    agent,
+                    original_input,
+                    context_wrapper,
+                    guardrails_error.guardrail_result,
+                    model_call,
+                )
+            guardrails_error.usage = context_wrapper.usage
+            raise guardrails_error
+        if turn_error is not None:
+            raise turn_error
+        if guardrails_error is not None:
+            raise guardrails_error
+        return guardrails_task.result(), turn_task.result()
+
+    @classmethod
+    async def _wait_for_input_guardrails(
+        cls, guardrails_task: asyncio.Future[Any], run_config: RunConfig
+    ) -> bool:
+        """Waits for the input guardrails as long as the input guardrail strategy requires, before
+        the first model call. Returns whether the guardrails are done.
+        """
+        if run_config.input_guardrail_strategy == "parallel":
+            return guardrails_task.done()
+
+        timeout = (
+            run_config.input_guardrail_budget
+            if run_config.input_guardrail_strategy == "race_with_budget"
+            else None
+        )
+        try:
+            await asyncio.wait({guardrails_task}, timeout=timeout)
+        except BaseException:
+            guardrails_task.cancel()
+            raise
+        return guardrails_task.done()
+
+    @classmethod
+    def _input_guardrails_blocked(
+        cls,
+        streamed_result: RunResultStreaming,
+        agent: Agent[Any],
+        context_wrapper: RunContextWrapper[Any],
+    ) -> bool:
+        """Returns whether the input guardrails of a streamed run finished before the first turn
+        and stopped the run, i.e. they failed or a tripwire was triggered.
+        """
+        task = streamed_result._input_guardrails_task
+        if task is None or not task.done():
+            return False
+        if task.cancelled() or task.exception():
+            return True
+        for result in streamed_result.input_guardrail_results:
+            if result.output.tripwire_triggered:
+                cls._record_cancelled_turn(
+                    agent, streamed_result.input, context_wrapper, result, _ModelCallProgress()
+                )
+                return True
+        return False
+
+    @classmethod
+    def _record_cancelled_turn(
+        cls,
+        agent: Agent[Any],
+        original_input: str | list[TResponseInputItem],
+        context_wrapper: RunContextWrapper[Any],
+        guardrail_result: InputGuardrailResult,
+        model_call: _ModelCallProgress,
+    ) -> None:
+        """Records the model call that a guardrail tripwire cancelled, or that never started, in the
+        usage and the trace. Only a call whose request was never sent saves its input tokens, so
+        only then are they estimated. A call that already finished is counted in the usage as is.
+        """
+        if model_call.finished:
+            return
+
+        estimated_tokens = 0
+        if not model_call.sent:
+            estimator = context_wrapper.token_estimator
+            estimated_tokens = estimator.estimate_items(
+                ItemHelpers.input_to_new_input_list(original_input)
+            ) + estimator.estimate_tools(agent.tools)
+            if isinstance(agent.instructions, str):
+                estimated_tokens += estimator.estimate_text(agent.instructions)
+
+        context_wrapper.usage.add(
+            Usage(cancelled_requests=1, estimated_input_tokens_saved=estimated_tokens)
+        )
+        with custom_span(
+            "Cancelled model call",
+            data={
+                "reason": "input_guardrail_tripwire_triggered",
+                "guardrail": guardrail_result.guardrail.get_name(),
+                "request_sent": model_call.sent,
+                "estimated_input_tokens_saved": estimated_tokens,
+            },
+        ):
+            pass
 
     @classmethod
     async def _run_input_guardrails(
@@ -815,15 +1386,27 @@ class Runner:
         agent: Agent[TContext],
         agent_output: Any,
         context: RunContextWrapper[TContext],
+        output_text: str | None = None,
     ) -> list[OutputGuardrailResult]:
-        if not guardrails:
+        """Runs the output guardrails on the final output. Streaming output guardrails check
+        `output_text` in a single window, or are skipped if it's None, i.e. when they already
+        checked the output as it streamed.
+        """
+        guardrail_inputs: list[tuple[OutputGuardrail[TContext], Any]] = []
+        for guardrail in guardrails:
+            if not isinstance(guardrail, StreamingOutputGuardrail):
+                guardrail_inputs.append((guardrail, agent_output))
+            elif output_text is not None:
+                window = StreamedTextWindow(delta=output_text, text=output_text, is_final=True)
+                guardrail_inputs.append((guardrail, window))
+        if not guardrail_inputs:
             return []
 
         guardrail_tasks = [
             asyncio.create_task(
-                RunImpl.run_single_output_guardrail(guardrail, agent, agent_output, context)
+                RunImpl.run_single_output_guardrail(guardrail, agent, guardrail_input, context)
             )
-            for guardrail in guardrails
+            for guardrail, guardrail_input in guardrail_inputs
         ]
 
         guardrail_results = []
@@ -875,6 +1458,30 @@ class Runner:
 
         return new_response
 
+    @classmethod
+    def _get_context_wrapper(
+        cls, context: TContext | None, run_config: RunConfig
+    ) -> RunContextWrapper[TContext]:
+        context_wrapper: RunContextWrapper[TContext] = RunContextWrapper(
+            context=context  # type: ignore
+        )
+        if run_config.token_estimator:
+            context_wrapper.token_estimator = run_config.token_estimator
+        return context_wrapper
+
+    @classmethod
+    def _get_input_compactor(
+        cls, run_config: RunConfig, context_wrapper: RunContextWrapper[Any]
+    ) -> InputCompactor | None:
+        if run_config.input_compaction_filter is None:
+            return None
+        return InputCompactor(
+            run_config.input_compaction_filter,
+            run_config.compaction_threshold_tokens,
+            context_wrapper.token_estimator,
+            context_wrapper,
+        )
+
     @classmethod
     def _get_output_schema(cls, agent: Agent[Any]) -> AgentOutputSchema | None:
         if agent.output_type is None or agent.output_type is str:
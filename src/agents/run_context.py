@@ -3,6 +3,7 @@ from typing import Any, Generic
 
 from typing_extensions import TypeVar
 
+from .token_estimator import TokenEstimator, get_default_token_estimator
 from .usage import Usage
 
 TContext = TypeVar("TContext", default=Any)
@@ -24,3 +25,8 @@ class RunContextWrapper(Generic[TContext]):
     """The usage of the agent run so far. For streamed responses, the usage will be stale until the
     last chunk of the stream is processed.
     """
+
+    token_estimator: TokenEstimator = field(default_factory=get_default_token_estimator)
+    """Estimates how many tokens input items, instructions and tools take up. Set it for a run
+    with `RunConfig.token_estimator`.
+    """
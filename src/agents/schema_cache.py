@@ -0,0 +1,351 @@
+from __future__ import annotations
+
+import atexit
+import copy
+import hashlib
+import importlib.metadata
+import inspect
+import os
+import re
+import sys
+import tempfile
+import threading
+import time
+from pathlib import Path
+from typing import Any, Callable, get_args, get_origin, get_type_hints
+
+from .json_codec import get_json_codec
+from .logger import logger
+from .version import __version__
+
+# Bump this if the format of the cached schemas changes
+_CACHE_FORMAT_VERSION = 2
+
+# How often the last use of an entry is written back. Entries are only rewritten when they haven't
+# been marked as used for this long, so that processes that only read the cache don't write it.
+_TOUCH_INTERVAL = 24 * 60 * 60
+
+# The default repr of objects contains their address, which changes from one process to the next
+_OBJECT_ADDRESS = re.compile(r" at 0x[0-9a-fA-F]+")
+
+# Classes from these modules are identified by name only: their schemas only change with the
+# library versions, which are part of the cache file name
+_LIBRARY_PACKAGES = {
+    "builtins",
+    "collections",
+    "datetime",
+    "decimal",
+    "enum",
+    "pathlib",
+    "pydantic",
+    "typing",
+    "typing_extensions",
+    "uuid",
+}
+
+
+class SchemaCache:
+    """Caches generated JSON schemas on disk, so that worker processes don't regenerate the same
+    schemas for their tools and output types every time they start. Enable it with
+    `set_schema_cache()`.
+
+    Schemas are keyed on a hash of the function or type they were generated from: its source code,
+    signature and type hints, including the source of the classes used in the type hints. All the
+    schemas are stored in one file per combination of library versions, which is read once, the
+    first time a schema is looked up. New schemas are written back by `save()`, which is called at
+    exit.
+
+    Each entry records when it was last used. When saving, entries that weren't used for `max_age`
+    seconds are dropped, as are the least recently used entries beyond `max_entries`, along with
+    the cache files of other library versions that weren't written for `max_age` seconds.
+    """
+
+    def __init__(
+        self,
+        directory: str | Path | None = None,
+        max_entries: int = 5000,
+        max_age: float = 30 * 24 * 60 * 60,
+    ):
+        """
+        Args:
+            directory: The directory to store the cache in. Defaults to the
+                `OPENAI_AGENTS_CACHE_DIR` environment variable, or `openai-agents` in the user's
+                cache directory.
+            max_entries: The maximum number of schemas to keep on disk.
+            max_age: The number of seconds after which unused schemas and cache files are
+                deleted. Defaults to 30 days.
+        """
+        self.directory = Path(directory) if directory else _default_directory()
+        self.max_entries = max_entries
+        self.max_age = max_age
+        self.path = self.directory / f"schemas-{_environment_fingerprint()}.json"
+        self.hits = 0
+        """The number of schemas that were found in the cache."""
+        self.misses = 0
+        """The number of schemas that weren't in the cache."""
+        # Entries are stored as `{"value": ..., "used_at": ...}`
+        self._entries: dict[str, dict[str, Any]] | None = None
+        self._new_entries: dict[str, dict[str, Any]] = {}
+        self._touched: dict[str, float] = {}
+        self._lock = threading.Lock()
+
+    def get(self, key: str) -> Any | None:
+        """Returns a copy of the cached value for a key, or None if there is none."""
+        with self._lock:
+            if self._entries is None:
+                self._entries = self._read()
+            entry = self._entries.get(key)
+            if entry is None:
+                self.misses += 1
+                return None
+            self.hits += 1
+            now = time.time()
+            if now - entry["used_at"] > _TOUCH_INTERVAL:
+                entry["used_at"] = now
+                self._touched[key] = now
+        return copy.deepcopy(entry["value"])
+
+    def set(self, key: str, value: Any) -> None:
+        """Caches a JSON-compatible value. It's written to disk by the next `save()`."""
+        entry = {"value": copy.deepcopy(value), "used_at": time.time()}
+        with self._lock:
+            if self._entries is None:
+                self._entries = self._read()
+            self._entries[key] = entry
+            self._new_entries[key] = entry
+
+    def save(self) -> None:
+        """Writes the new entries to disk, merged with the entries that other processes may have
+        written in the meantime, and prunes the entries and files that weren't used recently.
+        """
+        with self._lock:
+            if not self._new_entries and not self._touched:
+                return
+            entries = self._read()
+            entries.update(self._new_entries)
+            for key, used_at in self._touched.items():
+                if key in entries:
+                    entries[key]["used_at"] = max(entries[key]["used_at"], used_at)
+            entries = self._prune(entries)
+            try:
+                self.directory.mkdir(parents=True, exist_ok=True)
+                fd, temp_path = tempfile.mkstemp(dir=self.directory, prefix=".schemas.")
+                try:
+                    with os.fdopen(fd, "wb") as f:
+                        f.write(get_json_codec().dumps(entries))
+                    os.replace(temp_path, self.path)
+                except BaseException:
+                    Path(temp_path).unlink(missing_ok=True)
+                    raise
+            except OSError as e:
+                logger.warning(f"Could not write the schema cache to {self.path}: {e}")
+                return
+            self._new_entries.clear()
+            self._touched.clear()
+            self._remove_stale_files()
+
+    def clear(self) -> None:
+        """Deletes all the cached schemas, in memory and on disk."""
+        with self._lock:
+            self._entries = {}
+            self._new_entries.clear()
+            self._touched.clear()
+            self.path.unlink(missing_ok=True)
+
+    def _read(self) -> dict[str, dict[str, Any]]:
+        try:
+            entries = get_json_codec().loads(self.path.read_bytes())
+        except FileNotFoundError:
+            return {}
+        except (OSError, ValueError) as e:
+            logger.warning(f"Ignoring unreadable schema cache {self.path}: {e}")
+            return {}
+        if not isinstance(entries, dict):
+            return {}
+        return {
+            key: entry
+            for key, entry in entries.items()
+            if isinstance(entry, dict)
+            and "value" in entry
+            and isinstance(entry.get("used_at"), (int, float))
+        }
+
+    def _prune(self, entries: dict[str, dict[str, Any]]) -> dict[str, dict[str, Any]]:
+        cutoff = time.time() - self.max_age
+        kept = [(key, entry) for key, entry in entries.items() if entry["used_at"] >= cutoff]
+        if len(kept) > self.max_entries:
+            kept.sort(key=lambda item: item[1]["used_at"], reverse=True)
+            kept = kept[: self.max_entries]
+        return dict(kept)
+
+    def _remove_stale_files(self) -> None:
+        cutoff = time.time() - self.max_age
+        for path in self.directory.glob("schemas-*.json"):
+            if path == self.path:
+                continue
+            try:
+                if path.stat().st_mtime < cutoff:
+                    path.unlink()
+            except OSError:
+                # Another process may have removed it already
+                pass
+
+
+_cache: SchemaCache | None = None
+_save_registered = False
+
+
+def get_schema_cache() -> SchemaCache | None:
+    """Returns the schema cache, or None if schemas aren't cached."""
+    return _cache
+
+
+def set_schema_cache(cache: SchemaCache | None) -> None:
+    """Sets the cache for generated JSON schemas, or disables caching with None. Schemas aren't
+    cached by default. The cache is saved when the process exits.
+    """
+    global _cache, _save_registered
+    _cache = cache
+    if cache is not None and not _save_registered:
+        atexit.register(_save_at_exit)
+        _save_registered = True
+
+
+def function_schema_key(func: Callable[..., Any], **options: Any) -> str | None:
+    """Returns the cache key of a schema generated from a function, with the given options, or
+    None if the function can't be keyed the same way in every process, and so shouldn't be cached.
+    """
+    hasher = _Hasher()
+    try:
+        hasher.add_function(func)
+        hasher.add("options", _stable_repr(sorted(options.items())))
+    except _UnstableKeyError:
+        return None
+    return hasher.hexdigest()
+
+
+def type_schema_key(tp: Any, **options: Any) -> str | None:
+    """Returns the cache key of a schema generated from a type, with the given options, or None
+    if the type can't be keyed the same way in every process, and so shouldn't be cached.
+    """
+    hasher = _Hasher()
+    try:
+        hasher.add_type(tp)
+        hasher.add("options", _stable_repr(sorted(options.items())))
+    except _UnstableKeyError:
+        return None
+    return hasher.hexdigest()
+
+
+class _UnstableKeyError(Exception):
+    pass
+
+
+def _stable_repr(value: Any) -> str:
+    """Returns the repr of a value, if it's the same in every process. Raises
+    `_UnstableKeyError` if it contains an object address, e.g. for objects with the default repr.
+    """
+    return _stable_text(repr(value))
+
+
+def _stable_text(text: str) -> str:
+    if _OBJECT_ADDRESS.search(text):
+        raise _UnstableKeyError(text)
+    return text
+
+
+class _Hasher:
+    def __init__(self) -> None:
+        self._hash = hashlib.sha256()
+        self._seen: set[int] = set()
+
+    def add(self, *parts: str) -> None:
+        for part in parts:
+            self._hash.update(part.encode())
+            self._hash.update(b"\0")
+
+    def hexdigest(self) -> str:
+        return self._hash.hexdigest()
+
+    def add_function(self, func: Callable[..., Any]) -> None:
+        self.add("function", getattr(func, "__module__", ""), getattr(func, "__qualname__", ""))
+        self.add(_source(func))
+        try:
+            self.add(_stable_text(str(inspect.signature(func))))
+        except (TypeError, ValueError):
+            pass
+        for hint in _type_hints(func).values():
+            self.add_type(hint)
+
+    def add_type(self, tp: Any) -> None:
+        origin = get_origin(tp)
+        if origin is not None:
+            self.add("generic", _stable_repr(origin))
+            for arg in get_args(tp):
+                self.add_type(arg)
+            return
+
+        if not isinstance(tp, type):
+            self.add("value", _stable_repr(tp))
+            return
+
+        self.add("type", tp.__module__, tp.__qualname__)
+        if _is_library_type(tp) or id(tp) in self._seen:
+            return
+        self._seen.add(id(tp))
+        for base in tp.__mro__:
+            if not _is_library_type(base):
+                self.add(_source(base))
+        for hint in _type_hints(tp).values():
+            self.add_type(hint)
+
+
+def _is_library_type(tp: type[Any]) -> bool:
+    return tp.__module__.partition(".")[0] in _LIBRARY_PACKAGES
+
+
+def _source(obj: Any) -> str:
+    try:
+        return inspect.getsource(obj)
+    except (OSError, TypeError):
+        # No source available, e.g. for classes created at runtime. Their other properties still
+        # go into the key.
+        return ""
+
+
+def _type_hints(obj: Any) -> dict[str, Any]:
+    try:
+        return get_type_hints(obj, include_extras=True)
+    except Exception:
+        return dict(getattr(obj, "__annotations__", {}))
+
+
+def _package_version(name: str) -> str:
+    try:
+        return importlib.metadata.version(name)
+    except importlib.metadata.PackageNotFoundError:
+        return "none"
+
+
+def _environment_fingerprint() -> str:
+    parts = [
+        str(_CACHE_FORMAT_VERSION),
+        f"{sys.version_info.major}.{sys.version_info.minor}",
+        __version__,
+        _package_version("pydantic"),
+        _package_version("pydantic-core"),
+        _package_version("griffe"),
+    ]
+    return hashlib.sha256("|".join(parts).encode()).hexdigest()[:16]
+
+
+def _default_directory() -> Path:
+    if directory := os.environ.get("OPENAI_AGENTS_CACHE_DIR"):
+        return Path(directory)
+    cache_home = os.environ.get("XDG_CACHE_HOME") or os.path.join(Path.home(), ".cache")
+    return Path(cache_home) / "openai-agents"
+
+
+def _save_at_exit() -> None:
+    if _cache is not None:
+        _cache.save()
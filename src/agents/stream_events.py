@@ -54,5 +54,26 @@ class AgentUpdatedStreamEvent:
     type: Literal["agent_updated_stream_event"] = "agent_updated_stream_event"
 
 
-StreamEvent: TypeAlias = Union[RawResponsesStreamEvent, RunItemStreamEvent, AgentUpdatedStreamEvent]
+@dataclass
+class PartialOutputStreamEvent:
+    """The agent's structured output, as far as it has been streamed. These events are only sent
+    if `RunConfig.stream_partial_output` is enabled and the agent has a non-text `output_type`.
+    """
+
+    output: Any
+    """The partially streamed output, validated against the agent's output type. Trailing strings
+    and lists may be incomplete. An event is only sent once all required fields have started
+    streaming and the output validates.
+    """
+
+    agent: Agent[Any]
+    """The agent that is producing the output."""
+
+    type: Literal["partial_output_stream_event"] = "partial_output_stream_event"
+    """The type of the event."""
+
+
+StreamEvent: TypeAlias = Union[
+    RawResponsesStreamEvent, RunItemStreamEvent, AgentUpdatedStreamEvent, PartialOutputStreamEvent
+]
 """A streaming event from an agent."""
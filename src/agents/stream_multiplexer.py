@@ -0,0 +1,169 @@
+from __future__ import annotations
+
+import asyncio
+from collections import deque
+from collections.abc import AsyncIterator
+from dataclasses import dataclass
+from typing import Literal, Union
+
+from typing_extensions import TypeAlias
+
+from ._run_impl import QueueCompleteSentinel
+from .exceptions import UserError
+from .result import RunResultStreaming
+from .stream_events import StreamEvent
+
+
+@dataclass
+class MultiplexedStreamEvent:
+    """A stream event from one of the runs in a `StreamMultiplexer`."""
+
+    run_id: str
+    """The ID that the run was added to the multiplexer with."""
+
+    event: StreamEvent
+    """The event, as `RunResultStreaming.stream_events()` would have yielded it."""
+
+    type: Literal["multiplexed_stream_event"] = "multiplexed_stream_event"
+    """The type of the event."""
+
+
+@dataclass
+class MultiplexedRunComplete:
+    """Sent once a run in a `StreamMultiplexer` has no more events."""
+
+    run_id: str
+    """The ID that the run was added to the multiplexer with."""
+
+    result: RunResultStreaming
+    """The result of the run."""
+
+    error: Exception | None
+    """The exception that `stream_events()` would have raised, e.g. a `MaxTurnsExceeded` or
+    `InputGuardrailTripwireTriggered`, or None if the run completed successfully.
+    """
+
+    type: Literal["multiplexed_run_complete"] = "multiplexed_run_complete"
+    """The type of the event."""
+
+
+MultiplexerEvent: TypeAlias = Union[MultiplexedStreamEvent, MultiplexedRunComplete]
+"""An event from a `StreamMultiplexer`."""
+
+
+class StreamMultiplexer:
+    """Merges the events of many streamed runs into a single async iterator, so that one consumer
+    can serve them all:
+
+    ```python
+    multiplexer = StreamMultiplexer()
+    multiplexer.add("run-1", Runner.run_streamed(agent, "Hello"))
+    multiplexer.add("run-2", Runner.run_streamed(agent, "Bonjour"))
+    async for event in multiplexer:
+        ...
+    ```
+
+    No task is created per run: each run's event queue wakes up the multiplexer when an event is
+    queued. Runs with waiting events are served round-robin, one event at a time, so a run that
+    streams quickly can't starve the others. Once a run has no more events, a
+    `MultiplexedRunComplete` is sent for it, including the error that ended it, if any.
+
+    A run that was added to a multiplexer must not also be consumed with `stream_events()`.
+    """
+
+    def __init__(self) -> None:
+        self._runs: dict[str, RunResultStreaming] = {}
+        self._ready: deque[str] = deque()
+        """The IDs of runs that may have events waiting, in the order they will be served."""
+        self._ready_ids: set[str] = set()
+        self._wakeup = asyncio.Event()
+
+    def add(self, run_id: str, result: RunResultStreaming) -> None:
+        """Adds a streamed run. Runs can be added while iterating over the multiplexer.
+
+        Args:
+            run_id: An ID for the run, which is included in all of its events.
+            result: The result returned by `Runner.run_streamed()`.
+        """
+        if run_id in self._runs:
+            raise UserError(f"A run with ID {run_id} was already added")
+        if result._event_queue._put_listener is not None:
+            raise UserError("This run is already being consumed by a multiplexer")
+
+        self._runs[run_id] = result
+        result._event_queue._put_listener = lambda: self._mark_ready(run_id)
+        # The run may already have queued events, or even completed
+        self._mark_ready(run_id)
+
+    def __len__(self) -> int:
+        """The number of runs that haven't completed yet."""
+        return len(self._runs)
+
+    def __aiter__(self) -> AsyncIterator[MultiplexerEvent]:
+        return self.events()
+
+    async def events(self) -> AsyncIterator[MultiplexerEvent]:
+        """Yields the events of all runs, until every run that was added has completed.
+
+        If the iteration stops early, e.g. with `break`, the runs that haven't completed are
+        removed from the multiplexer, and their event queues stop blocking the runs, like when
+        `RunResultStreaming.stream_events()` stops early.
+        """
+        try:
+            while self._runs:
+                if not self._ready:
+                    self._wakeup.clear()
+                    await self._wakeup.wait()
+                    continue
+
+                run_id = self._ready.popleft()
+                self._ready_ids.discard(run_id)
+                event = self._next_event(run_id)
+                if run_id in self._runs and not self._runs[run_id]._event_queue.empty():
+                    # More events are waiting; serve the other ready runs first
+                    self._mark_ready(run_id)
+                if event:
+                    yield event
+        finally:
+            self._detach_runs()
+
+    def _next_event(self, run_id: str) -> MultiplexerEvent | None:
+        result = self._runs[run_id]
+        # Same checks as `RunResultStreaming.stream_events()`
+        result._check_errors()
+        if result._stored_exception:
+            result.is_complete = True
+            return self._complete(run_id)
+
+        queue = result._event_queue
+        if queue.empty():
+            return self._complete(run_id) if result.is_complete else None
+
+        item = queue.get_nowait()
+        queue.task_done()
+        if isinstance(item, QueueCompleteSentinel):
+            # Check for errors, in case the queue was completed due to an exception
+            result._check_errors()
+            return self._complete(run_id)
+        return MultiplexedStreamEvent(run_id=run_id, event=item)
+
+    def _complete(self, run_id: str) -> MultiplexedRunComplete:
+        result = self._runs.pop(run_id)
+        result._event_queue._put_listener = None
+        result._finish_stream()
+        return MultiplexedRunComplete(run_id=run_id, result=result, error=result._stored_exception)
+
+    def _detach_runs(self) -> None:
+        for result in self._runs.values():
+            result._event_queue._put_listener = None
+            # Nothing reads from the queue anymore, so a bounded queue must not block the run
+            result._event_queue.release()
+        self._runs.clear()
+        self._ready.clear()
+        self._ready_ids.clear()
+
+    def _mark_ready(self, run_id: str) -> None:
+        if run_id not in self._ready_ids:
+            self._ready_ids.add(run_id)
+            self._ready.append(run_id)
+            self._wakeup.set()
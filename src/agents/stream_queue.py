@@ -0,0 +1,267 @@
+from __future__ import annotations
+
+import asyncio
+from collections import deque
+from dataclasses import dataclass
+from typing import Callable, Literal, Union
+
+from openai.types.responses import ResponseTextDeltaEvent
+from typing_extensions import TypeAlias
+
+from ._run_impl import QueueCompleteSentinel
+from .stream_events import PartialOutputStreamEvent, RawResponsesStreamEvent, StreamEvent
+
+StreamQueueOverflowPolicy: TypeAlias = Literal["block", "coalesce_text_deltas", "drop_raw_events"]
+"""What to do when a bounded stream event queue is full:
+- `block`: The agent run waits until the consumer has made room in the queue.
+- `coalesce_text_deltas`: Consecutive text deltas are merged into a single event. Other events
+  wait for room, like with `block`.
+- `drop_raw_events`: Raw response events and partial output events are dropped. Other events,
+  such as run item events, are always queued.
+"""
+
+_QueueItem: TypeAlias = Union[StreamEvent, QueueCompleteSentinel]
+
+
+@dataclass
+class StreamQueueStats:
+    """Statistics about the event queue of a streamed run."""
+
+    high_water_mark: int = 0
+    """The largest number of events that were waiting in the queue at once."""
+
+    blocked_puts: int = 0
+    """How often the agent run had to wait for room in the queue."""
+
+    coalesced_events: int = 0
+    """The number of text delta events that were merged into a previous event."""
+
+    dropped_events: int = 0
+    """The number of events that were dropped because the queue was full."""
+
+
+class StreamEventQueue(asyncio.Queue[_QueueItem]):
+    """The queue that a streamed run writes its events to, and `stream_events()` reads from.
+
+    Unlike a bounded `asyncio.Queue`, `put_nowait()` never fails: it always queues the event,
+    even past `max_size`. The agent run uses `put()` for events that may be held back or dropped,
+    and `put_nowait()` for the few that must always be delivered, like the completion sentinel.
+    """
+
+    def __init__(self, max_size: int = 0, overflow_policy: StreamQueueOverflowPolicy = "block"):
+        """
+        Args:
+            max_size: The number of events the queue can hold before `overflow_policy` applies. If
+                0, the queue is unbounded.
+            overflow_policy: What to do with new events when the queue is full.
+        """
+        super().__init__()
+        self.max_size = max_size
+        self.overflow_policy = overflow_policy
+        self.stats = StreamQueueStats()
+        self._ignore_max_size = False
+        self._tail_delta_parts: list[str] | None = None
+        """The deltas of text delta events merged into the last event in the queue."""
+        self._put_listener: Callable[[], None] | None = None
+        """Called whenever an event is queued, e.g. to wake up a `StreamMultiplexer`."""
+        self._released = False
+        self._room = asyncio.Event()
+        """Set whenever an event is read or the queue is released, to wake up blocked producers."""
+
+    def full(self) -> bool:
+        return (
+            not self._ignore_max_size and not self._released and 0 < self.max_size <= self.qsize()
+        )
+
+    def release(self) -> None:
+        """Stops bounding the queue and wakes up the producers waiting for room. Called once the
+        consumer stops reading events, so that the agent run isn't blocked forever, and can finish
+        like it does with an unbounded queue.
+        """
+        self._released = True
+        self._room.set()
+
+    def notify_put_listener(self) -> None:
+        """Calls the put listener, if any. Also used when the run has news for its consumer that
+        isn't queued as an event, e.g. an input guardrail result.
+        """
+        if self._put_listener:
+            self._put_listener()
+
+    async def put(self, item: _QueueItem) -> None:
+        if self.full():
+            if self.overflow_policy == "drop_raw_events":
+                if isinstance(item, (RawResponsesStreamEvent, PartialOutputStreamEvent)):
+                    self.stats.dropped_events += 1
+                    return
+                self.put_nowait(item)
+                return
+
+            if self.overflow_policy == "coalesce_text_deltas" and self._coalesce(item):
+                self.stats.coalesced_events += 1
+                return
+
+            self.stats.blocked_puts += 1
+            # Wait for room ourselves, rather than in `asyncio.Queue.put()`, so that `release()`
+            # can wake up every blocked producer at once
+            while self.full():
+                self._room.clear()
+                await self._room.wait()
+        super().put_nowait(item)
+
+    def put_nowait(self, item: _QueueItem) -> None:
+        self._ignore_max_size = True
+        try:
+            super().put_nowait(item)
+        finally:
+            self._ignore_max_size = False
+
+    # The methods below are the hooks that asyncio.Queue subclasses override
+
+    def _init(self, maxsize: int) -> None:
+        self._queue: deque[_QueueItem] = deque()
+
+    def _put(self, item: _QueueItem) -> None:
+        self._flush_tail_deltas()
+        self._queue.append(item)
+        if len(self._queue) > self.stats.high_water_mark:
+            self.stats.high_water_mark = len(self._queue)
+        self.notify_put_listener()
+
+    def _get(self) -> _QueueItem:
+        if len(self._queue) == 1:
+            self._flush_tail_deltas()
+        self._room.set()
+        return self._queue.popleft()
+
+    def _coalesce(self, item: _QueueItem) -> bool:
+        """Merges a text delta event into the last event in the queue, if that is a text delta
+        for the same content part. The merged text is only joined when the event is read, or when
+        another event is queued after it.
+        """
+        new_delta = _text_delta(item)
+        last_delta = _text_delta(self._queue[-1]) if self._queue else None
+        if not new_delta or not last_delta or not _same_content_part(new_delta, last_delta):
+            return False
+
+        if self._tail_delta_parts is None:
+            self._tail_delta_parts = [last_delta.delta]
+        self._tail_delta_parts.append(new_delta.delta)
+        return True
+
+    def _flush_tail_deltas(self) -> None:
+        if self._tail_delta_parts is None:
+            return
+        last_delta = _text_delta(self._queue[-1])
+        assert last_delta is not None
+        self._queue[-1] = _merged_text_delta(last_delta, self._tail_delta_parts)
+        self._tail_delta_parts = None
+
+
+class TextDeltaCoalescer:
+    """Reads events from a `StreamEventQueue`, merging consecutive text deltas for the same content
+    part into a single event. Used by `RunResultStreaming.stream_events()`. Events keep their
+    order: a merged delta is returned before the event that ended it.
+    """
+
+    def __init__(self, queue: StreamEventQueue, window: float | None, max_chars: int | None):
+        """
+        Args:
+            queue: The queue to read events from.
+            window: How long to wait for more deltas after the first one, in seconds. If None, only
+                deltas that are already in the queue are merged.
+            max_chars: Stop merging once a merged delta has this many characters.
+        """
+        self.queue = queue
+        self.window = window
+        self.max_chars = max_chars
+        self._lookahead: _QueueItem | None = None
+        """An event that ended the previous merge, and is returned next."""
+        self._pending_get: asyncio.Task[_QueueItem] | None = None
+        """A `get()` that timed out while waiting for more deltas. It's kept rather than cancelled,
+        so that no event is lost."""
+
+    @property
+    def has_buffered_events(self) -> bool:
+        """Whether events were taken off the queue but not returned yet."""
+        return self._lookahead is not None or (
+            self._pending_get is not None and self._pending_get.done()
+        )
+
+    async def get(self) -> _QueueItem:
+        """Returns the next event, merging text deltas. Calls `task_done()` on the queue for every
+        event it merged, but not for the returned event.
+        """
+        item = self._lookahead
+        self._lookahead = None
+        if item is None:
+            item = await self._get(timeout=None)
+            assert item is not None
+
+        first = _text_delta(item)
+        if first is None:
+            return item
+
+        parts = [first.delta]
+        size = len(first.delta)
+        loop = asyncio.get_running_loop()
+        deadline = loop.time() + self.window if self.window is not None else None
+        while self.max_chars is None or size < self.max_chars:
+            timeout = max(0.0, deadline - loop.time()) if deadline is not None else 0.0
+            next_item = await self._get(timeout)
+            if next_item is None:
+                break
+            next_delta = _text_delta(next_item)
+            if next_delta is None or not _same_content_part(first, next_delta):
+                self._lookahead = next_item
+                break
+            parts.append(next_delta.delta)
+            size += len(next_delta.delta)
+            self.queue.task_done()
+
+        if len(parts) == 1:
+            return item
+        return _merged_text_delta(first, parts)
+
+    def close(self) -> None:
+        """Cancels a pending `get()`. Call this once no more events will be read."""
+        if self._pending_get is not None:
+            self._pending_get.cancel()
+            self._pending_get = None
+
+    async def _get(self, timeout: float | None) -> _QueueItem | None:
+        """Gets the next event from the queue, or None if there was none within `timeout`."""
+        if self._pending_get is None:
+            if not self.queue.empty():
+                return self.queue.get_nowait()
+            if timeout == 0:
+                return None
+            self._pending_get = asyncio.ensure_future(self.queue.get())
+
+        if timeout is None:
+            item = await self._pending_get
+        else:
+            done, _ = await asyncio.wait({self._pending_get}, timeout=timeout)
+            if not done:
+                return None
+            item = self._pending_get.result()
+        self._pending_get = None
+        return item
+
+
+def _text_delta(item: _QueueItem) -> ResponseTextDeltaEvent | None:
+    if isinstance(item, RawResponsesStreamEvent) and isinstance(item.data, ResponseTextDeltaEvent):
+        return item.data
+    return None
+
+
+def _same_content_part(a: ResponseTextDeltaEvent, b: ResponseTextDeltaEvent) -> bool:
+    return (
+        a.item_id == b.item_id
+        and a.output_index == b.output_index
+        and a.content_index == b.content_index
+    )
+
+
+def _merged_text_delta(first: ResponseTextDeltaEvent, parts: list[str]) -> RawResponsesStreamEvent:
+    return RawResponsesStreamEvent(data=first.model_copy(update={"delta": "".join(parts)}))
@@ -1,29 +1,194 @@
 from __future__ import annotations
 
-from typing import Any
+import copy
+import hashlib
+import json
+import re
+import threading
+from collections import OrderedDict
+from typing import Any, NoReturn
 
 from openai import NOT_GIVEN
 from typing_extensions import TypeGuard
 
 from .exceptions import UserError
 
-_EMPTY_SCHEMA = {
-    "additionalProperties": False,
-    "type": "object",
-    "properties": {},
-    "required": [],
-}
+# Strict schemas are cached by a fingerprint of the schema they were made from. Definitions in
+# `$defs` are cached on their own too, so that a model that is used by many tools and output types
+# is only made strict once, and its strict schema is shared by all of them.
+_MAX_CACHED_SCHEMAS = 1024
+_MAX_CACHED_DEFS = 4096
+_DEFS_REF_PATTERN = re.compile(r'"\$ref":\s*"#/\$defs/([^"]+)"')
+_OTHER_REF_PATTERN = re.compile(r'"\$ref":\s*"(?!#/\$defs/)')
+
+_cache_lock = threading.Lock()
+_strict_schemas: OrderedDict[str, dict[str, Any]] = OrderedDict()
+_strict_defs: OrderedDict[str, dict[str, Any]] = OrderedDict()
+
+
+class _FrozenDict(dict[str, Any]):
+    """A dict that can't be modified, for schemas that are shared. Copies are regular dicts."""
+
+    def _frozen(self, *args: Any, **kwargs: Any) -> NoReturn:
+        raise TypeError("Strict JSON schemas are shared and can't be modified. Copy them first.")
+
+    __setitem__ = __delitem__ = __ior__ = _frozen
+    clear = pop = popitem = setdefault = update = _frozen
+
+    def __copy__(self) -> dict[str, Any]:
+        return dict(self)
+
+    def __deepcopy__(self, memo: dict[int, Any]) -> dict[str, Any]:
+        return {key: copy.deepcopy(value, memo) for key, value in self.items()}
+
+    def __reduce__(self) -> tuple[Any, ...]:
+        return (dict, (dict(self),))
+
+
+class _FrozenList(list[Any]):
+    """A list that can't be modified, for schemas that are shared. Copies are regular lists."""
+
+    def _frozen(self, *args: Any, **kwargs: Any) -> NoReturn:
+        raise TypeError("Strict JSON schemas are shared and can't be modified. Copy them first.")
+
+    __setitem__ = __delitem__ = __iadd__ = __imul__ = _frozen
+    append = extend = insert = pop = remove = clear = sort = reverse = _frozen
+
+    def __copy__(self) -> list[Any]:
+        return list(self)
+
+    def __deepcopy__(self, memo: dict[int, Any]) -> list[Any]:
+        return [copy.deepcopy(value, memo) for value in self]
+
+    def __reduce__(self) -> tuple[Any, ...]:
+        return (list, (list(self),))
+
+
+def _freeze(value: Any) -> Any:
+    if isinstance(value, (_FrozenDict, _FrozenList)):
+        return value
+    if isinstance(value, dict):
+        return _FrozenDict({key: _freeze(item) for key, item in value.items()})
+    if isinstance(value, list):
+        return _FrozenList(_freeze(item) for item in value)
+    return value
+
+
+_EMPTY_SCHEMA: dict[str, Any] = _freeze(
+    {
+        "additionalProperties": False,
+        "type": "object",
+        "properties": {},
+        "required": [],
+    }
+)
 
 
 def ensure_strict_json_schema(
     schema: dict[str, Any],
 ) -> dict[str, Any]:
-    """Mutates the given JSON schema to ensure it conforms to the `strict` standard
-    that the OpenAI API expects.
+    """Returns a version of the given JSON schema that conforms to the `strict` standard that the
+    OpenAI API expects. The given schema may be modified.
+
+    Results are cached, so that the same schema is only made strict once per process. The returned
+    schema is shared and can't be modified; copy it (e.g. with `copy.deepcopy()`) to change it.
     """
     if schema == {}:
         return _EMPTY_SCHEMA
-    return _ensure_strict_json_schema(schema, path=(), root=schema)
+    if not is_dict(schema):
+        raise TypeError(f"Expected {schema} to be a dictionary; path=()")
+
+    key = _fingerprint(schema)
+    with _cache_lock:
+        cached = _strict_schemas.get(key)
+        if cached is not None:
+            _strict_schemas.move_to_end(key)
+            return cached
+
+    def_keys = _use_cached_defs(schema)
+    strict_schema: dict[str, Any] = _freeze(
+        _ensure_strict_json_schema(schema, path=(), root=schema)
+    )
+
+    with _cache_lock:
+        _strict_schemas[key] = strict_schema
+        if len(_strict_schemas) > _MAX_CACHED_SCHEMAS:
+            _strict_schemas.popitem(last=False)
+        strict_defs = strict_schema.get("$defs")
+        if is_dict(strict_defs):
+            for def_name, def_key in def_keys.items():
+                strict_def = strict_defs.get(def_name)
+                if is_dict(strict_def):
+                    _strict_defs[def_key] = strict_def
+            while len(_strict_defs) > _MAX_CACHED_DEFS:
+                _strict_defs.popitem(last=False)
+    return strict_schema
+
+
+def clear_strict_schema_cache() -> None:
+    """Clears the cache of strict schemas."""
+    with _cache_lock:
+        _strict_schemas.clear()
+        _strict_defs.clear()
+
+
+def _fingerprint(value: Any) -> str:
+    # Key order matters, e.g. it's the order of the properties, so the keys aren't sorted
+    encoded = json.dumps(value, separators=(",", ":"), default=repr)
+    return hashlib.sha256(encoded.encode()).hexdigest()
+
+
+def _use_cached_defs(schema: dict[str, Any]) -> dict[str, str]:
+    """Replaces the definitions in `$defs` that were already made strict with their cached strict
+    versions, which are skipped when the schema is made strict. Returns the keys of the other
+    definitions, to cache them once they're strict.
+    """
+    defs = schema.get("$defs")
+    if not is_dict(defs):
+        return {}
+
+    encoded_defs = {
+        name: json.dumps(def_schema, separators=(",", ":"), default=repr)
+        for name, def_schema in defs.items()
+    }
+    uncached_keys: dict[str, str] = {}
+    for name in encoded_defs:
+        # A definition's strict version depends on the definitions it references, so they're part
+        # of its key. References elsewhere, e.g. to the root, can't be keyed like this.
+        referenced = _referenced_defs(name, encoded_defs)
+        if referenced is None:
+            continue
+        key = hashlib.sha256(
+            "\0".join(f"{ref}={encoded_defs[ref]}" for ref in sorted(referenced)).encode()
+        ).hexdigest()
+        with _cache_lock:
+            cached = _strict_defs.get(key)
+            if cached is not None:
+                _strict_defs.move_to_end(key)
+        if cached is not None:
+            defs[name] = cached
+        else:
+            uncached_keys[name] = key
+    return uncached_keys
+
+
+def _referenced_defs(name: str, encoded_defs: dict[str, str]) -> set[str] | None:
+    """Returns the definitions that a definition references, directly or indirectly, including
+    itself. Returns None if it references anything that isn't a definition.
+    """
+    referenced = {name}
+    pending = [name]
+    while pending:
+        encoded = encoded_defs[pending.pop()]
+        if _OTHER_REF_PATTERN.search(encoded):
+            return None
+        for ref in _DEFS_REF_PATTERN.findall(encoded):
+            if ref not in encoded_defs:
+                return None
+            if ref not in referenced:
+                referenced.add(ref)
+                pending.append(ref)
+    return referenced
 
 
 # Adapted from https://github.com/openai/openai-python/blob/main/src/openai/lib/_pydantic.py
@@ -33,6 +198,9 @@ def _ensure_strict_json_schema(
     path: tuple[str, ...],
     root: dict[str, object],
 ) -> dict[str, Any]:
+    if isinstance(json_schema, _FrozenDict):
+        # Already strict, e.g. a cached definition
+        return json_schema
     if not is_dict(json_schema):
         raise TypeError(f"Expected {json_schema} to be a dictionary; path={path}")
 
@@ -0,0 +1,155 @@
+from __future__ import annotations
+
+import abc
+import hashlib
+import threading
+from collections import OrderedDict
+from collections.abc import Iterable
+from typing import TYPE_CHECKING, Any
+
+from .items import TResponseInputItem
+from .json_codec import get_json_codec
+
+if TYPE_CHECKING:
+    from .tool import Tool
+
+_CHARS_PER_TOKEN = 4
+# Every item and tool costs a few tokens for its framing, beyond its content
+_ITEM_OVERHEAD_TOKENS = 4
+_TOOL_OVERHEAD_TOKENS = 8
+
+
+class TokenEstimator(abc.ABC):
+    """Estimates how many tokens input items, instructions and tools take up, e.g. for budgeting or
+    compaction. Subclasses only implement `count_text_tokens()`.
+
+    Counts are cached by a hash of the content that was counted: the JSON of an input item, a text,
+    or the name, description and JSON schema of a tool, so equal content shares its count. Only the
+    hashes and counts are kept, not the content itself. One estimator is shared by all runs by
+    default, so the cache carries over from one run to the next, and it's safe to use from several
+    threads.
+    """
+
+    cache_counts: bool = True
+    """Whether counts are cached. Estimators whose counting is cheaper than hashing the content,
+    like `HeuristicTokenEstimator`, turn it off."""
+
+    def __init__(self, max_cached_items: int = 10_000):
+        """
+        Args:
+            max_cached_items: The maximum number of counts to cache. The least recently used counts
+                are evicted first.
+        """
+        self.max_cached_items = max_cached_items
+        self._counts: OrderedDict[bytes, int] = OrderedDict()
+        """Counts by the hash of the content, prefixed with its kind."""
+        self._lock = threading.Lock()
+
+    @abc.abstractmethod
+    def count_text_tokens(self, text: str) -> int:
+        """Returns the number of tokens in a text."""
+        pass
+
+    def estimate_text(self, text: str) -> int:
+        """Returns the number of tokens in a text, such as an agent's instructions."""
+        if not self.cache_counts:
+            return self.count_text_tokens(text)
+        return self._cached_count(b"text", text.encode(), 0)
+
+    def estimate_item(self, item: TResponseInputItem) -> int:
+        """Returns the number of tokens in an input item."""
+        return self._cached_count(b"item", get_json_codec().dumps(item), _ITEM_OVERHEAD_TOKENS)
+
+    def estimate_items(self, items: Iterable[TResponseInputItem]) -> int:
+        """Returns the number of tokens in a list of input items."""
+        return sum(self.estimate_item(item) for item in items)
+
+    def estimate_tool(self, tool: Tool) -> int:
+        """Returns the number of tokens a tool's definition takes up."""
+        definition = get_json_codec().dumps(_tool_definition(tool))
+        return self._cached_count(b"tool", definition, _TOOL_OVERHEAD_TOKENS)
+
+    def estimate_tools(self, tools: Iterable[Tool]) -> int:
+        """Returns the number of tokens the definitions of a list of tools take up."""
+        return sum(self.estimate_tool(tool) for tool in tools)
+
+    def clear_cache(self) -> None:
+        """Forgets all cached counts."""
+        with self._lock:
+            self._counts.clear()
+
+    def _cached_count(self, kind: bytes, content: bytes, overhead_tokens: int) -> int:
+        if not self.cache_counts:
+            return self.count_text_tokens(content.decode()) + overhead_tokens
+
+        key = kind + hashlib.blake2b(content, digest_size=16).digest()
+        with self._lock:
+            count = self._counts.get(key)
+            if count is not None:
+                self._counts.move_to_end(key)
+                return count
+
+        # Counting runs outside the lock, so that a slow tokenizer doesn't block other threads
+        count = self.count_text_tokens(content.decode()) + overhead_tokens
+        with self._lock:
+            self._counts[key] = count
+            if len(self._counts) > self.max_cached_items:
+                self._counts.popitem(last=False)
+        return count
+
+
+class HeuristicTokenEstimator(TokenEstimator):
+    """A fast estimator that assumes a token is 4 characters long, which is about right for English
+    text and JSON. It doesn't depend on any tokenizer. This is the default estimator.
+
+    Its counts aren't cached, since counting the characters of an item's JSON is cheaper than
+    hashing it."""
+
+    cache_counts = False
+
+    def count_text_tokens(self, text: str) -> int:
+        return -(-len(text) // _CHARS_PER_TOKEN)
+
+
+class TiktokenEstimator(TokenEstimator):
+    """An estimator that counts tokens exactly with [tiktoken](https://github.com/openai/tiktoken),
+    which needs to be installed. The framing of items and tools is still estimated.
+    """
+
+    def __init__(self, encoding_name: str = "o200k_base", max_cached_items: int = 10_000):
+        """
+        Args:
+            encoding_name: The tiktoken encoding to use. `o200k_base` is the encoding of the GPT-4o
+                and o-series models.
+            max_cached_items: The maximum number of counts to cache.
+        """
+        import tiktoken
+
+        super().__init__(max_cached_items=max_cached_items)
+        self._encoding = tiktoken.get_encoding(encoding_name)
+
+    def count_text_tokens(self, text: str) -> int:
+        return len(self._encoding.encode(text, disallowed_special=()))
+
+
+def _tool_definition(tool: Tool) -> list[Any]:
+    """The parts of a tool that are sent to the model."""
+    from .tool import FunctionTool
+
+    if isinstance(tool, FunctionTool):
+        return [tool.name, tool.description, tool.params_json_schema]
+    return [tool.name]
+
+
+_default_token_estimator: TokenEstimator = HeuristicTokenEstimator()
+
+
+def get_default_token_estimator() -> TokenEstimator:
+    """Returns the token estimator that runs use, unless `RunConfig.token_estimator` is set."""
+    return _default_token_estimator
+
+
+def set_default_token_estimator(estimator: TokenEstimator) -> None:
+    """Sets the token estimator that runs use, unless `RunConfig.token_estimator` is set."""
+    global _default_token_estimator
+    _default_token_estimator = estimator
@@ -1,10 +1,11 @@
 from __future__ import annotations
 
 import inspect
-import json
-from collections.abc import Awaitable
+import logging
+import threading
+from collections.abc import Awaitable, Iterable
 from dataclasses import dataclass
-from typing import Any, Callable, Literal, Union, overload
+from typing import TYPE_CHECKING, Any, Callable, Literal, Union, overload
 
 from openai.types.responses.file_search_tool_param import Filters, RankingOptions
 from openai.types.responses.web_search_tool_param import UserLocation
@@ -15,9 +16,10 @@ from . import _debug, _utils
 from ._utils import MaybeAwaitable
 from .computer import AsyncComputer, Computer
 from .exceptions import ModelBehaviorError
-from .function_schema import DocstringStyle, function_schema
+from .function_schema import DocstringStyle, FuncSchema, function_schema
 from .logger import logger
 from .run_context import RunContextWrapper
+from .schema_cache import function_schema_key, get_schema_cache
 from .tracing import SpanError
 
 ToolParams = ParamSpec("ToolParams")
@@ -27,6 +29,10 @@ ToolFunctionWithContext = Callable[Concatenate[RunContextWrapper[Any], ToolParam
 
 ToolFunction = Union[ToolFunctionWithoutContext[ToolParams], ToolFunctionWithContext[ToolParams]]
 
+# Guards the deferred schema builds. A module-level lock, rather than one per tool, keeps tools
+# copyable and picklable; builds happen at most once per tool, so contention is negligible.
+_schema_lock = threading.RLock()
+
 
 @dataclass
 class FunctionTool:
@@ -58,6 +64,64 @@ class FunctionTool:
     """Whether the JSON schema is in strict mode. We **strongly** recommend setting this to True,
     as it increases the likelihood of correct JSON input."""
 
+    @classmethod
+    def deferred(
+        cls,
+        name: str,
+        load_schema: Callable[[], tuple[str, dict[str, Any]]],
+        on_invoke_tool: Callable[[RunContextWrapper[Any], str], Awaitable[str]],
+        strict_json_schema: bool = True,
+    ) -> FunctionTool:
+        """Creates a tool whose description and parameters schema are only built when they're
+        first accessed. Used by `function_tool(defer_schema=True)`, so that defining a tool doesn't
+        pay for parsing docstrings and building JSON schemas.
+
+        Args:
+            name: The name of the tool.
+            load_schema: Returns the description and the JSON schema of the parameters. Called at
+                most once, on first access.
+            on_invoke_tool: Invokes the tool, see `FunctionTool.on_invoke_tool`.
+            strict_json_schema: Whether the JSON schema is in strict mode.
+        """
+        tool = cls(
+            name=name,
+            description="",
+            params_json_schema={},
+            on_invoke_tool=on_invoke_tool,
+            strict_json_schema=strict_json_schema,
+        )
+        # Removing the placeholders makes the first access go through `__getattr__`
+        del tool.__dict__["description"]
+        del tool.__dict__["params_json_schema"]
+        tool.__dict__["_load_schema"] = load_schema
+        return tool
+
+    @property
+    def schema_loaded(self) -> bool:
+        """Whether the description and parameters schema have been built."""
+        return "params_json_schema" in self.__dict__
+
+    def load_schema(self) -> None:
+        """Builds the description and parameters schema now, if they are deferred. Safe to call
+        from several threads.
+        """
+        if self.schema_loaded:
+            return
+        with _schema_lock:
+            if not self.schema_loaded:
+                description, params_json_schema = self.__dict__["_load_schema"]()
+                self.__dict__["description"] = description
+                self.__dict__["params_json_schema"] = params_json_schema
+
+    if not TYPE_CHECKING:
+        # Only called for attributes that aren't set, i.e. the deferred fields
+
+        def __getattr__(self, name: str) -> Any:
+            if name in ("description", "params_json_schema") and "_load_schema" in self.__dict__:
+                self.load_schema()
+                return self.__dict__[name]
+            raise AttributeError(f"{type(self).__name__!r} object has no attribute {name!r}")
+
 
 @dataclass
 class FileSearchTool:
@@ -120,6 +184,34 @@ Tool = Union[FunctionTool, FileSearchTool, WebSearchTool, ComputerTool]
 """A tool that can be used in an agent."""
 
 
+def load_function_tool_schemas(
+    tools: Iterable[Tool], *, background: bool = False
+) -> threading.Thread | None:
+    """Builds the deferred schemas of function tools ahead of time, so that the first run using
+    them doesn't wait for it. Call this at startup, once the tools are defined.
+
+    Args:
+        tools: The tools to build the schemas of. Tools other than function tools are skipped.
+        background: If True, the schemas are built in a daemon thread, which is returned.
+
+    Returns:
+        The thread building the schemas if `background` is True, None otherwise.
+    """
+    function_tools = [tool for tool in tools if isinstance(tool, FunctionTool)]
+
+    def load() -> None:
+        for tool in function_tools:
+            tool.load_schema()
+
+    if not background:
+        load()
+        return None
+
+    thread = threading.Thread(target=load, name="load-function-tool-schemas", daemon=True)
+    thread.start()
+    return thread
+
+
 def default_tool_error_function(ctx: RunContextWrapper[Any], error: Exception) -> str:
     """The default tool error function, which just returns a generic error message."""
     return f"An error occurred while running the tool. Please try again. Error: {str(error)}"
@@ -137,6 +229,7 @@ def function_tool(
     docstring_style: DocstringStyle | None = None,
     use_docstring_info: bool = True,
     failure_error_function: ToolErrorFunction | None = None,
+    defer_schema: bool = False,
 ) -> FunctionTool:
     """Overload for usage as @function_tool (no parentheses)."""
     ...
@@ -150,6 +243,7 @@ def function_tool(
     docstring_style: DocstringStyle | None = None,
     use_docstring_info: bool = True,
     failure_error_function: ToolErrorFunction | None = None,
+    defer_schema: bool = False,
 ) -> Callable[[ToolFunction[...]], FunctionTool]:
     """Overload for usage as @function_tool(...)."""
     ...
@@ -163,6 +257,7 @@ def function_tool(
     docstring_style: DocstringStyle | None = None,
     use_docstring_info: bool = True,
     failure_error_function: ToolErrorFunction | None = default_tool_error_function,
+    defer_schema: bool = False,
 ) -> FunctionTool | Callable[[ToolFunction[...]], FunctionTool]:
     """
     Decorator to create a FunctionTool from a function. By default, we will:
@@ -186,46 +281,53 @@ def function_tool(
         failure_error_function: If provided, use this function to generate an error message when
             the tool call fails. The error message is sent to the LLM. If you pass None, then no
             error message will be sent and instead an Exception will be raised.
+        defer_schema: If True, the docstring is only parsed and the tool's description and
+            parameters schema are only built when they're first accessed, typically when the tool
+            is first sent to the model. This speeds up defining many tools, but errors in the
+            function's signature are only raised then, too. See `load_function_tool_schemas()` to
+            build them ahead of time.
     """
 
     def _create_function_tool(the_func: ToolFunction[...]) -> FunctionTool:
-        schema = function_schema(
-            func=the_func,
-            name_override=name_override,
-            description_override=description_override,
-            docstring_style=docstring_style,
-            use_docstring_info=use_docstring_info,
-        )
+        name = name_override or the_func.__name__
+        func_schema: FuncSchema | None = None
+
+        def get_schema() -> FuncSchema:
+            nonlocal func_schema
+            if func_schema is None:
+                with _schema_lock:
+                    if func_schema is None:
+                        func_schema = function_schema(
+                            func=the_func,
+                            name_override=name_override,
+                            description_override=description_override,
+                            docstring_style=docstring_style,
+                            use_docstring_info=use_docstring_info,
+                        )
+            return func_schema
 
         async def _on_invoke_tool_impl(ctx: RunContextWrapper[Any], input: str) -> str:
-            try:
-                json_data: dict[str, Any] = json.loads(input) if input else {}
-            except Exception as e:
-                if _debug.DONT_LOG_TOOL_DATA:
-                    logger.debug(f"Invalid JSON input for tool {schema.name}")
-                else:
-                    logger.debug(f"Invalid JSON input for tool {schema.name}: {input}")
-                raise ModelBehaviorError(
-                    f"Invalid JSON input for tool {schema.name}: {input}"
-                ) from e
-
+            schema = get_schema()
             if _debug.DONT_LOG_TOOL_DATA:
-                logger.debug(f"Invoking tool {schema.name}")
-            else:
-                logger.debug(f"Invoking tool {schema.name} with input {input}")
+                logger.debug(f"Invoking tool {name}")
+            elif logger.isEnabledFor(logging.DEBUG):
+                logger.debug(f"Invoking tool {name} with input {input}")
 
             try:
-                parsed = (
-                    schema.params_pydantic_model(**json_data)
-                    if json_data
-                    else schema.params_pydantic_model()
-                )
+                # Parses and validates the arguments in one pass, without an intermediate dict
+                parsed = schema.validate_json(input)
             except ValidationError as e:
-                raise ModelBehaviorError(f"Invalid JSON input for tool {schema.name}: {e}") from e
+                if any(error["type"] == "json_invalid" for error in e.errors()):
+                    if _debug.DONT_LOG_TOOL_DATA:
+                        logger.debug(f"Invalid JSON input for tool {name}")
+                    elif logger.isEnabledFor(logging.DEBUG):
+                        logger.debug(f"Invalid JSON input for tool {name}: {input}")
+                    raise ModelBehaviorError(f"Invalid JSON input for tool {name}: {input}") from e
+                raise ModelBehaviorError(f"Invalid JSON input for tool {name}: {e}") from e
 
             args, kwargs_dict = schema.to_call_args(parsed)
 
-            if not _debug.DONT_LOG_TOOL_DATA:
+            if not _debug.DONT_LOG_TOOL_DATA and logger.isEnabledFor(logging.DEBUG):
                 logger.debug(f"Tool call args: {args}, kwargs: {kwargs_dict}")
 
             if inspect.iscoroutinefunction(the_func):
@@ -240,9 +342,9 @@ def function_tool(
                     result = the_func(*args, **kwargs_dict)
 
             if _debug.DONT_LOG_TOOL_DATA:
-                logger.debug(f"Tool {schema.name} completed.")
-            else:
-                logger.debug(f"Tool {schema.name} returned {result}")
+                logger.debug(f"Tool {name} completed.")
+            elif logger.isEnabledFor(logging.DEBUG):
+                logger.debug(f"Tool {name} returned {result}")
 
             return str(result)
 
@@ -261,17 +363,51 @@ def function_tool(
                     SpanError(
                         message="Error running tool (non-fatal)",
                         data={
-                            "tool_name": schema.name,
+                            "tool_name": name,
                             "error": str(e),
                         },
                     )
                 )
                 return result
 
+        def load_schema() -> tuple[str, dict[str, Any]]:
+            cache = get_schema_cache()
+            key = (
+                function_schema_key(
+                    the_func,
+                    name_override=name_override,
+                    description_override=description_override,
+                    docstring_style=docstring_style,
+                    use_docstring_info=use_docstring_info,
+                )
+                if cache is not None
+                else None
+            )
+            if cache is None or key is None:
+                schema = get_schema()
+                return schema.description or "", schema.params_json_schema
+
+            # On a cache hit, the pydantic model for the arguments is only built once the tool is
+            # invoked
+            cached = cache.get(key)
+            if cached is not None:
+                return cached["description"], cached["params_json_schema"]
+
+            schema = get_schema()
+            description = schema.description or ""
+            cache.set(
+                key, {"description": description, "params_json_schema": schema.params_json_schema}
+            )
+            return description, schema.params_json_schema
+
+        if defer_schema:
+            return FunctionTool.deferred(name, load_schema, _on_invoke_tool)
+
+        description, params_json_schema = load_schema()
         return FunctionTool(
-            name=schema.name,
-            description=schema.description or "",
-            params_json_schema=schema.params_json_schema,
+            name=name,
+            description=description,
+            params_json_schema=params_json_schema,
             on_invoke_tool=_on_invoke_tool,
         )
 
@@ -9,6 +9,7 @@ from typing import Any
 
 import httpx
 
+from ..json_codec import get_json_codec
 from .logger import logger
 from .processor_interface import TracingExporter, TracingProcessor
 from .spans import Span
@@ -78,8 +79,9 @@ class BackendSpanExporter(TracingExporter):
             logger.warning("OPENAI_API_KEY is not set, skipping trace export")
             return
 
-        data = [item.export() for item in items if item.export()]
-        payload = {"data": data}
+        exported = (item.export() for item in items)
+        # Encoded once up front, rather than on every retry
+        content = get_json_codec().dumps({"data": [data for data in exported if data]})
 
         headers = {
             "Authorization": f"Bearer {self.api_key}",
@@ -93,7 +95,7 @@ class BackendSpanExporter(TracingExporter):
         while True:
             attempt += 1
             try:
-                response = self._client.post(url=self.endpoint, headers=headers, json=payload)
+                response = self._client.post(url=self.endpoint, headers=headers, content=content)
 
                 # If the response is successful, break out of the loop
                 if response.status_code < 300:
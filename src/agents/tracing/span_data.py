@@ -170,19 +170,32 @@ class CustomSpanData(SpanData):
 
 
 class GuardrailSpanData(SpanData):
-    __slots__ = ("name", "triggered")
+    __slots__ = ("name", "triggered", "cache_hit", "cache_hit_rate")
 
-    def __init__(self, name: str, triggered: bool = False):
+    def __init__(
+        self,
+        name: str,
+        triggered: bool = False,
+        cache_hit: bool | None = None,
+        cache_hit_rate: float | None = None,
+    ):
         self.name = name
         self.triggered = triggered
+        self.cache_hit = cache_hit
+        self.cache_hit_rate = cache_hit_rate
 
     @property
     def type(self) -> str:
         return "guardrail"
 
     def export(self) -> dict[str, Any]:
-        return {
+        data: dict[str, Any] = {
             "type": self.type,
             "name": self.name,
             "triggered": self.triggered,
         }
+        # Only guardrails with a cache report it
+        if self.cache_hit is not None:
+            data["cache_hit"] = self.cache_hit
+            data["cache_hit_rate"] = self.cache_hit_rate
+        return data
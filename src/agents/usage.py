@@ -15,8 +15,21 @@ class Usage:
     total_tokens: int = 0
     """Total tokens sent and received, across all requests."""
 
+    cancelled_requests: int = 0
+    """Requests that were cancelled before they completed, or never started, because an input
+    guardrail tripwire was triggered. They're not included in `requests`."""
+
+    estimated_input_tokens_saved: int = 0
+    """The estimated input tokens of the cancelled requests that were never sent, as counted by the
+    run's token estimator. Requests that were cancelled after being sent may still be billed for
+    their input, so they don't count towards it. They're not included in `input_tokens`."""
+
     def add(self, other: "Usage") -> None:
         self.requests += other.requests if other.requests else 0
         self.input_tokens += other.input_tokens if other.input_tokens else 0
         self.output_tokens += other.output_tokens if other.output_tokens else 0
         self.total_tokens += other.total_tokens if other.total_tokens else 0
+        self.cancelled_requests += other.cancelled_requests if other.cancelled_requests else 0
+        self.estimated_input_tokens_saved += (
+            other.estimated_input_tokens_saved if other.estimated_input_tokens_saved else 0
+        )
@@ -1,5 +1,6 @@
 from __future__ import annotations
 
+import asyncio
 import json
 from typing import Any
 
@@ -16,11 +17,15 @@ from agents import (
     ModelBehaviorError,
     OutputGuardrail,
     OutputGuardrailTripwireTriggered,
+    RunConfig,
     RunContextWrapper,
+    RunHooks,
     Runner,
     UserError,
+    function_tool,
     handoff,
 )
+from agents.tracing import CustomSpanData
 
 from .fake_model import FakeModel
 from .test_responses import (
@@ -31,6 +36,7 @@ from .test_responses import (
     get_text_input_item,
     get_text_message,
 )
+from .testing_processor import fetch_ordered_spans
 
 
 @pytest.mark.asyncio
@@ -552,3 +558,258 @@ async def test_output_guardrail_tripwire_triggered_causes_exception():
 
     with pytest.raises(OutputGuardrailTripwireTriggered):
         await Runner.run(agent, input="user_message")
+
+
+class SlowModel(FakeModel):
+    """Waits before responding, and records whether the call was cancelled."""
+
+    def __init__(self, delay: float):
+        super().__init__()
+        self.delay = delay
+        self.cancelled = False
+
+    async def get_response(self, *args: Any, **kwargs: Any):
+        try:
+            await asyncio.sleep(self.delay)
+        except asyncio.CancelledError:
+            self.cancelled = True
+            raise
+        return await super().get_response(*args, **kwargs)
+
+
+def _tripwire_guardrail(delay: float = 0) -> InputGuardrail[Any]:
+    async def guardrail_function(
+        context: RunContextWrapper[Any], agent: Agent[Any], input: Any
+    ) -> GuardrailFunctionOutput:
+        await asyncio.sleep(delay)
+        return GuardrailFunctionOutput(output_info=None, tripwire_triggered=True)
+
+    return InputGuardrail(guardrail_function=guardrail_function, name="tripwire")
+
+
+@pytest.mark.asyncio
+async def test_input_guardrail_tripwire_cancels_model_call():
+    model = SlowModel(delay=10)
+    model.set_next_output([get_text_message("done")])
+    agent = Agent(
+        name="test",
+        model=model,
+        instructions="Be helpful.",
+        input_guardrails=[_tripwire_guardrail()],
+    )
+
+    with pytest.raises(InputGuardrailTripwireTriggered) as exc_info:
+        await asyncio.wait_for(Runner.run(agent, input="user_message"), timeout=5)
+
+    assert model.cancelled
+    usage = exc_info.value.usage
+    assert usage is not None
+    assert usage.requests == 0
+    assert usage.cancelled_requests == 1
+    # The request was already sent, so its input may be billed
+    assert usage.estimated_input_tokens_saved == 0
+
+    [span] = _cancelled_model_call_spans()
+    assert span.span_data.data["guardrail"] == "tripwire"
+    assert span.span_data.data["request_sent"] is True
+    assert span.span_data.data["estimated_input_tokens_saved"] == 0
+
+
+@pytest.mark.asyncio
+async def test_input_guardrail_tripwire_before_the_model_call_saves_its_input():
+    class SlowStartHooks(RunHooks[Any]):
+        async def on_agent_start(self, context: RunContextWrapper[Any], agent: Agent[Any]) -> None:
+            await asyncio.sleep(10)
+
+    model = FakeModel()
+    model.set_next_output([get_text_message("done")])
+    agent = Agent(
+        name="test",
+        model=model,
+        instructions="Be helpful.",
+        input_guardrails=[_tripwire_guardrail()],
+    )
+
+    with pytest.raises(InputGuardrailTripwireTriggered) as exc_info:
+        await asyncio.wait_for(
+            Runner.run(agent, input="user_message", hooks=SlowStartHooks()), timeout=5
+        )
+
+    # The model was never called
+    assert len(model.turn_outputs) == 1
+    usage = exc_info.value.usage
+    assert usage is not None
+    assert usage.cancelled_requests == 1
+    assert usage.estimated_input_tokens_saved > 0
+
+    [span] = _cancelled_model_call_spans()
+    assert span.span_data.data["request_sent"] is False
+    assert span.span_data.data["estimated_input_tokens_saved"] == usage.estimated_input_tokens_saved
+
+
+def _cancelled_model_call_spans() -> list[Any]:
+    return [
+        span
+        for span in fetch_ordered_spans()
+        if isinstance(span.span_data, CustomSpanData)
+        and span.span_data.name == "Cancelled model call"
+    ]
+
+
+@pytest.mark.asyncio
+async def test_input_guardrail_tripwire_cancels_running_tools():
+    tool_cancelled = asyncio.Event()
+
+    @function_tool
+    async def slow_tool() -> str:
+        try:
+            await asyncio.sleep(10)
+        except asyncio.CancelledError:
+            tool_cancelled.set()
+            raise
+        return "done"
+
+    model = FakeModel()
+    model.set_next_output([get_function_tool_call("slow_tool", "{}")])
+    agent = Agent(
+        name="test",
+        model=model,
+        tools=[slow_tool],
+        input_guardrails=[_tripwire_guardrail(delay=0.05)],
+    )
+
+    with pytest.raises(InputGuardrailTripwireTriggered) as exc_info:
+        await asyncio.wait_for(Runner.run(agent, input="user_message"), timeout=5)
+
+    assert tool_cancelled.is_set()
+    # The model call had finished, so it isn't recorded as cancelled
+    usage = exc_info.value.usage
+    assert usage is not None
+    assert usage.cancelled_requests == 0
+    assert usage.estimated_input_tokens_saved == 0
+    assert _cancelled_model_call_spans() == []
+
+
+@pytest.mark.asyncio
+async def test_model_error_cancels_input_guardrails():
+    guardrail_finished = False
+
+    async def guardrail_function(
+        context: RunContextWrapper[Any], agent: Agent[Any], input: Any
+    ) -> GuardrailFunctionOutput:
+        nonlocal guardrail_finished
+        await asyncio.sleep(10)
+        guardrail_finished = True
+        return GuardrailFunctionOutput(output_info=None, tripwire_triggered=False)
+
+    model = FakeModel()
+    model.set_next_output(ValueError("model failed"))
+    agent = Agent(
+        name="test",
+        model=model,
+        input_guardrails=[InputGuardrail(guardrail_function=guardrail_function)],
+    )
+
+    with pytest.raises(ValueError):
+        await asyncio.wait_for(Runner.run(agent, input="user_message"), timeout=5)
+
+    assert not guardrail_finished
+
+
+@pytest.mark.asyncio
+async def test_sequential_input_guardrails_skip_the_model_call():
+    model = FakeModel()
+    model.set_next_output([get_text_message("done")])
+    agent = Agent(name="test", model=model, input_guardrails=[_tripwire_guardrail(delay=0.05)])
+
+    with pytest.raises(InputGuardrailTripwireTriggered) as exc_info:
+        await Runner.run(
+            agent,
+            input="user_message",
+            run_config=RunConfig(input_guardrail_strategy="sequential"),
+        )
+
+    # The model was never called
+    assert len(model.turn_outputs) == 1
+    usage = exc_info.value.usage
+    assert usage is not None
+    assert usage.requests == 0
+    assert usage.cancelled_requests == 1
+    assert usage.estimated_input_tokens_saved > 0
+
+
+@pytest.mark.asyncio
+async def test_sequential_input_guardrails_pass():
+    model = FakeModel()
+    model.set_next_output([get_text_message("done")])
+    guardrail = InputGuardrail(
+        guardrail_function=lambda context, agent, input: GuardrailFunctionOutput(
+            output_info=None, tripwire_triggered=False
+        )
+    )
+    agent = Agent(name="test", model=model, input_guardrails=[guardrail])
+
+    result = await Runner.run(
+        agent, input="user_message", run_config=RunConfig(input_guardrail_strategy="sequential")
+    )
+
+    assert result.final_output == "done"
+    assert len(result.input_guardrail_results) == 1
+    assert guardrail.stats.runs == 1
+
+
+@pytest.mark.asyncio
+async def test_race_with_budget_skips_the_model_call_within_budget():
+    model = FakeModel()
+    model.set_next_output([get_text_message("done")])
+    agent = Agent(name="test", model=model, input_guardrails=[_tripwire_guardrail(delay=0.01)])
+
+    with pytest.raises(InputGuardrailTripwireTriggered):
+        await Runner.run(
+            agent,
+            input="user_message",
+            run_config=RunConfig(
+                input_guardrail_strategy="race_with_budget", input_guardrail_budget=5
+            ),
+        )
+
+    assert len(model.turn_outputs) == 1
+
+
+@pytest.mark.asyncio
+async def test_race_with_budget_starts_the_model_after_the_budget():
+    model = SlowModel(delay=10)
+    model.set_next_output([get_text_message("done")])
+    agent = Agent(name="test", model=model, input_guardrails=[_tripwire_guardrail(delay=0.1)])
+
+    with pytest.raises(InputGuardrailTripwireTriggered) as exc_info:
+        await Runner.run(
+            agent,
+            input="user_message",
+            run_config=RunConfig(
+                input_guardrail_strategy="race_with_budget", input_guardrail_budget=0.01
+            ),
+        )
+
+    # The model call started once the budget ran out, and was cancelled by the tripwire
+    assert model.cancelled
+    assert exc_info.value.usage is not None
+    assert exc_info.value.usage.cancelled_requests == 1
+
+
+@pytest.mark.asyncio
+async def test_sequential_input_guardrails_streamed():
+    model = FakeModel()
+    model.set_next_output([get_text_message("done")])
+    agent = Agent(name="test", model=model, input_guardrails=[_tripwire_guardrail(delay=0.05)])
+
+    result = Runner.run_streamed(
+        agent,
+        input="user_message",
+        run_config=RunConfig(input_guardrail_strategy="sequential"),
+    )
+    with pytest.raises(InputGuardrailTripwireTriggered):
+        async for _ in result.stream_events():
+            pass
+
+    assert len(model.turn_outputs) == 1
@@ -1,9 +1,20 @@
 from __future__ import annotations
 
+import asyncio
 import json
+from collections.abc import AsyncIterator
 from typing import Any
 
 import pytest
+from openai.types.responses import (
+    ResponseCompletedEvent,
+    ResponseContentPartAddedEvent,
+    ResponseFunctionToolCall,
+    ResponseOutputItemDoneEvent,
+    ResponseOutputText,
+    ResponseTextDeltaEvent,
+)
+from pydantic import BaseModel
 from typing_extensions import TypedDict
 
 from agents import (
@@ -13,18 +24,22 @@ from agents import (
     HandoffInputData,
     InputGuardrail,
     InputGuardrailTripwireTriggered,
+    ModelBehaviorError,
     OutputGuardrail,
     OutputGuardrailTripwireTriggered,
     RunContextWrapper,
     Runner,
+    StreamedTextWindow,
+    StreamingOutputGuardrail,
     UserError,
+    function_tool,
     handoff,
 )
-from agents.items import RunItem
+from agents.items import RunItem, TResponseStreamEvent
 from agents.run import RunConfig
-from agents.stream_events import AgentUpdatedStreamEvent
+from agents.stream_events import AgentUpdatedStreamEvent, PartialOutputStreamEvent
 
-from .fake_model import FakeModel
+from .fake_model import FakeModel, get_response_obj
 from .test_responses import (
     get_final_output_message,
     get_function_tool,
@@ -684,3 +699,439 @@ async def test_streaming_events():
     assert len(agent_data) == 2, "should have 2 agent updated events"
     assert agent_data[0].new_agent == agent_2, "should have started with agent_2"
     assert agent_data[1].new_agent == agent_1, "should have handed off to agent_1"
+
+
+class ItemByItemStreamingModel(FakeModel):
+    """Streams a `response.output_item.done` event per output item, and pauses before completing
+    the response, recording which tools had been called by then."""
+
+    def __init__(self, calls: list[str]):
+        super().__init__()
+        self.calls = calls
+        self.calls_before_completion: list[list[str]] = []
+
+    async def stream_response(
+        self, *args: Any, **kwargs: Any
+    ) -> AsyncIterator[TResponseStreamEvent]:
+        output = self.get_next_output()
+        assert not isinstance(output, Exception)
+        for index, item in enumerate(output):
+            yield ResponseOutputItemDoneEvent(
+                item=item, output_index=index, type="response.output_item.done"
+            )
+        await asyncio.sleep(0.05)
+        self.calls_before_completion.append(list(self.calls))
+        yield ResponseCompletedEvent(type="response.completed", response=get_response_obj(output))
+
+
+def _tool_call(name: str, call_id: str) -> ResponseFunctionToolCall:
+    return ResponseFunctionToolCall(
+        id="1", call_id=call_id, type="function_call", name=name, arguments="{}"
+    )
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("run_tools_while_streaming", [True, False])
+async def test_tools_run_while_streaming(run_tools_while_streaming: bool):
+    calls: list[str] = []
+
+    @function_tool
+    async def slow_tool() -> str:
+        calls.append("slow_tool")
+        await asyncio.sleep(0.01)
+        return "slow_result"
+
+    @function_tool
+    def fast_tool() -> str:
+        calls.append("fast_tool")
+        return "fast_result"
+
+    model = ItemByItemStreamingModel(calls)
+    agent = Agent(name="test", model=model, tools=[slow_tool, fast_tool])
+    model.add_multiple_turn_outputs(
+        [
+            [_tool_call("slow_tool", "call_1"), _tool_call("fast_tool", "call_2")],
+            [get_text_message("done")],
+        ]
+    )
+
+    result = Runner.run_streamed(
+        agent,
+        input="test",
+        run_config=RunConfig(run_tools_while_streaming=run_tools_while_streaming),
+    )
+    async for _ in result.stream_events():
+        pass
+
+    if run_tools_while_streaming:
+        # Both tools were started before the response finished streaming
+        assert sorted(model.calls_before_completion[0]) == ["fast_tool", "slow_tool"]
+    else:
+        assert model.calls_before_completion[0] == []
+
+    # Each tool ran exactly once, and outputs are in the order the model called the tools
+    assert sorted(calls) == ["fast_tool", "slow_tool"]
+    assert result.final_output == "done"
+    outputs = [item.output for item in result.new_items if item.type == "tool_call_output_item"]
+    assert outputs == ["slow_result", "fast_result"]
+
+
+@pytest.mark.asyncio
+async def test_tools_run_while_streaming_skip_handoffs():
+    calls: list[str] = []
+    model = ItemByItemStreamingModel(calls)
+    agent_2 = Agent(name="test_2", model=model)
+    agent_1 = Agent(name="test_1", model=model, handoffs=[agent_2])
+    model.add_multiple_turn_outputs(
+        [
+            [get_handoff_tool_call(agent_2)],
+            [get_text_message("done")],
+        ]
+    )
+
+    result = Runner.run_streamed(
+        agent_1, input="test", run_config=RunConfig(run_tools_while_streaming=True)
+    )
+    async for _ in result.stream_events():
+        pass
+
+    # The handoff is not treated as a function tool; it's processed once the response is complete
+    assert result.last_agent == agent_2
+    assert result.final_output == "done"
+
+
+class TextDeltaStreamingModel(FakeModel):
+    """Streams the text of the final output message in deltas of a few characters."""
+
+    async def stream_response(
+        self, *args: Any, **kwargs: Any
+    ) -> AsyncIterator[TResponseStreamEvent]:
+        output = self.get_next_output()
+        assert not isinstance(output, Exception)
+        text = "".join(
+            part.text
+            for item in output
+            if item.type == "message"
+            for part in item.content
+            if part.type == "output_text"
+        )
+        yield ResponseContentPartAddedEvent(
+            content_index=0,
+            item_id="1",
+            output_index=0,
+            part=ResponseOutputText(text="", type="output_text", annotations=[]),
+            type="response.content_part.added",
+        )
+        for start in range(0, len(text), 3):
+            yield ResponseTextDeltaEvent(
+                content_index=0,
+                delta=text[start : start + 3],
+                item_id="1",
+                output_index=0,
+                type="response.output_text.delta",
+            )
+        yield ResponseCompletedEvent(type="response.completed", response=get_response_obj(output))
+
+
+class Story(BaseModel):
+    title: str
+    paragraphs: list[str]
+
+
+async def _partial_outputs(agent: Agent[Any], run_config: RunConfig) -> list[Any]:
+    result = Runner.run_streamed(agent, input="test", run_config=run_config)
+    outputs = []
+    async for event in result.stream_events():
+        if isinstance(event, PartialOutputStreamEvent):
+            assert event.agent == agent
+            outputs.append(event.output)
+    return outputs + [result.final_output]
+
+
+@pytest.mark.asyncio
+async def test_stream_partial_output():
+    model = TextDeltaStreamingModel()
+    agent = Agent(name="test", model=model, output_type=Story)
+    story = Story(title="A title", paragraphs=["First paragraph.", "Second one."])
+    model.set_next_output([get_final_output_message(story.model_dump_json())])
+
+    outputs = await _partial_outputs(agent, RunConfig(stream_partial_output=True))
+
+    assert outputs[-1] == story
+    partial_outputs = outputs[:-1]
+    assert partial_outputs, "Expected partial outputs"
+    assert all(isinstance(output, Story) for output in partial_outputs)
+    # Nothing validates until the required fields have started streaming
+    assert partial_outputs[0] == Story(title="A title", paragraphs=[])
+    assert Story(title="A title", paragraphs=["First"]) in partial_outputs
+    assert partial_outputs[-1] == story
+    # Only changes are sent
+    assert all(a != b for a, b in zip(partial_outputs, partial_outputs[1:]))
+
+
+@pytest.mark.asyncio
+async def test_stream_partial_output_wrapped_type():
+    model = TextDeltaStreamingModel()
+    agent = Agent(name="test", model=model, output_type=list[int])
+    model.set_next_output([get_final_output_message(json.dumps({"response": [10, 20, 30]}))])
+
+    outputs = await _partial_outputs(agent, RunConfig(stream_partial_output=True))
+
+    assert all(isinstance(output, list) for output in outputs)
+    assert [10, 20] in outputs
+    assert outputs[-1] == [10, 20, 30]
+
+
+@pytest.mark.asyncio
+async def test_stream_partial_output_disabled_or_plain_text():
+    model = TextDeltaStreamingModel()
+    story = Story(title="A title", paragraphs=["First paragraph."])
+    model.set_next_output([get_final_output_message(story.model_dump_json())])
+    assert await _partial_outputs(
+        Agent(name="test", model=model, output_type=Story), RunConfig()
+    ) == [story]
+
+    model.set_next_output([get_text_message("some text")])
+    agent = Agent(name="test", model=model)
+    outputs = await _partial_outputs(agent, RunConfig(stream_partial_output=True))
+    assert outputs == ["some text"]
+
+
+@pytest.mark.asyncio
+async def test_stream_partial_output_invalid_json():
+    model = TextDeltaStreamingModel()
+    agent = Agent(name="test", model=model, output_type=Story)
+    model.set_next_output([get_final_output_message('{"title": "x", "paragraphs": [] oops')])
+
+    result = Runner.run_streamed(
+        agent, input="test", run_config=RunConfig(stream_partial_output=True)
+    )
+    partial_outputs = []
+    with pytest.raises(ModelBehaviorError):
+        async for event in result.stream_events():
+            if isinstance(event, PartialOutputStreamEvent):
+                partial_outputs.append(event.output)
+
+    # Partial outputs stop once the JSON is invalid; the final validation reports the error
+    assert partial_outputs[-1] == Story(title="x", paragraphs=[])
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("overflow_policy", ["block", "coalesce_text_deltas", "drop_raw_events"])
+async def test_bounded_stream_queue_with_slow_consumer(overflow_policy: Any):
+    model = TextDeltaStreamingModel()
+    agent = Agent(name="test", model=model)
+    text = "A long message that is streamed in many small deltas. " * 10
+    model.set_next_output([get_text_message(text)])
+
+    result = Runner.run_streamed(
+        agent,
+        input="test",
+        run_config=RunConfig(stream_queue_max_size=5, stream_queue_overflow_policy=overflow_policy),
+    )
+    deltas = []
+    run_items = []
+    async for event in result.stream_events():
+        await asyncio.sleep(0)
+        if event.type == "raw_response_event" and isinstance(event.data, ResponseTextDeltaEvent):
+            deltas.append(event.data.delta)
+        elif event.type == "run_item_stream_event":
+            run_items.append(event.name)
+
+    assert result.final_output == text
+    assert run_items == ["message_output_created"]
+    # The queue may overshoot its size for events that are always delivered, like the sentinel
+    assert result.queue_stats.high_water_mark <= 6
+    if overflow_policy == "drop_raw_events":
+        assert result.queue_stats.dropped_events > 0
+        assert len("".join(deltas)) < len(text)
+    else:
+        assert "".join(deltas) == text
+    if overflow_policy == "coalesce_text_deltas":
+        assert result.queue_stats.coalesced_events > 0
+        assert len(deltas) < len(text) / 3
+    if overflow_policy == "block":
+        assert result.queue_stats.blocked_puts > 0
+
+
+@pytest.mark.asyncio
+async def test_bounded_stream_queue_does_not_block_run_after_consumer_stops():
+    model = TextDeltaStreamingModel()
+    agent = Agent(name="test", model=model)
+    text = "A long message that is streamed in many small deltas. " * 10
+    model.set_next_output([get_text_message(text)])
+
+    result = Runner.run_streamed(agent, input="test", run_config=RunConfig(stream_queue_max_size=2))
+    events = result.stream_events()
+    async for _ in events:
+        # Stop reading once the run is waiting for room in the queue
+        while result.queue_stats.blocked_puts == 0:
+            await asyncio.sleep(0)
+        break
+    await events.aclose()  # type: ignore[attr-defined]
+
+    # The run finishes in the background, rather than waiting forever for room in the queue
+    assert result._run_impl_task is not None
+    await asyncio.wait_for(result._run_impl_task, timeout=5)
+    assert result.final_output == text
+
+
+@pytest.mark.asyncio
+async def test_stream_events_coalesces_text_deltas():
+    model = TextDeltaStreamingModel()
+    agent = Agent(name="test", model=model)
+    text = "Some text that is streamed in many small deltas."
+    model.set_next_output([get_text_message(text)])
+
+    result = Runner.run_streamed(agent, input="test")
+    events = [event async for event in result.stream_events(coalesce_max_chars=20)]
+
+    deltas = [
+        event.data.delta
+        for event in events
+        if event.type == "raw_response_event" and isinstance(event.data, ResponseTextDeltaEvent)
+    ]
+    assert "".join(deltas) == text
+    assert len(deltas) == 3
+    assert all(len(delta) >= 20 for delta in deltas[:-1])
+    # Other events keep their order
+    event_types = [event.type for event in events]
+    assert event_types[0] == "agent_updated_stream_event"
+    assert event_types[-1] == "run_item_stream_event"
+    assert result.final_output == text
+
+
+class SlowTextStreamingModel(FakeModel):
+    """Streams the given words one at a time, and records whether the stream was closed early."""
+
+    def __init__(self, words: list[str]):
+        super().__init__()
+        self.words = words
+        self.words_streamed = 0
+        self.closed_early = False
+
+    async def stream_response(
+        self, *args: Any, **kwargs: Any
+    ) -> AsyncIterator[TResponseStreamEvent]:
+        try:
+            for word in self.words:
+                await asyncio.sleep(0.001)
+                self.words_streamed += 1
+                yield ResponseTextDeltaEvent(
+                    content_index=0,
+                    delta=word,
+                    item_id="1",
+                    output_index=0,
+                    type="response.output_text.delta",
+                )
+        except GeneratorExit:
+            self.closed_early = True
+            raise
+        yield ResponseCompletedEvent(
+            type="response.completed",
+            response=get_response_obj([get_text_message("".join(self.words))]),
+        )
+
+
+def _recording_streaming_guardrail(
+    windows: list[StreamedTextWindow], banned: str | None = None, min_window_chars: int = 10
+) -> StreamingOutputGuardrail[Any]:
+    async def check_text(
+        context: RunContextWrapper[Any], agent: Agent[Any], window: StreamedTextWindow
+    ) -> GuardrailFunctionOutput:
+        windows.append(window)
+        return GuardrailFunctionOutput(
+            output_info=None, tripwire_triggered=banned is not None and banned in window.text
+        )
+
+    return StreamingOutputGuardrail(
+        guardrail_function=check_text, min_window_chars=min_window_chars
+    )
+
+
+@pytest.mark.asyncio
+async def test_streaming_output_guardrail_checks_windows_of_text():
+    words = [f"word{i} " for i in range(20)]
+    windows: list[StreamedTextWindow] = []
+    agent = Agent(
+        name="test",
+        model=SlowTextStreamingModel(words),
+        output_guardrails=[_recording_streaming_guardrail(windows)],
+    )
+
+    result = Runner.run_streamed(agent, input="test")
+    async for _ in result.stream_events():
+        pass
+
+    text = "".join(words)
+    assert result.final_output == text
+    # The text is checked in batches, not on every delta
+    assert 1 < len(windows) < len(words)
+    assert "".join(window.delta for window in windows) == text
+    assert all(len(window.delta) >= 10 for window in windows[:-1])
+    assert not any(window.is_final for window in windows[:-1])
+    assert windows[-1].text == text
+    # The result has one entry per window that was checked
+    assert [r.agent_output for r in result.output_guardrail_results] == windows
+    assert all(not r.output.tripwire_triggered for r in result.output_guardrail_results)
+
+
+@pytest.mark.asyncio
+async def test_streaming_output_guardrail_aborts_the_stream():
+    words = ["fine "] * 10 + ["forbidden "] + ["more "] * 100
+    model = SlowTextStreamingModel(words)
+    windows: list[StreamedTextWindow] = []
+    agent = Agent(
+        name="test",
+        model=model,
+        output_guardrails=[_recording_streaming_guardrail(windows, banned="forbidden")],
+    )
+
+    result = Runner.run_streamed(agent, input="test")
+    deltas = []
+    with pytest.raises(OutputGuardrailTripwireTriggered) as exc_info:
+        async for event in result.stream_events():
+            if event.type == "raw_response_event" and isinstance(
+                event.data, ResponseTextDeltaEvent
+            ):
+                deltas.append(event.data.delta)
+
+    assert model.closed_early
+    assert model.words_streamed < len(words)
+    assert len(deltas) < len(words)
+    assert not windows[-1].is_final
+    assert isinstance(exc_info.value.guardrail_result.agent_output, StreamedTextWindow)
+
+
+@pytest.mark.asyncio
+async def test_streaming_output_guardrail_checks_final_text_when_not_streaming():
+    windows: list[StreamedTextWindow] = []
+    agent = Agent(
+        name="test",
+        model=FakeModel(initial_output=[get_text_message("some forbidden text")]),
+        output_guardrails=[_recording_streaming_guardrail(windows, banned="forbidden")],
+    )
+
+    with pytest.raises(OutputGuardrailTripwireTriggered):
+        await Runner.run(agent, input="test")
+
+    assert windows == [
+        StreamedTextWindow(delta="some forbidden text", text="some forbidden text", is_final=True)
+    ]
+
+
+@pytest.mark.asyncio
+async def test_streaming_output_guardrail_checks_short_text_once_complete():
+    windows: list[StreamedTextWindow] = []
+    agent = Agent(
+        name="test",
+        model=TextDeltaStreamingModel(initial_output=[get_text_message("short answer")]),
+        output_guardrails=[_recording_streaming_guardrail(windows, min_window_chars=1000)],
+    )
+
+    result = Runner.run_streamed(agent, input="test")
+    async for _ in result.stream_events():
+        pass
+
+    assert windows == [StreamedTextWindow(delta="short answer", text="short answer", is_final=True)]
+    assert [r.agent_output for r in result.output_guardrail_results] == windows
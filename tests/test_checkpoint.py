@@ -0,0 +1,254 @@
+from __future__ import annotations
+
+import json
+from pathlib import Path
+
+import pytest
+
+from agents import (
+    Agent,
+    CheckpointStore,
+    FileCheckpointStore,
+    MaxTurnsExceeded,
+    RunCheckpoint,
+    RunConfig,
+    RunContextWrapper,
+    Runner,
+    SQLiteCheckpointStore,
+    UserError,
+    function_tool,
+    handoff,
+)
+from agents.items import HandoffOutputItem, MessageOutputItem, ToolCallItem, ToolCallOutputItem
+from agents.usage import Usage
+
+from .fake_model import FakeModel
+from .test_responses import (
+    get_function_tool,
+    get_function_tool_call,
+    get_handoff_tool_call,
+    get_text_message,
+)
+
+
+class RecordingStore(CheckpointStore):
+    def __init__(self) -> None:
+        self.saved: list[RunCheckpoint] = []
+        self.checkpoints: dict[str, RunCheckpoint] = {}
+
+    async def save(self, checkpoint: RunCheckpoint) -> None:
+        self.saved.append(checkpoint)
+        self.checkpoints[checkpoint.run_id] = checkpoint
+
+    async def load(self, run_id: str) -> RunCheckpoint | None:
+        return self.checkpoints.get(run_id)
+
+    async def delete(self, run_id: str) -> None:
+        self.checkpoints.pop(run_id, None)
+
+
+@pytest.mark.asyncio
+async def test_checkpoint_saved_after_each_turn_and_deleted_on_completion():
+    model = FakeModel()
+    agent = Agent(name="test", model=model, tools=[get_function_tool("foo", "tool_result")])
+    model.add_multiple_turn_outputs(
+        [
+            [get_text_message("a"), get_function_tool_call("foo", json.dumps({}))],
+            [get_function_tool_call("foo", json.dumps({}))],
+            [get_text_message("done")],
+        ]
+    )
+    store = RecordingStore()
+
+    result = await Runner.run(
+        agent, input="user_message", run_config=RunConfig(checkpoint_store=store, run_id="run_1")
+    )
+
+    assert result.final_output == "done"
+    assert [c.current_turn for c in store.saved] == [1, 2]
+    assert all(c.run_id == "run_1" and c.agent_name == "test" for c in store.saved)
+    assert store.saved[0].original_input == "user_message"
+    assert len(store.saved[0].generated_items) == 3
+    assert len(store.saved[1].generated_items) == 5
+    assert store.checkpoints == {}
+
+
+@pytest.mark.asyncio
+async def test_resume_continues_interrupted_run(tmp_path: Path):
+    model = FakeModel()
+    agent = Agent(name="test", model=model, tools=[get_function_tool("foo", "tool_result")])
+    model.add_multiple_turn_outputs(
+        [[get_function_tool_call("foo", json.dumps({}))], ValueError("connection lost")]
+    )
+    store = FileCheckpointStore(tmp_path)
+    run_config = RunConfig(checkpoint_store=store, run_id="run_1")
+
+    with pytest.raises(ValueError):
+        await Runner.run(agent, input="user_message", run_config=run_config)
+
+    checkpoint = await store.load("run_1")
+    assert checkpoint is not None
+    checkpoint.usage = Usage(requests=1, input_tokens=10, output_tokens=5, total_tokens=15)
+
+    model.set_next_output([get_text_message("done")])
+    result = await Runner.resume(agent, checkpoint, run_config=run_config)
+
+    assert result.final_output == "done"
+    assert result.input == "user_message"
+    assert len(result.raw_responses) == 1
+    assert [type(item) for item in result.new_items] == [
+        ToolCallItem,
+        ToolCallOutputItem,
+        MessageOutputItem,
+    ]
+    tool_output = result.new_items[1]
+    assert isinstance(tool_output, ToolCallOutputItem)
+    assert tool_output.output == "tool_result"
+    # The restored items are sent to the model as they were
+    assert result.to_input_list()[1]["type"] == "function_call"
+    assert result.to_input_list()[2]["output"] == "tool_result"  # type: ignore[typeddict-item]
+    assert await store.load("run_1") is None
+
+
+@pytest.mark.asyncio
+async def test_resume_restores_usage_and_turn_count():
+    requests: list[int] = []
+
+    @function_tool(name_override="foo")
+    def record_usage(ctx: RunContextWrapper[None]) -> str:
+        requests.append(ctx.usage.requests)
+        return "tool_result"
+
+    model = FakeModel()
+    agent = Agent(name="test", model=model, tools=[record_usage])
+    checkpoint = RunCheckpoint(
+        run_id="run_1",
+        agent_name="test",
+        original_input="user_message",
+        generated_items=[],
+        usage=Usage(requests=3, input_tokens=30, output_tokens=3, total_tokens=33),
+        current_turn=2,
+    )
+    model.add_multiple_turn_outputs(
+        [[get_function_tool_call("foo", json.dumps({}))], [get_text_message("done")]]
+    )
+
+    result = await Runner.resume(agent, checkpoint, max_turns=4)
+    assert result.final_output == "done"
+    # FakeModel reports no usage, so this is the usage of the checkpoint
+    assert requests == [3]
+
+    # The turns before the checkpoint count towards max_turns
+    model.add_multiple_turn_outputs(
+        [[get_function_tool_call("foo", json.dumps({}))], [get_text_message("done")]]
+    )
+    checkpoint.current_turn = 3
+    with pytest.raises(MaxTurnsExceeded):
+        await Runner.resume(agent, checkpoint, max_turns=4)
+
+
+@pytest.mark.asyncio
+async def test_resume_after_handoff(tmp_path: Path):
+    model = FakeModel()
+    agent_2 = Agent(name="agent_2", model=model)
+    agent_1 = Agent(name="agent_1", model=model, handoffs=[agent_2])
+    model.add_multiple_turn_outputs(
+        [[get_handoff_tool_call(agent_2)], ValueError("connection lost")]
+    )
+    store = SQLiteCheckpointStore(tmp_path / "checkpoints.db")
+    run_config = RunConfig(checkpoint_store=store, run_id="run_1")
+
+    with pytest.raises(ValueError):
+        await Runner.run(agent_1, input="user_message", run_config=run_config)
+
+    checkpoint = await store.load("run_1")
+    assert checkpoint is not None
+    assert checkpoint.agent_name == "agent_2"
+
+    model.set_next_output([get_text_message("done")])
+    result = await Runner.resume(agent_1, checkpoint, run_config=run_config)
+
+    assert result.final_output == "done"
+    assert result.last_agent is agent_2
+    handoff_output = result.new_items[1]
+    assert isinstance(handoff_output, HandoffOutputItem)
+    assert handoff_output.source_agent is agent_1
+    assert handoff_output.target_agent is agent_2
+    store.close()
+
+
+@pytest.mark.asyncio
+async def test_resume_needs_agents_behind_handoff_objects():
+    model = FakeModel()
+    agent_2 = Agent(name="agent_2", model=model)
+    agent_1 = Agent(name="agent_1", model=model, handoffs=[handoff(agent_2)])
+    checkpoint = RunCheckpoint(
+        run_id="run_1",
+        agent_name="agent_2",
+        original_input="user_message",
+        generated_items=[],
+        usage=Usage(),
+        current_turn=1,
+    )
+
+    with pytest.raises(UserError):
+        await Runner.resume(agent_1, checkpoint)
+
+    model.set_next_output([get_text_message("done")])
+    result = await Runner.resume(agent_1, checkpoint, agents=[agent_2])
+    assert result.last_agent is agent_2
+
+
+@pytest.mark.asyncio
+async def test_streamed_run_saves_checkpoints():
+    model = FakeModel()
+    agent = Agent(name="test", model=model, tools=[get_function_tool("foo", "tool_result")])
+    model.add_multiple_turn_outputs(
+        [[get_function_tool_call("foo", json.dumps({}))], [get_text_message("done")]]
+    )
+    store = RecordingStore()
+
+    result = Runner.run_streamed(
+        agent, input="user_message", run_config=RunConfig(checkpoint_store=store)
+    )
+    async for _ in result.stream_events():
+        pass
+
+    assert result.final_output == "done"
+    assert len(store.saved) == 1
+    assert store.saved[0].run_id.startswith("run_")
+    assert store.checkpoints == {}
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("store_type", ["file", "sqlite"])
+async def test_stores_round_trip(tmp_path: Path, store_type: str):
+    store: CheckpointStore
+    if store_type == "file":
+        store = FileCheckpointStore(tmp_path)
+    else:
+        store = SQLiteCheckpointStore(tmp_path / "checkpoints.db")
+    checkpoint = RunCheckpoint(
+        run_id="run_1",
+        agent_name="test",
+        original_input=[{"role": "user", "content": "hi"}],
+        generated_items=[{"type": "tool_call_output_item", "agent": "test", "raw_item": {}}],
+        usage=Usage(requests=1),
+        current_turn=1,
+    )
+
+    assert await store.load("run_1") is None
+    await store.save(checkpoint)
+    checkpoint.current_turn = 2
+    await store.save(checkpoint)
+    assert await store.load("run_1") == checkpoint
+
+    await store.delete("run_1")
+    assert await store.load("run_1") is None
+    await store.delete("run_1")
+
+
+def test_file_store_rejects_paths_as_run_ids(tmp_path: Path):
+    store = FileCheckpointStore(tmp_path)
+    with pytest.raises(UserError):
+        store._path("../run_1")
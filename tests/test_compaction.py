@@ -0,0 +1,370 @@
+from __future__ import annotations
+
+import inspect
+import json
+from collections.abc import AsyncIterator
+from dataclasses import replace
+from typing import Any
+
+import pytest
+
+from agents import (
+    Agent,
+    CompactionInputData,
+    RunConfig,
+    RunContextWrapper,
+    RunHooks,
+    Runner,
+    TResponseInputItem,
+    Usage,
+    UserError,
+)
+from agents.compaction import CompactionFilter, InputCompactor
+from agents.extensions.compaction_filters import drop_old_tool_outputs, summarize_older_items
+from agents.items import MessageOutputItem, RunItem, TResponseOutputItem, TResponseStreamEvent
+from agents.token_estimator import HeuristicTokenEstimator, get_default_token_estimator
+
+from .fake_model import FakeModel
+from .test_responses import get_function_tool, get_function_tool_call, get_text_message
+
+
+class SummarizerModel(FakeModel):
+    """Records the input of every model call, and reports 10 input tokens for each."""
+
+    def __init__(self) -> None:
+        super().__init__()
+        self.inputs: list[list[TResponseInputItem]] = []
+
+    async def get_response(self, system_instructions, input, *args: Any, **kwargs: Any):
+        self.inputs.append(input)
+        response = await super().get_response(system_instructions, input, *args, **kwargs)
+        response.usage = Usage(requests=1, input_tokens=10, total_tokens=10)
+        return response
+
+
+class RecordingModel(FakeModel):
+    """Records the input of every model call."""
+
+    def __init__(self) -> None:
+        super().__init__()
+        self.inputs: list[list[TResponseInputItem]] = []
+
+    async def get_response(self, system_instructions, input, *args: Any, **kwargs: Any):
+        self.inputs.append(input)
+        return await super().get_response(system_instructions, input, *args, **kwargs)
+
+    async def stream_response(
+        self, system_instructions, input, *args: Any, **kwargs: Any
+    ) -> AsyncIterator[TResponseStreamEvent]:
+        self.inputs.append(input)
+        async for event in super().stream_response(system_instructions, input, *args, **kwargs):
+            yield event
+
+
+def _message(content: str) -> TResponseInputItem:
+    return {"role": "user", "content": content}
+
+
+def _keep_last(count: int):
+    calls: list[CompactionInputData] = []
+
+    def _filter(data: CompactionInputData) -> CompactionInputData:
+        calls.append(data)
+        return CompactionInputData(
+            input_items=data.input_items[-count:],
+            estimated_tokens=0,
+            threshold_tokens=data.threshold_tokens,
+        )
+
+    return _filter, calls
+
+
+def _tool_turns(num_turns: int) -> list[list[TResponseOutputItem] | Exception]:
+    turns: list[list[TResponseOutputItem] | Exception] = [
+        [get_function_tool_call("foo", json.dumps({}))] for _ in range(num_turns)
+    ]
+    turns.append([get_text_message("done")])
+    return turns
+
+
+async def _apply(
+    compaction_filter: CompactionFilter, data: CompactionInputData
+) -> CompactionInputData:
+    result = compaction_filter(data)
+    if inspect.isawaitable(result):
+        result = await result
+    assert isinstance(result, CompactionInputData)
+    return result
+
+
+@pytest.mark.asyncio
+async def test_input_is_compacted_above_threshold():
+    model = RecordingModel()
+    agent = Agent(name="test", model=model, tools=[get_function_tool("foo", "x" * 400)])
+    model.add_multiple_turn_outputs(_tool_turns(4))
+    compaction_filter, calls = _keep_last(2)
+
+    result = await Runner.run(
+        agent,
+        input="question",
+        run_config=RunConfig(
+            input_compaction_filter=compaction_filter, compaction_threshold_tokens=150
+        ),
+    )
+
+    assert result.final_output == "done"
+    assert calls
+    assert all(call.estimated_tokens > 150 for call in calls)
+    estimator = get_default_token_estimator()
+    assert calls[0].estimated_tokens == estimator.estimate_items(calls[0].input_items)
+    # Every model call after the first compaction gets the compacted input plus the new items
+    for input in model.inputs[len(model.inputs) - len(calls) :]:
+        assert len(input) <= 4
+    # The result isn't affected by compaction
+    assert len(result.to_input_list()) == 1 + 4 * 2 + 1
+
+
+@pytest.mark.asyncio
+async def test_input_is_not_compacted_below_threshold():
+    model = RecordingModel()
+    agent = Agent(name="test", model=model, tools=[get_function_tool("foo", "result")])
+    model.add_multiple_turn_outputs(_tool_turns(2))
+    compaction_filter, calls = _keep_last(1)
+
+    await Runner.run(
+        agent,
+        input="question",
+        run_config=RunConfig(input_compaction_filter=compaction_filter),
+    )
+
+    assert calls == []
+    assert len(model.inputs[-1]) == 5
+
+
+@pytest.mark.asyncio
+async def test_streamed_input_is_compacted():
+    model = RecordingModel()
+    agent = Agent(name="test", model=model, tools=[get_function_tool("foo", "x" * 400)])
+    model.add_multiple_turn_outputs(_tool_turns(3))
+    compaction_filter, calls = _keep_last(2)
+
+    result = Runner.run_streamed(
+        agent,
+        input="question",
+        run_config=RunConfig(
+            input_compaction_filter=compaction_filter, compaction_threshold_tokens=150
+        ),
+    )
+    async for _ in result.stream_events():
+        pass
+
+    assert calls
+    assert len(model.inputs[-1]) <= 4
+    assert len(result.to_input_list()) == 1 + 3 * 2 + 1
+
+
+@pytest.mark.asyncio
+async def test_compacted_prefix_is_reused():
+    estimated: list[int] = []
+
+    class CountingEstimator(HeuristicTokenEstimator):
+        def estimate_items(self, items):
+            items = list(items)
+            estimated.append(len(items))
+            return super().estimate_items(items)
+
+    compaction_filter, calls = _keep_last(1)
+    compactor = InputCompactor(
+        compaction_filter, threshold_tokens=10_000, token_estimator=CountingEstimator()
+    )
+    agent = Agent(name="test")
+    original_input = [_message("question")]
+    generated: list[RunItem] = [
+        MessageOutputItem(agent=agent, raw_item=get_text_message(str(index)))  # type: ignore
+        for index in range(3)
+    ]
+
+    assert len(await compactor.get_input(original_input, generated[:1])) == 2
+    assert len(await compactor.get_input(original_input, generated[:3])) == 4
+    # The second call only estimated the two new items
+    assert estimated == [1, 1, 2]
+
+    # A different original input, e.g. after a handoff input filter, starts over
+    assert len(await compactor.get_input([_message("other")], generated[:3])) == 4
+    assert estimated[-2:] == [1, 3]
+
+    compactor.threshold_tokens = 0
+    assert len(await compactor.get_input([_message("other")], generated[:3])) == 1
+    assert compactor.compactions == 1
+
+
+@pytest.mark.asyncio
+async def test_invalid_filter_result():
+    compactor = InputCompactor(
+        lambda data: None,  # type: ignore
+        threshold_tokens=0,
+        token_estimator=HeuristicTokenEstimator(),
+    )
+    with pytest.raises(UserError):
+        await compactor.get_input([_message("question")], [])
+
+
+def test_drop_old_tool_outputs():
+    items: list[TResponseInputItem] = [
+        _message("question"),
+        {"type": "function_call", "id": "1", "call_id": "1", "name": "foo", "arguments": "{}"},
+        {"type": "function_call_output", "call_id": "1", "output": "first"},
+        {"type": "function_call", "id": "2", "call_id": "2", "name": "foo", "arguments": "{}"},
+        {"type": "function_call_output", "call_id": "2", "output": "second"},
+    ]
+    data = CompactionInputData(input_items=tuple(items), estimated_tokens=100, threshold_tokens=10)
+
+    filtered = drop_old_tool_outputs(keep_last=1, placeholder="removed")(data)
+    assert isinstance(filtered, CompactionInputData)
+    assert [item.get("output") for item in filtered.input_items] == [
+        None,
+        None,
+        "removed",
+        None,
+        "second",
+    ]
+    assert filtered.input_items[2]["call_id"] == "1"  # type: ignore[typeddict-item]
+    # Nothing to drop
+    assert drop_old_tool_outputs(keep_last=2)(data) is data
+
+
+@pytest.mark.asyncio
+async def test_summarize_older_items():
+    summarizer_model = SummarizerModel()
+    summarizer_model.set_next_output([get_text_message("the summary")])
+    summarizer = Agent(name="summarizer", model=summarizer_model)
+    items: list[TResponseInputItem] = [
+        _message("first"),
+        _message("second"),
+        {"type": "function_call", "id": "1", "call_id": "1", "name": "foo", "arguments": "{}"},
+        {"type": "function_call_output", "call_id": "1", "output": "result"},
+        _message("third"),
+    ]
+    data = CompactionInputData(
+        input_items=tuple(items),
+        estimated_tokens=100,
+        threshold_tokens=10,
+        run_context=RunContextWrapper(context=None),
+    )
+
+    summarized = await _apply(summarize_older_items(summarizer, keep_last=2), data)
+
+    # The tool call is kept along with its output
+    assert list(summarized.input_items[1:]) == items[2:]
+    assert summarized.input_items[0] == {
+        "role": "user",
+        "content": "Summary of the earlier conversation:\nthe summary",
+    }
+    assert summarizer_model.inputs[0][:2] == items[:2]
+    # The summarizer's usage is part of the run's usage
+    assert data.run_context is not None
+    assert data.run_context.usage.requests == 1
+    assert data.run_context.usage.input_tokens == 10
+
+    # Nothing older to summarize
+    assert await _apply(summarize_older_items(summarizer, keep_last=10), data) is data
+
+
+@pytest.mark.asyncio
+async def test_summarize_older_items_reuses_summary():
+    summarizer_model = SummarizerModel()
+    summarizer_model.add_multiple_turn_outputs(
+        [[get_text_message("summary 1")], [get_text_message("summary 2")]]
+    )
+    summarizer = Agent(name="summarizer", model=summarizer_model)
+    compaction_filter = summarize_older_items(summarizer, keep_last=1)
+    items = tuple(_message(text) for text in ("first", "second", "third", "fourth"))
+    data = CompactionInputData(
+        input_items=items[:3],
+        estimated_tokens=100,
+        threshold_tokens=10,
+        run_context=RunContextWrapper(context=None),
+    )
+
+    summarized = await _apply(compaction_filter, data)
+    assert len(summarizer_model.inputs) == 1
+    # The same older items aren't summarized again
+    assert await _apply(compaction_filter, data) == summarized
+    # Neither is a compacted input whose only older item is the summary
+    compacted_data = replace(data, input_items=summarized.input_items)
+    assert await _apply(compaction_filter, compacted_data) == summarized
+    assert len(summarizer_model.inputs) == 1
+
+    # Once more items are older, only those are summarized, along with the previous summary
+    compacted = await _apply(compaction_filter, replace(data, input_items=items))
+    assert summarizer_model.inputs[1][:2] == [summarized.input_items[0], items[2]]
+    assert compacted.input_items[1:] == items[3:]
+    assert "summary 2" in compacted.input_items[0]["content"]  # type: ignore[typeddict-item]
+
+
+@pytest.mark.asyncio
+async def test_summarize_older_items_doesnt_share_summaries_between_runs():
+    summarizer_model = SummarizerModel()
+    summarizer_model.add_multiple_turn_outputs(
+        [[get_text_message("summary 1")], [get_text_message("summary 2")]]
+    )
+    compaction_filter = summarize_older_items(
+        Agent(name="summarizer", model=summarizer_model), keep_last=1
+    )
+    items = tuple(_message(text) for text in ("first", "second", "third"))
+
+    first_run = CompactionInputData(
+        input_items=items,
+        estimated_tokens=100,
+        threshold_tokens=10,
+        run_context=RunContextWrapper(context=None),
+    )
+    second_run = replace(first_run, run_context=RunContextWrapper(context=None))
+    first = await _apply(compaction_filter, first_run)
+    second = await _apply(compaction_filter, second_run)
+
+    assert len(summarizer_model.inputs) == 2
+    assert "summary 1" in first.input_items[0]["content"]  # type: ignore[typeddict-item]
+    assert "summary 2" in second.input_items[0]["content"]  # type: ignore[typeddict-item]
+    # Without a run context, nothing is cached
+    summarizer_model.set_next_output([get_text_message("summary 3")])
+    await _apply(compaction_filter, replace(first_run, run_context=None))
+    assert len(summarizer_model.inputs) == 3
+
+
+@pytest.mark.asyncio
+async def test_summarizer_usage_is_added_to_the_run():
+    model = RecordingModel()
+    agent = Agent(name="test", model=model, tools=[get_function_tool("foo", "x" * 400)])
+    model.add_multiple_turn_outputs(_tool_turns(2))
+    summarizer_model = SummarizerModel()
+    summarizer_model.add_multiple_turn_outputs(
+        [[get_text_message("summary")], [get_text_message("summary")]]
+    )
+
+    class UsageHooks(RunHooks[Any]):
+        usage: Usage | None = None
+
+        async def on_agent_end(
+            self, context: RunContextWrapper[Any], agent: Agent[Any], output: Any
+        ) -> None:
+            self.usage = context.usage
+
+    hooks = UsageHooks()
+    await Runner.run(
+        agent,
+        input="question",
+        hooks=hooks,
+        run_config=RunConfig(
+            input_compaction_filter=summarize_older_items(
+                Agent(name="summarizer", model=summarizer_model), keep_last=1
+            ),
+            compaction_threshold_tokens=150,
+        ),
+    )
+
+    summarizer_requests = len(summarizer_model.inputs)
+    assert summarizer_requests > 0
+    assert hooks.usage is not None
+    # The agent's model reports no usage, so all of it comes from the summarizer
+    assert hooks.usage.input_tokens == 10 * summarizer_requests
@@ -0,0 +1,167 @@
+from __future__ import annotations
+
+import logging
+from typing import Any
+
+import httpx
+import pytest
+from openai.types.chat.chat_completion import ChatCompletion, Choice
+from openai.types.chat.chat_completion_message import ChatCompletionMessage
+
+from agents import (
+    FunctionTool,
+    ModelSettings,
+    ModelTracing,
+    OpenAIChatCompletionsModel,
+    OpenAIResponsesModel,
+    RunContextWrapper,
+    StdlibJSONCodec,
+    TResponseInputItem,
+    function_tool,
+    get_json_codec,
+    set_json_codec,
+)
+from agents.logger import logger
+
+from .fake_model import get_response_obj
+from .test_responses import get_function_tool, get_text_message
+
+
+class CountingCodec(StdlibJSONCodec):
+    """Counts the payloads that are pretty-printed for debug logs."""
+
+    def __init__(self) -> None:
+        self.pretty_dumps = 0
+        self.pretty_bytes = 0
+
+    def dumps_pretty(self, obj: Any) -> str:
+        encoded = super().dumps_pretty(obj)
+        self.pretty_dumps += 1
+        self.pretty_bytes += len(encoded)
+        return encoded
+
+
+@pytest.fixture
+def codec():
+    previous = get_json_codec()
+    codec = CountingCodec()
+    set_json_codec(codec)
+    yield codec
+    set_json_codec(previous)
+
+
+@pytest.fixture
+def logger_level():
+    previous = logger.level
+
+    def set_level(level: int) -> None:
+        logger.setLevel(level)
+
+    yield set_level
+    logger.setLevel(previous)
+
+
+class DummyCompletions:
+    async def create(self, **kwargs: Any) -> Any:
+        message = ChatCompletionMessage(role="assistant", content="done")
+        return ChatCompletion(
+            id="resp-id",
+            created=0,
+            model="fake",
+            object="chat.completion",
+            choices=[Choice(index=0, finish_reason="stop", message=message)],
+        )
+
+
+class DummyResponses:
+    async def create(self, **kwargs: Any) -> Any:
+        return get_response_obj([get_text_message("done")])
+
+
+class DummyClient:
+    """Answers both Chat Completions and Responses API calls."""
+
+    def __init__(self) -> None:
+        self.base_url = httpx.URL("http://fake")
+        self.chat = type("_Chat", (), {"completions": DummyCompletions()})()
+        self.responses = DummyResponses()
+
+
+def _large_input(num_items: int) -> list[TResponseInputItem]:
+    text = "lorem ipsum dolor sit amet " * 40
+    return [{"role": "user", "content": f"{index}: {text}"} for index in range(num_items)]
+
+
+async def _get_response(model_class: type, input: list[TResponseInputItem]) -> None:
+    model = model_class(model="gpt-4", openai_client=DummyClient())
+    await model.get_response(
+        system_instructions="sys",
+        input=input,
+        model_settings=ModelSettings(),
+        tools=[get_function_tool("foo", "result")],
+        output_schema=None,
+        handoffs=[],
+        tracing=ModelTracing.DISABLED,
+    )
+
+
+@pytest.mark.allow_call_model_methods
+@pytest.mark.asyncio
+@pytest.mark.parametrize("model_class", [OpenAIChatCompletionsModel, OpenAIResponsesModel])
+async def test_payloads_are_not_serialized_without_debug_logging(
+    model_class: type, codec: CountingCodec, logger_level
+):
+    logger_level(logging.INFO)
+    await _get_response(model_class, _large_input(10))
+    assert codec.pretty_dumps == 0
+
+    logger_level(logging.DEBUG)
+    await _get_response(model_class, _large_input(10))
+    # The request (messages and tools) and the response
+    assert codec.pretty_dumps == 3
+
+
+@pytest.mark.asyncio
+async def test_tool_data_is_not_formatted_without_debug_logging(logger_level):
+    class Result:
+        str_calls = 0
+
+        def __str__(self) -> str:
+            Result.str_calls += 1
+            return "result"
+
+    @function_tool
+    def make_result(value: str) -> Any:
+        return Result()
+
+    assert isinstance(make_result, FunctionTool)
+    ctx = RunContextWrapper(context=None)
+
+    logger_level(logging.INFO)
+    assert await make_result.on_invoke_tool(ctx, '{"value": "a"}') == "result"
+    # Only for the tool output itself
+    assert Result.str_calls == 1
+
+    logger_level(logging.DEBUG)
+    await make_result.on_invoke_tool(ctx, '{"value": "a"}')
+    assert Result.str_calls == 3
+
+
+@pytest.mark.allow_call_model_methods
+@pytest.mark.asyncio
+@pytest.mark.parametrize("model_class", [OpenAIChatCompletionsModel, OpenAIResponsesModel])
+async def test_debug_logging_serializes_large_input_only_when_enabled(
+    model_class: type, codec: CountingCodec, logger_level
+):
+    """Counts how many bytes of a request with a large input are serialized for the logs. Without
+    DEBUG logging, nothing should be serialized."""
+    input = _large_input(1_000)
+
+    async def serialized_bytes(level: int) -> int:
+        logger_level(level)
+        codec.pretty_bytes = 0
+        await _get_response(model_class, input)
+        return codec.pretty_bytes
+
+    assert await serialized_bytes(logging.DEBUG) > 1_000_000
+    assert await serialized_bytes(logging.INFO) == 0
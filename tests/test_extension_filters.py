@@ -1,9 +1,10 @@
 from openai.types.responses import ResponseOutputMessage, ResponseOutputText
 
 from agents import Agent, HandoffInputData
-from agents.extensions.handoff_filters import remove_all_tools
+from agents.extensions.handoff_filters import ItemTypeFilter, compose, remove_all_tools
 from agents.items import (
     HandoffOutputItem,
+    ItemHelpers,
     MessageOutputItem,
     ToolCallOutputItem,
     TResponseInputItem,
@@ -186,3 +187,79 @@ def test_removes_handoffs_from_history():
     assert len(filtered_data.input_history) == 1
     assert len(filtered_data.pre_handoff_items) == 1
     assert len(filtered_data.new_items) == 1
+
+
+def test_unchanged_parts_are_not_copied():
+    history = (_get_message_input_item("Hello"),)
+    pre_handoff_items = (_get_message_output_run_item("Hello"),)
+    handoff_input_data = HandoffInputData(
+        input_history=history,
+        pre_handoff_items=pre_handoff_items,
+        new_items=(_get_message_output_run_item("Hello"), _get_tool_output_run_item("World")),
+    )
+
+    filtered_data = remove_all_tools(handoff_input_data)
+    assert filtered_data.input_history is history
+    assert filtered_data.pre_handoff_items is pre_handoff_items
+    assert len(filtered_data.new_items) == 1
+
+    unchanged_data = HandoffInputData(
+        input_history=history, pre_handoff_items=pre_handoff_items, new_items=()
+    )
+    assert remove_all_tools(unchanged_data) is unchanged_data
+
+
+def test_compose_merges_item_type_filters():
+    remove_messages = ItemTypeFilter(
+        input_types=frozenset({"message"}), run_item_types=frozenset({"message_output_item"})
+    )
+    composed = compose(remove_all_tools, remove_messages)
+
+    assert composed == remove_all_tools.merge(remove_messages)
+
+    handoff_input_data = HandoffInputData(
+        input_history=(
+            {"role": "user", "content": "Hello", "type": "message"},
+            _get_function_result_input_item("World"),
+            _get_message_input_item("Untyped"),
+        ),
+        pre_handoff_items=(_get_message_output_run_item("Hello"),),
+        new_items=(_get_message_output_run_item("Hello"), _get_handoff_output_run_item("World")),
+    )
+    filtered_data = composed(handoff_input_data)
+    assert filtered_data.input_history == (_get_message_input_item("Untyped"),)
+    assert filtered_data.pre_handoff_items == ()
+    assert filtered_data.new_items == ()
+
+
+def test_compose_applies_other_filters_in_order():
+    calls: list[int] = []
+
+    def keep_last_item(handoff_input_data: HandoffInputData) -> HandoffInputData:
+        calls.append(len(handoff_input_data.new_items))
+        return HandoffInputData(
+            input_history=handoff_input_data.input_history,
+            pre_handoff_items=handoff_input_data.pre_handoff_items,
+            new_items=handoff_input_data.new_items[-1:],
+        )
+
+    composed = compose(remove_all_tools, keep_last_item)
+    filtered_data = composed(
+        HandoffInputData(
+            input_history="Hello",
+            pre_handoff_items=(),
+            new_items=(
+                _get_message_output_run_item("First"),
+                _get_tool_output_run_item("World"),
+                _get_message_output_run_item("Last"),
+            ),
+        )
+    )
+
+    # The tool output was removed before the custom filter ran
+    assert calls == [2]
+    assert filtered_data.input_history == "Hello"
+    assert len(filtered_data.new_items) == 1
+    last_item = filtered_data.new_items[0]
+    assert isinstance(last_item, MessageOutputItem)
+    assert ItemHelpers.text_message_output(last_item) == "Last"
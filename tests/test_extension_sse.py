@@ -0,0 +1,216 @@
+from __future__ import annotations
+
+import asyncio
+import json
+from collections.abc import AsyncIterator
+from typing import Any
+
+import httpx
+import pytest
+from openai.types.responses import (
+    ResponseCompletedEvent,
+    ResponseFunctionCallArgumentsDeltaEvent,
+    ResponseTextDeltaEvent,
+)
+
+from agents import Agent, RawResponsesStreamEvent, Runner
+from agents.extensions.sse import SSEStreamingResponse, encode_sse_event
+from agents.items import TResponseStreamEvent
+
+from .fake_model import FakeModel, get_response_obj
+from .test_responses import get_function_tool, get_function_tool_call, get_text_message
+
+
+def _parse_sse(body: bytes) -> list[tuple[str, Any]]:
+    frames = []
+    for frame in body.decode().split("\n\n"):
+        if not frame:
+            continue
+        event_line, data_line = frame.split("\n")
+        assert event_line.startswith("event: ") and data_line.startswith("data: ")
+        frames.append((event_line[len("event: ") :], json.loads(data_line[len("data: ") :])))
+    return frames
+
+
+class DeltaStreamingModel(FakeModel):
+    """Streams each character of a text message as a delta, optionally hanging afterwards."""
+
+    def __init__(self, hang: bool = False):
+        super().__init__()
+        self.hang = hang
+
+    async def stream_response(
+        self, *args: Any, **kwargs: Any
+    ) -> AsyncIterator[TResponseStreamEvent]:
+        output = self.get_next_output()
+        assert not isinstance(output, Exception)
+        text = output[0].content[0].text  # type: ignore[union-attr]
+        for char in text:
+            yield ResponseTextDeltaEvent(
+                content_index=0,
+                delta=char,
+                item_id="1",
+                output_index=0,
+                type="response.output_text.delta",
+            )
+        if self.hang:
+            await asyncio.sleep(60)
+        yield ResponseCompletedEvent(type="response.completed", response=get_response_obj(output))
+
+
+@pytest.mark.parametrize(
+    "data",
+    [
+        ResponseTextDeltaEvent(
+            content_index=1,
+            delta='quotes " and\nnewlines, unicode é',
+            item_id="msg_1",
+            output_index=2,
+            type="response.output_text.delta",
+        ),
+        ResponseFunctionCallArgumentsDeltaEvent(
+            delta='{"a": "\\n"',
+            item_id="fc_1",
+            output_index=0,
+            type="response.function_call_arguments.delta",
+        ),
+    ],
+)
+def test_templates_match_generic_encoding(data: Any):
+    frame = encode_sse_event(RawResponsesStreamEvent(data=data))
+
+    [(event_name, payload)] = _parse_sse(frame)
+    assert event_name == "raw_response_event"
+    assert payload == json.loads(data.model_dump_json())
+
+
+@pytest.mark.asyncio
+async def test_sse_response_streams_run():
+    model = FakeModel()
+    agent = Agent(name="test", model=model, tools=[get_function_tool("foo", "tool_result")])
+    model.add_multiple_turn_outputs(
+        [[get_function_tool_call("foo", json.dumps({}))], [get_text_message("done")]]
+    )
+
+    async def app(scope, receive, send):
+        await SSEStreamingResponse(Runner.run_streamed(agent, input="test"))(scope, receive, send)
+
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://test") as client:
+        response = await client.get("/")
+
+    assert response.status_code == 200
+    assert response.headers["content-type"] == "text/event-stream"
+    frames = _parse_sse(response.content)
+    assert frames[0] == ("agent_updated_stream_event", {"new_agent": "test"})
+    run_items = [payload["name"] for name, payload in frames if name == "run_item_stream_event"]
+    assert run_items == ["tool_called", "tool_output", "message_output_created"]
+    assert frames[-1] == ("run_complete", {"final_output": "done"})
+
+
+@pytest.mark.asyncio
+async def test_sse_response_reports_errors():
+    model = FakeModel()
+    agent = Agent(name="test", model=model, tools=[get_function_tool("foo", "tool_result")])
+    model.add_multiple_turn_outputs(
+        [[get_function_tool_call("foo", json.dumps({}))], [get_text_message("done")]]
+    )
+
+    async def app(scope, receive, send):
+        result = Runner.run_streamed(agent, input="test", max_turns=1)
+        await SSEStreamingResponse(result)(scope, receive, send)
+
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://test") as client:
+        response = await client.get("/")
+
+    event_name, payload = _parse_sse(response.content)[-1]
+    assert event_name == "error"
+    assert payload["error"] == "MaxTurnsExceeded"
+    # The details of the error aren't sent to the client
+    assert "turns" not in payload["message"].lower()
+
+
+@pytest.mark.asyncio
+async def test_sse_response_batches_waiting_events():
+    model = DeltaStreamingModel()
+    agent = Agent(name="test", model=model)
+    text = "a fairly long message, streamed one character at a time"
+    model.set_next_output([get_text_message(text)])
+
+    bodies: list[bytes] = []
+
+    async def receive():
+        await asyncio.sleep(60)
+
+    async def send(message):
+        if message["type"] == "http.response.body":
+            bodies.append(message["body"])
+
+    await SSEStreamingResponse(Runner.run_streamed(agent, input="test"))({}, receive, send)
+
+    frames = _parse_sse(b"".join(bodies))
+    deltas = [
+        payload["delta"]
+        for name, payload in frames
+        if payload.get("type") == "response.output_text.delta"
+    ]
+    assert "".join(deltas) == text
+    # The deltas are already waiting when they're written, so they share chunks
+    assert len(bodies) < len(deltas)
+
+
+@pytest.mark.asyncio
+async def test_sse_response_cancels_run_on_disconnect():
+    model = DeltaStreamingModel(hang=True)
+    agent = Agent(name="test", model=model)
+    model.set_next_output([get_text_message("hello")])
+    result = Runner.run_streamed(agent, input="test")
+
+    bodies: list[bytes] = []
+
+    async def receive():
+        await asyncio.sleep(0.05)
+        return {"type": "http.disconnect"}
+
+    async def send(message):
+        if message["type"] == "http.response.body":
+            bodies.append(message["body"])
+
+    await asyncio.wait_for(SSEStreamingResponse(result)({}, receive, send), timeout=5)
+
+    assert result._run_impl_task is not None
+    await asyncio.sleep(0)
+    assert result._run_impl_task.cancelled()
+    # Nothing is sent after the client disconnected
+    frames = _parse_sse(b"".join(bodies))
+    assert all(
+        name == "raw_response_event" or name == "agent_updated_stream_event" for name, _ in frames
+    )
+
+
+@pytest.mark.asyncio
+async def test_sse_response_cancels_run_when_writing_fails():
+    model = DeltaStreamingModel(hang=True)
+    agent = Agent(name="test", model=model)
+    model.set_next_output([get_text_message("hello")])
+    result = Runner.run_streamed(agent, input="test")
+
+    bodies: list[bytes] = []
+
+    async def receive():
+        await asyncio.sleep(60)
+
+    async def send(message):
+        if message["type"] == "http.response.body":
+            bodies.append(message["body"])
+            raise OSError("connection reset")
+
+    with pytest.raises(OSError):
+        await asyncio.wait_for(SSEStreamingResponse(result)({}, receive, send), timeout=5)
+
+    # The failed write isn't followed by an attempt to send an error event
+    assert len(bodies) == 1
+    assert result._run_impl_task is not None
+    await asyncio.sleep(0)
+    assert result._run_impl_task.cancelled()
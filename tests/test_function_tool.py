@@ -1,12 +1,22 @@
+import copy
 import json
-from typing import Any
+import threading
+from typing import Any, Callable
 
 import pytest
 from pydantic import BaseModel
 from typing_extensions import TypedDict
 
-from agents import FunctionTool, ModelBehaviorError, RunContextWrapper, function_tool
-from agents.tool import default_tool_error_function
+from agents import (
+    Agent,
+    FunctionTool,
+    ModelBehaviorError,
+    RunContextWrapper,
+    UserError,
+    function_tool,
+)
+from agents.function_schema import FuncSchema, function_schema
+from agents.tool import default_tool_error_function, load_function_tool_schemas
 
 
 def argless_function() -> str:
@@ -255,3 +265,179 @@ async def test_async_custom_error_function_works():
 
     result = await tool.on_invoke_tool(ctx, '{"a": 1, "b": 2}')
     assert result == "error_ValueError"
+
+
+def documented_function(a: int, b: str = "x") -> str:
+    """Does a thing.
+
+    Args:
+        a: The first argument.
+        b: The second argument.
+    """
+    return b * a
+
+
+@pytest.fixture
+def schema_builds(monkeypatch: pytest.MonkeyPatch) -> list[str]:
+    builds: list[str] = []
+
+    def counting_function_schema(func: Callable[..., Any], **kwargs: Any) -> FuncSchema:
+        builds.append(func.__name__)
+        return function_schema(func, **kwargs)
+
+    monkeypatch.setattr("agents.tool.function_schema", counting_function_schema)
+    return builds
+
+
+@pytest.mark.asyncio
+async def test_schema_is_built_on_first_access(schema_builds: list[str]):
+    tool = function_tool(documented_function, name_override="custom_name", defer_schema=True)
+
+    assert tool.name == "custom_name"
+    assert not tool.schema_loaded
+    assert schema_builds == []
+
+    assert tool.description == "Does a thing."
+    assert tool.params_json_schema["properties"]["a"]["description"] == "The first argument."
+    assert tool.schema_loaded
+    assert await tool.on_invoke_tool(RunContextWrapper(None), '{"a": 2}') == "xx"
+    assert schema_builds == ["documented_function"]
+
+
+@pytest.mark.asyncio
+async def test_invoking_builds_schema_once(schema_builds: list[str]):
+    tool = function_tool(documented_function, defer_schema=True)
+
+    assert await tool.on_invoke_tool(RunContextWrapper(None), '{"a": 1, "b": "y"}') == "y"
+    assert tool.params_json_schema["required"] == ["a", "b"]
+    assert schema_builds == ["documented_function"]
+
+
+def test_schema_is_built_eagerly_by_default(schema_builds: list[str]):
+    tool = function_tool(documented_function)
+
+    assert schema_builds == ["documented_function"]
+    assert tool.schema_loaded
+    assert tool.description == function_tool(documented_function, defer_schema=True).description
+
+
+def test_signature_errors_are_raised_at_definition_unless_deferred():
+    def bad_function(a: int, ctx: RunContextWrapper[Any]) -> str:
+        return ""
+
+    with pytest.raises(UserError):
+        function_tool(bad_function)
+
+    # A deferred tool only raises once its schema is built
+    deferred = function_tool(bad_function, defer_schema=True)
+    with pytest.raises(UserError):
+        _ = deferred.params_json_schema
+
+
+@pytest.mark.asyncio
+async def test_deferred_tool_can_be_deep_copied():
+    tool = function_tool(documented_function, defer_schema=True)
+
+    tool_copy = copy.deepcopy(tool)
+    agent_copy = copy.deepcopy(Agent(name="test", tools=[tool]))
+
+    assert not tool.schema_loaded
+    assert tool_copy.description == "Does a thing."
+    assert await tool_copy.on_invoke_tool(RunContextWrapper(None), '{"a": 2}') == "xx"
+    copied_tool = agent_copy.tools[0]
+    assert isinstance(copied_tool, FunctionTool)
+    assert copied_tool.params_json_schema == tool.params_json_schema
+
+
+def test_concurrent_loads_build_schema_once(schema_builds: list[str]):
+    tool = function_tool(documented_function, defer_schema=True)
+    threads = [threading.Thread(target=tool.load_schema) for _ in range(8)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert schema_builds == ["documented_function"]
+
+
+def test_load_function_tool_schemas_in_background(schema_builds: list[str]):
+    tools = [
+        function_tool(documented_function, name_override=f"tool_{i}", defer_schema=True)
+        for i in range(3)
+    ]
+
+    thread = load_function_tool_schemas(tools, background=True)
+    assert thread is not None
+    thread.join(timeout=10)
+
+    assert all(tool.schema_loaded for tool in tools)
+    assert len(schema_builds) == 3
+    assert load_function_tool_schemas(tools) is None
+    assert len(schema_builds) == 3
+
+
+def test_name_override_without_docstring_info():
+    tool = function_tool(documented_function, name_override="custom", use_docstring_info=False)
+    assert tool.name == "custom"
+    assert tool.description == ""
+
+
+class Address(BaseModel):
+    street: str
+    city: str
+    tags: list[str]
+
+
+class Customer(BaseModel):
+    name: str
+    addresses: list[Address]
+    metadata: dict[str, int]
+
+
+def count_addresses(customers: list[Customer], *, region: str = "eu") -> str:
+    return f"{region}:{sum(len(customer.addresses) for customer in customers)}"
+
+
+def _large_arguments(customers: int) -> str:
+    return json.dumps(
+        {
+            "customers": [
+                {
+                    "name": f"customer {i}",
+                    "addresses": [
+                        {"street": f"{j} Main St", "city": "Springfield", "tags": ["home", "work"]}
+                        for j in range(5)
+                    ],
+                    "metadata": {f"key_{k}": k for k in range(10)},
+                }
+                for i in range(customers)
+            ],
+            "region": "us",
+        }
+    )
+
+
+@pytest.mark.asyncio
+async def test_nested_arguments():
+    tool = function_tool(count_addresses, failure_error_function=None)
+    ctx = RunContextWrapper(None)
+
+    assert await tool.on_invoke_tool(ctx, _large_arguments(3)) == "us:15"
+    with pytest.raises(ModelBehaviorError, match="Invalid JSON input"):
+        await tool.on_invoke_tool(ctx, '{"customers": [')
+    with pytest.raises(ModelBehaviorError):
+        await tool.on_invoke_tool(ctx, '{"customers": [{"name": "a"}]}')
+
+
+def test_one_pass_validation_matches_two_passes():
+    """Validating large nested arguments in one pass gives the same result as parsing them into a
+    dict first, which is what tools used to do."""
+    schema = function_schema(count_addresses)
+    arguments = _large_arguments(500)
+
+    parsed = schema.validate_json(arguments)
+    assert parsed == schema.params_pydantic_model(**json.loads(arguments))
+
+    args, kwargs = schema.to_call_args(parsed)
+    assert len(args[0]) == 500
+    assert kwargs == {"region": "us"}
@@ -0,0 +1,318 @@
+from __future__ import annotations
+
+import sqlite3
+import threading
+from pathlib import Path
+from typing import Any
+
+import pytest
+from pydantic import BaseModel
+
+from agents import (
+    Agent,
+    GuardrailFunctionOutput,
+    InMemoryGuardrailCache,
+    RunContextWrapper,
+    Runner,
+    SQLiteGuardrailCache,
+    input_guardrail,
+    output_guardrail,
+)
+from agents._run_impl import RunImpl
+from agents.guardrail_cache import guardrail_cache_key
+from agents.tracing import GuardrailSpanData
+
+from .fake_model import FakeModel
+from .test_responses import get_text_message
+from .testing_processor import fetch_ordered_spans
+
+
+class Verdict(BaseModel):
+    reason: str
+
+
+def test_cache_key_is_canonical():
+    first = [{"role": "user", "content": "hi", "type": "message"}]
+    second = [{"type": "message", "content": "hi", "role": "user"}]
+
+    assert guardrail_cache_key("check", first) == guardrail_cache_key("check", second)
+    assert guardrail_cache_key("check", first) != guardrail_cache_key("other", first)
+    assert guardrail_cache_key("check", "hi") != guardrail_cache_key("check", "hello")
+    assert guardrail_cache_key("check", Verdict(reason="a")) == guardrail_cache_key(
+        "check", {"reason": "a"}
+    )
+    assert guardrail_cache_key("check", object()) is None
+
+
+@pytest.mark.asyncio
+async def test_in_memory_cache_evicts_least_recently_used():
+    cache = InMemoryGuardrailCache(max_size=2)
+    outputs = [GuardrailFunctionOutput(output_info=i, tripwire_triggered=False) for i in range(3)]
+
+    await cache.set("a", outputs[0])
+    await cache.set("b", outputs[1])
+    assert await cache.get("a") == outputs[0]
+    await cache.set("c", outputs[2])
+
+    assert await cache.get("a") == outputs[0]
+    assert await cache.get("b") is None
+    assert await cache.get("c") == outputs[2]
+
+    await cache.clear()
+    assert await cache.get("a") is None
+
+
+@pytest.mark.asyncio
+async def test_in_memory_cache_ttl(monkeypatch: pytest.MonkeyPatch):
+    now = 1000.0
+    monkeypatch.setattr("agents.guardrail_cache.time.monotonic", lambda: now)
+    cache = InMemoryGuardrailCache(ttl=10)
+    output = GuardrailFunctionOutput(output_info=None, tripwire_triggered=True)
+
+    await cache.set("a", output)
+    now = 1009.0
+    assert await cache.get("a") == output
+    now = 1010.0
+    assert await cache.get("a") is None
+
+
+@pytest.mark.asyncio
+async def test_in_memory_cache_returns_copies():
+    cache = InMemoryGuardrailCache()
+    output = GuardrailFunctionOutput(output_info={"flags": ["spam"]}, tripwire_triggered=True)
+
+    await cache.set("a", output)
+    output.output_info["flags"].append("changed after set")
+    first = await cache.get("a")
+    assert first is not None
+    first.output_info["flags"].append("changed after get")
+    first.tripwire_triggered = False
+
+    second = await cache.get("a")
+    assert second == GuardrailFunctionOutput(
+        output_info={"flags": ["spam"]}, tripwire_triggered=True
+    )
+    assert second is not first
+
+    # Outputs that can't be copied aren't cached
+    await cache.set(
+        "b", GuardrailFunctionOutput(output_info=threading.Lock(), tripwire_triggered=False)
+    )
+    assert await cache.get("b") is None
+
+
+@pytest.mark.asyncio
+async def test_sqlite_cache(tmp_path: Path):
+    cache = SQLiteGuardrailCache(tmp_path / "cache.db", max_size=2)
+    try:
+        await cache.set(
+            "a",
+            GuardrailFunctionOutput(output_info=Verdict(reason="spam"), tripwire_triggered=True),
+        )
+        await cache.set("b", GuardrailFunctionOutput(output_info=None, tripwire_triggered=False))
+        await cache.get("a")
+        await cache.set("c", GuardrailFunctionOutput(output_info=[1, 2], tripwire_triggered=False))
+
+        output = await cache.get("a")
+        assert output is not None
+        assert output.output_info == {"reason": "spam"}
+        assert output.tripwire_triggered
+        assert await cache.get("b") is None
+        assert await cache.get("c") is not None
+
+        # Outputs that can't be stored as JSON aren't cached
+        await cache.set(
+            "d", GuardrailFunctionOutput(output_info=object(), tripwire_triggered=False)
+        )
+        assert await cache.get("d") is None
+    finally:
+        cache.close()
+
+    # The outputs are shared with other instances
+    other = SQLiteGuardrailCache(tmp_path / "cache.db")
+    try:
+        assert await other.get("a") is not None
+        await other.clear()
+        assert await other.get("a") is None
+    finally:
+        other.close()
+
+
+@pytest.mark.asyncio
+async def test_sqlite_cache_ttl(tmp_path: Path, monkeypatch: pytest.MonkeyPatch):
+    now = 1000.0
+    monkeypatch.setattr("agents.guardrail_cache.time.time", lambda: now)
+    cache = SQLiteGuardrailCache(tmp_path / "cache.db", ttl=10)
+    try:
+        await cache.set("a", GuardrailFunctionOutput(output_info=None, tripwire_triggered=False))
+        now = 1009.0
+        assert await cache.get("a") is not None
+        now = 1010.0
+        assert await cache.get("a") is None
+    finally:
+        cache.close()
+
+
+@pytest.mark.asyncio
+async def test_sqlite_cache_evicts_in_batches(tmp_path: Path, monkeypatch: pytest.MonkeyPatch):
+    now = 1000.0
+    monkeypatch.setattr("agents.guardrail_cache.time.time", lambda: now)
+    cache = SQLiteGuardrailCache(tmp_path / "cache.db", max_size=20)
+    output = GuardrailFunctionOutput(output_info=None, tripwire_triggered=False)
+
+    def count_rows() -> int:
+        with sqlite3.connect(tmp_path / "cache.db") as connection:
+            (count,) = connection.execute("SELECT COUNT(*) FROM guardrail_cache").fetchone()
+        return int(count)
+
+    try:
+        for i in range(21):
+            now += 1
+            await cache.set(str(i), output)
+        # Outputs are evicted every other set, so the cache can briefly be over its size
+        assert count_rows() == 21
+
+        now += 1
+        await cache.get("0")
+        now += 1
+        await cache.set("21", output)
+        assert count_rows() == 20
+        assert await cache.get("0") is not None
+        assert await cache.get("1") is None
+        assert await cache.get("2") is None
+        assert await cache.get("3") is not None
+    finally:
+        cache.close()
+
+
+@pytest.mark.asyncio
+async def test_cached_input_guardrail_runs_once_per_input():
+    calls: list[Any] = []
+
+    @input_guardrail(cache=InMemoryGuardrailCache())
+    def check_input(
+        context: RunContextWrapper[Any], agent: Agent[Any], input: Any
+    ) -> GuardrailFunctionOutput:
+        calls.append(input)
+        return GuardrailFunctionOutput(output_info=len(calls), tripwire_triggered=False)
+
+    context = RunContextWrapper(context=None)
+    agent = Agent(name="test")
+
+    first = await check_input.run(agent, "hello", context)
+    second = await check_input.run(agent, "hello", context)
+    third = await check_input.run(agent, "goodbye", context)
+
+    assert calls == ["hello", "goodbye"]
+    assert (first.cache_hit, second.cache_hit, third.cache_hit) == (False, True, False)
+    assert second.output.output_info == 1
+    assert check_input.stats.cache_hits == 1
+    assert check_input.stats.cache_misses == 2
+    assert check_input.stats.cache_hit_rate == pytest.approx(1 / 3)
+
+
+@pytest.mark.asyncio
+async def test_cache_hits_are_left_out_of_latency_stats(monkeypatch: pytest.MonkeyPatch):
+    @input_guardrail(cache=InMemoryGuardrailCache())
+    async def check_input(
+        context: RunContextWrapper[Any], agent: Agent[Any], input: Any
+    ) -> GuardrailFunctionOutput:
+        return GuardrailFunctionOutput(output_info=None, tripwire_triggered=True)
+
+    now = 0.0
+
+    def perf_counter() -> float:
+        nonlocal now
+        now += 1.0
+        return now
+
+    monkeypatch.setattr("agents._run_impl.time.perf_counter", perf_counter)
+    context = RunContextWrapper(context=None)
+    agent = Agent(name="test")
+
+    miss = await RunImpl.run_single_input_guardrail(agent, check_input, "hello", context)
+    hit = await RunImpl.run_single_input_guardrail(agent, check_input, "hello", context)
+
+    assert (miss.cache_hit, hit.cache_hit) == (False, True)
+    assert hit.latency == 1.0
+    stats = check_input.stats
+    assert (stats.runs, stats.tripwires_triggered, stats.cache_hits) == (1, 1, 1)
+    assert list(stats.recent_latencies) == [miss.latency]
+
+
+@pytest.mark.asyncio
+async def test_cached_output_guardrail_keys_on_agent_output():
+    calls = 0
+
+    @output_guardrail(cache=InMemoryGuardrailCache())
+    async def check_output(
+        context: RunContextWrapper[Any], agent: Agent[Any], agent_output: Any
+    ) -> GuardrailFunctionOutput:
+        nonlocal calls
+        calls += 1
+        return GuardrailFunctionOutput(output_info=None, tripwire_triggered=False)
+
+    context = RunContextWrapper(context=None)
+    agent = Agent(name="test")
+
+    await check_output.run(context, agent, Verdict(reason="a"))
+    result = await check_output.run(context, agent, Verdict(reason="a"))
+    await check_output.run(context, agent, Verdict(reason="b"))
+
+    assert calls == 2
+    assert result.cache_hit
+    assert result.agent_output == Verdict(reason="a")
+
+
+@pytest.mark.asyncio
+async def test_uncached_guardrail_result_has_no_cache_hit():
+    @input_guardrail
+    def check_input(
+        context: RunContextWrapper[Any], agent: Agent[Any], input: Any
+    ) -> GuardrailFunctionOutput:
+        return GuardrailFunctionOutput(output_info=None, tripwire_triggered=False)
+
+    result = await RunImpl.run_single_input_guardrail(
+        Agent(name="test"), check_input, "hello", RunContextWrapper(context=None)
+    )
+
+    assert result.cache_hit is None
+    assert check_input.stats.cache_hit_rate == 0
+
+
+@pytest.mark.asyncio
+async def test_guardrail_spans_report_cache_hits():
+    @input_guardrail(cache=InMemoryGuardrailCache())
+    def check_input(
+        context: RunContextWrapper[Any], agent: Agent[Any], input: Any
+    ) -> GuardrailFunctionOutput:
+        return GuardrailFunctionOutput(output_info=None, tripwire_triggered=False)
+
+    model = FakeModel()
+    model.add_multiple_turn_outputs([[get_text_message("one")], [get_text_message("two")]])
+    agent = Agent(name="test", model=model, input_guardrails=[check_input])
+
+    await Runner.run(agent, input="hello")
+    await Runner.run(agent, input="hello")
+
+    exported = [
+        span.span_data.export()
+        for span in fetch_ordered_spans()
+        if isinstance(span.span_data, GuardrailSpanData)
+    ]
+    assert exported == [
+        {
+            "type": "guardrail",
+            "name": "check_input",
+            "triggered": False,
+            "cache_hit": False,
+            "cache_hit_rate": 0.0,
+        },
+        {
+            "type": "guardrail",
+            "name": "check_input",
+            "triggered": False,
+            "cache_hit": True,
+            "cache_hit_rate": 0.5,
+        },
+    ]
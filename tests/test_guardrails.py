@@ -7,12 +7,14 @@ import pytest
 from agents import (
     Agent,
     GuardrailFunctionOutput,
+    GuardrailStats,
     InputGuardrail,
     OutputGuardrail,
     RunContextWrapper,
     TResponseInputItem,
     UserError,
 )
+from agents._run_impl import RunImpl
 from agents.guardrail import input_guardrail, output_guardrail
 
 
@@ -260,3 +262,40 @@ async def test_output_guardrail_decorators():
     assert not result.output.tripwire_triggered
     assert result.output.output_info == "test_4"
     assert guardrail.get_name() == "Custom name"
+
+
+def test_guardrail_stats():
+    stats = GuardrailStats()
+    assert stats.mean_latency == 0
+    assert stats.latency_percentile(95) == 0
+
+    for i in range(1, 101):
+        stats.record(i / 1000, tripwire_triggered=i % 10 == 0)
+
+    assert stats.runs == 100
+    assert stats.tripwires_triggered == 10
+    assert stats.max_latency == 0.1
+    assert stats.mean_latency == pytest.approx(0.0505)
+    assert stats.latency_percentile(50) == 0.05
+    assert stats.latency_percentile(95) == 0.095
+    assert stats.latency_percentile(100) == 0.1
+
+
+@pytest.mark.asyncio
+async def test_guardrail_runs_record_latency():
+    input_rail = InputGuardrail(guardrail_function=get_async_input_guardrail(triggers=True))
+    output_rail = OutputGuardrail(guardrail_function=get_async_output_guardrail(triggers=False))
+    context = RunContextWrapper(context=None)
+    agent = Agent(name="test")
+
+    input_result = await RunImpl.run_single_input_guardrail(agent, input_rail, "test", context)
+    output_result = await RunImpl.run_single_output_guardrail(output_rail, agent, "out", context)
+
+    assert input_result.latency > 0
+    assert input_rail.stats.runs == 1
+    assert input_rail.stats.tripwires_triggered == 1
+    assert input_rail.stats.total_latency == input_result.latency
+
+    assert output_result.latency > 0
+    assert output_rail.stats.runs == 1
+    assert output_rail.stats.tripwires_triggered == 0
@@ -0,0 +1,92 @@
+from __future__ import annotations
+
+import subprocess
+import sys
+
+import pytest
+
+import agents
+
+# Budgets for the cumulative import time of `agents`, in microseconds. They're far above what the
+# imports take, to keep the tests stable on slow machines, but an eager import of the OpenAI client
+# alone takes several times longer.
+BARE_IMPORT_BUDGET_US = 100_000
+
+
+def _import_times(statement: str) -> dict[str, int]:
+    """Runs a statement in a fresh interpreter with `-X importtime`, and returns the cumulative
+    import time of every module it imported, in microseconds.
+    """
+    process = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", statement],
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+    times: dict[str, int] = {}
+    for line in process.stderr.splitlines():
+        if not line.startswith("import time:") or "cumulative" in line:
+            continue
+        _, cumulative, module = line[len("import time:") :].split("|")
+        times[module.strip()] = int(cumulative)
+    return times
+
+
+def test_bare_import_is_cheap():
+    times = _import_times("import agents")
+
+    assert times["agents"] < BARE_IMPORT_BUDGET_US
+    for heavy_module in ["openai", "pydantic", "griffe", "agents.run", "agents.tracing"]:
+        assert heavy_module not in times
+
+
+def test_defining_an_agent_skips_models_and_runner():
+    times = _import_times("from agents import Agent, function_tool")
+
+    for module in [
+        "agents.run",
+        "agents.models.openai_provider",
+        "agents.models.openai_responses",
+        "agents.models.openai_chatcompletions",
+        "agents.memory.sqlite_session",
+    ]:
+        assert module not in times
+
+
+def test_defining_a_tool_skips_docstring_parsing():
+    statement = (
+        "from agents import function_tool\n"
+        "@function_tool(defer_schema=True)\n"
+        "def f(a: int) -> int:\n  'Doc.'"
+    )
+    times = _import_times(statement)
+
+    assert "griffe" not in times
+
+
+def test_all_public_names_resolve():
+    for name in agents.__all__:
+        assert getattr(agents, name) is not None
+        assert name in dir(agents)
+
+    from agents.run import Runner
+
+    assert agents.Runner is Runner
+
+
+def test_submodules_resolve_as_attributes():
+    # In a fresh interpreter, so that the submodules aren't imported yet
+    statement = (
+        "import agents\n"
+        "assert agents.tracing.Span is not None\n"
+        "assert agents.extensions.__name__ == 'agents.extensions'\n"
+    )
+    subprocess.run([sys.executable, "-c", statement], check=True)
+
+
+def test_unknown_attribute_raises():
+    with pytest.raises(AttributeError):
+        agents.DoesNotExist  # noqa: B018
+    with pytest.raises(AttributeError):
+        agents.does_not_exist  # noqa: B018
+    assert not hasattr(agents, "__wrapped__")
@@ -0,0 +1,130 @@
+import copy
+import json
+import random
+from typing import Any
+
+import pytest
+from pydantic_core import from_json
+
+from agents._incremental_json import IncrementalJsonError, IncrementalJsonParser
+
+DOCUMENTS: list[Any] = [
+    {
+        "text": 'quotes "here", a \\ backslash\n, unicode é and 😀',
+        "numbers": [0, 1, -2, 3.25, -4e10, 1.5e-3],
+        "literals": [True, False, None],
+        "nested": {"empty_obj": {}, "empty_list": [], "deep": [[{"a": [1, {"b": "c"}]}]]},
+    },
+    [{"x": "y"}, [], [[1]], "s", 12, {}],
+    "just a string with \\ and ☃",
+    12345,
+    True,
+]
+
+
+@pytest.mark.parametrize("document", DOCUMENTS)
+@pytest.mark.parametrize("ensure_ascii", [True, False])
+def test_snapshots_match_partial_json_parsing(document: Any, ensure_ascii: bool):
+    text = json.dumps(document, ensure_ascii=ensure_ascii)
+    rng = random.Random(0)
+    for _ in range(20):
+        parser = IncrementalJsonParser()
+        start = 0
+        while start < len(text):
+            end = min(len(text), start + rng.randint(1, 8))
+            parser.feed(text[start:end])
+            start = end
+
+            prefix = text[:end]
+            if "\\" in prefix[-6:]:
+                # A trailing unfinished escape sequence is allowed to differ
+                continue
+            try:
+                expected = from_json(prefix, allow_partial="trailing-strings")
+            except ValueError:
+                with pytest.raises(IncrementalJsonError):
+                    parser.snapshot()
+            else:
+                assert parser.snapshot() == expected, prefix
+
+        assert parser.snapshot() == document
+
+
+def test_snapshots_do_not_change_after_more_chunks():
+    text = json.dumps(DOCUMENTS[0])
+    parser = IncrementalJsonParser()
+    snapshots = []
+    for char in text:
+        parser.feed(char)
+        try:
+            snapshot = parser.snapshot()
+        except IncrementalJsonError:
+            continue
+        snapshots.append((snapshot, copy.deepcopy(snapshot)))
+
+    for snapshot, original in snapshots:
+        assert snapshot == original
+
+
+def test_done():
+    parser = IncrementalJsonParser()
+    parser.feed('{"a": [1, "b"')
+    assert not parser.done
+    parser.feed("]}")
+    assert parser.done
+    parser.feed("  \n")
+    assert parser.snapshot() == {"a": [1, "b"]}
+
+
+def test_no_value_yet():
+    parser = IncrementalJsonParser()
+    parser.feed("  ")
+    with pytest.raises(IncrementalJsonError):
+        parser.snapshot()
+
+    parser.feed("tr")
+    with pytest.raises(IncrementalJsonError):
+        parser.snapshot()
+    parser.feed("ue")
+    assert parser.snapshot() is True
+
+
+@pytest.mark.parametrize(
+    "text",
+    ['{"a" 1}', "[1 2]", '{"a": tru}', "{]", '"\\x"', "1 2", '{"a": NaN}', '{"a": 1,,}', "[}"],
+)
+def test_invalid_json_raises(text: str):
+    parser = IncrementalJsonParser()
+    with pytest.raises(IncrementalJsonError):
+        parser.feed(text)
+        parser.feed(" ")
+
+
+def test_escape_split_across_chunks():
+    parser = IncrementalJsonParser()
+    for chunk in ['"a\\', "u00", "e9\\", "n\\ud83d\\", 'ude00"']:
+        parser.feed(chunk)
+    assert parser.snapshot() == "aé\n😀"
+    assert parser.done
+
+
+def test_long_string_is_parsed_in_linear_time(monkeypatch: pytest.MonkeyPatch):
+    scanned = 0
+    original_feed_string = IncrementalJsonParser._feed_string
+
+    def counting_feed_string(self: IncrementalJsonParser, chunk: str, i: int) -> tuple[str, int]:
+        nonlocal scanned
+        scanned += len(chunk) - i
+        return original_feed_string(self, chunk, i)
+
+    monkeypatch.setattr(IncrementalJsonParser, "_feed_string", counting_feed_string)
+    parser = IncrementalJsonParser()
+    parser.feed('{"text": "')
+    scanned = 0
+    for _ in range(20_000):
+        parser.feed("some words ")
+        parser.snapshot()
+
+    assert parser.snapshot()["text"] == "some words " * 20_000
+    # Each delta is scanned once; the prefix that was already parsed is never scanned again
+    assert scanned == len("some words ") * 20_000
@@ -0,0 +1,141 @@
+from __future__ import annotations
+
+import json
+from typing import Any, cast
+
+import pytest
+from openai.types.responses import ResponseOutputMessage
+from pydantic import BaseModel
+
+from agents import (
+    Agent,
+    FunctionTool,
+    JSONCodec,
+    MessageOutputItem,
+    ModelBehaviorError,
+    OrjsonCodec,
+    RunCheckpoint,
+    RunContextWrapper,
+    StdlibJSONCodec,
+    Usage,
+    function_tool,
+    get_json_codec,
+    set_json_codec,
+)
+
+from .test_responses import get_text_message
+
+
+class Point(BaseModel):
+    x: int
+    y: int
+
+
+CODECS = [StdlibJSONCodec(), OrjsonCodec()]
+
+
+@pytest.fixture
+def restore_codec():
+    codec = get_json_codec()
+    yield
+    set_json_codec(codec)
+
+
+@pytest.mark.parametrize("codec", CODECS, ids=lambda codec: type(codec).__name__)
+def test_codec_round_trip(codec: JSONCodec):
+    value = {"text": 'unicode é and "quotes"', "numbers": [1, 2.5, None, True], "nested": {}}
+
+    encoded = codec.dumps(value)
+    assert isinstance(encoded, bytes)
+    assert json.loads(encoded) == value
+    assert codec.loads(encoded) == value
+    assert codec.loads(encoded.decode()) == value
+
+
+@pytest.mark.parametrize("codec", CODECS, ids=lambda codec: type(codec).__name__)
+def test_codec_encodes_pydantic_models(codec: JSONCodec):
+    encoded = codec.dumps({"point": Point(x=1, y=2)})
+    assert json.loads(encoded) == {"point": {"x": 1, "y": 2}}
+
+    pretty = codec.dumps_pretty([Point(x=1, y=2)])
+    assert json.loads(pretty) == [{"x": 1, "y": 2}]
+    assert "\n  " in pretty
+
+
+@pytest.mark.parametrize("codec", CODECS, ids=lambda codec: type(codec).__name__)
+def test_codec_errors(codec: JSONCodec):
+    with pytest.raises(ValueError):
+        codec.loads('{"a": ')
+
+    with pytest.raises(TypeError):
+        codec.dumps({"a": object()})
+
+
+def test_orjson_is_the_default():
+    assert isinstance(get_json_codec(), OrjsonCodec)
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("codec", CODECS, ids=lambda codec: type(codec).__name__)
+async def test_function_tool_uses_codec(codec: JSONCodec, restore_codec):
+    set_json_codec(codec)
+
+    @function_tool(failure_error_function=None)
+    def add(a: int, b: int) -> int:
+        return a + b
+
+    assert isinstance(add, FunctionTool)
+    ctx = RunContextWrapper(context=None)
+    assert await add.on_invoke_tool(ctx, '{"a": 1, "b": 2}') == "3"
+
+    with pytest.raises(ModelBehaviorError):
+        await add.on_invoke_tool(ctx, '{"a": 1,')
+
+
+@pytest.mark.asyncio
+async def test_custom_codec(restore_codec):
+    class CountingCodec(StdlibJSONCodec):
+        loads_calls = 0
+
+        def loads(self, data: str | bytes) -> Any:
+            self.loads_calls += 1
+            return super().loads(data)
+
+    codec = CountingCodec()
+    set_json_codec(codec)
+
+    checkpoint = RunCheckpoint(
+        run_id="run_1",
+        agent_name="test",
+        original_input="hi",
+        generated_items=[],
+        usage=Usage(),
+        current_turn=1,
+    )
+    assert RunCheckpoint.from_json(checkpoint.to_json()) == checkpoint
+    assert codec.loads_calls == 1
+
+
+def test_output_items_are_only_dumped_once(monkeypatch: pytest.MonkeyPatch):
+    raw_item = get_text_message("hello")
+    assert isinstance(raw_item, ResponseOutputMessage)
+    expected = raw_item.model_dump(exclude_unset=True)
+    item = MessageOutputItem(agent=Agent(name="test"), raw_item=raw_item)
+
+    dumps = 0
+    original_model_dump = ResponseOutputMessage.model_dump
+
+    def counting_model_dump(self, **kwargs):
+        nonlocal dumps
+        dumps += 1
+        return original_model_dump(self, **kwargs)
+
+    monkeypatch.setattr(ResponseOutputMessage, "model_dump", counting_model_dump)
+    first = cast(dict[str, Any], item.to_input_item())
+    assert first == expected
+    # Changing the returned item, including its nested content, doesn't change the next one
+    first["role"] = "user"
+    first["content"][0]["text"] = "changed"
+    first["content"].append({"type": "output_text", "text": "more"})
+    assert item.to_input_item() == expected
+    assert dumps == 1
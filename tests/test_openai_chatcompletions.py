@@ -5,7 +5,7 @@ from typing import Any
 
 import httpx
 import pytest
-from openai import NOT_GIVEN
+from openai import NOT_GIVEN, AsyncOpenAI
 from openai.types.chat.chat_completion import ChatCompletion, Choice
 from openai.types.chat.chat_completion_chunk import ChatCompletionChunk
 from openai.types.chat.chat_completion_message import ChatCompletionMessage
@@ -23,14 +23,19 @@ from openai.types.responses import (
 )
 
 from agents import (
+    Agent,
     ModelResponse,
     ModelSettings,
     ModelTracing,
     OpenAIChatCompletionsModel,
     OpenAIProvider,
+    RunConfig,
+    Runner,
+    function_tool,
     generation_span,
 )
 from agents.models.fake_id import FAKE_RESPONSES_ID
+from agents.models.openai_chatcompletions import _Converter
 
 
 @pytest.mark.allow_call_model_methods
@@ -288,3 +293,77 @@ async def test_fetch_response_stream(monkeypatch) -> None:
     assert response.output == []
     # We returned the async iterator produced by our dummy.
     assert hasattr(stream, "__aiter__")
+
+
+def test_provider_reuses_chat_completions_models():
+    """
+    The runner gets the model from the provider on every turn, so the provider must return the same
+    model, with the same cache of converted messages.
+    """
+    provider = OpenAIProvider(openai_client=AsyncOpenAI(api_key="fake"), use_responses=False)
+
+    assert provider.get_model("gpt-4") is provider.get_model("gpt-4")
+    assert provider.get_model("gpt-4") is not provider.get_model("gpt-4o")
+
+
+@pytest.mark.allow_call_model_methods
+@pytest.mark.asyncio
+async def test_items_to_messages_cache_hits_on_second_turn_of_run(monkeypatch):
+    """
+    On the second turn of a run, only the items added by the first turn are converted.
+    """
+    client = AsyncOpenAI(api_key="fake")
+    responses = [
+        _chat_completion(
+            ChatCompletionMessage(
+                role="assistant",
+                content=None,
+                tool_calls=[
+                    ChatCompletionMessageToolCall(
+                        id="call_1",
+                        type="function",
+                        function=Function(name="lookup", arguments="{}"),
+                    )
+                ],
+            )
+        ),
+        _chat_completion(ChatCompletionMessage(role="assistant", content="Done.")),
+    ]
+    sent_messages: list[list[Any]] = []
+
+    async def create(**kwargs: Any) -> ChatCompletion:
+        sent_messages.append(kwargs["messages"])
+        return responses.pop(0)
+
+    monkeypatch.setattr(client.chat.completions, "create", create)
+    converted_counts: list[int] = []
+    original_convert_items = _Converter._convert_items
+
+    def counting_convert_items(items: list[Any], *args: Any, **kwargs: Any) -> None:
+        converted_counts.append(len(items))
+        original_convert_items(items, *args, **kwargs)
+
+    monkeypatch.setattr(_Converter, "_convert_items", counting_convert_items)
+
+    @function_tool
+    def lookup() -> str:
+        return "found"
+
+    agent = Agent(name="test", model="gpt-4", tools=[lookup])
+    provider = OpenAIProvider(openai_client=client, use_responses=False)
+    result = await Runner.run(agent, "Look it up.", run_config=RunConfig(model_provider=provider))
+
+    assert result.final_output == "Done."
+    # Turn 1 converts the user message; turn 2 only converts the tool call and its output
+    assert converted_counts == [1, 2]
+    assert sent_messages[1][:1] == sent_messages[0]
+
+
+def _chat_completion(message: ChatCompletionMessage) -> ChatCompletion:
+    return ChatCompletion(
+        id="resp-id",
+        created=0,
+        model="fake",
+        object="chat.completion",
+        choices=[Choice(index=0, finish_reason="stop", message=message)],
+    )
@@ -23,9 +23,10 @@ These tests exercise both conversion directions:
 
 from __future__ import annotations
 
-from typing import Literal, cast
+from typing import Any, Literal, cast
 
 import pytest
+from openai import AsyncOpenAI
 from openai.types.chat import ChatCompletionMessage, ChatCompletionMessageToolCall
 from openai.types.chat.chat_completion_message_tool_call import Function
 from openai.types.responses import (
@@ -42,7 +43,11 @@ from agents.agent_output import AgentOutputSchema
 from agents.exceptions import UserError
 from agents.items import TResponseInputItem
 from agents.models.fake_id import FAKE_RESPONSES_ID
-from agents.models.openai_chatcompletions import _Converter
+from agents.models.openai_chatcompletions import (
+    OpenAIChatCompletionsModel,
+    _Converter,
+    _ItemsToMessagesCache,
+)
 
 
 def test_message_to_output_items_with_text_only():
@@ -393,3 +398,128 @@ def test_unknown_object_errors():
     with pytest.raises(UserError, match="Unhandled item type or structure"):
         # Purposely ignore the type error
         _Converter.items_to_messages([TestObject()])  # type: ignore
+
+
+def _conversation_turns() -> list[list[TResponseInputItem]]:
+    """A conversation that grows by one model turn (tool call + output) at a time."""
+    turns: list[list[TResponseInputItem]] = []
+    items: list[TResponseInputItem] = [
+        {"role": "developer", "content": "Be terse."},
+        {"role": "user", "content": [{"type": "input_text", "text": "Look things up."}]},
+    ]
+    turns.append(list(items))
+    for i in range(3):
+        items.append(
+            {
+                "type": "function_call",
+                "id": FAKE_RESPONSES_ID,
+                "call_id": f"call_{i}",
+                "name": "lookup",
+                "arguments": f'{{"n": {i}}}',
+            }
+        )
+        items.append({"type": "function_call_output", "call_id": f"call_{i}", "output": str(i)})
+        turns.append(list(items))
+    return turns
+
+
+def _fresh_copy(items: list[TResponseInputItem]) -> list[TResponseInputItem]:
+    """Equal copies of the items, like the ones the runner passes on every turn."""
+    return [cast(TResponseInputItem, dict(item)) for item in items]
+
+
+def test_items_to_messages_cache_matches_uncached_conversion():
+    """
+    The cache must produce exactly the same messages as a plain conversion, turn after turn, even
+    though every turn passes freshly built (but equal) item dicts.
+    """
+    cache = _ItemsToMessagesCache()
+    for turn in _conversation_turns():
+        assert cache.items_to_messages(_fresh_copy(turn)) == _Converter.items_to_messages(turn)
+
+
+def test_items_to_messages_cache_reuses_converted_prefix(monkeypatch):
+    """
+    Messages converted on a previous turn should be reused, and only the new items converted.
+    """
+    converted_counts: list[int] = []
+    original_convert_items = _Converter._convert_items
+
+    def counting_convert_items(items, *args, **kwargs):
+        converted_counts.append(len(items))
+        return original_convert_items(items, *args, **kwargs)
+
+    monkeypatch.setattr(_Converter, "_convert_items", counting_convert_items)
+    cache = _ItemsToMessagesCache()
+    turns = _conversation_turns()
+    first = cache.items_to_messages(turns[1])
+    second = cache.items_to_messages(_fresh_copy(turns[2]))
+
+    assert converted_counts == [len(turns[1]), 2]
+    assert second[: len(first)] == first
+    assert len(second) == len(first) + 2
+
+
+def test_items_to_messages_cache_does_not_reuse_changed_items():
+    """
+    If an earlier item changed, messages from that point on must be converted again.
+    """
+    cache = _ItemsToMessagesCache()
+    turns = _conversation_turns()
+    cache.items_to_messages(turns[2])
+
+    changed = list(turns[2])
+    changed[1] = {"role": "user", "content": "Something else."}
+    messages = cache.items_to_messages(changed)
+
+    assert messages == _Converter.items_to_messages(changed)
+    assert messages[1]["content"] == "Something else."
+
+
+def test_items_to_messages_cache_returns_independent_lists():
+    """
+    Callers insert the system prompt into the returned list, which must not leak into the cache.
+    """
+    cache = _ItemsToMessagesCache()
+    turn = _conversation_turns()[1]
+    messages = cache.items_to_messages(turn)
+    messages.insert(0, {"role": "system", "content": "sys"})
+
+    assert cache.items_to_messages(turn) == _Converter.items_to_messages(turn)
+
+
+def test_items_to_messages_cache_returns_copies_of_messages():
+    """
+    Changing a returned message must not change the messages returned by later calls.
+    """
+    cache = _ItemsToMessagesCache()
+    turn = _conversation_turns()[1]
+    messages = cache.items_to_messages(turn)
+    messages[0]["content"] = "Changed."
+
+    assert cache.items_to_messages(turn) == _Converter.items_to_messages(turn)
+
+
+def test_items_to_messages_cache_returns_deep_copies_of_messages():
+    """
+    The nested `content` and `tool_calls` of returned messages must not be shared with the cache.
+    """
+    cache = _ItemsToMessagesCache()
+    turn = _conversation_turns()[2]
+    messages = cast(list[dict[str, Any]], cache.items_to_messages(turn))
+    messages[1]["content"][0]["text"] = "Changed."
+    messages[2]["tool_calls"][0]["function"]["name"] = "changed"
+    messages[2]["tool_calls"].clear()
+
+    assert cache.items_to_messages(turn) == _Converter.items_to_messages(turn)
+
+
+def test_items_to_messages_cache_is_per_model():
+    """
+    Each model keeps its own conversions, so they're released along with the model.
+    """
+    client = AsyncOpenAI(api_key="fake")
+    first = OpenAIChatCompletionsModel(model="gpt-4", openai_client=client)
+    second = OpenAIChatCompletionsModel(model="gpt-4", openai_client=client)
+
+    assert first._messages_cache is not second._messages_cache
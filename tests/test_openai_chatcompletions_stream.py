@@ -1,3 +1,5 @@
+from __future__ import annotations
+
 from collections.abc import AsyncIterator
 
 import pytest
@@ -11,7 +13,10 @@ from openai.types.chat.chat_completion_chunk import (
 from openai.types.completion_usage import CompletionUsage
 from openai.types.responses import (
     Response,
+    ResponseFunctionCallArgumentsDeltaEvent,
     ResponseFunctionToolCall,
+    ResponseOutputItemAddedEvent,
+    ResponseOutputItemDoneEvent,
     ResponseOutputMessage,
     ResponseOutputRefusal,
     ResponseOutputText,
@@ -19,7 +24,10 @@ from openai.types.responses import (
 
 from agents.model_settings import ModelSettings
 from agents.models.interface import ModelTracing
-from agents.models.openai_chatcompletions import OpenAIChatCompletionsModel
+from agents.models.openai_chatcompletions import (
+    OpenAIChatCompletionsModel,
+    _StreamingFunctionCall,
+)
 from agents.models.openai_provider import OpenAIProvider
 
 
@@ -252,27 +260,362 @@ async def test_stream_response_yields_events_for_tool_call(monkeypatch) -> None:
         tracing=ModelTracing.DISABLED,
     ):
         output_events.append(event)
-    # Sequence should be: response.created, then after loop we expect function call-related events:
-    # one response.output_item.added for function call, a response.function_call_arguments.delta,
-    # a response.output_item.done, and finally response.completed.
-    assert output_events[0].type == "response.created"
-    # The next three events are about the tool call.
-    assert output_events[1].type == "response.output_item.added"
+    # Sequence should be: response.created, then a response.output_item.added for the function call
+    # once its name is complete, a response.function_call_arguments.delta with the arguments
+    # received so far, a response.output_item.done, and finally response.completed.
+    assert [e.type for e in output_events] == [
+        "response.created",
+        "response.output_item.added",
+        "response.function_call_arguments.delta",
+        "response.output_item.done",
+        "response.completed",
+    ]
     # The added item should be a ResponseFunctionToolCall.
-    added_fn = output_events[1].item
+    added_event = output_events[1]
+    assert added_event.type == "response.output_item.added"
+    added_fn = added_event.item
     assert isinstance(added_fn, ResponseFunctionToolCall)
     assert added_fn.name == "my_func"  # Name should be concatenation of both chunks.
-    assert added_fn.arguments == "arg1arg2"
-    assert output_events[2].type == "response.function_call_arguments.delta"
-    assert output_events[2].delta == "arg1arg2"
-    assert output_events[3].type == "response.output_item.done"
-    assert output_events[4].type == "response.completed"
-    assert output_events[2].delta == "arg1arg2"
-    assert output_events[3].type == "response.output_item.done"
-    assert output_events[4].type == "response.completed"
-    assert added_fn.name == "my_func"  # Name should be concatenation of both chunks.
-    assert added_fn.arguments == "arg1arg2"
-    assert output_events[2].type == "response.function_call_arguments.delta"
-    assert output_events[2].delta == "arg1arg2"
-    assert output_events[3].type == "response.output_item.done"
-    assert output_events[4].type == "response.completed"
+    assert added_fn.arguments == ""
+    delta_event = output_events[2]
+    assert delta_event.type == "response.function_call_arguments.delta"
+    assert delta_event.delta == "arg1arg2"
+    # The done item and the final response carry the fully accumulated call.
+    done_event = output_events[3]
+    assert done_event.type == "response.output_item.done"
+    done_fn = done_event.item
+    assert isinstance(done_fn, ResponseFunctionToolCall)
+    assert done_fn.name == "my_func"
+    assert done_fn.arguments == "arg1arg2"
+    completed_event = output_events[4]
+    assert completed_event.type == "response.completed"
+    assert completed_event.response.output == [done_fn]
+
+
+@pytest.mark.allow_call_model_methods
+@pytest.mark.asyncio
+async def test_stream_response_streams_parallel_tool_calls_incrementally(monkeypatch) -> None:
+    """
+    Validate that with several tool calls in one response, each one is announced and its arguments
+    streamed as soon as the data arrives, rather than at the end of the stream. Arguments that
+    arrive before the name are buffered and flushed when the call is announced.
+    """
+
+    def tool_call_chunk(delta: ChoiceDeltaToolCall) -> ChatCompletionChunk:
+        return ChatCompletionChunk(
+            id="chunk-id",
+            created=1,
+            model="fake",
+            object="chat.completion.chunk",
+            choices=[Choice(index=0, delta=ChoiceDelta(tool_calls=[delta]))],
+        )
+
+    chunks = [
+        ChatCompletionChunk(
+            id="chunk-id",
+            created=1,
+            model="fake",
+            object="chat.completion.chunk",
+            choices=[Choice(index=0, delta=ChoiceDelta(content="Calling tools"))],
+        ),
+        tool_call_chunk(
+            ChoiceDeltaToolCall(
+                index=0, id="call-a", function=ChoiceDeltaToolCallFunction(name="tool_a")
+            )
+        ),
+        tool_call_chunk(
+            ChoiceDeltaToolCall(index=0, function=ChoiceDeltaToolCallFunction(arguments='{"a":'))
+        ),
+        tool_call_chunk(
+            ChoiceDeltaToolCall(index=0, function=ChoiceDeltaToolCallFunction(arguments="1}"))
+        ),
+        tool_call_chunk(
+            ChoiceDeltaToolCall(index=1, function=ChoiceDeltaToolCallFunction(arguments="{}"))
+        ),
+        tool_call_chunk(
+            ChoiceDeltaToolCall(
+                index=1, id="call-b", function=ChoiceDeltaToolCallFunction(name="tool_b")
+            )
+        ),
+    ]
+
+    async def fake_stream() -> AsyncIterator[ChatCompletionChunk]:
+        for c in chunks:
+            yield c
+
+    async def patched_fetch_response(self, *args, **kwargs):
+        resp = Response(
+            id="resp-id",
+            created_at=0,
+            model="fake-model",
+            object="response",
+            output=[],
+            tool_choice="none",
+            tools=[],
+            parallel_tool_calls=False,
+        )
+        return resp, fake_stream()
+
+    monkeypatch.setattr(OpenAIChatCompletionsModel, "_fetch_response", patched_fetch_response)
+    model = OpenAIProvider(use_responses=False).get_model("gpt-4")
+    output_events = []
+    async for event in model.stream_response(
+        system_instructions=None,
+        input="",
+        model_settings=ModelSettings(),
+        tools=[],
+        output_schema=None,
+        handoffs=[],
+        tracing=ModelTracing.DISABLED,
+    ):
+        output_events.append(event)
+
+    function_events: list[tuple[str, int, str | None]] = []
+    for e in output_events:
+        if isinstance(e, ResponseFunctionCallArgumentsDeltaEvent):
+            function_events.append((e.type, e.output_index, e.delta))
+        elif isinstance(
+            e, (ResponseOutputItemAddedEvent, ResponseOutputItemDoneEvent)
+        ) and isinstance(e.item, ResponseFunctionToolCall):
+            function_events.append((e.type, e.output_index, None))
+    assert function_events == [
+        ("response.output_item.added", 1, None),
+        ("response.function_call_arguments.delta", 1, '{"a":'),
+        ("response.function_call_arguments.delta", 1, "1}"),
+        ("response.output_item.added", 2, None),
+        ("response.function_call_arguments.delta", 2, "{}"),
+        ("response.output_item.done", 1, None),
+        ("response.output_item.done", 2, None),
+    ]
+    # Tool calls are announced while the stream is still running, not after it ends.
+    types = [e.type for e in output_events]
+    assert types.index("response.output_item.added") < types.index("response.content_part.done")
+
+    completed = output_events[-1]
+    assert completed.type == "response.completed"
+    message, call_a, call_b = completed.response.output
+    assert isinstance(message, ResponseOutputMessage)
+    assert isinstance(call_a, ResponseFunctionToolCall)
+    assert (call_a.call_id, call_a.name, call_a.arguments) == ("call-a", "tool_a", '{"a":1}')
+    assert isinstance(call_b, ResponseFunctionToolCall)
+    assert (call_b.call_id, call_b.name, call_b.arguments) == ("call-b", "tool_b", "{}")
+
+
+@pytest.mark.allow_call_model_methods
+@pytest.mark.asyncio
+async def test_stream_response_output_indices_follow_item_order(monkeypatch) -> None:
+    """
+    Validate that when a tool call starts before the assistant message, each item keeps a distinct
+    output index, and the final response lists the items in the same order.
+    """
+    chunks = [
+        ChatCompletionChunk(
+            id="chunk-id",
+            created=1,
+            model="fake",
+            object="chat.completion.chunk",
+            choices=[
+                Choice(
+                    index=0,
+                    delta=ChoiceDelta(
+                        tool_calls=[
+                            ChoiceDeltaToolCall(
+                                index=0,
+                                id="call-a",
+                                function=ChoiceDeltaToolCallFunction(name="tool_a", arguments="{}"),
+                            )
+                        ]
+                    ),
+                )
+            ],
+        ),
+        ChatCompletionChunk(
+            id="chunk-id",
+            created=1,
+            model="fake",
+            object="chat.completion.chunk",
+            choices=[Choice(index=0, delta=ChoiceDelta(content="Done"))],
+        ),
+    ]
+
+    async def fake_stream() -> AsyncIterator[ChatCompletionChunk]:
+        for c in chunks:
+            yield c
+
+    async def patched_fetch_response(self, *args, **kwargs):
+        resp = Response(
+            id="resp-id",
+            created_at=0,
+            model="fake-model",
+            object="response",
+            output=[],
+            tool_choice="none",
+            tools=[],
+            parallel_tool_calls=False,
+        )
+        return resp, fake_stream()
+
+    monkeypatch.setattr(OpenAIChatCompletionsModel, "_fetch_response", patched_fetch_response)
+    model = OpenAIProvider(use_responses=False).get_model("gpt-4")
+    output_events = []
+    async for event in model.stream_response(
+        system_instructions=None,
+        input="",
+        model_settings=ModelSettings(),
+        tools=[],
+        output_schema=None,
+        handoffs=[],
+        tracing=ModelTracing.DISABLED,
+    ):
+        output_events.append(event)
+
+    added = [
+        (e.output_index, e.item.type)
+        for e in output_events
+        if e.type == "response.output_item.added"
+    ]
+    done = [
+        (e.output_index, e.item.type)
+        for e in output_events
+        if e.type == "response.output_item.done"
+    ]
+    assert added == [(0, "function_call"), (1, "message")]
+    assert done == [(0, "function_call"), (1, "message")]
+    assert {e.output_index for e in output_events if e.type == "response.output_text.delta"} == {1}
+
+    completed = output_events[-1]
+    assert completed.type == "response.completed"
+    assert [item.type for item in completed.response.output] == ["function_call", "message"]
+
+
+def _synthetic_chunks(num_chunks: int) -> list[ChatCompletionChunk]:
+    """Builds a long stream: `num_chunks` text deltas followed by `num_chunks` argument deltas for a
+    single tool call."""
+    chunks = [
+        ChatCompletionChunk(
+            id="chunk-id",
+            created=1,
+            model="fake",
+            object="chat.completion.chunk",
+            choices=[Choice(index=0, delta=ChoiceDelta(content="ab"))],
+        )
+        for _ in range(num_chunks)
+    ]
+    chunks.append(
+        ChatCompletionChunk(
+            id="chunk-id",
+            created=1,
+            model="fake",
+            object="chat.completion.chunk",
+            choices=[
+                Choice(
+                    index=0,
+                    delta=ChoiceDelta(
+                        tool_calls=[
+                            ChoiceDeltaToolCall(
+                                index=0,
+                                id="tool-id",
+                                function=ChoiceDeltaToolCallFunction(name="fn", arguments=""),
+                                type="function",
+                            )
+                        ]
+                    ),
+                )
+            ],
+        )
+    )
+    for _ in range(num_chunks):
+        chunks.append(
+            ChatCompletionChunk(
+                id="chunk-id",
+                created=1,
+                model="fake",
+                object="chat.completion.chunk",
+                choices=[
+                    Choice(
+                        index=0,
+                        delta=ChoiceDelta(
+                            tool_calls=[
+                                ChoiceDeltaToolCall(
+                                    index=0,
+                                    function=ChoiceDeltaToolCallFunction(arguments="xy"),
+                                )
+                            ]
+                        ),
+                    )
+                ],
+            )
+        )
+    return chunks
+
+
+@pytest.mark.allow_call_model_methods
+@pytest.mark.asyncio
+async def test_stream_response_long_stream_is_linear(monkeypatch) -> None:
+    """
+    Stream 10k text chunks and 10k tool call argument chunks through `stream_response`, and check
+    that everything is accumulated correctly, with one event per chunk, and that the accumulated
+    tool call is only built a constant number of times rather than once per chunk (which would make
+    streaming quadratic).
+    """
+    num_chunks = 10_000
+    chunks = _synthetic_chunks(num_chunks)
+
+    async def fake_stream() -> AsyncIterator[ChatCompletionChunk]:
+        for c in chunks:
+            yield c
+
+    async def patched_fetch_response(self, *args, **kwargs):
+        resp = Response(
+            id="resp-id",
+            created_at=0,
+            model="fake-model",
+            object="response",
+            output=[],
+            tool_choice="none",
+            tools=[],
+            parallel_tool_calls=False,
+        )
+        return resp, fake_stream()
+
+    monkeypatch.setattr(OpenAIChatCompletionsModel, "_fetch_response", patched_fetch_response)
+    builds = 0
+    original_to_output_item = _StreamingFunctionCall.to_output_item
+
+    def counting_to_output_item(
+        self: _StreamingFunctionCall, arguments: str | None = None
+    ) -> ResponseFunctionToolCall:
+        nonlocal builds
+        builds += 1
+        return original_to_output_item(self, arguments)
+
+    monkeypatch.setattr(_StreamingFunctionCall, "to_output_item", counting_to_output_item)
+    model = OpenAIProvider(use_responses=False).get_model("gpt-4")
+
+    output_events = []
+    async for event in model.stream_response(
+        system_instructions=None,
+        input="",
+        model_settings=ModelSettings(),
+        tools=[],
+        output_schema=None,
+        handoffs=[],
+        tracing=ModelTracing.DISABLED,
+    ):
+        output_events.append(event)
+
+    last_event = output_events[-1]
+    assert last_event.type == "response.completed"
+    message, function_call = last_event.response.output
+    assert isinstance(message, ResponseOutputMessage)
+    assert isinstance(message.content[0], ResponseOutputText)
+    assert message.content[0].text == "ab" * num_chunks
+    assert isinstance(function_call, ResponseFunctionToolCall)
+    assert function_call.arguments == "xy" * num_chunks
+
+    types = [e.type for e in output_events]
+    assert types.count("response.output_text.delta") == num_chunks
+    assert types.count("response.function_call_arguments.delta") == num_chunks
+    # Besides the deltas, only a constant number of events (created, added, done, completed...)
+    assert len(output_events) - 2 * num_chunks < 10
+    assert builds <= 3
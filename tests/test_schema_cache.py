@@ -0,0 +1,254 @@
+from __future__ import annotations
+
+import json
+import os
+import time
+from pathlib import Path
+from typing import Annotated, Any, Callable
+
+import pytest
+from pydantic import BaseModel, Field, create_model
+
+from agents import RunContextWrapper, agent_output, function_tool
+from agents.agent_output import AgentOutputSchema
+from agents.function_schema import FuncSchema, function_schema
+from agents.schema_cache import (
+    SchemaCache,
+    function_schema_key,
+    get_schema_cache,
+    set_schema_cache,
+    type_schema_key,
+)
+
+
+class Location(BaseModel):
+    city: str
+    country: str = "US"
+
+
+class Forecast(BaseModel):
+    location: Location
+    temperatures: list[float]
+
+
+def get_forecast(location: Location, days: int = 3) -> str:
+    """Returns the forecast.
+
+    Args:
+        location: Where to get the forecast for.
+        days: The number of days.
+    """
+    return f"{location.city}: sunny for {days} days"
+
+
+class Marker:
+    pass
+
+
+@pytest.fixture(autouse=True)
+def reset_schema_cache():
+    agent_output._built_schemas.clear()
+    yield
+    set_schema_cache(None)
+    agent_output._built_schemas.clear()
+
+
+@pytest.fixture
+def schema_builds(monkeypatch: pytest.MonkeyPatch) -> list[str]:
+    builds: list[str] = []
+
+    def counting_function_schema(func: Callable[..., Any], **kwargs: Any) -> FuncSchema:
+        builds.append(func.__name__)
+        return function_schema(func, **kwargs)
+
+    monkeypatch.setattr("agents.tool.function_schema", counting_function_schema)
+    return builds
+
+
+@pytest.mark.asyncio
+async def test_tool_schema_is_cached_across_processes(tmp_path: Path, schema_builds: list[str]):
+    set_schema_cache(SchemaCache(tmp_path))
+    first = function_tool(get_forecast)
+    assert first.params_json_schema["properties"]["days"]["description"] == "The number of days."
+    cache = get_schema_cache()
+    assert cache is not None and cache.misses == 1
+    cache.save()
+    assert cache.path.exists()
+
+    # A new process reads the cache file
+    set_schema_cache(SchemaCache(tmp_path))
+    schema_builds.clear()
+    second = function_tool(get_forecast)
+
+    assert second.description == first.description
+    assert second.params_json_schema == first.params_json_schema
+    assert schema_builds == []
+    cache = get_schema_cache()
+    assert cache is not None and cache.hits == 1
+
+    # The pydantic model is still built to invoke the tool
+    result = await second.on_invoke_tool(RunContextWrapper(None), '{"location": {"city": "Oslo"}}')
+    assert result == "Oslo: sunny for 3 days"
+    assert schema_builds == ["get_forecast"]
+
+
+def test_tool_options_are_part_of_the_key():
+    assert function_schema_key(get_forecast, name_override=None) != function_schema_key(
+        get_forecast, name_override="forecast"
+    )
+
+
+def test_type_key_follows_the_fields_of_nested_types():
+    def make_forecast(temperature_type: type) -> type[BaseModel]:
+        nested = create_model("Nested", value=(temperature_type, ...))
+        return create_model("Forecast", nested=(nested, ...))
+
+    assert type_schema_key(make_forecast(int)) == type_schema_key(make_forecast(int))
+    assert type_schema_key(make_forecast(int)) != type_schema_key(make_forecast(str))
+    assert type_schema_key(list[Forecast]) != type_schema_key(list[Location])
+
+
+def test_type_key_follows_annotated_metadata():
+    def make_model(description: str) -> type[BaseModel]:
+        return create_model("Model", value=(Annotated[int, Field(description=description)], ...))
+
+    assert type_schema_key(make_model("Days")) == type_schema_key(make_model("Days"))
+    assert type_schema_key(make_model("Days")) != type_schema_key(make_model("Hours"))
+
+
+@pytest.mark.filterwarnings("ignore::pydantic.json_schema.PydanticJsonSchemaWarning")
+def test_metadata_with_object_addresses_is_not_cached(tmp_path: Path):
+    assert type_schema_key(Annotated[int, Marker()]) is None
+
+    def get_days(days: int = Marker()) -> str:  # type: ignore[assignment]
+        return str(days)
+
+    assert function_schema_key(get_days) is None
+
+    set_schema_cache(SchemaCache(tmp_path))
+    function_tool(get_days)
+    AgentOutputSchema(list[Annotated[int, Marker()]])
+    assert get_schema_cache().misses == 0  # type: ignore[union-attr]
+
+
+def test_output_schema_is_cached(tmp_path: Path):
+    set_schema_cache(SchemaCache(tmp_path))
+    schema = AgentOutputSchema(Forecast).json_schema()
+    wrapped_schema = AgentOutputSchema(list[Forecast]).json_schema()
+    get_schema_cache().save()  # type: ignore[union-attr]
+
+    # Start over, as a new process would
+    agent_output._built_schemas.clear()
+    cache = SchemaCache(tmp_path)
+    set_schema_cache(cache)
+    assert AgentOutputSchema(Forecast).json_schema() == schema
+    output_schema = AgentOutputSchema(list[Forecast])
+    assert output_schema.json_schema() == wrapped_schema
+    assert cache.hits == 2
+    assert output_schema.validate_json('{"response": []}') == []
+
+
+def test_output_schema_is_built_once_per_process(tmp_path: Path, monkeypatch: pytest.MonkeyPatch):
+    keys: list[Any] = []
+
+    def counting_type_schema_key(tp: Any, **options: Any) -> str | None:
+        keys.append(tp)
+        return type_schema_key(tp, **options)
+
+    monkeypatch.setattr("agents.agent_output.type_schema_key", counting_type_schema_key)
+    set_schema_cache(SchemaCache(tmp_path))
+
+    first = AgentOutputSchema(list[Forecast])
+    second = AgentOutputSchema(list[Forecast])
+    assert keys == [list[Forecast]]
+    assert second._type_adapter is first._type_adapter
+    assert second.validate_json('{"response": []}') == []
+
+    first.json_schema()["properties"].clear()
+    assert "response" in second.json_schema()["properties"]
+
+    AgentOutputSchema(list[Forecast], strict_json_schema=False)
+    assert len(keys) == 2
+
+
+def test_save_merges_entries_from_other_processes(tmp_path: Path):
+    cache_a = SchemaCache(tmp_path)
+    cache_b = SchemaCache(tmp_path)
+    cache_a.get("a")
+    cache_b.get("b")
+    cache_a.set("a", {"type": "object"})
+    cache_b.set("b", {"type": "string"})
+    cache_a.save()
+    cache_b.save()
+
+    cache = SchemaCache(tmp_path)
+    assert cache.get("a") == {"type": "object"}
+    assert cache.get("b") == {"type": "string"}
+
+
+def test_cached_values_are_copies(tmp_path: Path):
+    cache = SchemaCache(tmp_path)
+    value: dict[str, Any] = {"properties": {}}
+    cache.set("key", value)
+    value["properties"]["x"] = 1
+
+    cached = cache.get("key")
+    assert cached == {"properties": {}}
+    cached["properties"]["y"] = 2
+    assert cache.get("key") == {"properties": {}}
+
+
+def test_save_prunes_old_and_least_recently_used_entries(tmp_path: Path):
+    now = time.time()
+    cache = SchemaCache(tmp_path, max_entries=2, max_age=100)
+    cache.path.write_text(
+        json.dumps(
+            {
+                "expired": {"value": 1, "used_at": now - 200},
+                "old": {"value": 2, "used_at": now - 50},
+                "recent": {"value": 3, "used_at": now - 10},
+            }
+        )
+    )
+    cache.set("new", 4)
+    cache.save()
+
+    cache = SchemaCache(tmp_path)
+    assert cache.get("expired") is None
+    assert cache.get("old") is None
+    assert cache.get("recent") == 3
+    assert cache.get("new") == 4
+
+
+def test_save_removes_stale_cache_files(tmp_path: Path):
+    stale = tmp_path / "schemas-stale.json"
+    recent = tmp_path / "schemas-recent.json"
+    stale.write_text("{}")
+    recent.write_text("{}")
+    old = time.time() - 200
+    os.utime(stale, (old, old))
+
+    cache = SchemaCache(tmp_path, max_age=100)
+    cache.set("key", {"type": "object"})
+    cache.save()
+    assert not stale.exists()
+    assert recent.exists()
+    assert cache.path.exists()
+
+
+def test_unreadable_cache_is_ignored(tmp_path: Path):
+    cache = SchemaCache(tmp_path)
+    cache.path.write_text("not json")
+    assert cache.get("key") is None
+
+    cache.set("key", {"type": "object"})
+    cache.save()
+    assert SchemaCache(tmp_path).get("key") == {"type": "object"}
+
+    cache.clear()
+    assert not cache.path.exists()
+
+
+def test_default_directory_from_environment(tmp_path: Path, monkeypatch: pytest.MonkeyPatch):
+    monkeypatch.setenv("OPENAI_AGENTS_CACHE_DIR", str(tmp_path))
+    assert SchemaCache().directory == tmp_path
@@ -0,0 +1,227 @@
+from __future__ import annotations
+
+import json
+import sqlite3
+from collections.abc import AsyncIterator
+from pathlib import Path
+from typing import Any, Callable, cast
+
+import pytest
+
+from agents import (
+    Agent,
+    GuardrailFunctionOutput,
+    InMemorySession,
+    InputGuardrail,
+    InputGuardrailTripwireTriggered,
+    RunConfig,
+    Runner,
+    Session,
+    SQLiteSession,
+    TResponseInputItem,
+)
+from agents.items import TResponseStreamEvent
+
+from .fake_model import FakeModel
+from .test_responses import get_function_tool, get_function_tool_call, get_text_message
+
+
+class RecordingModel(FakeModel):
+    """Records the input of every model call."""
+
+    def __init__(self) -> None:
+        super().__init__()
+        self.inputs: list[list[TResponseInputItem]] = []
+
+    async def get_response(self, system_instructions, input, *args: Any, **kwargs: Any):
+        self.inputs.append(input)
+        return await super().get_response(system_instructions, input, *args, **kwargs)
+
+    async def stream_response(
+        self, system_instructions, input, *args: Any, **kwargs: Any
+    ) -> AsyncIterator[TResponseStreamEvent]:
+        self.inputs.append(input)
+        async for event in super().stream_response(system_instructions, input, *args, **kwargs):
+            yield event
+
+
+def _message(content: str) -> TResponseInputItem:
+    return {"role": "user", "content": content}
+
+
+def _in_memory_session(session_id: str, tmp_path: Path) -> Session:
+    return InMemorySession(session_id, store={})
+
+
+def _sqlite_session(session_id: str, tmp_path: Path) -> Session:
+    return SQLiteSession(session_id, db_path=tmp_path / "sessions.db")
+
+
+SESSION_FACTORIES = [_in_memory_session, _sqlite_session]
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("make_session", SESSION_FACTORIES)
+async def test_session_items(make_session: Callable[[str, Path], Session], tmp_path: Path):
+    session = make_session("session_1", tmp_path)
+    assert await session.get_items() == []
+    assert await session.pop_item() is None
+
+    await session.add_items([_message("a"), _message("b")])
+    await session.add_items([_message("c")])
+    assert await session.get_items() == [_message("a"), _message("b"), _message("c")]
+    assert await session.get_items(limit=2) == [_message("b"), _message("c")]
+    assert await session.get_items(limit=10) == [_message("a"), _message("b"), _message("c")]
+    assert await session.get_items(limit=0) == []
+
+    assert await session.pop_item() == _message("c")
+    assert await session.get_items() == [_message("a"), _message("b")]
+
+    await session.clear_session()
+    assert await session.get_items() == []
+
+
+@pytest.mark.asyncio
+async def test_in_memory_sessions_only_share_an_explicit_store():
+    await InMemorySession("session_1").add_items([_message("a")])
+    assert await InMemorySession("session_1").get_items() == []
+
+    store: dict[str, list[TResponseInputItem]] = {}
+    await InMemorySession("session_1", store=store).add_items([_message("a")])
+    assert await InMemorySession("session_1", store=store).get_items() == [_message("a")]
+    await InMemorySession("session_1", store=store).clear_session()
+    assert store == {}
+
+
+@pytest.mark.asyncio
+async def test_in_memory_session_returns_copies():
+    session = InMemorySession("session_1")
+    await session.add_items(
+        [{"role": "user", "content": [{"type": "input_text", "text": "original"}]}]
+    )
+
+    items = cast(list[dict[str, Any]], await session.get_items())
+    items[0]["content"][0]["text"] = "changed"
+    items[0]["role"] = "assistant"
+
+    assert await session.get_items() == [
+        {"role": "user", "content": [{"type": "input_text", "text": "original"}]}
+    ]
+
+
+@pytest.mark.asyncio
+async def test_sqlite_sessions_share_a_database(tmp_path: Path):
+    db_path = tmp_path / "sessions.db"
+    first = SQLiteSession("first", db_path=db_path)
+    second = SQLiteSession("second", db_path=db_path)
+    await first.add_items([_message("a")])
+    await second.add_items([_message("b")])
+    await first.clear_session()
+
+    assert await first.get_items() == []
+    assert await second.get_items() == [_message("b")]
+    # Another connection, e.g. after a restart, sees the same items
+    assert await SQLiteSession("second", db_path=db_path).get_items() == [_message("b")]
+
+    connection = sqlite3.connect(db_path)
+    assert connection.execute("PRAGMA journal_mode").fetchone() == ("wal",)
+    plan = connection.execute(
+        "EXPLAIN QUERY PLAN SELECT item_data FROM agent_session_items WHERE session_id = ? "
+        "ORDER BY id DESC LIMIT 10",
+        ("second",),
+    ).fetchall()
+    assert "USING INDEX" in str(plan)
+    connection.close()
+    for session in (first, second):
+        session.close()
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("make_session", SESSION_FACTORIES)
+async def test_runs_continue_the_session(
+    make_session: Callable[[str, Path], Session], tmp_path: Path
+):
+    session = make_session("session_1", tmp_path)
+    model = RecordingModel()
+    agent = Agent(name="test", model=model, tools=[get_function_tool("foo", "tool_result")])
+    run_config = RunConfig(session=session)
+
+    model.add_multiple_turn_outputs(
+        [[get_function_tool_call("foo", json.dumps({}))], [get_text_message("first answer")]]
+    )
+    first = await Runner.run(agent, input="first question", run_config=run_config)
+
+    items = await session.get_items()
+    assert items == first.to_input_list()
+    assert [item.get("type") for item in items] == [
+        None,
+        "function_call",
+        "function_call_output",
+        "message",
+    ]
+
+    model.set_next_output([get_text_message("second answer")])
+    second = await Runner.run(agent, input="second question", run_config=run_config)
+
+    assert model.inputs[-1] == items + [_message("second question")]
+    assert await session.get_items() == second.to_input_list()
+    assert len(second.to_input_list()) == 6
+
+
+@pytest.mark.asyncio
+async def test_streamed_runs_continue_the_session():
+    session = InMemorySession("session_1", store={})
+    await session.add_items([_message("earlier question")])
+    model = RecordingModel()
+    agent = Agent(name="test", model=model)
+
+    model.set_next_output([get_text_message("answer")])
+    result = Runner.run_streamed(agent, input="question", run_config=RunConfig(session=session))
+    async for _ in result.stream_events():
+        pass
+
+    assert model.inputs[0] == [_message("earlier question"), _message("question")]
+    items = await session.get_items()
+    assert items == result.to_input_list()
+    assert len(items) == 3
+
+
+@pytest.mark.asyncio
+async def test_history_limit_drops_orphaned_tool_outputs():
+    session = InMemorySession("session_1", store={})
+    model = RecordingModel()
+    agent = Agent(name="test", model=model, tools=[get_function_tool("foo", "tool_result")])
+    model.add_multiple_turn_outputs(
+        [[get_function_tool_call("foo", json.dumps({}))], [get_text_message("answer")]]
+    )
+    await Runner.run(agent, input="question", run_config=RunConfig(session=session))
+
+    model.set_next_output([get_text_message("second answer")])
+    await Runner.run(
+        agent,
+        input="second question",
+        run_config=RunConfig(session=session, session_history_limit=2),
+    )
+
+    # The last two items are the tool output and the answer. The output is dropped, since its
+    # call is outside the window.
+    assert [item.get("type") for item in model.inputs[-1]] == ["message", None]
+
+
+@pytest.mark.asyncio
+async def test_tripped_input_is_not_saved():
+    def guardrail_function(context, agent, input) -> GuardrailFunctionOutput:
+        return GuardrailFunctionOutput(output_info=None, tripwire_triggered=True)
+
+    session = InMemorySession("session_1", store={})
+    model = RecordingModel()
+    agent = Agent(
+        name="test",
+        model=model,
+        input_guardrails=[InputGuardrail(guardrail_function=guardrail_function)],
+    )
+    model.set_next_output([get_text_message("answer")])
+
+    with pytest.raises(InputGuardrailTripwireTriggered):
+        await Runner.run(agent, input="question", run_config=RunConfig(session=session))
+    assert await session.get_items() == []
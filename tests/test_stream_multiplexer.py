@@ -0,0 +1,196 @@
+from __future__ import annotations
+
+import asyncio
+import json
+from collections.abc import AsyncIterator
+from typing import Any
+
+import pytest
+
+from agents import (
+    Agent,
+    GuardrailFunctionOutput,
+    InputGuardrailTripwireTriggered,
+    MaxTurnsExceeded,
+    MultiplexedRunComplete,
+    MultiplexedStreamEvent,
+    RunConfig,
+    RunContextWrapper,
+    Runner,
+    StreamMultiplexer,
+    UserError,
+    input_guardrail,
+)
+from agents.items import TResponseStreamEvent
+
+from .fake_model import FakeModel
+from .test_responses import get_function_tool, get_function_tool_call, get_text_message
+
+
+def _agent_with_tool_turns(final_text: str) -> Agent:
+    model = FakeModel()
+    model.add_multiple_turn_outputs(
+        [
+            [get_function_tool_call("foo", json.dumps({}))],
+            [get_text_message(final_text)],
+        ]
+    )
+    return Agent(name="test", model=model, tools=[get_function_tool("foo", "tool_result")])
+
+
+class StalledModel(FakeModel):
+    """A model whose stream never produces an event."""
+
+    async def stream_response(
+        self, *args: Any, **kwargs: Any
+    ) -> AsyncIterator[TResponseStreamEvent]:
+        await asyncio.Event().wait()
+        yield  # type: ignore[misc]
+
+
+@pytest.mark.asyncio
+async def test_multiplexer_merges_runs():
+    multiplexer = StreamMultiplexer()
+    for run_id in ["a", "b", "c"]:
+        agent = _agent_with_tool_turns(f"done {run_id}")
+        multiplexer.add(run_id, Runner.run_streamed(agent, input="test"))
+    assert len(multiplexer) == 3
+
+    events: dict[str, list[str]] = {"a": [], "b": [], "c": []}
+    completed = {}
+    async for event in multiplexer:
+        if isinstance(event, MultiplexedStreamEvent):
+            assert event.run_id not in completed
+            events[event.run_id].append(event.event.type)
+        else:
+            completed[event.run_id] = event
+
+    assert len(multiplexer) == 0
+    for run_id in ["a", "b", "c"]:
+        assert completed[run_id].error is None
+        assert completed[run_id].result.final_output == f"done {run_id}"
+        assert completed[run_id].result.is_complete
+        assert events[run_id][0] == "agent_updated_stream_event"
+        assert events[run_id].count("run_item_stream_event") == 3
+
+
+@pytest.mark.asyncio
+async def test_multiplexer_is_fair():
+    multiplexer = StreamMultiplexer()
+    results = {
+        run_id: Runner.run_streamed(_agent_with_tool_turns("done"), input="test")
+        for run_id in ["a", "b"]
+    }
+    for run_id, result in results.items():
+        multiplexer.add(run_id, result)
+
+    order = [event.run_id async for event in multiplexer]
+
+    # Both runs are served alternately while both have events waiting
+    assert order[:4] == ["a", "b", "a", "b"]
+    assert order.count("a") == order.count("b")
+
+
+@pytest.mark.asyncio
+async def test_multiplexer_reports_errors_per_run():
+    failing_agent = _agent_with_tool_turns("never")
+    multiplexer = StreamMultiplexer()
+    multiplexer.add("ok", Runner.run_streamed(_agent_with_tool_turns("done"), input="test"))
+    multiplexer.add("failing", Runner.run_streamed(failing_agent, input="test", max_turns=1))
+
+    completed = {
+        event.run_id: event
+        async for event in multiplexer
+        if isinstance(event, MultiplexedRunComplete)
+    }
+
+    assert completed["ok"].error is None
+    assert completed["ok"].result.final_output == "done"
+    assert isinstance(completed["failing"].error, MaxTurnsExceeded)
+
+
+@pytest.mark.asyncio
+async def test_multiplexer_add_while_iterating():
+    multiplexer = StreamMultiplexer()
+    multiplexer.add("first", Runner.run_streamed(_agent_with_tool_turns("first"), input="test"))
+
+    completed = []
+    async for event in multiplexer:
+        if isinstance(event, MultiplexedRunComplete):
+            completed.append(event.run_id)
+            if event.run_id == "first":
+                second = Runner.run_streamed(_agent_with_tool_turns("second"), input="test")
+                multiplexer.add("second", second)
+
+    assert completed == ["first", "second"]
+
+
+@pytest.mark.asyncio
+async def test_multiplexer_rejects_duplicates():
+    multiplexer = StreamMultiplexer()
+    result = Runner.run_streamed(_agent_with_tool_turns("done"), input="test")
+    multiplexer.add("a", result)
+
+    with pytest.raises(UserError):
+        multiplexer.add("a", Runner.run_streamed(_agent_with_tool_turns("done"), input="test"))
+    with pytest.raises(UserError):
+        StreamMultiplexer().add("b", result)
+
+    async for _ in multiplexer:
+        pass
+
+
+@pytest.mark.asyncio
+async def test_multiplexer_reports_tripwires_without_waiting_for_events():
+    @input_guardrail
+    async def tripwire(
+        context: RunContextWrapper[Any], agent: Agent[Any], input: Any
+    ) -> GuardrailFunctionOutput:
+        await asyncio.sleep(0.01)
+        return GuardrailFunctionOutput(output_info=None, tripwire_triggered=True)
+
+    agent = Agent(name="test", model=StalledModel(), input_guardrails=[tripwire])
+    multiplexer = StreamMultiplexer()
+    multiplexer.add("a", Runner.run_streamed(agent, input="test"))
+
+    async def completion() -> MultiplexedRunComplete:
+        async for event in multiplexer:
+            if isinstance(event, MultiplexedRunComplete):
+                return event
+        raise AssertionError("The run never completed")
+
+    completed = await asyncio.wait_for(completion(), timeout=5)
+
+    assert isinstance(completed.error, InputGuardrailTripwireTriggered)
+
+
+@pytest.mark.asyncio
+async def test_multiplexer_detaches_runs_when_iteration_stops_early():
+    results = [
+        Runner.run_streamed(
+            _agent_with_tool_turns("done"),
+            input="test",
+            run_config=RunConfig(stream_queue_max_size=1, stream_queue_overflow_policy="block"),
+        )
+        for _ in range(2)
+    ]
+    multiplexer = StreamMultiplexer()
+    for run_id, result in zip(["a", "b"], results):
+        multiplexer.add(run_id, result)
+
+    events = multiplexer.events()
+    async for _ in events:
+        break
+    await events.aclose()  # type: ignore[attr-defined]
+
+    assert len(multiplexer) == 0
+    for result in results:
+        assert result._event_queue._put_listener is None
+    # The bounded queues no longer block the runs, so they can finish without a consumer
+    tasks = [result._run_impl_task for result in results if result._run_impl_task is not None]
+    assert len(tasks) == 2
+    await asyncio.wait_for(asyncio.gather(*tasks), timeout=5)
+    assert [result.final_output for result in results] == ["done", "done"]
+    # The runs can be added to another multiplexer
+    other = StreamMultiplexer()
+    other.add("a", results[0])
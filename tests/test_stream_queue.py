@@ -0,0 +1,225 @@
+import asyncio
+from collections.abc import Sequence
+
+import pytest
+from openai.types.responses import ResponseTextDeltaEvent
+
+from agents import Agent, AgentUpdatedStreamEvent, RawResponsesStreamEvent
+from agents._run_impl import QueueCompleteSentinel
+from agents.stream_queue import StreamEventQueue, TextDeltaCoalescer
+
+
+def _text_delta(delta: str, item_id: str = "1") -> RawResponsesStreamEvent:
+    return RawResponsesStreamEvent(
+        data=ResponseTextDeltaEvent(
+            content_index=0,
+            delta=delta,
+            item_id=item_id,
+            output_index=0,
+            type="response.output_text.delta",
+        )
+    )
+
+
+def _agent_updated() -> AgentUpdatedStreamEvent:
+    return AgentUpdatedStreamEvent(new_agent=Agent(name="test"))
+
+
+def _drain(queue: StreamEventQueue) -> list[object]:
+    items: list[object] = []
+    while not queue.empty():
+        items.append(queue.get_nowait())
+    return items
+
+
+def _deltas(items: Sequence[object]) -> list[str]:
+    return [
+        item.data.delta
+        for item in items
+        if isinstance(item, RawResponsesStreamEvent)
+        and isinstance(item.data, ResponseTextDeltaEvent)
+    ]
+
+
+@pytest.mark.asyncio
+async def test_unbounded_by_default():
+    queue = StreamEventQueue()
+    for index in range(100):
+        await queue.put(_text_delta(str(index)))
+
+    assert queue.qsize() == 100
+    assert queue.stats.high_water_mark == 100
+    assert queue.stats.blocked_puts == 0
+
+
+@pytest.mark.asyncio
+async def test_block_policy_waits_for_consumer():
+    queue = StreamEventQueue(max_size=2, overflow_policy="block")
+    await queue.put(_text_delta("a"))
+    await queue.put(_text_delta("b"))
+
+    put_task = asyncio.create_task(queue.put(_text_delta("c")))
+    await asyncio.sleep(0.01)
+    assert not put_task.done()
+
+    queue.get_nowait()
+    await asyncio.wait_for(put_task, timeout=1)
+    assert _deltas(_drain(queue)) == ["b", "c"]
+    assert queue.stats.blocked_puts == 1
+    assert queue.stats.high_water_mark == 2
+
+
+@pytest.mark.asyncio
+async def test_release_wakes_up_blocked_producers():
+    queue = StreamEventQueue(max_size=1, overflow_policy="block")
+    await queue.put(_text_delta("a"))
+
+    put_tasks = [asyncio.create_task(queue.put(_text_delta(delta))) for delta in "bc"]
+    await asyncio.sleep(0)
+    assert not any(task.done() for task in put_tasks)
+
+    queue.release()
+    await asyncio.wait_for(asyncio.gather(*put_tasks), timeout=1)
+    await queue.put(_text_delta("d"))
+    assert _deltas(_drain(queue)) == ["a", "b", "c", "d"]
+
+
+@pytest.mark.asyncio
+async def test_put_nowait_ignores_max_size():
+    queue = StreamEventQueue(max_size=1)
+    await queue.put(_text_delta("a"))
+    queue.put_nowait(QueueCompleteSentinel())
+
+    assert queue.qsize() == 2
+    assert queue.stats.high_water_mark == 2
+
+
+@pytest.mark.asyncio
+async def test_coalesce_policy_merges_text_deltas():
+    queue = StreamEventQueue(max_size=2, overflow_policy="coalesce_text_deltas")
+    await queue.put(_agent_updated())
+    for delta in ["Hel", "lo", " wor", "ld"]:
+        await queue.put(_text_delta(delta))
+
+    assert queue.qsize() == 2
+    assert queue.stats.coalesced_events == 3
+
+    queue.put_nowait(QueueCompleteSentinel())
+    items = _drain(queue)
+    assert isinstance(items[0], AgentUpdatedStreamEvent)
+    assert _deltas(items) == ["Hello world"]
+    assert isinstance(items[2], QueueCompleteSentinel)
+
+
+@pytest.mark.asyncio
+async def test_coalesce_policy_keeps_content_parts_apart():
+    queue = StreamEventQueue(max_size=1, overflow_policy="coalesce_text_deltas")
+    await queue.put(_text_delta("a", item_id="1"))
+    await queue.put(_text_delta("b", item_id="1"))
+
+    put_task = asyncio.create_task(queue.put(_text_delta("c", item_id="2")))
+    await asyncio.sleep(0.01)
+    # Deltas for a different message can't be merged, so the producer waits
+    assert not put_task.done()
+
+    assert _deltas([queue.get_nowait()]) == ["ab"]
+    await asyncio.wait_for(put_task, timeout=1)
+    assert _deltas(_drain(queue)) == ["c"]
+
+
+@pytest.mark.asyncio
+async def test_drop_policy_keeps_other_events():
+    queue = StreamEventQueue(max_size=2, overflow_policy="drop_raw_events")
+    for delta in ["a", "b", "c", "d"]:
+        await queue.put(_text_delta(delta))
+    await queue.put(_agent_updated())
+
+    items = _drain(queue)
+    assert _deltas(items) == ["a", "b"]
+    assert isinstance(items[-1], AgentUpdatedStreamEvent)
+    assert queue.stats.dropped_events == 2
+    assert queue.stats.high_water_mark == 3
+
+
+@pytest.mark.asyncio
+async def test_coalescer_merges_waiting_deltas_in_order():
+    queue = StreamEventQueue()
+    for delta in ["a", "b"]:
+        queue.put_nowait(_text_delta(delta))
+    queue.put_nowait(_agent_updated())
+    for delta in ["c", "d"]:
+        queue.put_nowait(_text_delta(delta, item_id="2"))
+    queue.put_nowait(_text_delta("e", item_id="3"))
+    queue.put_nowait(QueueCompleteSentinel())
+
+    coalescer = TextDeltaCoalescer(queue, window=None, max_chars=100)
+    items = []
+    while not isinstance(item := await coalescer.get(), QueueCompleteSentinel):
+        items.append(item)
+
+    assert _deltas(items[:1]) == ["ab"]
+    assert isinstance(items[1], AgentUpdatedStreamEvent)
+    assert _deltas(items[2:]) == ["cd", "e"]
+
+
+@pytest.mark.asyncio
+async def test_coalescer_max_chars():
+    queue = StreamEventQueue()
+    for delta in ["aa", "bb", "cc", "dd", "ee"]:
+        queue.put_nowait(_text_delta(delta))
+
+    coalescer = TextDeltaCoalescer(queue, window=None, max_chars=4)
+    assert _deltas([await coalescer.get() for _ in range(3)]) == ["aabb", "ccdd", "ee"]
+
+
+@pytest.mark.asyncio
+async def test_coalescer_window_waits_for_more_deltas():
+    queue = StreamEventQueue()
+
+    async def produce():
+        for delta in ["a", "b", "c"]:
+            await queue.put(_text_delta(delta))
+            await asyncio.sleep(0.01)
+        await asyncio.sleep(0.2)
+        await queue.put(_text_delta("d"))
+
+    producer = asyncio.create_task(produce())
+    coalescer = TextDeltaCoalescer(queue, window=0.1, max_chars=None)
+    assert _deltas([await coalescer.get()]) == ["abc"]
+    # The pending get() that timed out still delivers the next delta
+    assert _deltas([await coalescer.get()]) == ["d"]
+    await producer
+    coalescer.close()
+
+
+@pytest.mark.asyncio
+async def test_coalescing_reduces_writes():
+    """Compares how many events a consumer receives, i.e. how many writes it would make, with and
+    without coalescing text deltas."""
+    num_deltas = 5_000
+    max_chars = 4096
+
+    async def consume(coalesce: bool) -> int:
+        queue = StreamEventQueue()
+        coalescer = (
+            TextDeltaCoalescer(queue, window=None, max_chars=max_chars) if coalesce else None
+        )
+        for _ in range(num_deltas):
+            queue.put_nowait(_text_delta("token "))
+        queue.put_nowait(QueueCompleteSentinel())
+
+        events = 0
+        text = []
+        while True:
+            item = await (coalescer.get() if coalescer else queue.get())
+            if isinstance(item, QueueCompleteSentinel):
+                break
+            events += 1
+            text.extend(_deltas([item]))
+        assert "".join(text) == "token " * num_deltas
+        return events
+
+    assert await consume(coalesce=False) == num_deltas
+    # Each merged event stops once it has at least `max_chars` characters
+    deltas_per_event = -(-max_chars // len("token "))
+    assert await consume(coalesce=True) == -(-num_deltas // deltas_per_event)
@@ -1,7 +1,15 @@
+import copy
+import json
+import pickle
+from typing import Any
+
 import pytest
+from pydantic import BaseModel, Field
 
+from agents import strict_schema
 from agents.exceptions import UserError
-from agents.strict_schema import ensure_strict_json_schema
+from agents.json_codec import get_json_codec
+from agents.strict_schema import clear_strict_schema_cache, ensure_strict_json_schema
 
 
 def test_empty_schema_has_additional_properties_false():
@@ -124,3 +132,115 @@ def test_invalid_ref_format():
     schema = {"type": "object", "properties": {"a": {"$ref": "invalid", "description": "desc"}}}
     with pytest.raises(ValueError):
         ensure_strict_json_schema(schema)
+
+
+class Address(BaseModel):
+    street: str
+    city: str = "Springfield"
+
+
+class Customer(BaseModel):
+    name: str
+    address: Address = Field(description="Where the customer lives")
+
+
+class Order(BaseModel):
+    customer: Customer
+    shipping_address: Address
+
+
+@pytest.fixture
+def strict_walks(monkeypatch: pytest.MonkeyPatch) -> list[tuple[str, ...]]:
+    clear_strict_schema_cache()
+    walks: list[tuple[str, ...]] = []
+    original = strict_schema._ensure_strict_json_schema
+
+    def counting_walk(json_schema, *, path, root):
+        # Cached strict schemas are returned right away, so they don't count
+        if not isinstance(json_schema, strict_schema._FrozenDict):
+            walks.append(path)
+        return original(json_schema, path=path, root=root)
+
+    monkeypatch.setattr(strict_schema, "_ensure_strict_json_schema", counting_walk)
+    return walks
+
+
+def test_results_are_cached_and_frozen(strict_walks: list[tuple[str, ...]]):
+    first = ensure_strict_json_schema(Customer.model_json_schema())
+    walks = len(strict_walks)
+    second = ensure_strict_json_schema(Customer.model_json_schema())
+
+    assert second is first
+    assert len(strict_walks) == walks
+    with pytest.raises(TypeError):
+        first["required"] = []
+    with pytest.raises(TypeError):
+        first["required"].append("x")
+    with pytest.raises(TypeError):
+        first["properties"].pop("name")
+
+    # Copies can be modified, and serialize like regular schemas
+    copied = copy.deepcopy(first)
+    copied["properties"]["address"]["properties"].clear()
+    assert type(copied) is dict
+    assert first["properties"]["address"]["properties"]
+    assert json.loads(json.dumps(first)) == first
+    assert json.loads(get_json_codec().dumps(first)) == first
+    assert pickle.loads(pickle.dumps(first)) == first
+
+
+def test_shared_defs_are_made_strict_once(strict_walks: list[tuple[str, ...]]):
+    customer = ensure_strict_json_schema(Customer.model_json_schema())
+    strict_walks.clear()
+    order = ensure_strict_json_schema(Order.model_json_schema())
+
+    # Address was already made strict for Customer, so it's reused rather than walked again
+    assert ("$defs", "Address") not in strict_walks
+    assert ("$defs", "Customer") in strict_walks
+    assert order["$defs"]["Address"] is customer["$defs"]["Address"]
+    assert order["$defs"]["Address"]["required"] == ["street", "city"]
+    assert order["$defs"]["Address"]["additionalProperties"] is False
+    address = order["$defs"]["Customer"]["properties"]["address"]
+    assert address["description"] == "Where the customer lives"
+    assert address["additionalProperties"] is False
+
+
+def test_defs_are_keyed_on_the_defs_they_reference():
+    clear_strict_schema_cache()
+
+    def schema_with_address(address_type: str) -> dict[str, Any]:
+        return {
+            "$defs": {
+                "Address": {"type": "object", "properties": {"street": {"type": address_type}}},
+                "Customer": {
+                    "type": "object",
+                    "properties": {"address": {"$ref": "#/$defs/Address", "description": "d"}},
+                },
+            },
+            "type": "object",
+            "properties": {"customer": {"$ref": "#/$defs/Customer"}},
+        }
+
+    string_schema = ensure_strict_json_schema(schema_with_address("string"))
+    int_schema = ensure_strict_json_schema(schema_with_address("integer"))
+
+    string_address = string_schema["$defs"]["Customer"]["properties"]["address"]
+    int_address = int_schema["$defs"]["Customer"]["properties"]["address"]
+    assert string_address["properties"]["street"]["type"] == "string"
+    assert int_address["properties"]["street"]["type"] == "integer"
+
+
+def test_property_order_is_part_of_the_key():
+    clear_strict_schema_cache()
+    a_first = {"type": "object", "properties": {"a": {"type": "string"}, "b": {"type": "string"}}}
+    b_first = {"type": "object", "properties": {"b": {"type": "string"}, "a": {"type": "string"}}}
+
+    assert ensure_strict_json_schema(a_first)["required"] == ["a", "b"]
+    assert ensure_strict_json_schema(b_first)["required"] == ["b", "a"]
+
+
+def test_errors_are_not_cached():
+    schema = {"type": "object", "additionalProperties": True, "properties": {}}
+    for _ in range(2):
+        with pytest.raises(UserError):
+            ensure_strict_json_schema(copy.deepcopy(schema))
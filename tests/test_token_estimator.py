@@ -0,0 +1,176 @@
+from __future__ import annotations
+
+import json
+import sys
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, cast
+
+import pytest
+
+from agents import (
+    Agent,
+    HeuristicTokenEstimator,
+    RunConfig,
+    RunContextWrapper,
+    Runner,
+    TokenEstimator,
+    TResponseInputItem,
+    function_tool,
+    get_default_token_estimator,
+)
+
+from .fake_model import FakeModel
+from .test_responses import get_function_tool, get_function_tool_call, get_text_message
+
+
+class CountingEstimator(TokenEstimator):
+    """Counts like the heuristic estimator, but caches its counts, like a tokenizer-based estimator
+    would."""
+
+    def __init__(self, max_cached_items: int = 10_000):
+        super().__init__(max_cached_items=max_cached_items)
+        self.counted: list[str] = []
+
+    def count_text_tokens(self, text: str) -> int:
+        self.counted.append(text)
+        return -(-len(text) // 4)
+
+
+def _message(content: str) -> TResponseInputItem:
+    return {"role": "user", "content": content}
+
+
+def test_heuristic_counts():
+    estimator = HeuristicTokenEstimator()
+    assert estimator.count_text_tokens("") == 0
+    assert estimator.count_text_tokens("abcd") == 1
+    assert estimator.count_text_tokens("abcde") == 2
+
+    item = _message("hello world")
+    # The JSON of the item, plus the overhead of an item
+    assert (
+        estimator.estimate_item(item) == -(-len(json.dumps(item, separators=(",", ":"))) // 4) + 4
+    )
+    assert estimator.estimate_items([item, item]) == 2 * estimator.estimate_item(item)
+    # Counting is cheaper than hashing, so nothing is cached
+    assert estimator.estimate_text("some instructions") == 5
+    assert not estimator._counts
+
+
+def test_item_counts_are_cached_by_content():
+    estimator = CountingEstimator()
+    first, second, other = _message("a"), _message("a"), _message("b")
+
+    estimator.estimate_items([first, second, other])
+    assert len(estimator.counted) == 2
+    estimator.estimate_item(second)
+    assert len(estimator.counted) == 2
+
+    estimator.clear_cache()
+    estimator.estimate_item(first)
+    assert len(estimator.counted) == 3
+
+
+def test_cache_keeps_no_references_to_items():
+    estimator = CountingEstimator()
+    item = _message("a")
+    ref_count = sys.getrefcount(item)
+
+    estimator.estimate_item(item)
+    estimator.estimate_text("some instructions")
+
+    assert sys.getrefcount(item) == ref_count
+    assert all(isinstance(key, bytes) for key in estimator._counts)
+
+
+def test_estimator_is_thread_safe():
+    estimator = CountingEstimator(max_cached_items=8)
+    items = [_message(str(index)) for index in range(100)]
+    expected = sum(estimator.count_text_tokens(json.dumps(i, separators=(",", ":"))) for i in items)
+
+    with ThreadPoolExecutor(max_workers=8) as executor:
+        totals = list(executor.map(lambda _: estimator.estimate_items(items), range(16)))
+
+    assert totals == [expected + 4 * len(items)] * 16
+    assert len(estimator._counts) <= 8
+
+
+def test_cache_evicts_least_recently_used():
+    estimator = CountingEstimator(max_cached_items=2)
+    items = [_message(str(index)) for index in range(3)]
+
+    estimator.estimate_items(items[:2])
+    estimator.estimate_item(items[0])
+    estimator.estimate_item(items[2])
+    assert len(estimator.counted) == 3
+    # items[1] was evicted, items[0] was used more recently
+    estimator.estimate_item(items[0])
+    assert len(estimator.counted) == 3
+    estimator.estimate_item(items[1])
+    assert len(estimator.counted) == 4
+
+    estimator.estimate_text("instructions")
+    estimator.estimate_text("instructions")
+    assert estimator.counted[-1] == "instructions"
+    assert len(estimator.counted) == 5
+
+
+def test_tool_counts_are_cached_by_fingerprint():
+    estimator = CountingEstimator()
+
+    first = get_function_tool("foo")
+    same_schema = get_function_tool("foo")
+    other = get_function_tool("bar")
+
+    count = estimator.estimate_tool(first)
+    assert count > 0
+    assert estimator.estimate_tool(same_schema) == count
+    assert len(estimator.counted) == 1
+    assert "foo" in estimator.counted[0]
+
+    assert estimator.estimate_tools([first, other]) > count
+    assert len(estimator.counted) == 2
+
+
+def test_tiktoken_estimator():
+    pytest.importorskip("tiktoken")
+    from agents import TiktokenEstimator
+
+    try:
+        estimator = TiktokenEstimator()
+    except Exception:
+        pytest.skip("The tiktoken encoding isn't available offline")
+    assert estimator.count_text_tokens("hello world") == 2
+
+
+@pytest.mark.asyncio
+async def test_estimator_is_available_to_tools():
+    seen = []
+
+    @function_tool
+    def count_tokens(ctx: RunContextWrapper[None], text: str) -> int:
+        seen.append(ctx.token_estimator)
+        return ctx.token_estimator.estimate_text(text)
+
+    model = FakeModel()
+    agent = Agent(name="test", model=model, tools=[count_tokens])
+    model.add_multiple_turn_outputs(
+        [
+            [get_function_tool_call("count_tokens", json.dumps({"text": "abcdefgh"}))],
+            [get_text_message("done")],
+        ]
+    )
+    await Runner.run(agent, input="test")
+    assert seen == [get_default_token_estimator()]
+
+    estimator = CountingEstimator()
+    model.add_multiple_turn_outputs(
+        [
+            [get_function_tool_call("count_tokens", json.dumps({"text": "abcdefgh"}))],
+            [get_text_message("done")],
+        ]
+    )
+    result = await Runner.run(agent, input="test", run_config=RunConfig(token_estimator=estimator))
+    assert seen[-1] is estimator
+    assert estimator.counted == ["abcdefgh"]
+    assert cast(dict[str, Any], result.new_items[1].raw_item)["output"] == "2"
@@ -1,3 +1,4 @@
+import json
 import os
 import time
 from unittest.mock import MagicMock, patch
@@ -274,3 +275,23 @@ def test_backend_span_exporter_close(mock_client):
 
     # Ensure underlying http client is closed
     mock_client.return_value.close.assert_called_once()
+
+
+@patch("httpx.Client")
+def test_backend_span_exporter_exports_items_once(mock_client, patched_time_sleep):
+    mock_response = MagicMock()
+    mock_response.status_code = 500
+    mock_client.return_value.post.return_value = mock_response
+
+    span = get_span(mock_processor())
+    exporter = BackendSpanExporter(api_key="test_key", max_retries=2)
+    with patch.object(span, "export", wraps=span.export) as export:
+        exporter.export([span])
+        assert export.call_count == 1
+
+    # Every retry sends the same encoded payload
+    payloads = [call.kwargs["content"] for call in mock_client.return_value.post.call_args_list]
+    assert len(payloads) == 2
+    assert json.loads(payloads[0]) == {"data": [span.export()]}
+    assert payloads[0] is payloads[1]
+    exporter.close()